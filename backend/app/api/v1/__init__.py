@@ -1,12 +1,14 @@
 from fastapi import APIRouter
 
 from app.api.v1.routes import (
+    analytics,
     atm_straddles,
     corp_actions_ingestion,
     expected_move,
     health,
     ingestion,
     indexes_ingestion,
+    jobs,
     meta,
     scheduler,
     validation,
@@ -21,7 +23,9 @@ api_router.include_router(corp_actions_ingestion.router, tags=["corp-actions"])
 api_router.include_router(indexes_ingestion.router, tags=["indexes"])
 api_router.include_router(validation.router, tags=["validation"])
 api_router.include_router(scheduler.router, tags=["scheduler"])
+api_router.include_router(jobs.router, tags=["jobs"])
 api_router.include_router(atm_straddles.router, tags=["options"])
 api_router.include_router(vol_surface.router, tags=["options"])
 api_router.include_router(expected_move.router, tags=["options"])
+api_router.include_router(analytics.router, tags=["analytics"])
 
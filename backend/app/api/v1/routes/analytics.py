@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.services.analytics import (
+    get_daily_log_returns,
+    get_realized_vol_batch,
+    get_resampled_bars,
+    get_symbol_realized_vol,
+    parse_bucket,
+)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/bars/{symbol}")
+async def resampled_bars(
+    symbol: str,
+    bucket: str = Query("1w", description="Bucket width, e.g. 1d, 5d, 1w, 2w, 1mo, 1q, 1y"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(500, ge=1, le=5000),
+) -> dict[str, object]:
+    try:
+        parse_bucket(bucket)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    try:
+        bars = await get_resampled_bars(symbol, bucket, start=start, end=end, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"symbol": symbol.upper(), "bucket": bucket, "results": bars}
+
+
+@router.get("/returns/{symbol}")
+async def daily_log_returns(
+    symbol: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(500, ge=1, le=5000),
+) -> dict[str, object]:
+    try:
+        returns = await get_daily_log_returns(symbol, start=start, end=end, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"symbol": symbol.upper(), "results": returns}
+
+
+@router.get("/realized-vol")
+async def realized_vol_batch(
+    symbols: Optional[List[str]] = Query(None, description="Symbols to include; defaults to every active security"),
+    windows: Optional[List[int]] = Query(None),
+    estimator: str = "close_to_close",
+    as_of: Optional[date] = None,
+) -> dict[str, object]:
+    results = await get_realized_vol_batch(symbols, windows, estimator=estimator, as_of=as_of)
+    return {"estimator": estimator, "results": results}
+
+
+@router.get("/realized-vol/{symbol}")
+async def realized_vol(
+    symbol: str,
+    windows: List[int] = Query([7, 14, 21, 30, 60]),
+    estimator: str = "close_to_close",
+    as_of: Optional[date] = None,
+) -> dict[str, object]:
+    try:
+        values = await get_symbol_realized_vol(symbol, windows, estimator=estimator, as_of=as_of)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {"symbol": symbol.upper(), "estimator": estimator, "results": values}
@@ -6,7 +6,12 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
-from app.services.options import get_recent_atm_straddles, ingest_atm_straddle
+from app.services.job_queue import ATM_TERM_STRUCTURE, enqueue_job
+from app.services.options import (
+    get_recent_atm_straddles,
+    ingest_atm_straddle,
+    record_request,
+)
 
 router = APIRouter(prefix="/options/straddles", tags=["options"])
 
@@ -22,8 +27,27 @@ async def ingest_straddle(payload: IngestRequest, force: bool = Query(False)) ->
     return {"status": "ok", "straddle": straddle}
 
 
+class TermStructureRequest(IngestRequest):
+    tenors: Optional[List[int]] = None
+
+
+@router.post("/term-structure", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_term_structure(payload: TermStructureRequest, force: bool = Query(False)) -> dict[str, object]:
+    job_id = await enqueue_job(
+        ATM_TERM_STRUCTURE,
+        {
+            "symbol": payload.symbol.upper(),
+            "target_date": payload.target_date.isoformat() if payload.target_date else None,
+            "tenors": payload.tenors,
+            "force": force,
+        },
+    )
+    return {"status": "queued", "job_id": job_id}
+
+
 @router.get("/{symbol}")
 async def list_straddles(symbol: str, limit: int = Query(10, ge=1, le=100)) -> dict[str, object]:
+    record_request(symbol)
     straddles = await get_recent_atm_straddles(symbol, limit=limit)
     if not straddles:
         raise HTTPException(status_code=404, detail="No straddles found")
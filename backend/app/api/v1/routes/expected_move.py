@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
+from app.services.job_queue import EXPECTED_MOVE_BATCH, enqueue_job
+from app.services.options.demand import record_request
 from app.services.options.expected_move import (
     compute_expected_move,
     get_recent_expected_moves,
@@ -30,8 +32,26 @@ async def compute_expected_move_endpoint(payload: ExpectedMoveRequest, force: bo
     return {"status": "ok", **result}
 
 
+class ExpectedMoveBatchRequest(BaseModel):
+    symbols: Optional[List[str]] = None
+    horizons: Optional[List[int]] = None
+
+
+@router.post("/batch", status_code=status.HTTP_202_ACCEPTED)
+async def compute_expected_move_batch_endpoint(payload: ExpectedMoveBatchRequest) -> dict[str, object]:
+    job_id = await enqueue_job(
+        EXPECTED_MOVE_BATCH,
+        {
+            "symbols": [symbol.upper() for symbol in payload.symbols] if payload.symbols else None,
+            "horizons": payload.horizons,
+        },
+    )
+    return {"status": "queued", "job_id": job_id}
+
+
 @router.get("/{symbol}")
 async def list_expected_moves(symbol: str, limit: int = Query(10, ge=1, le=50)) -> dict[str, object]:
+    record_request(symbol)
     results = await get_recent_expected_moves(symbol, limit=limit)
     if not results:
         raise HTTPException(status_code=404, detail="No expected move records found")
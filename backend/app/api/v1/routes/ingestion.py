@@ -5,7 +5,8 @@ from datetime import date
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
 
-from app.services.ingestion import backfill_ohlcv, update_ohlcv
+from app.services.ingestion import update_ohlcv
+from app.services.job_queue import OHLCV_BACKFILL, enqueue_job
 
 router = APIRouter(prefix="/ingestion/ohlcv")
 
@@ -22,8 +23,13 @@ class UpdateRequest(BaseModel):
 
 @router.post("/backfill", status_code=status.HTTP_202_ACCEPTED)
 async def trigger_backfill(payload: BackfillRequest) -> dict[str, int | str]:
-    rows = await backfill_ohlcv(payload.symbol, payload.start, payload.end)
-    return {"status": "ok", "rows": rows}
+    if payload.start > payload.end:
+        raise HTTPException(status_code=422, detail="start must be before end")
+    job_id = await enqueue_job(
+        OHLCV_BACKFILL,
+        {"symbol": payload.symbol.upper(), "start": payload.start.isoformat(), "end": payload.end.isoformat()},
+    )
+    return {"status": "queued", "job_id": job_id}
 
 
 @router.post("/update", status_code=status.HTTP_202_ACCEPTED)
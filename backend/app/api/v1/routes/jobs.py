@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.services.job_queue import get_job, list_jobs
+
+router = APIRouter(prefix="/jobs")
+
+
+@router.get("")
+async def list_background_jobs(
+    status: Optional[str] = Query(None, pattern="^(queued|running|succeeded|failed)$"),
+    limit: int = Query(50, ge=1, le=500),
+) -> list[dict[str, Any]]:
+    return await list_jobs(status=status, limit=limit)
+
+
+@router.get("/{job_id}")
+async def get_background_job(job_id: int) -> dict[str, Any]:
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
@@ -1,6 +1,11 @@
+from typing import Any
+
 from fastapi import APIRouter, Depends
 
+from app.clients.circuit import breaker_status
+from app.core import metrics
 from app.core.config import Settings, get_settings
+from app.db.instrumentation import get_slow_queries
 
 router = APIRouter()
 
@@ -13,3 +18,17 @@ async def meta_info(settings: Settings = Depends(get_settings)) -> dict[str, str
         "version": settings.APP_VERSION,
     }
 
+
+@router.get("/metrics")
+async def meta_metrics() -> dict[str, Any]:
+    return metrics.snapshot()
+
+
+@router.get("/circuits")
+async def meta_circuits() -> dict[str, dict[str, Any]]:
+    return breaker_status()
+
+
+@router.get("/slow-queries")
+async def meta_slow_queries() -> list[dict[str, Any]]:
+    return get_slow_queries()
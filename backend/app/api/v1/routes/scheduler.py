@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
-from app.services.scheduler import get_job_status, run_job_now, start_scheduler
-from app.services.scheduler.backfill import run_backfill
+from app.core.config import get_settings
+from app.services.job_queue import SCHEDULER_BACKFILL, SCHEDULER_RUN, JobConflictError, enqueue_job
+from app.services.scheduler import get_job_status
+from app.services.scheduler.history import get_job_runs, get_job_runtimes
+from app.services.scheduler.scheduler import JOB_DEFINITIONS
 
 router = APIRouter(prefix="/scheduler")
 
@@ -21,25 +24,73 @@ class BackfillRequest(BaseModel):
 
 class RunJobResponse(BaseModel):
     status: str
+    job_id: int
+    job_ids: List[int]
 
 
 @router.post("/backfill", status_code=status.HTTP_202_ACCEPTED)
-async def trigger_backfill(payload: BackfillRequest) -> dict[str, int | List[int] | str]:
-    summary = await run_backfill(payload.ingestion_type, payload.symbols, payload.start, payload.end)
-    return {"status": "ok", **summary}
+async def trigger_backfill(payload: BackfillRequest) -> dict[str, int | str]:
+    job_id = await enqueue_job(
+        SCHEDULER_BACKFILL,
+        {
+            "ingestion_type": payload.ingestion_type,
+            "symbols": payload.symbols,
+            "start": payload.start.isoformat(),
+            "end": payload.end.isoformat(),
+        },
+    )
+    return {"status": "queued", "job_id": job_id}
 
 
-@router.post("/run/{job_id}", response_model=RunJobResponse)
+@router.post("/run/{job_id}", response_model=RunJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def run_scheduler_job(job_id: str) -> RunJobResponse:
-    try:
-        await run_job_now(job_id)
-    except ValueError as exc:
-        raise HTTPException(status_code=404, detail=str(exc)) from exc
-    return RunJobResponse(status="ok")
+    if job_id not in JOB_DEFINITIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    # One queued job per shard so a manual run covers the whole universe in parallel.
+    # A shard that is already active keeps its job; the others are still queued, and a
+    # 409 reports both so the caller can track every job covering this run.
+    queued_ids: List[int] = []
+    conflicts: List[dict[str, Any]] = []
+    for shard in range(max(get_settings().SCHEDULER_SHARD_COUNT, 1)):
+        try:
+            queued_ids.append(
+                await enqueue_job(
+                    SCHEDULER_RUN,
+                    {"job_id": job_id, "shard": shard},
+                    dedupe_key=f"scheduler:{job_id}:{shard}",
+                )
+            )
+        except JobConflictError as exc:
+            conflicts.append({"shard": shard, "job_id": exc.job_id, "detail": str(exc)})
+    if conflicts:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": f"Job {job_id} is already active",
+                "job_ids": queued_ids,
+                "conflicts": conflicts,
+            },
+        )
+    return RunJobResponse(status="queued", job_id=queued_ids[0], job_ids=queued_ids)
 
 
 @router.get("/status")
 async def scheduler_status() -> dict[str, dict[str, str | None]]:
-    await start_scheduler()
     return get_job_status()
 
+
+
+@router.get("/history")
+async def scheduler_history(
+    job_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+) -> list[dict[str, Any]]:
+    return await get_job_runs(job_id, limit)
+
+
+@router.get("/runtimes")
+async def scheduler_runtimes(
+    job_id: Optional[str] = None,
+    days: int = Query(7, ge=1, le=90),
+) -> dict[str, Any]:
+    return await get_job_runtimes(days=days, job_id=job_id)
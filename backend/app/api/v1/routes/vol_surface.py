@@ -6,7 +6,9 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
-from app.services.options.vol_surface import compute_surface, get_recent_surfaces
+from app.services.job_queue import SURFACE_COMPUTE, enqueue_job
+from app.services.options.demand import record_request
+from app.services.options.vol_surface import get_recent_surfaces
 
 router = APIRouter(prefix="/options/surface", tags=["options"])
 
@@ -18,12 +20,20 @@ class SurfaceRequest(BaseModel):
 
 @router.post("/compute", status_code=status.HTTP_202_ACCEPTED)
 async def compute_surface_endpoint(payload: SurfaceRequest, force: bool = Query(False)) -> dict[str, object]:
-    surface = await compute_surface(payload.symbol, payload.target_date, force=force)
-    return {"status": "ok", "surface": surface}
+    job_id = await enqueue_job(
+        SURFACE_COMPUTE,
+        {
+            "symbol": payload.symbol.upper(),
+            "target_date": payload.target_date.isoformat() if payload.target_date else None,
+            "force": force,
+        },
+    )
+    return {"status": "queued", "job_id": job_id}
 
 
 @router.get("/{symbol}")
 async def get_recent_surface(symbol: str, limit: int = Query(5, ge=1, le=20)) -> dict[str, object]:
+    record_request(symbol)
     surfaces = await get_recent_surfaces(symbol, limit)
     if not surfaces:
         raise HTTPException(status_code=404, detail="No surfaces found")
@@ -5,12 +5,25 @@ import asyncio
 from datetime import date
 
 from app.core.logging import get_logger
-from app.services.options import ingest_atm_straddle
+from app.services.options import ingest_atm_straddle, ingest_atm_term_structure
 
 logger = get_logger("cli.options")
 
 
-async def _run(symbol: str, target_date: date | None) -> None:
+async def _run(symbol: str, target_date: date | None, term_structure: bool = False) -> None:
+    if term_structure:
+        result = await ingest_atm_term_structure(symbol, target_date)
+        for straddle in result["straddles"]:
+            logger.info(
+                "ATM straddle ingested: expiration=%s dte=%s tenor=%s mid=%.4f",
+                straddle["expiration"],
+                straddle["dte"],
+                straddle["tenor_days"],
+                straddle["straddle_mid"],
+            )
+        for missing in result["missing"]:
+            logger.warning("Skipped expiration %s: %s", missing["expiration"], missing["error"])
+        return
     result = await ingest_atm_straddle(symbol, target_date)
     logger.info("ATM straddle ingested: %s", result)
 
@@ -23,9 +36,14 @@ def main() -> None:
         dest="target_date",
         help="Target date (YYYY-MM-DD). Defaults to today.",
     )
+    parser.add_argument(
+        "--term-structure",
+        action="store_true",
+        help="Ingest straddles at every standard tenor (ATM_TERM_STRUCTURE_TENORS) in one run",
+    )
     args = parser.parse_args()
     parsed_date = date.fromisoformat(args.target_date) if args.target_date else None
-    asyncio.run(_run(args.symbol, parsed_date))
+    asyncio.run(_run(args.symbol, parsed_date, args.term_structure))
 
 
 if __name__ == "__main__":
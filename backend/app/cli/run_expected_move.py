@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+from typing import List, Optional
 
 from app.core.logging import get_logger
 from app.services.options.expected_move import compute_expected_move
+from app.services.options.expected_move_batch import compute_expected_moves_batch
 
 logger = get_logger("cli.options.expected_move")
 
@@ -19,9 +21,24 @@ async def _run(symbol: str, horizon: int | None, use_latest: bool, force: bool)
     )
 
 
+async def _run_batch(symbols: Optional[List[str]], horizons: Optional[List[int]]) -> None:
+    summary = await compute_expected_moves_batch(symbols, horizons)
+    logger.info(
+        "Batch expected move run %s: checks=%s flags=%s skipped=%s",
+        summary["run_id"],
+        summary["checks"],
+        summary["flags"],
+        ",".join(summary["skipped"]) or "-",
+    )
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Compute expected move diagnostics")
-    parser.add_argument("symbol", help="Underlying ticker symbol (e.g., AAPL)")
+    parser.add_argument("symbol", nargs="?", help="Underlying ticker symbol (e.g., AAPL)")
     parser.add_argument(
         "horizon",
         nargs="?",
@@ -38,7 +55,28 @@ def main() -> None:
         action="store_true",
         help="Bypass cache and refresh guardrails",
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Compute checks for many symbols and horizons in one pass",
+    )
+    parser.add_argument(
+        "--symbols",
+        type=_csv,
+        help="Comma-separated symbols for --batch (defaults to every active security)",
+    )
+    parser.add_argument(
+        "--horizons",
+        type=lambda value: [int(item) for item in _csv(value)],
+        help="Comma-separated horizons in days for --batch (defaults to EXPECTED_MOVE_BATCH_HORIZONS)",
+    )
     args = parser.parse_args()
+    if args.batch:
+        symbols = args.symbols or ([args.symbol] if args.symbol else None)
+        asyncio.run(_run_batch(symbols, args.horizons))
+        return
+    if args.symbol is None:
+        parser.error("symbol is required unless --batch is provided")
     if not args.latest and args.horizon is None:
         parser.error("horizon is required unless --latest is provided")
     asyncio.run(_run(args.symbol, args.horizon, args.latest, args.force))
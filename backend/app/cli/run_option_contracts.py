@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import List
+
+from app.core.logging import get_logger
+from app.services.options import refresh_option_contracts
+
+logger = get_logger("cli.options.contracts")
+
+
+async def _run(symbols: List[str]) -> None:
+    for symbol in symbols:
+        count = await refresh_option_contracts(symbol)
+        logger.info("%s: %s option contracts recorded", symbol.upper(), count)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh the option contract reference index")
+    parser.add_argument("symbols", nargs="+", help="Underlying ticker symbols")
+    args = parser.parse_args()
+    asyncio.run(_run(args.symbols))
+
+
+if __name__ == "__main__":
+    main()
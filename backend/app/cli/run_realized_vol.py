@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import List, Optional
+
+from app.core.logging import get_logger
+from app.services.analytics import refresh_realized_vol
+
+logger = get_logger("cli.analytics.realized_vol")
+
+
+async def _run(symbols: Optional[List[str]]) -> None:
+    results = await refresh_realized_vol(symbols)
+    for symbol, rows in results.items():
+        logger.info("%s: %s realized vol rows written", symbol, rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bring the realized volatility store up to date")
+    parser.add_argument(
+        "symbols",
+        nargs="*",
+        help="Ticker symbols to refresh (defaults to every active security)",
+    )
+    args = parser.parse_args()
+    asyncio.run(_run(args.symbols or None))
+
+
+if __name__ == "__main__":
+    main()
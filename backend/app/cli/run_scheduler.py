@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 
 from app.core.logging import get_logger
+from app.services.audit import start_audit_sink, stop_audit_sink
 from app.services.scheduler import start_scheduler, stop_scheduler
 
 logger = get_logger("cli.scheduler")
@@ -13,6 +14,7 @@ async def _run() -> None:
     if not started:
         logger.info("Scheduler is disabled; exiting")
         return
+    await start_audit_sink()
     logger.info("Scheduler running. Press Ctrl+C to stop.")
     try:
         while True:
@@ -20,6 +22,8 @@ async def _run() -> None:
     except (KeyboardInterrupt, asyncio.CancelledError):
         logger.info("Stopping scheduler...")
         await stop_scheduler()
+    finally:
+        await stop_audit_sink()
 
 
 def main() -> None:
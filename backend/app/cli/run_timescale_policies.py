@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.connection import open_connection
+from app.db.timescale_policies import apply_policies, load_policies
+
+logger = get_logger("cli.timescale_policies")
+
+
+async def _run(config: Path, tables: Optional[List[str]], dry_run: bool) -> Dict[str, Any]:
+    policies = load_policies(config)
+    if tables:
+        wanted = set(tables)
+        policies = [policy for policy in policies if policy.table in wanted]
+    conn = await open_connection()
+    try:
+        return await apply_policies(conn, policies, dry_run=dry_run)
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply Timescale hypertable, compression and retention policies")
+    parser.add_argument("--config", help="Policy file (defaults to TIMESCALE_POLICY_FILE)")
+    parser.add_argument("--table", action="append", dest="tables", help="Limit to a table (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Print planned statements without executing them")
+    args = parser.parse_args()
+
+    config = Path(args.config or get_settings().TIMESCALE_POLICY_FILE)
+    try:
+        results = asyncio.run(_run(config, args.tables, args.dry_run))
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Timescale policy run failed: %s", exc)
+        raise SystemExit(1) from exc
+
+    for table, result in results.items():
+        status = "error: " + result["error"] if result["error"] else ("applied" if result["applied"] else "planned")
+        logger.info("%s (%s)\n  %s", table, status, "\n  ".join(result["statements"]) or "-")
+    raise SystemExit(1 if any(result["error"] for result in results.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+from app.core import metrics
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+
+logger = get_logger("clients.circuit")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Longest prefix wins; anything else is grouped by its first two path segments.
+ENDPOINT_FAMILIES = (
+    ("/v3/snapshot/options", "options.snapshot"),
+    ("/v3/reference/options", "options.reference"),
+    ("/v2/aggs", "aggs"),
+    ("/v3/reference", "reference"),
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint family whose breaker is open."""
+
+    def __init__(self, family: str, retry_in: float) -> None:
+        super().__init__(f"Circuit for {family} is open; retry in {retry_in:.0f}s")
+        self.family = family
+        self.retry_in = retry_in
+
+
+def endpoint_family(url: str) -> str:
+    path = urlsplit(url).path
+    for prefix, family in ENDPOINT_FAMILIES:
+        if path.startswith(prefix):
+            return family
+    return ".".join(segment for segment in path.split("/")[1:3] if segment) or "root"
+
+
+class _Call:
+    def __init__(self, breaker: "CircuitBreaker") -> None:
+        self._breaker = breaker
+        self.recorded = False
+
+    def record(self, status_code: int) -> None:
+        """5xx counts as a failure; 429 is throttling (left to the limiter), not an outage."""
+        self.recorded = True
+        if status_code >= 500:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and every call fails
+    fast with CircuitOpenError for ``reset_seconds``. The next call after that is let through
+    as a probe: success closes the breaker, failure re-opens it for another period.
+    """
+
+    def __init__(self, family: str, *, failure_threshold: int, reset_seconds: float) -> None:
+        self.family = family
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._publish()
+
+    def before_call(self) -> None:
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN:
+            elapsed = time.monotonic() - (self.opened_at or 0.0)
+            if elapsed < self.reset_seconds:
+                raise CircuitOpenError(self.family, self.reset_seconds - elapsed)
+            self.state = HALF_OPEN
+            self._publish()
+        if self._probing:
+            raise CircuitOpenError(self.family, 0.0)
+        self._probing = True
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info("Circuit for %s closed after successful probe", self.family)
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+        self._publish()
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning("Circuit for %s opened after %s consecutive failures", self.family, self.failures)
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+        self._publish()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN and time.monotonic() - (self.opened_at or 0.0) < self.reset_seconds
+
+    @asynccontextmanager
+    async def call(self) -> AsyncIterator[_Call]:
+        self.before_call()
+        call = _Call(self)
+        try:
+            yield call
+        except Exception:
+            if not call.recorded:
+                self.record_failure()
+            raise
+        except BaseException:
+            # Cancelled mid-probe: free the probe slot without judging the endpoint.
+            self._probing = False
+            raise
+
+    def _publish(self) -> None:
+        metrics.set_gauge("upstream.circuit.open", 0 if self.state == CLOSED else 1, family=self.family)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(url: str, *, settings: Optional[Settings] = None) -> CircuitBreaker:
+    family = endpoint_family(url)
+    breaker = _breakers.get(family)
+    if breaker is None:
+        settings = settings or get_settings()
+        breaker = CircuitBreaker(
+            family,
+            failure_threshold=settings.UPSTREAM_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=settings.UPSTREAM_BREAKER_RESET_SECONDS,
+        )
+        _breakers[family] = breaker
+    return breaker
+
+
+def is_open(family: str) -> bool:
+    breaker = _breakers.get(family)
+    return breaker is not None and breaker.is_open
+
+
+def breaker_status() -> Dict[str, Dict[str, Any]]:
+    return {
+        family: {"state": breaker.state, "consecutive_failures": breaker.failures}
+        for family, breaker in _breakers.items()
+    }
+
+
+def reset_breakers() -> None:
+    _breakers.clear()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from app.core import metrics, run_stats
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+
+logger = get_logger("clients.concurrency")
+
+
+class _Slot:
+    def __init__(self, limiter: "AimdLimiter") -> None:
+        self._limiter = limiter
+        self._started = time.perf_counter()
+        self._recorded = False
+
+    def record(self, status_code: int) -> None:
+        """Feed the response status back; 429 and 5xx count as overload."""
+        self._recorded = True
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        if status_code == 429 or status_code >= 500:
+            self._limiter.on_overload(self._started, status_code)
+        else:
+            self._limiter.on_success(elapsed_ms)
+
+
+class AimdLimiter:
+    """Adaptive in-flight limit: additive increase while healthy, multiplicative decrease on overload.
+
+    The limit grows by ``increase`` per limit's worth of fast successes (so roughly one step
+    per round trip at full concurrency) and is cut by ``decrease`` on a 429, 5xx or
+    transport error. Only the first overload from a burst cuts the limit: requests that
+    were already in flight when the last cut happened are ignored.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial: float,
+        minimum: float,
+        maximum: float,
+        increase: float,
+        decrease: float,
+        latency_target_ms: float,
+    ) -> None:
+        self.name = name
+        self.minimum = max(minimum, 1.0)
+        self.maximum = max(maximum, self.minimum)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target_ms = latency_target_ms
+        self._limit = min(max(initial, self.minimum), self.maximum)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._publish()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        while self._in_flight >= self.limit:
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # Woken but cancelled before taking the slot; pass the wake-up on.
+                    self._wake()
+                raise
+        self._in_flight += 1
+        self._publish()
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._publish()
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[_Slot]:
+        await self.acquire()
+        # Every upstream request passes through a slot, so this is where job runs count them.
+        run_stats.record_upstream_call()
+        slot = _Slot(self)
+        try:
+            yield slot
+        except Exception:
+            if not slot._recorded:
+                self.on_overload(slot._started, None)
+            raise
+        finally:
+            self.release()
+
+    def on_success(self, latency_ms: float) -> None:
+        if latency_ms > self.latency_target_ms or self._limit >= self.maximum:
+            return
+        self._limit = min(self._limit + self.increase / self._limit, self.maximum)
+        self._publish()
+        self._wake()
+
+    def on_overload(self, started: float, status_code: Optional[int]) -> None:
+        metrics.increment("upstream.overload", limiter=self.name, status=status_code or "error")
+        if started < self._last_decrease:
+            return
+        previous = self.limit
+        self._limit = max(self._limit * self.decrease, self.minimum)
+        self._last_decrease = time.perf_counter()
+        self._publish()
+        if self.limit != previous:
+            logger.warning(
+                "Upstream %s overloaded (%s); concurrency %s -> %s",
+                self.name,
+                status_code or "error",
+                previous,
+                self.limit,
+            )
+
+    def _wake(self) -> None:
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def _publish(self) -> None:
+        metrics.set_gauge("upstream.concurrency.limit", self.limit, limiter=self.name)
+        metrics.set_gauge("upstream.concurrency.in_flight", self._in_flight, limiter=self.name)
+
+
+_limiters: Dict[str, AimdLimiter] = {}
+
+
+def get_limiter(name: str = "polygon", *, settings: Optional[Settings] = None) -> AimdLimiter:
+    """Process-wide limiter for one upstream; every Polygon client shares ``polygon``."""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        settings = settings or get_settings()
+        limiter = AimdLimiter(
+            name,
+            initial=settings.UPSTREAM_CONCURRENCY_INITIAL,
+            minimum=settings.UPSTREAM_CONCURRENCY_MIN,
+            maximum=settings.UPSTREAM_CONCURRENCY_MAX,
+            increase=settings.UPSTREAM_CONCURRENCY_INCREASE,
+            decrease=settings.UPSTREAM_CONCURRENCY_DECREASE,
+            latency_target_ms=settings.UPSTREAM_LATENCY_TARGET_MS,
+        )
+        _limiters[name] = limiter
+    return limiter
+
+
+def reset_limiters() -> None:
+    _limiters.clear()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from app.core.config import Settings, get_settings
+
+_orjson: Optional[ModuleType]
+try:  # Optional speedup: pip install 'astrasim-backend[fast-json]'
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    _orjson = None
+
+Transform = Callable[[Any], Any]
+
+
+def page_transform(normalize: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> Transform:
+    """Transform for paged list endpoints: normalize ``results`` and keep ``next_url``."""
+
+    def transform(data: Dict[str, Any]) -> Dict[str, Any]:
+        results = [normalize(item) for item in data.get("results", [])]
+        return {"results": [item for item in results if item is not None], "next_url": data.get("next_url")}
+
+    return transform
+
+
+def loads(raw: bytes) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _decode(raw: bytes, transform: Optional[Transform]) -> Any:
+    data = loads(raw)
+    return transform(data) if transform is not None else data
+
+
+async def decode_json(
+    raw: bytes,
+    transform: Optional[Transform] = None,
+    *,
+    offload_bytes: int,
+) -> Any:
+    """Parse ``raw`` and apply ``transform`` (page normalization) in one step.
+
+    Bodies of at least ``offload_bytes`` are handled in a worker thread so a large chain
+    does not stall other coroutines; small bodies stay inline where a thread hop costs
+    more than the parse. ``offload_bytes <= 0`` disables offloading.
+    """
+    if 0 < offload_bytes <= len(raw):
+        return await asyncio.to_thread(_decode, raw, transform)
+    return _decode(raw, transform)
+
+
+async def decode_response(
+    response: httpx.Response,
+    transform: Optional[Transform] = None,
+    *,
+    settings: Optional[Settings] = None,
+) -> Any:
+    settings = settings or get_settings()
+    return await decode_json(response.content, transform, offload_bytes=settings.HTTP_JSON_OFFLOAD_BYTES)
@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional
 import httpx
 from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from app.clients import circuit, concurrency, payloads
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
 
@@ -92,12 +93,18 @@ class PolygonCorpActionsClient:
             retry=retry_if_exception_type(httpx.HTTPError),
         ):
             with attempt:
-                response = await self._client.get(url, params=params)
+                async with (
+                    circuit.get_breaker(url, settings=self.settings).call() as call,
+                    concurrency.get_limiter(settings=self.settings).slot() as slot,
+                ):
+                    response = await self._client.get(url, params=params)
+                    slot.record(response.status_code)
+                    call.record(response.status_code)
                 if response.status_code == 429:
                     logger.warning("Polygon corporate actions rate limited; backing off")
                     raise httpx.HTTPStatusError("Rate limited", request=response.request, response=response)
                 response.raise_for_status()
-                return response.json()
+                return await payloads.decode_response(response, settings=self.settings)
 
         raise PolygonCorpActionsClientError("Failed to fetch data from Polygon corporate actions endpoints")
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 import httpx
 from tenacity import (
@@ -11,6 +11,7 @@ from tenacity import (
     wait_exponential,
 )
 
+from app.clients import circuit, concurrency, payloads
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
 
@@ -25,6 +26,10 @@ class PolygonOptionsRateLimitError(PolygonOptionsClientError):
     """Raised when Polygon returns 429."""
 
 
+class PolygonOptionsCircuitOpenError(PolygonOptionsClientError):
+    """Raised without calling Polygon while the endpoint family's breaker is open."""
+
+
 class PolygonOptionsClient:
     def __init__(
         self,
@@ -44,61 +49,127 @@ class PolygonOptionsClient:
         if self._owns_client:
             await self._client.aclose()
 
-    async def fetch_chain(self, symbol: str, expiration: date) -> List[Dict[str, Any]]:
-        params = {
+    async def fetch_chain(
+        self,
+        symbol: str,
+        expiration: date,
+        *,
+        strike_range: Optional[Tuple[float, float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Snapshot chain for one expiration, following ``next_url`` until exhausted.
+
+        ``strike_range`` is passed upstream as ``strike_price.gte``/``strike_price.lte`` so
+        only the strikes the caller will look at are transferred.
+        """
+        query: Dict[str, Any] = {
             "underlying_ticker": symbol.upper(),
             "expiration_date": expiration.isoformat(),
             "limit": 1000,
             "order": "asc",
         }
+        if strike_range is not None:
+            query["strike_price.gte"] = round(strike_range[0], 4)
+            query["strike_price.lte"] = round(strike_range[1], 4)
+        params: Optional[Dict[str, Any]] = query
         url = "/v3/snapshot/options/{symbol}".format(symbol=symbol.upper())
-        data = await self._request(url, params)
-        results = data.get("results", [])
 
         normalized: List[Dict[str, Any]] = []
-        for option in results:
-            details = option.get("details", {})
-            contract_symbol = details.get("ticker") or option.get("ticker")
-            strike = details.get("strike_price") or option.get("strike_price")
-            exp_str = details.get("expiration_date") or option.get("expiration_date")
-            contract_type = (
-                details.get("contract_type")
-                or option.get("contract_type")
-                or ""
-            ).lower()
-            quote = option.get("quote") or {}
-            day = option.get("day") or {}
-
-            if not contract_symbol or strike is None or exp_str is None:
-                continue
-
-            bid = quote.get("bid_price")
-            ask = quote.get("ask_price")
-            mid = None
-            if bid is not None and ask is not None:
-                mid = (bid + ask) / 2
-
-            normalized.append(
-                {
-                    "option_symbol": contract_symbol,
-                    "strike": float(strike),
-                    "expiration": date.fromisoformat(exp_str),
-                    "call_put": contract_type,
-                    "bid": bid,
-                    "ask": ask,
-                    "mid": mid,
-                    "volume": day.get("volume"),
-                    "open_interest": option.get("open_interest"),
-                    "underlying_price": option.get("underlying_price")
-                    or option.get("underlying_asset", {}).get("price"),
-                    "raw": option,
-                }
-            )
+        seen: Set[str] = set()
+        while True:
+            # Pages are decoded and normalized together, off the event loop when large.
+            data = await self._request(url, params, transform=_chain_page)
+            for item in data["results"]:
+                if item["option_symbol"] in seen:
+                    continue
+                seen.add(item["option_symbol"])
+                normalized.append(item)
+            next_url = data.get("next_url")
+            if not next_url:
+                break
+            url = next_url
+            params = None
 
         return normalized
 
+    @staticmethod
+    def _normalize_snapshot(option: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        details = option.get("details", {})
+        contract_symbol = details.get("ticker") or option.get("ticker")
+        strike = details.get("strike_price") or option.get("strike_price")
+        exp_str = details.get("expiration_date") or option.get("expiration_date")
+        contract_type = (
+            details.get("contract_type")
+            or option.get("contract_type")
+            or ""
+        ).lower()
+        quote = option.get("quote") or {}
+        day = option.get("day") or {}
+
+        if not contract_symbol or strike is None or exp_str is None:
+            return None
+
+        bid = quote.get("bid_price")
+        ask = quote.get("ask_price")
+        mid = None
+        if bid is not None and ask is not None:
+            mid = (bid + ask) / 2
+
+        return {
+            "option_symbol": contract_symbol,
+            "strike": float(strike),
+            "expiration": date.fromisoformat(exp_str),
+            "call_put": contract_type,
+            "bid": bid,
+            "ask": ask,
+            "mid": mid,
+            "volume": day.get("volume"),
+            "open_interest": option.get("open_interest"),
+            "underlying_price": option.get("underlying_price")
+            or option.get("underlying_asset", {}).get("price"),
+            "raw": option,
+        }
+
+    async def fetch_contracts(self, symbol: str) -> List[Dict[str, Any]]:
+        """Page through every listed contract for ``symbol`` (used by the daily reference refresh)."""
+        params: Optional[Dict[str, Any]] = {
+            "underlying_ticker": symbol.upper(),
+            "limit": 1000,
+            "order": "asc",
+        }
+        url = "/v3/reference/options/contracts"
+        contracts: List[Dict[str, Any]] = []
+
+        while True:
+            data = await self._request(url, params, transform=_contract_page)
+            contracts.extend(data["results"])
+            next_url = data.get("next_url")
+            if not next_url:
+                break
+            url = next_url
+            params = None
+
+        return contracts
+
+    @staticmethod
+    def _normalize_contract(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        details = item.get("details", {})
+        ticker = item.get("ticker") or details.get("ticker")
+        exp_str = item.get("expiration_date") or details.get("expiration_date")
+        strike = item.get("strike_price")
+        if strike is None:
+            strike = details.get("strike_price")
+        if not ticker or not exp_str or strike is None:
+            return None
+        return {
+            "option_symbol": ticker,
+            "expiration": date.fromisoformat(exp_str),
+            "strike": float(strike),
+            "call_put": (item.get("contract_type") or details.get("contract_type") or "").lower(),
+            "shares_per_contract": item.get("shares_per_contract"),
+        }
+
     async def fetch_expirations(self, symbol: str) -> List[date]:
-        params = {
+        params: Optional[Dict[str, Any]] = {
             "underlying_ticker": symbol.upper(),
             "limit": 1000,
             "order": "asc",
@@ -127,22 +198,36 @@ class PolygonOptionsClient:
         self,
         url: str,
         params: Optional[Dict[str, Any]],
+        *,
+        transform: Optional[payloads.Transform] = None,
     ) -> Dict[str, Any]:
-        async for attempt in AsyncRetrying(
-            reraise=True,
-            stop=stop_after_attempt(self.settings.INGESTION_MAX_ATTEMPTS),
-            wait=wait_exponential(multiplier=self.settings.INGESTION_RATE_LIMIT_SLEEP, min=1, max=10),
-            retry=retry_if_exception_type(
-                (PolygonOptionsRateLimitError, httpx.HTTPError)
-            ),
-        ):
-            with attempt:
-                response = await self._client.get(url, params=params)
-                if response.status_code == 429:
-                    logger.warning("Polygon options rate limited; backing off")
-                    raise PolygonOptionsRateLimitError("Rate limited by Polygon")
-                response.raise_for_status()
-                return response.json()
+        # Client errors (including an open breaker) send callers to cache/historical fallback.
+        try:
+            async for attempt in AsyncRetrying(
+                reraise=True,
+                stop=stop_after_attempt(self.settings.INGESTION_MAX_ATTEMPTS),
+                wait=wait_exponential(multiplier=self.settings.INGESTION_RATE_LIMIT_SLEEP, min=1, max=10),
+                retry=retry_if_exception_type(
+                    (PolygonOptionsRateLimitError, httpx.HTTPError)
+                ),
+            ):
+                with attempt:
+                    async with (
+                        circuit.get_breaker(url, settings=self.settings).call() as call,
+                        concurrency.get_limiter(settings=self.settings).slot() as slot,
+                    ):
+                        response = await self._client.get(url, params=params)
+                        slot.record(response.status_code)
+                        call.record(response.status_code)
+                    if response.status_code == 429:
+                        logger.warning("Polygon options rate limited; backing off")
+                        raise PolygonOptionsRateLimitError("Rate limited by Polygon")
+                    response.raise_for_status()
+                    return await payloads.decode_response(response, transform, settings=self.settings)
+        except circuit.CircuitOpenError as exc:
+            raise PolygonOptionsCircuitOpenError(str(exc)) from exc
+        except httpx.HTTPError as exc:
+            raise PolygonOptionsClientError(f"Polygon options request failed: {exc}") from exc
 
         raise PolygonOptionsClientError("Failed to fetch data from Polygon")
 
@@ -192,3 +277,6 @@ class PolygonOptionsClient:
             return None
         return min(matches, key=lambda opt: abs(opt["strike"] - target_strike))
 
+
+_chain_page = payloads.page_transform(PolygonOptionsClient._normalize_snapshot)
+_contract_page = payloads.page_transform(PolygonOptionsClient._normalize_contract)
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Any
+from typing import Any, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -26,12 +26,52 @@ class Settings(BaseSettings):
     DB_NAME: str = Field(default="astrasim", alias="DATABASE_NAME")
     DB_USER: str = Field(default="astrasim", alias="DATABASE_USER")
     DB_PASSWORD: str = Field(default="astrasim", alias="DATABASE_PASSWORD")
+    DB_REPLICA_HOST: Optional[str] = Field(default=None, alias="DATABASE_REPLICA_HOST")
+    DB_REPLICA_PORT: int = Field(default=5432, alias="DATABASE_REPLICA_PORT")
+    DB_POOL_API_MIN_SIZE: int = 2
+    DB_POOL_API_MAX_SIZE: int = 10
+    DB_POOL_API_COMMAND_TIMEOUT: float = 30.0
+    DB_POOL_API_STATEMENT_TIMEOUT_MS: int = 15000
+    DB_POOL_API_FLOAT_NUMERIC: bool = True
+    DB_POOL_API_STATEMENT_CACHE_SIZE: int = 200
+    DB_POOL_INGESTION_MIN_SIZE: int = 1
+    DB_POOL_INGESTION_MAX_SIZE: int = 5
+    DB_POOL_INGESTION_COMMAND_TIMEOUT: float = 120.0
+    DB_POOL_INGESTION_STATEMENT_TIMEOUT_MS: int = 0
+    DB_POOL_INGESTION_FLOAT_NUMERIC: bool = False
+    DB_POOL_INGESTION_STATEMENT_CACHE_SIZE: int = 100
+    DB_POOL_ANALYTICS_MIN_SIZE: int = 0
+    DB_POOL_ANALYTICS_MAX_SIZE: int = 3
+    DB_POOL_ANALYTICS_COMMAND_TIMEOUT: float = 600.0
+    DB_POOL_ANALYTICS_STATEMENT_TIMEOUT_MS: int = 300000
+    DB_POOL_ANALYTICS_FLOAT_NUMERIC: bool = True
+    DB_POOL_ANALYTICS_STATEMENT_CACHE_SIZE: int = 50
+    DB_QUERY_INSTRUMENTATION: bool = True
+    DB_SLOW_QUERY_MS: float = 500.0
+    DB_SLOW_QUERY_CAPTURE_MAX: int = 100
+    DB_SLOW_QUERY_EXPLAIN: bool = False
+    DB_SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    TIMESCALE_POLICY_FILE: str = "../infra/db/timescale/policies/policies.json"
+    SECURITIES_REGISTRY_TTL: int = 3600
+    AUDIT_SINK_ENABLED: bool = True
+    AUDIT_BUFFER_MAX: int = 10000
+    AUDIT_FLUSH_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL: float = 1.0
 
     POLYGON_API_KEY: str = Field(default="", alias="POLYGON_API_KEY")
     POLYGON_OPTIONS_API_KEY: str = Field(default="", alias="POLYGON_OPTIONS_API_KEY")
     POLYGON_BASE_URL: str = "https://api.polygon.io"
     INGESTION_MAX_ATTEMPTS: int = 5
     INGESTION_RATE_LIMIT_SLEEP: float = 1.0
+    HTTP_JSON_OFFLOAD_BYTES: int = 262144
+    UPSTREAM_CONCURRENCY_INITIAL: int = 4
+    UPSTREAM_CONCURRENCY_MIN: int = 1
+    UPSTREAM_CONCURRENCY_MAX: int = 32
+    UPSTREAM_CONCURRENCY_INCREASE: float = 1.0
+    UPSTREAM_CONCURRENCY_DECREASE: float = 0.5
+    UPSTREAM_LATENCY_TARGET_MS: float = 2000.0
+    UPSTREAM_BREAKER_FAILURE_THRESHOLD: int = 5
+    UPSTREAM_BREAKER_RESET_SECONDS: float = 30.0
     CORP_ACTIONS_PAGE_LIMIT: int = 1000
     INDEX_PAGE_LIMIT: int = 50000
     VALIDATION_DEFAULT_LOOKBACK_DAYS: int = 30
@@ -39,10 +79,24 @@ class Settings(BaseSettings):
     SCHEDULER_ENABLED: bool = True
     SCHEDULER_TIMEZONE: str = "UTC"
     JOB_INTERVAL_MINUTES: int = 60
+    PIPELINE_CONCURRENCY: int = 4
+    SCHEDULER_LEADER_ELECTION: bool = True
+    SCHEDULER_LEADER_LOCK_ID: int = 73510001
+    SCHEDULER_LEADER_RETRY_SECONDS: int = 15
+    SCHEDULER_SHARD_COUNT: int = 1
+    SCHEDULER_SHARD_INDEX: int = 0
+    JOB_QUEUE_ENABLED: bool = True
+    JOB_QUEUE_CONCURRENCY: int = 2
+    JOB_QUEUE_POLL_SECONDS: float = 2.0
+    JOB_QUEUE_STALE_SECONDS: float = 300.0
+    JOB_QUEUE_MAX_ATTEMPTS: int = 3
+    JOB_QUEUE_PROGRESS_INTERVAL: float = 1.0
+    JOB_QUEUE_OHLCV_CHUNK_DAYS: int = 365
     OPTIONS_SCHEMA_VERSION: str = "v1"
     OPTIONS_DEFAULT_DTE_TARGET: int = 30
     OPTIONS_MIN_DTE_BUFFER: int = 7
     OPTIONS_MONEINESS_WINDOW: float = 0.05
+    OPTIONS_CHAIN_STRIKE_WINDOW: bool = True
     VOL_SURFACE_DTE_BUCKETS: list[int] = Field(
         default_factory=lambda: [7, 14, 21, 30, 45, 60]
     )
@@ -50,19 +104,63 @@ class Settings(BaseSettings):
         default_factory=lambda: [-0.20, -0.10, -0.05, 0.0, 0.05, 0.10, 0.20]
     )
     VOL_SURFACE_MIN_LIQUIDITY: int = 100
+    VOL_SURFACE_STRIKE_PADDING: float = 0.05
     VOL_SURFACE_MIN_DTE: int = 5
     VOL_SURFACE_MAX_DTE: int = 60
     VOL_SURFACE_MAX_BUCKET_DRIFT: int = 5
     OPTIONS_CACHE_TTL_CHAIN: int = 300
+    OPTION_CONTRACTS_INDEX_TTL: int = 3600
+    OPTION_CONTRACTS_MAX_AGE_DAYS: int = 3
     OPTIONS_CACHE_TTL_ATM: int = 120
     OPTIONS_CACHE_TTL_SURFACE: int = 180
+    OPTIONS_CACHE_SESSION_AWARE: bool = True
+    OPTIONS_CACHE_EXTENDED_HOURS_MULTIPLIER: float = 4.0
+    OPTIONS_CACHE_ACTIVITY_MOVE: float = 0.02
+    OPTIONS_CACHE_MIN_SCALE: float = 0.25
+    OPTIONS_CACHE_MAX_SCALE: float = 3.0
+    MARKET_TIMEZONE: str = "America/New_York"
+    MARKET_PRE_MARKET_OPEN: str = "04:00"
+    MARKET_OPEN: str = "09:30"
+    MARKET_CLOSE: str = "16:00"
+    MARKET_AFTER_HOURS_CLOSE: str = "20:00"
+    MARKET_HOLIDAYS: str = ""
     ATM_REFRESH_INTERVAL: int = 300
+    ATM_TERM_STRUCTURE_TENORS: list[int] = Field(
+        default_factory=lambda: [7, 30, 60, 90]
+    )
+    ATM_TERM_STRUCTURE_INCLUDE_INTERMEDIATE: bool = True
+    ATM_TERM_STRUCTURE_MAX_EXPIRATIONS: int = 16
+    ATM_TERM_STRUCTURE_CONCURRENCY: int = 4
     SURFACE_REFRESH_INTERVAL: int = 600
     MIN_UNDERLYING_MOVE: float = 0.003
+    OPTIONS_INTRADAY_REFRESH_ENABLED: bool = True
+    OPTIONS_INTRADAY_REFRESH_INTERVAL: int = 60
+    OPTIONS_INTRADAY_UPSTREAM_BUDGET: int = 200
+    OPTIONS_DEMAND_HALF_LIFE: int = 1800
+    OPTIONS_DEMAND_WEIGHT: float = 1.0
+    OPTIONS_DEMAND_FLUSH_SECONDS: float = 30.0
     EXPECTED_MOVE_TOL_IV: float = 0.1
     EXPECTED_MOVE_TOL_REALIZED: float = 0.15
     EXPECTED_MOVE_WARN_THRESHOLD: float = 0.1
     EXPECTED_MOVE_SEVERE_THRESHOLD: float = 0.25
+    EXPECTED_MOVE_BATCH_HORIZONS: list[int] = Field(
+        default_factory=lambda: [7, 14, 30]
+    )
+    EXPECTED_MOVE_BATCH_MAX_AGE_DAYS: int = 3
+    REALIZED_VOL_WINDOWS: list[int] = Field(
+        default_factory=lambda: [7, 14, 21, 30, 60]
+    )
+    REALIZED_VOL_ESTIMATORS: list[str] = Field(
+        default_factory=lambda: [
+            "close_to_close",
+            "parkinson",
+            "garman_klass",
+            "rogers_satchell",
+            "yang_zhang",
+            "ewma",
+        ]
+    )
+    REALIZED_VOL_RECOMPUTE_DAYS: int = 5
 
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+SAMPLE_WINDOW = 2048
+
+TagKey = Tuple[Tuple[str, str], ...]
+SeriesKey = Tuple[str, TagKey]
+
+
+@dataclass
+class _Histogram:
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=SAMPLE_WINDOW))
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+
+_lock = threading.Lock()
+_histograms: Dict[SeriesKey, _Histogram] = {}
+_counters: Dict[SeriesKey, float] = {}
+_gauges: Dict[SeriesKey, float] = {}
+
+
+def _key(name: str, tags: Dict[str, Any]) -> SeriesKey:
+    return name, tuple(sorted((k, str(v)) for k, v in tags.items()))
+
+
+def observe(name: str, value: float, **tags: Any) -> None:
+    """Record one sample for a latency/size style histogram."""
+    with _lock:
+        series = _histograms.setdefault(_key(name, tags), _Histogram())
+        series.samples.append(value)
+        series.count += 1
+        series.total += value
+        series.maximum = max(series.maximum, value)
+
+
+def increment(name: str, value: float = 1.0, **tags: Any) -> None:
+    with _lock:
+        key = _key(name, tags)
+        _counters[key] = _counters.get(key, 0.0) + value
+
+
+def set_gauge(name: str, value: float, **tags: Any) -> None:
+    with _lock:
+        _gauges[_key(name, tags)] = value
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile; ``pct`` is expressed on a 0-100 scale."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def snapshot() -> Dict[str, List[Dict[str, Any]]]:
+    with _lock:
+        histograms = [
+            {
+                "name": name,
+                "tags": dict(tags),
+                "count": series.count,
+                "sum": series.total,
+                "max": series.maximum,
+                "p50": percentile(series.samples, 50),
+                "p95": percentile(series.samples, 95),
+                "p99": percentile(series.samples, 99),
+            }
+            for (name, tags), series in _histograms.items()
+        ]
+        counters = [{"name": name, "tags": dict(tags), "value": value} for (name, tags), value in _counters.items()]
+        gauges = [{"name": name, "tags": dict(tags), "value": value} for (name, tags), value in _gauges.items()]
+    return {"histograms": histograms, "counters": counters, "gauges": gauges}
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _gauges.clear()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+
+@dataclass
+class SymbolStats:
+    symbol: str
+    status: str = "running"
+    duration_ms: float = 0.0
+    rows: int = 0
+    upstream_calls: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class RunStats:
+    """Accounting for one job run; client and service code feed it through the context."""
+
+    job_id: str
+    trigger: str
+    started_at: datetime = field(default_factory=lambda: datetime.now(tz=timezone.utc))
+    finished_at: Optional[datetime] = None
+    status: str = "running"
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+    rows: int = 0
+    upstream_calls: int = 0
+    symbols: Dict[str, SymbolStats] = field(default_factory=dict)
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        self.finished_at = datetime.now(tz=timezone.utc)
+        self.status = status
+        self.error = error
+
+    @property
+    def symbols_failed(self) -> int:
+        return sum(1 for entry in self.symbols.values() if entry.status == "failed")
+
+
+_run: ContextVar[Optional[RunStats]] = ContextVar("job_run", default=None)
+_symbol: ContextVar[Optional[SymbolStats]] = ContextVar("job_run_symbol", default=None)
+
+
+def current_run() -> Optional[RunStats]:
+    return _run.get()
+
+
+def bind_run(run: Optional[RunStats]) -> Token[Optional[RunStats]]:
+    return _run.set(run)
+
+
+def reset_run(token: Token[Optional[RunStats]]) -> None:
+    _run.reset(token)
+
+
+def bind_symbol(entry: Optional[SymbolStats]) -> Token[Optional[SymbolStats]]:
+    return _symbol.set(entry)
+
+
+def reset_symbol(token: Token[Optional[SymbolStats]]) -> None:
+    _symbol.reset(token)
+
+
+def record_upstream_call() -> None:
+    """Count one upstream request against the job run (and symbol) in progress, if any."""
+    run = _run.get()
+    if run is None:
+        return
+    run.upstream_calls += 1
+    entry = _symbol.get()
+    if entry is not None:
+        entry.upstream_calls += 1
+
+
+def record_rows(rows: int) -> None:
+    run = _run.get()
+    if run is None or not rows:
+        return
+    run.rows += rows
+    entry = _symbol.get()
+    if entry is not None:
+        entry.rows += rows
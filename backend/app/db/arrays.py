@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional
+
+import asyncpg
+import numpy as np
+
+
+async def fetch_arrays(
+    conn: asyncpg.Connection,
+    query: str,
+    *args: Any,
+    dtypes: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, np.ndarray]:
+    """Run ``query`` and return one NumPy array per result column.
+
+    Columns default to ``float64`` (NULL becomes NaN); pass ``dtypes`` for anything else,
+    e.g. ``{"time": object}``. An empty result returns an empty dict.
+    """
+    rows = await conn.fetch(query, *args)
+    if not rows:
+        return {}
+    dtypes = dtypes or {}
+    names = list(rows[0].keys())
+    columns = zip(*(tuple(row.values()) for row in rows))
+    return {
+        name: np.array(values, dtype=dtypes.get(name, np.float64))
+        for name, values in zip(names, columns)
+    }
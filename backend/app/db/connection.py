@@ -1,47 +1,154 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
 
 import asyncpg
 
-from app.core.config import get_settings
+from app.core import metrics
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.instrumentation import InstrumentedConnection, bind_caller, reset_caller
 
-_pool: Optional[asyncpg.Pool] = None
+logger = get_logger("db")
+
+POOL_PROFILES = ("api", "ingestion", "analytics")
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    name: str
+    min_size: int
+    max_size: int
+    command_timeout: float
+    statement_timeout_ms: int
+    statement_cache_size: int
+    float_numeric: bool
+
+
+_pools: Dict[str, asyncpg.Pool] = {}
+_pool_lock = asyncio.Lock()
+
+
+def get_pool_profile(profile: str, settings: Optional[Settings] = None) -> PoolProfile:
+    if profile not in POOL_PROFILES:
+        raise ValueError(f"Unknown pool profile '{profile}'")
+    settings = settings or get_settings()
+    prefix = f"DB_POOL_{profile.upper()}_"
+    return PoolProfile(
+        name=profile,
+        min_size=getattr(settings, prefix + "MIN_SIZE"),
+        max_size=getattr(settings, prefix + "MAX_SIZE"),
+        command_timeout=getattr(settings, prefix + "COMMAND_TIMEOUT"),
+        statement_timeout_ms=getattr(settings, prefix + "STATEMENT_TIMEOUT_MS"),
+        statement_cache_size=getattr(settings, prefix + "STATEMENT_CACHE_SIZE"),
+        float_numeric=getattr(settings, prefix + "FLOAT_NUMERIC"),
+    )
+
+
+def _pool_key(profile: str, read_only: bool, settings: Settings) -> str:
+    if read_only and settings.DB_REPLICA_HOST:
+        return f"{profile}:replica"
+    return profile
+
+
+async def use_float_numeric(conn: asyncpg.Connection) -> None:
+    """Decode NUMERIC as ``float`` instead of ``Decimal`` on this connection.
+
+    Values travel in text format, so writes still accept ``float``/``Decimal``/``int`` inputs.
+    """
+    await conn.set_type_codec(
+        "numeric",
+        encoder=str,
+        decoder=float,
+        schema="pg_catalog",
+        format="text",
+    )
+
+
+async def _create_pool(profile: PoolProfile, settings: Settings, *, replica: bool) -> asyncpg.Pool:
+    server_settings = {"application_name": f"astrasim-{profile.name}"}
+    if profile.statement_timeout_ms > 0:
+        server_settings["statement_timeout"] = str(profile.statement_timeout_ms)
+    return await asyncpg.create_pool(
+        host=settings.DB_REPLICA_HOST if replica else settings.DB_HOST,
+        port=settings.DB_REPLICA_PORT if replica else settings.DB_PORT,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        database=settings.DB_NAME,
+        command_timeout=profile.command_timeout,
+        min_size=profile.min_size,
+        max_size=profile.max_size,
+        statement_cache_size=profile.statement_cache_size,
+        server_settings=server_settings,
+        connection_class=InstrumentedConnection if settings.DB_QUERY_INSTRUMENTATION else asyncpg.Connection,
+        init=use_float_numeric if profile.float_numeric else None,
+    )
 
 
 async def connect_to_db() -> None:
-    global _pool
+    """Open the API pool eagerly; other profiles are created on first use."""
+    await get_pool("api")
 
-    if _pool is not None:
-        return
 
+async def open_connection() -> asyncpg.Connection:
+    """Open a standalone connection outside the shared pool."""
     settings = get_settings()
-    _pool = await asyncpg.create_pool(
+    return await asyncpg.connect(
         host=settings.DB_HOST,
         port=settings.DB_PORT,
         user=settings.DB_USER,
         password=settings.DB_PASSWORD,
         database=settings.DB_NAME,
         command_timeout=60,
-        min_size=1,
-        max_size=10,
+        connection_class=InstrumentedConnection if settings.DB_QUERY_INSTRUMENTATION else asyncpg.Connection,
     )
 
 
 async def close_db_connection() -> None:
-    global _pool
-
-    if _pool is None:
-        return
-
-    await _pool.close()
-    _pool = None
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.close()
 
 
-async def get_pool() -> asyncpg.Pool:
-    if _pool is None:
-        await connect_to_db()
-
-    assert _pool is not None  # for mypy
-    return _pool
-
+async def get_pool(profile: str = "api", *, read_only: bool = False) -> asyncpg.Pool:
+    """Return the pool for ``profile``; ``read_only`` callers use the replica when configured."""
+    settings = get_settings()
+    key = _pool_key(profile, read_only, settings)
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+
+    async with _pool_lock:
+        if key not in _pools:
+            _pools[key] = await _create_pool(
+                get_pool_profile(profile, settings),
+                settings,
+                replica=key.endswith(":replica"),
+            )
+    return _pools[key]
+
+
+@asynccontextmanager
+async def acquire_connection(pool: asyncpg.Pool, caller: str) -> AsyncIterator[asyncpg.Connection]:
+    """Acquire a pooled connection, recording pool wait and hold time for ``caller``.
+
+    Statements issued while the connection is held are tagged with ``caller`` as well.
+    """
+    requested = time.perf_counter()
+    async with pool.acquire() as conn:
+        acquired = time.perf_counter()
+        wait_ms = (acquired - requested) * 1000
+        metrics.observe("db.pool.wait_ms", wait_ms, caller=caller)
+        token = bind_caller(caller)
+        try:
+            yield conn
+        finally:
+            reset_caller(token)
+            hold_ms = (time.perf_counter() - acquired) * 1000
+            metrics.observe("db.pool.hold_ms", hold_ms, caller=caller)
+            logger.debug("%s held connection %.2f ms (waited %.2f ms)", caller, hold_ms, wait_ms)
@@ -4,11 +4,11 @@ from collections.abc import AsyncGenerator
 
 import asyncpg
 
-from app.db.connection import get_pool
+from app.db.connection import acquire_connection, get_pool
 
 
 async def get_db_connection() -> AsyncGenerator[asyncpg.Connection, None]:
     pool = await get_pool()
-    async with pool.acquire() as connection:
+    async with acquire_connection(pool, "api") as connection:
         yield connection
 
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import random
+import re
+import time
+from collections import deque
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Sequence, cast
+
+import asyncpg
+
+from app.core import metrics
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+
+logger = get_logger("db.queries")
+
+_caller: ContextVar[str] = ContextVar("db_caller", default="unknown")
+_slow_queries: Deque[Dict[str, Any]] = deque(maxlen=100)
+
+_STATEMENT_LABEL_LENGTH = 120
+_PARAM_REPR_LENGTH = 200
+
+# Reads that still write, lock or otherwise act: data-modifying CTEs, row locks, SELECT INTO
+# and calls such as advisory locks, sequences and Timescale policy/job management.
+_WRITE_CLAUSE = re.compile(r"\b(insert|update|delete|merge|into|for\s+(key\s+)?share)\b", re.IGNORECASE)
+_SIDE_EFFECT_CALL = re.compile(
+    r"\b(pg_(try_)?advisory\w*|pg_notify|pg_sleep\w*|pg_(cancel|terminate)_backend|nextval|setval"
+    r"|set_config|create_hypertable|(add|remove)_\w+_policy|refresh_continuous_aggregate"
+    r"|(de)?compress_chunk|drop_chunks|(add|alter|delete|run)_job|lo_\w+)\s*\(",
+    re.IGNORECASE,
+)
+
+
+def current_caller() -> str:
+    return _caller.get()
+
+
+def bind_caller(caller: str) -> Token[str]:
+    """Tag statements issued from the current task with ``caller`` until the token is reset."""
+    return _caller.set(caller)
+
+
+def reset_caller(token: Token[str]) -> None:
+    _caller.reset(token)
+
+
+def statement_label(query: str) -> str:
+    return " ".join(query.split())[:_STATEMENT_LABEL_LENGTH]
+
+
+def is_explainable(query: str) -> bool:
+    # EXPLAIN ANALYZE executes the statement, so only plain reads are ever sampled.
+    head = query.lstrip().split(None, 1)
+    if not head:
+        return False
+    if head[0].upper() not in ("SELECT", "WITH"):
+        return False
+    return not (_WRITE_CLAUSE.search(query) or _SIDE_EFFECT_CALL.search(query))
+
+
+def _row_count(status: str) -> int:
+    parts = status.split()
+    if parts and parts[-1].isdigit():
+        return int(parts[-1])
+    return 0
+
+
+def record_statement(
+    query: str,
+    args: Sequence[Any],
+    elapsed_ms: float,
+    rows: int,
+    *,
+    settings: Optional[Settings] = None,
+) -> Optional[Dict[str, Any]]:
+    """Record latency and row metrics for one statement; returns the capture when it was slow."""
+    settings = settings or get_settings()
+    caller = current_caller()
+    label = statement_label(query)
+    metrics.observe("db.query.ms", elapsed_ms, caller=caller, statement=label)
+    metrics.observe("db.query.rows", rows, caller=caller, statement=label)
+
+    if elapsed_ms < settings.DB_SLOW_QUERY_MS:
+        return None
+
+    metrics.increment("db.query.slow", caller=caller)
+    capture = {
+        "caller": caller,
+        "statement": " ".join(query.split()),
+        "params": [repr(arg)[:_PARAM_REPR_LENGTH] for arg in args],
+        "elapsed_ms": round(elapsed_ms, 3),
+        "rows": rows,
+        "captured_at": datetime.now(tz=timezone.utc),
+        "plan": None,
+    }
+    if _slow_queries.maxlen != settings.DB_SLOW_QUERY_CAPTURE_MAX:
+        _resize(settings.DB_SLOW_QUERY_CAPTURE_MAX)
+    _slow_queries.append(capture)
+    logger.warning("Slow query (%.1f ms, caller=%s, rows=%s): %s", elapsed_ms, caller, rows, label)
+    return capture
+
+
+def _resize(maxlen: int) -> None:
+    global _slow_queries
+    _slow_queries = deque(_slow_queries, maxlen=max(maxlen, 1))
+
+
+def get_slow_queries() -> List[Dict[str, Any]]:
+    return list(reversed(_slow_queries))
+
+
+def clear_slow_queries() -> None:
+    _slow_queries.clear()
+
+
+def _should_explain(query: str, settings: Settings) -> bool:
+    return (
+        settings.DB_SLOW_QUERY_EXPLAIN
+        and is_explainable(query)
+        and random.random() < settings.DB_SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+    )
+
+
+class InstrumentedConnection(asyncpg.Connection):
+    """asyncpg connection that times every statement and captures slow ones.
+
+    Used as the pool ``connection_class``; the caller tag comes from ``acquire_connection``.
+    """
+
+    async def fetch(
+        self, query: str, *args: Any, timeout: Optional[float] = None, record_class: Any = None
+    ) -> List[asyncpg.Record]:
+        started = time.perf_counter()
+        rows: List[asyncpg.Record] = await super().fetch(query, *args, timeout=timeout, record_class=record_class)
+        await self._observe(query, args, started, len(rows))
+        return rows
+
+    async def fetchrow(self, query: str, *args: Any, timeout: Optional[float] = None, record_class: Any = None) -> Any:
+        started = time.perf_counter()
+        row = await super().fetchrow(query, *args, timeout=timeout, record_class=record_class)
+        await self._observe(query, args, started, 0 if row is None else 1)
+        return row
+
+    async def fetchval(self, query: str, *args: Any, column: int = 0, timeout: Optional[float] = None) -> Any:
+        started = time.perf_counter()
+        value = await super().fetchval(query, *args, column=column, timeout=timeout)
+        await self._observe(query, args, started, 0 if value is None else 1)
+        return value
+
+    async def execute(self, query: str, *args: Any, timeout: Optional[float] = None) -> str:
+        started = time.perf_counter()
+        status = cast(str, await super().execute(query, *args, timeout=timeout))
+        await self._observe(query, args, started, _row_count(status), explain=False)
+        return status
+
+    async def executemany(self, command: str, args: Any, *, timeout: Optional[float] = None) -> None:
+        rows = list(args)
+        started = time.perf_counter()
+        await super().executemany(command, rows, timeout=timeout)
+        await self._observe(command, (), started, len(rows), explain=False)
+
+    async def _observe(
+        self,
+        query: str,
+        args: Sequence[Any],
+        started: float,
+        rows: int,
+        *,
+        explain: bool = True,
+    ) -> None:
+        settings = get_settings()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        capture = record_statement(query, args, elapsed_ms, rows, settings=settings)
+        if capture is None or not explain or not _should_explain(query, settings):
+            return
+        try:
+            plan = await super().fetch(f"EXPLAIN (ANALYZE, BUFFERS) {query}", *args)
+            capture["plan"] = "\n".join(row[0] for row in plan)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("EXPLAIN sample failed: %s", exc)
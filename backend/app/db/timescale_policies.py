@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import asyncpg
+
+from app.core.logging import get_logger
+
+logger = get_logger("db.timescale")
+
+
+@dataclass(frozen=True)
+class TablePolicy:
+    table: str
+    time_column: str
+    chunk_interval: str
+    primary_key: List[str] = field(default_factory=list)
+    compress_segmentby: List[str] = field(default_factory=list)
+    compress_orderby: List[str] = field(default_factory=list)
+    compress_after: Optional[str] = None
+    retention: Optional[str] = None
+
+    @property
+    def compressed(self) -> bool:
+        return self.compress_after is not None
+
+
+@dataclass
+class TableState:
+    exists: bool = True
+    is_hypertable: bool = False
+    primary_key_name: Optional[str] = None
+    primary_key: List[str] = field(default_factory=list)
+    compress_segmentby: List[str] = field(default_factory=list)
+    compress_orderby: List[str] = field(default_factory=list)
+
+
+def load_policies(path: Path) -> List[TablePolicy]:
+    payload = json.loads(Path(path).read_text())
+    if payload.get("version") != 1:
+        raise ValueError(f"Unsupported Timescale policy file version: {payload.get('version')}")
+    policies = []
+    for entry in payload["tables"]:
+        policy = TablePolicy(**entry)
+        if policy.primary_key and policy.time_column not in policy.primary_key:
+            raise ValueError(f"{policy.table}: primary key must include {policy.time_column}")
+        policies.append(policy)
+    return policies
+
+
+def _normalize_orderby(items: Sequence[str]) -> List[str]:
+    normalized = []
+    for item in items:
+        parts = item.split()
+        column = parts[0]
+        descending = len(parts) > 1 and parts[1].upper() == "DESC"
+        normalized.append(f"{column} DESC" if descending else column)
+    return normalized
+
+
+def plan_table(policy: TablePolicy, state: TableState) -> List[str]:
+    """Return the statements that bring ``policy.table`` in line with its policy.
+
+    Every statement is idempotent in effect; compression and retention jobs are replaced
+    rather than diffed so interval changes in the policy file always take.
+    """
+    if not state.exists:
+        return []
+
+    table = policy.table
+    statements: List[str] = []
+
+    if not state.is_hypertable:
+        if policy.primary_key and state.primary_key != policy.primary_key:
+            if state.primary_key_name:
+                statements.append(f"ALTER TABLE {table} DROP CONSTRAINT {state.primary_key_name}")
+            statements.append(f"ALTER TABLE {table} ADD PRIMARY KEY ({', '.join(policy.primary_key)})")
+        statements.append(
+            f"SELECT create_hypertable('{table}', '{policy.time_column}', "
+            f"chunk_time_interval => INTERVAL '{policy.chunk_interval}', migrate_data => true)"
+        )
+    else:
+        statements.append(f"SELECT set_chunk_time_interval('{table}', INTERVAL '{policy.chunk_interval}')")
+
+    if policy.compressed:
+        wanted_orderby = _normalize_orderby(policy.compress_orderby)
+        if (
+            state.compress_segmentby != policy.compress_segmentby
+            or _normalize_orderby(state.compress_orderby) != wanted_orderby
+        ):
+            settings = ["timescaledb.compress"]
+            if policy.compress_segmentby:
+                settings.append(f"timescaledb.compress_segmentby = '{', '.join(policy.compress_segmentby)}'")
+            if wanted_orderby:
+                settings.append(f"timescaledb.compress_orderby = '{', '.join(wanted_orderby)}'")
+            statements.append(f"ALTER TABLE {table} SET ({', '.join(settings)})")
+        statements.append(f"SELECT remove_compression_policy('{table}', if_exists => true)")
+        statements.append(f"SELECT add_compression_policy('{table}', INTERVAL '{policy.compress_after}')")
+
+    statements.append(f"SELECT remove_retention_policy('{table}', if_exists => true)")
+    if policy.retention:
+        statements.append(f"SELECT add_retention_policy('{table}', INTERVAL '{policy.retention}')")
+    return statements
+
+
+async def inspect_table(conn: asyncpg.Connection, table: str) -> TableState:
+    exists = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", f"public.{table}")
+    if not exists:
+        return TableState(exists=False)
+
+    state = TableState()
+    state.is_hypertable = bool(
+        await conn.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM timescaledb_information.hypertables WHERE hypertable_name=$1)",
+            table,
+        )
+    )
+    pk = await conn.fetchrow(
+        """
+        SELECT c.conname, array_agg(a.attname ORDER BY k.ord) AS columns
+        FROM pg_constraint c
+        CROSS JOIN LATERAL unnest(c.conkey) WITH ORDINALITY AS k(attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+        WHERE c.conrelid = $1::regclass AND c.contype = 'p'
+        GROUP BY c.conname
+        """,
+        table,
+    )
+    if pk:
+        state.primary_key_name = pk["conname"]
+        state.primary_key = list(pk["columns"])
+
+    if state.is_hypertable:
+        rows = await conn.fetch(
+            """
+            SELECT attname, segmentby_column_index, orderby_column_index, orderby_asc
+            FROM timescaledb_information.compression_settings
+            WHERE hypertable_name=$1
+            """,
+            table,
+        )
+        segment = sorted((r for r in rows if r["segmentby_column_index"]), key=lambda r: r["segmentby_column_index"])
+        order = sorted((r for r in rows if r["orderby_column_index"]), key=lambda r: r["orderby_column_index"])
+        state.compress_segmentby = [r["attname"] for r in segment]
+        state.compress_orderby = [r["attname"] if r["orderby_asc"] else f"{r['attname']} DESC" for r in order]
+    return state
+
+
+async def apply_policies(
+    conn: asyncpg.Connection,
+    policies: Sequence[TablePolicy],
+    *,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Apply each table's plan in its own transaction; one failing table does not stop the rest."""
+    results: Dict[str, Any] = {}
+    for policy in policies:
+        state = await inspect_table(conn, policy.table)
+        statements = plan_table(policy, state)
+        result: Dict[str, Any] = {"statements": statements, "applied": False, "error": None}
+        results[policy.table] = result
+        if not state.exists:
+            logger.warning("Skipping %s: table does not exist", policy.table)
+            continue
+        if dry_run:
+            continue
+        try:
+            async with conn.transaction():
+                for statement in statements:
+                    await conn.execute(statement)
+            result["applied"] = True
+            logger.info("Applied Timescale policy for %s (%s statements)", policy.table, len(statements))
+        except Exception as exc:  # noqa: BLE001
+            result["error"] = str(exc)
+            logger.error("Timescale policy for %s failed: %s", policy.table, exc)
+    return results
@@ -6,6 +6,10 @@ from app.core.config import get_settings
 from app.core.exceptions import register_exception_handlers
 from app.core.logging import build_request_logger, configure_logging
 from app.db.connection import close_db_connection, connect_to_db
+from app.services.audit import start_audit_sink, stop_audit_sink
+from app.services.job_queue import start_job_queue, stop_job_queue
+from app.services.scheduler import start_scheduler, stop_scheduler
+from app.services.securities import warm_security_registry
 
 
 def create_app() -> FastAPI:
@@ -33,9 +37,17 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     async def startup() -> None:
         await connect_to_db()
+        await warm_security_registry()
+        await start_audit_sink()
+        await start_job_queue()
+        # Every replica starts it; leader election keeps the cron jobs on one of them.
+        await start_scheduler()
 
     @app.on_event("shutdown")
     async def shutdown() -> None:
+        await stop_scheduler()
+        await stop_job_queue()
+        await stop_audit_sink()
         await close_db_connection()
 
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
@@ -0,0 +1,49 @@
+from .estimators import (
+    ESTIMATORS,
+    TRADING_DAYS,
+    close_to_close,
+    estimate,
+    ewma,
+    garman_klass,
+    log_returns,
+    parkinson,
+    rogers_satchell,
+    yang_zhang,
+)
+from .panel import OhlcPanel, fetch_ohlc_panel
+from .realized_vol import (
+    get_realized_vol,
+    get_realized_vol_batch,
+    get_realized_vol_many,
+    get_symbol_realized_vol,
+    refresh_realized_vol,
+    update_realized_vol,
+    update_realized_vol_batch,
+)
+from .resample import Bucket, get_daily_log_returns, get_resampled_bars, parse_bucket
+
+__all__ = [
+    "Bucket",
+    "parse_bucket",
+    "get_resampled_bars",
+    "get_daily_log_returns",
+    "ESTIMATORS",
+    "TRADING_DAYS",
+    "log_returns",
+    "close_to_close",
+    "parkinson",
+    "garman_klass",
+    "rogers_satchell",
+    "yang_zhang",
+    "ewma",
+    "estimate",
+    "OhlcPanel",
+    "fetch_ohlc_panel",
+    "update_realized_vol",
+    "update_realized_vol_batch",
+    "get_realized_vol",
+    "get_realized_vol_many",
+    "get_symbol_realized_vol",
+    "get_realized_vol_batch",
+    "refresh_realized_vol",
+]
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, Mapping, Tuple
+
+import numpy as np
+
+TRADING_DAYS = 252
+EWMA_LAMBDA = 0.94
+
+# Every estimator takes 1-D (dates) or 2-D (symbols x dates) arrays and returns an array of
+# the same shape holding annualized vol; position ``t`` covers the window ending at bar ``t``
+# and is NaN until the window is full or when it has fewer than two finite observations.
+
+
+def _log(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(np.where(values > 0, values, np.nan))
+
+
+def _rolling_sums(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sum, sum of squares and finite count over each full trailing window (NaNs skipped).
+
+    Cumulative sums keep this O(symbols x dates) regardless of the window length.
+    """
+    finite = np.isfinite(values)
+    filled = np.where(finite, values, 0.0)
+    sums = []
+    for series in (filled, filled**2, finite.astype(np.float64)):
+        cumulative = np.cumsum(series, axis=-1)
+        padded = np.concatenate([np.zeros(cumulative.shape[:-1] + (1,)), cumulative], axis=-1)
+        sums.append(padded[..., window:] - padded[..., :-window])
+    return sums[0], sums[1], sums[2]
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    result = np.full(values.shape, np.nan)
+    if window < 1 or values.shape[-1] < window:
+        return result
+    total, _, count = _rolling_sums(values, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+    result[..., window - 1:] = np.where(count >= 2, mean, np.nan)
+    return result
+
+
+def _rolling_var(values: np.ndarray, window: int) -> np.ndarray:
+    """Sample variance (ddof=1) over each trailing window, ignoring NaNs."""
+    result = np.full(values.shape, np.nan)
+    if window < 2 or values.shape[-1] < window:
+        return result
+    total, squares, count = _rolling_sums(values, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = np.maximum(squares - total**2 / count, 0.0) / (count - 1)
+    result[..., window - 1:] = np.where(count >= 2, variance, np.nan)
+    return result
+
+
+def _annualize(variance: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        vol: np.ndarray = np.sqrt(np.maximum(variance, 0.0) * TRADING_DAYS)
+    return vol
+
+
+def _lagged(values: np.ndarray) -> np.ndarray:
+    """Shift one bar forward along the date axis (first bar becomes NaN)."""
+    lagged = np.full(values.shape, np.nan)
+    lagged[..., 1:] = values[..., :-1]
+    return lagged
+
+
+def _returns(close: np.ndarray) -> np.ndarray:
+    # Aligned with the bars: position ``t`` is the return from ``t - 1`` to ``t``.
+    log_close = _log(close)
+    returns: np.ndarray = log_close - _lagged(log_close)
+    return returns
+
+
+def log_returns(close: np.ndarray) -> np.ndarray:
+    """Log returns along the last (date) axis; non-positive prices yield NaN."""
+    return np.diff(_log(close), axis=-1)
+
+
+def close_to_close(close: np.ndarray, window: int) -> np.ndarray:
+    """Sample stdev of ``window`` close-to-close log returns (needs ``window + 1`` closes)."""
+    variance = _rolling_var(_returns(close), window)
+    variance[..., :window] = np.nan
+    return _annualize(variance)
+
+
+def parkinson(high: np.ndarray, low: np.ndarray, window: int) -> np.ndarray:
+    """High-low range estimator (Parkinson, 1980)."""
+    hl = _log(high) - _log(low)
+    return _annualize(_rolling_mean(hl**2, window) / (4 * math.log(2)))
+
+
+def garman_klass(
+    open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int
+) -> np.ndarray:
+    """OHLC estimator (Garman & Klass, 1980); assumes no drift and no opening jump."""
+    hl = _log(high) - _log(low)
+    co = _log(close) - _log(open_)
+    daily = 0.5 * hl**2 - (2 * math.log(2) - 1) * co**2
+    return _annualize(_rolling_mean(daily, window))
+
+
+def _rogers_satchell_daily(
+    open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray
+) -> np.ndarray:
+    log_o, log_h, log_l, log_c = _log(open_), _log(high), _log(low), _log(close)
+    daily: np.ndarray = (log_h - log_c) * (log_h - log_o) + (log_l - log_c) * (log_l - log_o)
+    return daily
+
+
+def rogers_satchell(
+    open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int
+) -> np.ndarray:
+    """Drift-independent OHLC estimator (Rogers & Satchell, 1991)."""
+    return _annualize(_rolling_mean(_rogers_satchell_daily(open_, high, low, close), window))
+
+
+def yang_zhang(
+    open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int
+) -> np.ndarray:
+    """Overnight + open-to-close + Rogers-Satchell blend (Yang & Zhang, 2000)."""
+    overnight = _log(open_) - _lagged(_log(close))  # needs the prior close, like close_to_close
+    open_close = _log(close) - _log(open_)
+    k = 0.34 / (1.34 + (window + 1) / (window - 1)) if window > 1 else 0.0
+    variance = (
+        _rolling_var(overnight, window)
+        + k * _rolling_var(open_close, window)
+        + (1 - k) * _rolling_mean(_rogers_satchell_daily(open_, high, low, close), window)
+    )
+    variance[..., :window] = np.nan
+    return _annualize(variance)
+
+
+def ewma(close: np.ndarray, window: int, lam: float = EWMA_LAMBDA) -> np.ndarray:
+    """RiskMetrics-style exponentially weighted vol over the trailing ``window`` returns.
+
+    Weights are renormalized over the finite returns in the window, so the value does not
+    depend on how much history precedes it.
+    """
+    returns = _returns(close)
+    result = np.full(returns.shape, np.nan)
+    if window < 2 or returns.shape[-1] < window + 1:
+        return result
+    finite = np.isfinite(returns)
+    squares = np.where(finite, returns, 0.0) ** 2
+    weights = finite.astype(np.float64)
+    decay = lam**window
+    weighted = np.zeros(returns.shape[:-1])
+    total = np.zeros(returns.shape[:-1])
+    count = np.zeros(returns.shape[:-1])
+    variance = np.full(returns.shape, np.nan)
+    # One vectorized step per date across all symbols.
+    for t in range(returns.shape[-1]):
+        weighted = lam * weighted + squares[..., t]
+        total = lam * total + weights[..., t]
+        count = count + weights[..., t]
+        if t >= window:
+            weighted = weighted - decay * squares[..., t - window]
+            total = total - decay * weights[..., t - window]
+            count = count - weights[..., t - window]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance[..., t] = np.where(count >= 2, weighted / total, np.nan)
+    result[..., window:] = _annualize(variance[..., window:])
+    return result
+
+
+# name -> (bar columns the estimator consumes, estimator)
+ESTIMATORS: Dict[str, Tuple[Tuple[str, ...], Callable[..., np.ndarray]]] = {
+    "close_to_close": (("close",), close_to_close),
+    "parkinson": (("high", "low"), parkinson),
+    "garman_klass": (("open", "high", "low", "close"), garman_klass),
+    "rogers_satchell": (("open", "high", "low", "close"), rogers_satchell),
+    "yang_zhang": (("open", "high", "low", "close"), yang_zhang),
+    "ewma": (("close",), ewma),
+}
+
+
+def estimate(name: str, bars: Mapping[str, np.ndarray], window: int) -> np.ndarray:
+    """Run estimator ``name`` over ``bars`` (column name -> array) for ``window`` days."""
+    if name not in ESTIMATORS:
+        raise ValueError(f"Unknown realized volatility estimator '{name}'")
+    columns, estimator = ESTIMATORS[name]
+    return estimator(*(bars[column] for column in columns), window)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+import asyncpg
+import numpy as np
+
+from app.db.arrays import fetch_arrays
+
+OHLC_COLUMNS = ("open", "high", "low", "close")
+
+
+@dataclass
+class OhlcPanel:
+    """Daily bars aligned on a shared date axis: every price array is symbols x dates.
+
+    A security with no bar on a date holds NaN there, which the estimators skip.
+    """
+
+    security_ids: List[int]
+    dates: List[date]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in OHLC_COLUMNS}
+
+    def row(self, security_id: int) -> int:
+        return self.security_ids.index(security_id)
+
+
+async def fetch_ohlc_panel(
+    conn: asyncpg.Connection,
+    security_ids: Sequence[int],
+    *,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Optional[OhlcPanel]:
+    """Load ``1d`` bars for ``security_ids`` in one query; None when there are no bars."""
+    ids = [int(security_id) for security_id in security_ids]
+    columns = await fetch_arrays(
+        conn,
+        """
+        SELECT security_id, time, open, high, low, close
+        FROM ohlcv_bars
+        WHERE security_id = ANY($1::bigint[]) AND interval='1d'
+          AND ($2::date IS NULL OR time >= $2::date)
+          AND ($3::date IS NULL OR time < $3::date + 1)
+        ORDER BY time
+        """,
+        ids,
+        start,
+        end,
+        dtypes={"security_id": np.int64, "time": object},
+    )
+    if not columns:
+        return None
+
+    days, date_index = np.unique([value.date() for value in columns["time"]], return_inverse=True)
+    order = np.argsort(ids)
+    rows = order[np.searchsorted(np.asarray(ids)[order], columns["security_id"])]
+    shape = (len(ids), len(days))
+    arrays = {}
+    for name in OHLC_COLUMNS:
+        grid = np.full(shape, np.nan)
+        grid[rows, date_index] = columns[name]
+        arrays[name] = grid
+    return OhlcPanel(security_ids=ids, dates=list(days), **arrays)
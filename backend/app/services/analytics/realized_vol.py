@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import math
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+import numpy as np
+
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.connection import acquire_connection, get_pool
+from app.services.analytics.estimators import ESTIMATORS, estimate
+from app.services.analytics.panel import fetch_ohlc_panel
+from app.services.securities import lookup_security_id
+
+logger = get_logger("analytics.realized_vol")
+
+DEFAULT_ESTIMATOR = "close_to_close"
+
+UPSERT_REALIZED_VOL_SQL = """
+    INSERT INTO realized_vol (security_id, as_of, estimator, window_days, value)
+    VALUES ($1,$2,$3,$4,$5)
+    ON CONFLICT (security_id, estimator, window_days, as_of)
+    DO UPDATE SET value=EXCLUDED.value, updated_at=NOW()
+"""
+
+
+def _calendar_lookback(window: int) -> int:
+    # Daily bars only exist on trading days; pad for weekends and holidays.
+    return math.ceil((window + 1) * 7 / 5) + 10
+
+
+def _ordinal(value: Optional[date]) -> int:
+    return value.toordinal() if value is not None else 0
+
+
+async def update_realized_vol(
+    conn: asyncpg.Connection,
+    security_id: int,
+    *,
+    since: Optional[date] = None,
+    settings: Optional[Settings] = None,
+) -> int:
+    """Write realized vol for the dates not yet stored (plus a short recompute tail)."""
+    counts = await update_realized_vol_batch(conn, [security_id], since=since, settings=settings)
+    return counts.get(security_id, 0)
+
+
+async def update_realized_vol_batch(
+    conn: asyncpg.Connection,
+    security_ids: Sequence[int],
+    *,
+    since: Optional[date] = None,
+    settings: Optional[Settings] = None,
+) -> Dict[int, int]:
+    """Incrementally update many securities from one symbols x dates bar panel.
+
+    Only the bars needed to fill the longest window ahead of the earliest new date are
+    read, so the post-ingest update touches a few months of bars at most. ``since`` (the
+    start of a backfill) extends the recompute back to that date, even before what is stored.
+    """
+    settings = settings or get_settings()
+    windows = sorted(set(settings.REALIZED_VOL_WINDOWS))
+    estimators = [name for name in settings.REALIZED_VOL_ESTIMATORS if name in ESTIMATORS]
+    counts = {security_id: 0 for security_id in security_ids}
+    if not windows or not estimators or not security_ids:
+        return counts
+
+    # Tracked per series, so a newly enabled estimator or window starts from full history.
+    rows = await conn.fetch(
+        """
+        SELECT security_id, estimator, window_days, MAX(as_of) AS latest
+        FROM realized_vol
+        WHERE security_id = ANY($1::bigint[])
+        GROUP BY security_id, estimator, window_days
+        """,
+        list(security_ids),
+    )
+    latest: Dict[Tuple[int, str, int], date] = {
+        (row["security_id"], row["estimator"], row["window_days"]): row["latest"] for row in rows
+    }
+    recompute = timedelta(days=settings.REALIZED_VOL_RECOMPUTE_DAYS)
+    starts: Dict[Tuple[int, str, int], Optional[date]] = {}
+    for security_id in security_ids:
+        for name in estimators:
+            for window in windows:
+                stored = latest.get((security_id, name, window))
+                start = None if stored is None else stored - recompute
+                if start is not None and since is not None:
+                    start = min(since, start)
+                starts[(security_id, name, window)] = start
+    known = [value for value in starts.values() if value is not None]
+    fetch_from: Optional[date] = None
+    if len(known) == len(starts):
+        fetch_from = min(known) - timedelta(days=_calendar_lookback(windows[-1]))
+
+    panel = await fetch_ohlc_panel(conn, list(security_ids), start=fetch_from)
+    if panel is None:
+        return counts
+
+    day_ordinals = np.array([day.toordinal() for day in panel.dates])
+    has_close = np.isfinite(panel.close)
+    bars = panel.columns()
+
+    payload = []
+    for name in estimators:
+        for window in windows:
+            since_ordinals = np.array(
+                [_ordinal(starts[(security_id, name, window)]) for security_id in panel.security_ids]
+            )
+            wanted = (day_ordinals[None, :] >= since_ordinals[:, None]) & has_close
+            values = estimate(name, bars, window)
+            row_index, date_index = np.nonzero(wanted & np.isfinite(values))
+            for i, j in zip(row_index.tolist(), date_index.tolist()):
+                security_id = panel.security_ids[i]
+                payload.append((security_id, panel.dates[j], name, window, float(values[i, j])))
+                counts[security_id] += 1
+
+    if payload:
+        await conn.executemany(UPSERT_REALIZED_VOL_SQL, payload)
+    return counts
+
+
+async def get_realized_vol(
+    conn: asyncpg.Connection,
+    security_id: int,
+    windows: Sequence[int],
+    *,
+    estimator: str = DEFAULT_ESTIMATOR,
+    as_of: Optional[date] = None,
+) -> Dict[int, Optional[float]]:
+    """Latest stored value per window (on or before ``as_of``); missing windows map to None."""
+    rows = await conn.fetch(
+        """
+        SELECT DISTINCT ON (window_days) window_days, value
+        FROM realized_vol
+        WHERE security_id=$1 AND estimator=$2 AND window_days = ANY($3::int[])
+          AND ($4::date IS NULL OR as_of <= $4)
+        ORDER BY window_days, as_of DESC
+        """,
+        security_id,
+        estimator,
+        list(windows),
+        as_of,
+    )
+    found = {row["window_days"]: row["value"] for row in rows}
+    return {window: found.get(window) for window in windows}
+
+
+async def get_realized_vol_many(
+    conn: asyncpg.Connection,
+    security_ids: Sequence[int],
+    windows: Sequence[int],
+    *,
+    estimator: str = DEFAULT_ESTIMATOR,
+    as_of: Optional[date] = None,
+) -> Dict[int, Dict[int, Optional[float]]]:
+    """``get_realized_vol`` for many securities in one query."""
+    rows = await conn.fetch(
+        """
+        SELECT DISTINCT ON (security_id, window_days) security_id, window_days, value
+        FROM realized_vol
+        WHERE security_id = ANY($1::bigint[]) AND estimator=$2 AND window_days = ANY($3::int[])
+          AND ($4::date IS NULL OR as_of <= $4)
+        ORDER BY security_id, window_days, as_of DESC
+        """,
+        list(security_ids),
+        estimator,
+        list(windows),
+        as_of,
+    )
+    results: Dict[int, Dict[int, Optional[float]]] = {
+        security_id: {window: None for window in windows} for security_id in security_ids
+    }
+    for row in rows:
+        results[row["security_id"]][row["window_days"]] = row["value"]
+    return results
+
+
+async def get_symbol_realized_vol(
+    symbol: str,
+    windows: Sequence[int],
+    *,
+    estimator: str = DEFAULT_ESTIMATOR,
+    as_of: Optional[date] = None,
+) -> Dict[int, Optional[float]]:
+    pool = await get_pool(read_only=True)
+    async with acquire_connection(pool, "analytics.realized_vol") as conn:
+        security_id = await lookup_security_id(conn, symbol)
+        if security_id is None:
+            raise ValueError(f"Security {symbol} not found in securities table")
+        return await get_realized_vol(conn, security_id, windows, estimator=estimator, as_of=as_of)
+
+
+async def get_realized_vol_batch(
+    symbols: Optional[Sequence[str]] = None,
+    windows: Optional[Sequence[int]] = None,
+    *,
+    estimator: str = DEFAULT_ESTIMATOR,
+    as_of: Optional[date] = None,
+    settings: Optional[Settings] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Latest realized vol for ``symbols`` (every active security when omitted) in one query."""
+    settings = settings or get_settings()
+    windows = list(windows or settings.REALIZED_VOL_WINDOWS)
+    wanted = [symbol.upper() for symbol in symbols] if symbols else None
+    pool = await get_pool("analytics", read_only=True)
+    async with acquire_connection(pool, "analytics.realized_vol.batch") as conn:
+        rows = await conn.fetch(
+            """
+            SELECT DISTINCT ON (rv.security_id, rv.window_days)
+                   s.symbol, rv.window_days, rv.value, rv.as_of
+            FROM realized_vol rv
+            JOIN securities s ON s.id = rv.security_id
+            WHERE rv.estimator=$1 AND rv.window_days = ANY($2::int[])
+              AND s.is_active
+              AND ($3::text[] IS NULL OR s.symbol = ANY($3::text[]))
+              AND ($4::date IS NULL OR rv.as_of <= $4)
+            ORDER BY rv.security_id, rv.window_days, rv.as_of DESC
+            """,
+            estimator,
+            windows,
+            wanted,
+            as_of,
+        )
+    results: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        entry = results.setdefault(
+            row["symbol"],
+            {"as_of": row["as_of"], "values": {window: None for window in windows}},
+        )
+        entry["values"][row["window_days"]] = row["value"]
+        entry["as_of"] = max(entry["as_of"], row["as_of"])
+    return results
+
+
+async def refresh_realized_vol(
+    symbols: Optional[Sequence[str]] = None,
+    *,
+    settings: Optional[Settings] = None,
+) -> Dict[str, int]:
+    """Bring the store up to date for ``symbols`` (every active security when omitted)."""
+    settings = settings or get_settings()
+    pool = await get_pool("ingestion")
+    async with acquire_connection(pool, "analytics.realized_vol.refresh") as conn:
+        targets: List[Tuple[str, int]] = []
+        if symbols:
+            for symbol in symbols:
+                security_id = await lookup_security_id(conn, symbol)
+                if security_id is None:
+                    logger.warning("Skipping realized vol refresh for unknown symbol %s", symbol)
+                    continue
+                targets.append((symbol.upper(), security_id))
+        else:
+            rows = await conn.fetch("SELECT id, symbol FROM securities WHERE is_active ORDER BY symbol")
+            targets = [(row["symbol"], row["id"]) for row in rows]
+        counts = await update_realized_vol_batch(
+            conn, [security_id for _, security_id in targets], settings=settings
+        )
+        results = {symbol: counts.get(security_id, 0) for symbol, security_id in targets}
+    logger.info("Realized vol refreshed for %s securities (%s rows)", len(results), sum(results.values()))
+    return results
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.db.connection import acquire_connection, get_pool
+from app.services.securities import lookup_security_id
+
+_BUCKET_PATTERN = re.compile(r"^\s*(\d+)\s*([a-z]+)\s*$")
+_UNIT_ALIASES = {
+    "d": "day",
+    "day": "day",
+    "days": "day",
+    "w": "week",
+    "wk": "week",
+    "week": "week",
+    "weeks": "week",
+    "mo": "month",
+    "month": "month",
+    "months": "month",
+    "q": "quarter",
+    "quarter": "quarter",
+    "quarters": "quarter",
+    "y": "year",
+    "year": "year",
+    "years": "year",
+}
+
+# Finest stored series each unit can be rolled up from without crossing bucket edges.
+_SOURCES = {
+    "day": "SELECT time AS bucket, security_id, open, high, low, close, volume FROM ohlcv_bars WHERE interval = '1d'",
+    "week": "SELECT bucket, security_id, open, high, low, close, volume FROM ohlcv_bars_1w",
+    "month": "SELECT bucket, security_id, open, high, low, close, volume FROM ohlcv_bars_1mo",
+}
+_MONTHS_PER_UNIT = {"month": 1, "quarter": 3, "year": 12}
+
+
+@dataclass(frozen=True)
+class Bucket:
+    count: int
+    unit: str
+
+    @property
+    def source_unit(self) -> str:
+        return "month" if self.unit in _MONTHS_PER_UNIT else self.unit
+
+    @property
+    def interval(self) -> str:
+        if self.unit in _MONTHS_PER_UNIT:
+            return f"{self.count * _MONTHS_PER_UNIT[self.unit]} months"
+        return f"{self.count} {self.unit}s"
+
+    @property
+    def is_native(self) -> bool:
+        """True when the stored series already has exactly this bucket width."""
+        return self.count == 1 and self.unit == self.source_unit
+
+
+def parse_bucket(value: str) -> Bucket:
+    """Parse ``"1w"``, ``"2 weeks"``, ``"1mo"``, ``"1q"`` and similar into a bucket."""
+    match = _BUCKET_PATTERN.match(value.lower())
+    unit = _UNIT_ALIASES.get(match.group(2)) if match else None
+    if match is None or unit is None or int(match.group(1)) < 1:
+        raise ValueError(f"Unsupported time bucket '{value}'")
+    return Bucket(count=int(match.group(1)), unit=unit)
+
+
+def build_bars_query(bucket: Bucket) -> Tuple[str, bool]:
+    """Return the bars query and whether it takes the bucket interval as ``$5``.
+
+    Parameters are ``$1`` security id, ``$2``/``$3`` start/end (nullable), ``$4`` limit.
+    """
+    source = _SOURCES[bucket.source_unit]
+    filters = """
+        WHERE security_id = $1
+          AND ($2::timestamptz IS NULL OR bucket >= $2)
+          AND ($3::timestamptz IS NULL OR bucket < $3)
+    """
+    if bucket.is_native:
+        bucketed = f"SELECT bucket, open, high, low, close, volume FROM ({source}) src {filters}"
+    else:
+        bucketed = f"""
+            SELECT time_bucket($5::interval, bucket) AS bucket,
+                   first(open, bucket) AS open,
+                   max(high) AS high,
+                   min(low) AS low,
+                   last(close, bucket) AS close,
+                   sum(volume) AS volume
+            FROM ({source}) src
+            {filters}
+            GROUP BY 1
+        """
+    query = f"""
+        SELECT bucket, open, high, low, close, volume,
+               CASE
+                   WHEN prev_close > 0 AND close > 0 THEN ln(close / prev_close)
+               END AS log_return
+        FROM (
+            SELECT b.*, lag(close) OVER (ORDER BY bucket) AS prev_close
+            FROM ({bucketed}) b
+        ) bars
+        ORDER BY bucket DESC
+        LIMIT $4
+    """
+    return query, not bucket.is_native
+
+
+async def get_resampled_bars(
+    symbol: str,
+    bucket: str = "1w",
+    *,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 500,
+) -> List[Dict[str, Any]]:
+    """Return OHLCV bars for ``symbol`` in ``bucket`` widths, oldest first.
+
+    Weekly and monthly multiples are rolled up from the continuous aggregates; other day
+    widths come from the raw daily bars. ``log_return`` is close-to-close between buckets.
+    """
+    parsed = parse_bucket(bucket)
+    pool = await get_pool("analytics", read_only=True)
+    async with acquire_connection(pool, "analytics.resample") as conn:
+        security_id = await lookup_security_id(conn, symbol)
+        if security_id is None:
+            raise ValueError(f"Security {symbol} not found in securities table")
+        query, takes_interval = build_bars_query(parsed)
+        args: List[Any] = [security_id, start, end, limit]
+        if takes_interval:
+            args.append(parsed.interval)
+        rows = await conn.fetch(query, *args)
+    return [
+        {
+            "bucket": row["bucket"],
+            "open": row["open"],
+            "high": row["high"],
+            "low": row["low"],
+            "close": row["close"],
+            "volume": row["volume"],
+            "log_return": row["log_return"],
+        }
+        for row in reversed(rows)
+    ]
+
+
+async def get_daily_log_returns(
+    symbol: str,
+    *,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 500,
+) -> List[Dict[str, Any]]:
+    pool = await get_pool("analytics", read_only=True)
+    async with acquire_connection(pool, "analytics.returns") as conn:
+        security_id = await lookup_security_id(conn, symbol)
+        if security_id is None:
+            raise ValueError(f"Security {symbol} not found in securities table")
+        rows = await conn.fetch(
+            """
+            SELECT time, close, log_return
+            FROM ohlcv_daily_log_returns
+            WHERE security_id = $1
+              AND ($2::timestamptz IS NULL OR time >= $2)
+              AND ($3::timestamptz IS NULL OR time < $3)
+            ORDER BY time DESC
+            LIMIT $4
+            """,
+            security_id,
+            start,
+            end,
+            limit,
+        )
+    return [
+        {"time": row["time"], "close": row["close"], "log_return": row["log_return"]}
+        for row in reversed(rows)
+    ]
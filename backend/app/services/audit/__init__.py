@@ -0,0 +1,35 @@
+from .sink import (
+    COMPLETE_RUN_SQL,
+    FAIL_RUN_SQL,
+    INSERT_CALIBRATION_FLAG_SQL,
+    INSERT_ERROR_SQL,
+    INSERT_FINISHED_RUN_SQL,
+    INSERT_RECONCILIATION_SQL,
+    RECORD_FAILED_RUN_SQL,
+    AuditSink,
+    get_audit_sink,
+    insert_finished_run,
+    record_failed_run,
+    start_audit_sink,
+    stop_audit_sink,
+    write_audit,
+    write_audit_many,
+)
+
+__all__ = [
+    "AuditSink",
+    "get_audit_sink",
+    "start_audit_sink",
+    "stop_audit_sink",
+    "write_audit",
+    "write_audit_many",
+    "insert_finished_run",
+    "record_failed_run",
+    "COMPLETE_RUN_SQL",
+    "FAIL_RUN_SQL",
+    "INSERT_ERROR_SQL",
+    "INSERT_FINISHED_RUN_SQL",
+    "RECORD_FAILED_RUN_SQL",
+    "INSERT_RECONCILIATION_SQL",
+    "INSERT_CALIBRATION_FLAG_SQL",
+]
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.connection import open_connection
+from app.db.instrumentation import bind_caller
+
+logger = get_logger("audit")
+
+COMPLETE_RUN_SQL = """
+    UPDATE ingestion_runs
+    SET status='success', finished_at=NOW(), rows_inserted=$2
+    WHERE id=$1
+"""
+
+FAIL_RUN_SQL = """
+    UPDATE ingestion_runs
+    SET status='failed', finished_at=NOW(), error_message=$2
+    WHERE id=$1
+"""
+
+INSERT_FINISHED_RUN_SQL = """
+    INSERT INTO ingestion_runs (source, target_table, status, started_at, finished_at, rows_inserted)
+    VALUES ($1, $2, $3, $4, clock_timestamp(), $5)
+    RETURNING id
+"""
+
+# One statement (and one commit) records a failed run together with its error payload.
+RECORD_FAILED_RUN_SQL = """
+    WITH run AS (
+        INSERT INTO ingestion_runs (source, target_table, status, started_at, finished_at, error_message)
+        VALUES ($1, $2, 'failed', $3, clock_timestamp(), $4)
+        RETURNING id
+    )
+    INSERT INTO ingestion_errors (ingestion_run_id, context, payload, message)
+    SELECT id, $5, $6, $4 FROM run
+"""
+
+INSERT_ERROR_SQL = """
+    INSERT INTO ingestion_errors (ingestion_run_id, context, payload, message)
+    VALUES ($1, $2, $3, $4)
+"""
+
+INSERT_RECONCILIATION_SQL = """
+    INSERT INTO reconciliation_log (security_id, issue_type, severity, details, issue_timestamp, ingestion_run_id)
+    VALUES ($1, $2, $3, $4, $5, $6)
+"""
+
+INSERT_CALIBRATION_FLAG_SQL = """
+    INSERT INTO calibration_flags (
+        security_id,
+        horizon_days,
+        flag_type,
+        severity,
+        details,
+        ingestion_run_id
+    )
+    VALUES ($1,$2,$3,$4,$5,$6)
+"""
+
+AuditRecord = Tuple[str, Sequence[Any]]
+ConnectionFactory = Callable[[], Awaitable[asyncpg.Connection]]
+
+_STOP = object()
+
+
+class AuditSink:
+    """Buffers audit writes and flushes them in batches on a dedicated connection.
+
+    The buffer is bounded by ``AUDIT_BUFFER_MAX``; once full, producers wait for the
+    flusher instead of dropping records. ``stop`` drains everything that was accepted.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        connect: ConnectionFactory = open_connection,
+    ) -> None:
+        self.settings = settings or get_settings()
+        self._connect = connect
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max(self.settings.AUDIT_BUFFER_MAX, 1))
+        self._conn: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self.running = False
+        self.written = 0
+        self.dropped = 0
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._task = asyncio.create_task(self._run(), name="audit-sink")
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self.running = False
+        await self._queue.put(_STOP)
+        if self._task is not None:
+            await self._task
+            self._task = None
+        leftovers = self._drain()
+        if leftovers:
+            await self._write(leftovers)
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    async def submit(self, sql: str, args: Sequence[Any]) -> None:
+        await self._queue.put((sql, tuple(args)))
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _drain(self) -> List[AuditRecord]:
+        records: List[AuditRecord] = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                records.append(item)
+        return records
+
+    async def _run(self) -> None:
+        bind_caller("audit.sink")
+        loop = asyncio.get_running_loop()
+        batch_size = max(self.settings.AUDIT_FLUSH_BATCH_SIZE, 1)
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch: List[AuditRecord] = [item]
+            deadline = loop.time() + self.settings.AUDIT_FLUSH_INTERVAL
+            stopping = False
+            while len(batch) < batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._write(batch)
+            if stopping:
+                return
+
+    async def _write(self, batch: List[AuditRecord]) -> None:
+        grouped: Dict[str, List[Sequence[Any]]] = {}
+        for sql, args in batch:
+            grouped.setdefault(sql, []).append(args)
+
+        for attempt in range(2):
+            try:
+                if self._conn is None or self._conn.is_closed():
+                    self._conn = await self._connect()
+                async with self._conn.transaction():
+                    for sql, rows in grouped.items():
+                        await self._conn.executemany(sql, rows)
+                self.written += len(batch)
+                return
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Audit flush attempt %s failed: %s", attempt + 1, exc)
+                if self._conn is not None:
+                    self._conn.terminate()
+                    self._conn = None
+
+        # Fall back to one statement per record so a single bad row cannot sink the batch.
+        for sql, args in batch:
+            try:
+                if self._conn is None or self._conn.is_closed():
+                    self._conn = await self._connect()
+                await self._conn.execute(sql, *args)
+                self.written += 1
+            except Exception as exc:  # noqa: BLE001
+                self.dropped += 1
+                logger.error("Dropped audit record (%s): %s", " ".join(sql.split()[:3]), exc)
+
+
+_sink: Optional[AuditSink] = None
+
+
+def get_audit_sink() -> Optional[AuditSink]:
+    return _sink
+
+
+async def start_audit_sink(settings: Optional[Settings] = None) -> Optional[AuditSink]:
+    global _sink
+    settings = settings or get_settings()
+    if not settings.AUDIT_SINK_ENABLED:
+        return None
+    if _sink is None:
+        _sink = AuditSink(settings=settings)
+    await _sink.start()
+    logger.info("Audit sink started")
+    return _sink
+
+
+async def stop_audit_sink() -> None:
+    global _sink
+    if _sink is None:
+        return
+    await _sink.stop()
+    logger.info("Audit sink stopped (%s written, %s dropped)", _sink.written, _sink.dropped)
+    _sink = None
+
+
+async def write_audit(conn: asyncpg.Connection, sql: str, *args: Any) -> None:
+    """Queue an audit statement, or run it on ``conn`` when no sink is running."""
+    sink = _sink
+    if sink is not None and sink.running:
+        await sink.submit(sql, args)
+        return
+    await conn.execute(sql, *args)
+
+
+async def write_audit_many(conn: asyncpg.Connection, sql: str, rows: Sequence[Sequence[Any]]) -> None:
+    if not rows:
+        return
+    sink = _sink
+    if sink is not None and sink.running:
+        for args in rows:
+            await sink.submit(sql, args)
+        return
+    await conn.executemany(sql, rows)
+
+
+async def insert_finished_run(
+    conn: asyncpg.Connection,
+    source: str,
+    target_table: str,
+    started_at: datetime,
+    rows_inserted: int,
+    *,
+    status: str = "success",
+) -> int:
+    """Record a completed ingestion run and return its id (callers link rows to it)."""
+    row = await conn.fetchrow(INSERT_FINISHED_RUN_SQL, source, target_table, status, started_at, rows_inserted)
+    return int(row["id"])
+
+
+async def record_failed_run(
+    conn: asyncpg.Connection,
+    source: str,
+    target_table: str,
+    started_at: datetime,
+    exc: Exception,
+    context: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Record a failed ingestion run together with its error context."""
+    await write_audit(
+        conn,
+        RECORD_FAILED_RUN_SQL,
+        source,
+        target_table,
+        started_at,
+        str(exc),
+        json.dumps(context or {}),
+        "{}",
+    )
@@ -9,7 +9,9 @@ import asyncpg
 from app.clients.polygon_corp_actions import PolygonCorpActionsClient
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
-from app.db.connection import get_pool
+from app.db.connection import acquire_connection, get_pool
+from app.services.audit import COMPLETE_RUN_SQL, FAIL_RUN_SQL, INSERT_ERROR_SQL, write_audit
+from app.services.securities import lookup_security_id
 
 logger = get_logger("ingestion.corp_actions")
 
@@ -24,8 +26,8 @@ async def backfill_corp_actions(symbol: str, start: date, end: date, *, settings
 
     settings = settings or get_settings()
     async with PolygonCorpActionsClient(settings=settings) as client:
-        pool = await get_pool()
-        async with pool.acquire() as conn:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "ingestion.corp_actions.backfill") as conn:
             run_id = await _create_run(conn, "polygon_corp_actions_backfill")
             try:
                 security_id = await _lookup_security_id(conn, symbol)
@@ -46,8 +48,8 @@ async def backfill_corp_actions(symbol: str, start: date, end: date, *, settings
 async def update_corp_actions(symbol: str, *, settings: Optional[Settings] = None) -> int:
     settings = settings or get_settings()
     async with PolygonCorpActionsClient(settings=settings) as client:
-        pool = await get_pool()
-        async with pool.acquire() as conn:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "ingestion.corp_actions.update") as conn:
             run_id = await _create_run(conn, "polygon_corp_actions_update")
             try:
                 security_id = await _lookup_security_id(conn, symbol)
@@ -121,7 +123,7 @@ def _parse_date(value: Optional[str]) -> Optional[date]:
 
 
 async def _lookup_security_id(conn: asyncpg.Connection, symbol: str) -> int:
-    security_id = await conn.fetchval("SELECT id FROM securities WHERE symbol=$1 LIMIT 1", symbol.upper())
+    security_id = await lookup_security_id(conn, symbol)
     if security_id is None:
         raise CorporateActionIngestionError(f"Security {symbol} not found")
     return int(security_id)
@@ -140,15 +142,7 @@ async def _create_run(conn: asyncpg.Connection, source: str) -> int:
 
 
 async def _complete_run(conn: asyncpg.Connection, run_id: int, rows: int) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='success', finished_at=NOW(), rows_inserted=$2
-        WHERE id=$1
-        """,
-        run_id,
-        rows,
-    )
+    await write_audit(conn, COMPLETE_RUN_SQL, run_id, rows)
 
 
 async def _fail_run(
@@ -158,26 +152,9 @@ async def _fail_run(
     *,
     context: Optional[Dict[str, Any]] = None,
 ) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='failed', finished_at=NOW(), error_message=$2
-        WHERE id=$1
-        """,
-        run_id,
-        str(exc),
-    )
+    await write_audit(conn, FAIL_RUN_SQL, run_id, str(exc))
     context_str = None
     if context:
         context_str = ", ".join(f"{key}={value}" for key, value in context.items())
-    await conn.execute(
-        """
-        INSERT INTO ingestion_errors (ingestion_run_id, context, payload, message)
-        VALUES ($1, $2, $3, $4)
-        """,
-        run_id,
-        context_str,
-        json.dumps(context or {}),
-        str(exc),
-    )
+    await write_audit(conn, INSERT_ERROR_SQL, run_id, context_str, json.dumps(context or {}), str(exc))
 
@@ -9,7 +9,9 @@ import asyncpg
 from app.clients.polygon_indexes import PolygonIndexesClient
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
-from app.db.connection import get_pool
+from app.db.connection import acquire_connection, get_pool
+from app.services.audit import COMPLETE_RUN_SQL, FAIL_RUN_SQL, INSERT_ERROR_SQL, write_audit
+from app.services.securities import ensure_security
 
 logger = get_logger("ingestion.indexes")
 
@@ -41,8 +43,8 @@ async def backfill_index_series(symbol: str, start: date, end: date, *, settings
 
     settings = settings or get_settings()
     async with PolygonIndexesClient(settings=settings) as client:
-        pool = await get_pool()
-        async with pool.acquire() as conn:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "ingestion.indexes.backfill") as conn:
             run_id = await _create_run(conn, "polygon_index_backfill")
             try:
                 security_id = await _ensure_security(conn, symbol)
@@ -63,8 +65,8 @@ async def backfill_index_series(symbol: str, start: date, end: date, *, settings
 async def update_index_series(symbol: str, *, settings: Optional[Settings] = None) -> int:
     settings = settings or get_settings()
     async with PolygonIndexesClient(settings=settings) as client:
-        pool = await get_pool()
-        async with pool.acquire() as conn:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "ingestion.indexes.update") as conn:
             run_id = await _create_run(conn, "polygon_index_update")
             try:
                 security_id = await _ensure_security(conn, symbol)
@@ -125,19 +127,7 @@ async def _ingest_range(
 
 
 async def _ensure_security(conn: asyncpg.Connection, symbol: str) -> int:
-    existing = await conn.fetchrow("SELECT id FROM securities WHERE symbol=$1 LIMIT 1", symbol.upper())
-    if existing:
-        return int(existing["id"])
-
-    row = await conn.fetchrow(
-        """
-        INSERT INTO securities (symbol, type, is_active)
-        VALUES ($1, 'index', true)
-        RETURNING id
-        """,
-        symbol.upper(),
-    )
-    return int(row["id"])
+    return await ensure_security(conn, symbol, "index")
 
 
 async def _determine_update_start(conn: asyncpg.Connection, security_id: int) -> date:
@@ -163,15 +153,7 @@ async def _create_run(conn: asyncpg.Connection, source: str) -> int:
 
 
 async def _complete_run(conn: asyncpg.Connection, run_id: int, rows: int) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='success', finished_at=NOW(), rows_inserted=$2
-        WHERE id=$1
-        """,
-        run_id,
-        rows,
-    )
+    await write_audit(conn, COMPLETE_RUN_SQL, run_id, rows)
 
 
 async def _fail_run(
@@ -181,26 +163,9 @@ async def _fail_run(
     *,
     context: Optional[Dict[str, Any]] = None,
 ) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='failed', finished_at=NOW(), error_message=$2
-        WHERE id=$1
-        """,
-        run_id,
-        str(exc),
-    )
+    await write_audit(conn, FAIL_RUN_SQL, run_id, str(exc))
     context_str = None
     if context:
         context_str = ", ".join(f"{k}={v}" for k, v in context.items())
-    await conn.execute(
-        """
-        INSERT INTO ingestion_errors (ingestion_run_id, context, payload, message)
-        VALUES ($1, $2, $3, $4)
-        """,
-        run_id,
-        context_str,
-        json.dumps(context or {}),
-        str(exc),
-    )
+    await write_audit(conn, INSERT_ERROR_SQL, run_id, context_str, json.dumps(context or {}), str(exc))
 
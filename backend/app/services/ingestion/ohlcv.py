@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import json
-from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 import asyncpg
 
 from app.clients.polygon import PolygonClient
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
-from app.db.connection import get_pool
+from app.db.connection import acquire_connection, get_pool
+from app.services.analytics.realized_vol import update_realized_vol
+from app.services.audit import COMPLETE_RUN_SQL, FAIL_RUN_SQL, INSERT_ERROR_SQL, write_audit
+from app.services.securities import lookup_security_id
 
 logger = get_logger("ingestion.ohlcv")
 
@@ -24,13 +27,16 @@ async def backfill_ohlcv(symbol: str, start: date, end: date, *, settings: Optio
         raise ValueError("start must be before end")
 
     async with PolygonClient(settings=settings) as client:
-        pool = await get_pool()
-        async with pool.acquire() as conn:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "ingestion.ohlcv.backfill") as conn:
             run_id = await _create_run(conn, source="polygon_ohlcv_backfill")
             try:
                 security_id = await _lookup_security_id(conn, symbol)
                 rows = await _ingest_range(conn, client, security_id, symbol.upper(), start, end)
                 await _complete_run(conn, run_id, rows_inserted=rows)
+                await _refresh_rollups(conn, start, end)
+                # Recompute from the backfill start: it may reach before what is stored.
+                await _update_realized_vol(conn, security_id, settings, since=start)
                 logger.info("Backfill completed for %s (%s rows)", symbol, rows)
                 return rows
             except Exception as exc:
@@ -46,8 +52,8 @@ async def backfill_ohlcv(symbol: str, start: date, end: date, *, settings: Optio
 async def update_ohlcv(symbol: str, *, settings: Optional[Settings] = None) -> int:
     settings = settings or get_settings()
     async with PolygonClient(settings=settings) as client:
-        pool = await get_pool()
-        async with pool.acquire() as conn:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "ingestion.ohlcv.update") as conn:
             run_id = await _create_run(conn, source="polygon_ohlcv_update")
             try:
                 security_id = await _lookup_security_id(conn, symbol)
@@ -55,6 +61,7 @@ async def update_ohlcv(symbol: str, *, settings: Optional[Settings] = None) -> i
                 end_date = date.today()
                 rows = await _ingest_range(conn, client, security_id, symbol.upper(), start_date, end_date)
                 await _complete_run(conn, run_id, rows_inserted=rows)
+                await _update_realized_vol(conn, security_id, settings)
                 logger.info("Update completed for %s (%s rows)", symbol, rows)
                 return rows
             except Exception as exc:
@@ -121,11 +128,50 @@ async def _ingest_range(
     return len(payload)
 
 
+async def _update_realized_vol(
+    conn: asyncpg.Connection,
+    security_id: int,
+    settings: Settings,
+    *,
+    since: Optional[date] = None,
+) -> None:
+    # The bars are already committed; a realized-vol failure must not fail the ingest run.
+    try:
+        await update_realized_vol(conn, security_id, since=since, settings=settings)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Realized vol update failed for security %s: %s", security_id, exc)
+
+
+def _week_window(start: date, end: date) -> Tuple[date, date]:
+    return start - timedelta(days=start.weekday()), end + timedelta(days=7 - end.weekday())
+
+
+def _month_window(start: date, end: date) -> Tuple[date, date]:
+    following = end.replace(day=1) + timedelta(days=32)
+    return start.replace(day=1), following.replace(day=1)
+
+
+# Continuous aggregates over daily bars, with the bucket-aligned window covering a date range.
+ROLLUPS = (("ohlcv_bars_1w", _week_window), ("ohlcv_bars_1mo", _month_window))
+
+
+async def _refresh_rollups(conn: asyncpg.Connection, start: date, end: date) -> None:
+    # Refresh policies only cover recent buckets, so backfilled history is materialized here.
+    # Only whole buckets inside the window are refreshed, hence the alignment.
+    for view, window in ROLLUPS:
+        window_start, window_end = window(start, end)
+        try:
+            await conn.execute(
+                f"CALL refresh_continuous_aggregate('{view}', $1::timestamptz, $2::timestamptz)",
+                datetime.combine(window_start, datetime.min.time(), tzinfo=timezone.utc),
+                datetime.combine(window_end, datetime.min.time(), tzinfo=timezone.utc),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Refreshing %s for %s..%s failed: %s", view, start, end, exc)
+
+
 async def _lookup_security_id(conn: asyncpg.Connection, symbol: str) -> int:
-    security_id: Optional[int] = await conn.fetchval(
-        "SELECT id FROM securities WHERE symbol=$1 LIMIT 1",
-        symbol.upper(),
-    )
+    security_id = await lookup_security_id(conn, symbol)
     if security_id is None:
         raise IngestionError(f"Security {symbol} not found")
     return security_id
@@ -144,15 +190,7 @@ async def _create_run(conn: asyncpg.Connection, *, source: str) -> int:
 
 
 async def _complete_run(conn: asyncpg.Connection, run_id: int, *, rows_inserted: int) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='success', finished_at=NOW(), rows_inserted=$2
-        WHERE id=$1
-        """,
-        run_id,
-        rows_inserted,
-    )
+    await write_audit(conn, COMPLETE_RUN_SQL, run_id, rows_inserted)
 
 
 async def _fail_run(
@@ -162,25 +200,8 @@ async def _fail_run(
     *,
     context: Optional[Dict[str, Any]] = None,
 ) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='failed', finished_at=NOW(), error_message=$2
-        WHERE id=$1
-        """,
-        run_id,
-        str(exc),
-    )
+    await write_audit(conn, FAIL_RUN_SQL, run_id, str(exc))
     context_str = None
     if context:
         context_str = ", ".join(f"{key}={value}" for key, value in context.items())
-    await conn.execute(
-        """
-        INSERT INTO ingestion_errors (ingestion_run_id, context, payload, message)
-        VALUES ($1, $2, $3, $4)
-        """,
-        run_id,
-        context_str,
-        json.dumps(context or {}),
-        str(exc),
-    )
+    await write_audit(conn, INSERT_ERROR_SQL, run_id, context_str, json.dumps(context or {}), str(exc))
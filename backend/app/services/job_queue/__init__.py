@@ -0,0 +1,40 @@
+from .handlers import (
+    ATM_TERM_STRUCTURE,
+    EXPECTED_MOVE_BATCH,
+    HANDLERS,
+    OHLCV_BACKFILL,
+    SCHEDULER_BACKFILL,
+    SCHEDULER_RUN,
+    SURFACE_COMPUTE,
+    JobProgress,
+)
+from .queue import (
+    JobQueue,
+    enqueue_job,
+    get_job,
+    get_job_queue,
+    list_jobs,
+    start_job_queue,
+    stop_job_queue,
+)
+from .store import JobConflictError, JobStore
+
+__all__ = [
+    "ATM_TERM_STRUCTURE",
+    "EXPECTED_MOVE_BATCH",
+    "HANDLERS",
+    "OHLCV_BACKFILL",
+    "SCHEDULER_BACKFILL",
+    "SCHEDULER_RUN",
+    "SURFACE_COMPUTE",
+    "JobConflictError",
+    "JobProgress",
+    "JobQueue",
+    "JobStore",
+    "enqueue_job",
+    "get_job",
+    "get_job_queue",
+    "list_jobs",
+    "start_job_queue",
+    "stop_job_queue",
+]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import time
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+from app.services.ingestion import backfill_ohlcv
+from app.services.job_queue.store import JobStore
+from app.services.options.atm_straddle import ingest_atm_term_structure
+from app.services.options.expected_move_batch import compute_expected_moves_batch
+from app.services.options.vol_surface import compute_surface
+from app.services.securities.universe import shard_scope
+from app.services.scheduler import run_job_now
+from app.services.scheduler.backfill import run_backfill
+
+SCHEDULER_RUN = "scheduler.run"
+SCHEDULER_BACKFILL = "scheduler.backfill"
+OHLCV_BACKFILL = "ingestion.ohlcv_backfill"
+SURFACE_COMPUTE = "options.surface_compute"
+ATM_TERM_STRUCTURE = "options.atm_term_structure"
+EXPECTED_MOVE_BATCH = "options.expected_move_batch"
+
+STRADDLE_SUMMARY_FIELDS = ("id", "expiration", "tenor_days", "dte", "strike", "straddle_mid", "implied_vol")
+
+
+class JobProgress:
+    """Progress handle passed to a running handler; writes are throttled to the job row."""
+
+    def __init__(self, store: JobStore, job_id: int, *, min_interval: float) -> None:
+        self._store = store
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self.rows = 0
+        self.pct: Optional[float] = None
+        self._flushed_at = 0.0
+
+    async def update(self, *, rows: int = 0, done: Optional[int] = None, total: Optional[int] = None) -> None:
+        """Add ``rows`` to the running total and, given ``done``/``total``, set the percentage."""
+        self.rows += rows
+        if done is not None and total:
+            self.pct = round(min(done / total, 1.0) * 100, 1)
+        now = time.monotonic()
+        if now - self._flushed_at >= self.min_interval or self.pct == 100.0:
+            self._flushed_at = now
+            await self._store.update_progress(self.job_id, self.rows, self.pct)
+
+
+JobHandler = Callable[[Dict[str, Any], JobProgress], Awaitable[Optional[Dict[str, Any]]]]
+
+
+def _date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def date_chunks(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    """Split ``[start, end]`` into consecutive inclusive windows of at most ``days`` days."""
+    days = max(days, 1)
+    chunks: List[Tuple[date, date]] = []
+    cursor = start
+    while cursor <= end:
+        chunk_end = min(cursor + timedelta(days=days - 1), end)
+        chunks.append((cursor, chunk_end))
+        cursor = chunk_end + timedelta(days=1)
+    return chunks
+
+
+async def run_scheduler_job(params: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """Run one scheduler job for the shard in ``params`` (any worker may claim any shard)."""
+    shard = int(params.get("shard") or 0)
+    with shard_scope(shard):
+        await run_job_now(params["job_id"])
+    await progress.update(done=1, total=1)
+    return {"job_id": params["job_id"], "shard": shard}
+
+
+async def run_scheduler_backfill(params: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    return await run_backfill(
+        params["ingestion_type"],
+        params["symbols"],
+        _date(params["start"]),
+        _date(params["end"]),
+        progress=progress.update,
+    )
+
+
+async def run_ohlcv_backfill(params: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    """Backfill in date windows so progress is visible and a retry only loses one window."""
+    symbol = params["symbol"]
+    start, end = _date(params["start"]), _date(params["end"])
+    if start > end:
+        raise ValueError("start must be before end")
+    chunks = date_chunks(start, end, get_settings().JOB_QUEUE_OHLCV_CHUNK_DAYS)
+    for done, (chunk_start, chunk_end) in enumerate(chunks, start=1):
+        rows = await backfill_ohlcv(symbol, chunk_start, chunk_end)
+        await progress.update(rows=rows, done=done, total=len(chunks))
+    return {"symbol": symbol.upper(), "rows": progress.rows, "chunks": len(chunks)}
+
+
+async def run_surface_compute(params: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    target_date = _date(params["target_date"]) if params.get("target_date") else None
+    surface = await compute_surface(params["symbol"], target_date, force=bool(params.get("force")))
+    await progress.update(done=1, total=1)
+    return surface
+
+
+async def run_atm_term_structure(params: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    target_date = _date(params["target_date"]) if params.get("target_date") else None
+    result = await ingest_atm_term_structure(
+        params["symbol"], target_date, tenors=params.get("tenors"), force=bool(params.get("force"))
+    )
+    # Raw contract payloads stay in option_chains; the job row keeps a summary per straddle.
+    straddles = [
+        {key: straddle.get(key) for key in STRADDLE_SUMMARY_FIELDS} for straddle in result.get("straddles", [])
+    ]
+    await progress.update(rows=len(straddles), done=1, total=1)
+    return {**result, "straddles": straddles}
+
+
+async def run_expected_move_batch(params: Dict[str, Any], progress: JobProgress) -> Dict[str, Any]:
+    summary = await compute_expected_moves_batch(params.get("symbols"), params.get("horizons"))
+    await progress.update(rows=summary["checks"], done=1, total=1)
+    return {key: summary[key] for key in ("run_id", "checks", "flags", "skipped")}
+
+
+HANDLERS: Dict[str, JobHandler] = {
+    SCHEDULER_RUN: run_scheduler_job,
+    SCHEDULER_BACKFILL: run_scheduler_backfill,
+    OHLCV_BACKFILL: run_ohlcv_backfill,
+    SURFACE_COMPUTE: run_surface_compute,
+    ATM_TERM_STRUCTURE: run_atm_term_structure,
+    EXPECTED_MOVE_BATCH: run_expected_move_batch,
+}
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import socket
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core import metrics
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.instrumentation import bind_caller
+from app.services.job_queue.handlers import HANDLERS, JobHandler, JobProgress
+from app.services.job_queue.store import JobStore
+
+logger = get_logger("jobs")
+
+
+class JobQueue:
+    """Claims queued jobs from ``background_jobs`` and runs at most ``JOB_QUEUE_CONCURRENCY`` at once.
+
+    Every replica may run a queue; claims use SKIP LOCKED so a job runs on exactly one of
+    them. Running jobs are heartbeated each poll, and jobs left ``running`` by a worker that
+    stopped heartbeating for ``JOB_QUEUE_STALE_SECONDS`` are re-queued (or failed after
+    ``JOB_QUEUE_MAX_ATTEMPTS``). ``stop`` cancels in-flight jobs and puts them back on the queue.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        store: Optional[JobStore] = None,
+        handlers: Optional[Dict[str, JobHandler]] = None,
+    ) -> None:
+        self.settings = settings or get_settings()
+        self.store = store or JobStore()
+        self.handlers = HANDLERS if handlers is None else handlers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._active: Dict[int, asyncio.Task[None]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+        self.running = False
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._task = asyncio.create_task(self._run(), name="job-queue")
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        interrupted = list(self._active)
+        for task in self._active.values():
+            task.cancel()
+        await asyncio.gather(*self._active.values(), return_exceptions=True)
+        self._active.clear()
+        if interrupted:
+            await self.store.release(interrupted)
+            logger.info("Returned %s interrupted job(s) to the queue", len(interrupted))
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    @property
+    def active(self) -> List[int]:
+        return list(self._active)
+
+    async def poll(self) -> int:
+        """Reap stale jobs, heartbeat our own and claim up to the free capacity."""
+        settings = self.settings
+        for job in await self.store.requeue_stale(settings.JOB_QUEUE_STALE_SECONDS, settings.JOB_QUEUE_MAX_ATTEMPTS):
+            logger.warning("Job %s lost its worker; now %s", job["id"], job["status"])
+        await self.store.heartbeat(self.active)
+        free = max(settings.JOB_QUEUE_CONCURRENCY, 1) - len(self._active)
+        if free <= 0:
+            return 0
+        claimed = await self.store.claim(self.worker_id, free)
+        for job in claimed:
+            task = asyncio.create_task(self._execute(job), name=f"job-{job['id']}")
+            self._active[job["id"]] = task
+            task.add_done_callback(functools.partial(self._finished, job["id"]))
+        metrics.set_gauge("jobs.running", len(self._active), worker=self.worker_id)
+        return len(claimed)
+
+    def _finished(self, job_id: int, task: asyncio.Task[None]) -> None:
+        self._active.pop(job_id, None)
+        metrics.set_gauge("jobs.running", len(self._active), worker=self.worker_id)
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        bind_caller("jobs.worker")
+        while True:
+            try:
+                await self.poll()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Job queue poll failed: %s", exc)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(self.settings.JOB_QUEUE_POLL_SECONDS, 0.1))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        job_id, kind = job["id"], job["kind"]
+        progress = JobProgress(self.store, job_id, min_interval=self.settings.JOB_QUEUE_PROGRESS_INTERVAL)
+        started = time.perf_counter()
+        status, result, error = "failed", None, None
+        logger.info("Job %s (%s) started, attempt %s", job_id, kind, job.get("attempts", 1))
+        try:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind {kind}")
+            result = await handler(job["params"], progress)
+            status = "succeeded"
+            if progress.pct is None:
+                progress.pct = 100.0
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Job %s (%s) failed: %s", job_id, kind, exc)
+            error = str(exc) or exc.__class__.__name__
+        duration_ms = (time.perf_counter() - started) * 1000
+        metrics.observe("jobs.duration_ms", duration_ms, kind=kind, status=status)
+        try:
+            await self.store.finish(job_id, status, rows=progress.rows, pct=progress.pct, result=result, error=error)
+        except Exception as exc:  # noqa: BLE001
+            # The row stays 'running' and is re-queued once its heartbeat goes stale.
+            logger.error("Could not record outcome of job %s: %s", job_id, exc)
+            return
+        logger.info("Job %s (%s) %s in %.0f ms (%s rows)", job_id, kind, status, duration_ms, progress.rows)
+
+
+_queue: Optional[JobQueue] = None
+_store = JobStore()
+
+
+def get_job_queue() -> Optional[JobQueue]:
+    return _queue
+
+
+async def start_job_queue(settings: Optional[Settings] = None) -> Optional[JobQueue]:
+    global _queue
+    settings = settings or get_settings()
+    if not settings.JOB_QUEUE_ENABLED:
+        return None
+    if _queue is None:
+        _queue = JobQueue(settings=settings, store=_store)
+    await _queue.start()
+    logger.info("Job queue started (%s workers)", settings.JOB_QUEUE_CONCURRENCY)
+    return _queue
+
+
+async def stop_job_queue() -> None:
+    global _queue
+    if _queue is None:
+        return
+    await _queue.stop()
+    logger.info("Job queue stopped")
+    _queue = None
+
+
+async def enqueue_job(kind: str, params: Dict[str, Any], *, dedupe_key: Optional[str] = None) -> int:
+    """Persist a job and return its id; raises JobConflictError if ``dedupe_key`` is active."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind {kind}")
+    job_id = await _store.insert(kind, params, dedupe_key)
+    metrics.increment("jobs.enqueued", kind=kind)
+    logger.info("Queued job %s (%s)", job_id, kind)
+    if _queue is not None:
+        _queue.wake()
+    return job_id
+
+
+async def get_job(job_id: int) -> Optional[Dict[str, Any]]:
+    return await _store.get(job_id)
+
+
+async def list_jobs(*, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    return await _store.list(status=status, limit=limit)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+import asyncpg
+
+from app.db.connection import acquire_connection, get_pool
+
+JOB_COLUMNS = """
+    id, kind, params, status, attempts, rows_processed, progress_pct, result, error,
+    worker, created_at, started_at, heartbeat_at, finished_at
+"""
+
+INSERT_JOB_SQL = """
+    INSERT INTO background_jobs (kind, params, dedupe_key)
+    VALUES ($1, $2::jsonb, $3)
+    ON CONFLICT (dedupe_key) WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'running')
+    DO NOTHING
+    RETURNING id
+"""
+
+ACTIVE_BY_DEDUPE_SQL = """
+    SELECT id FROM background_jobs
+    WHERE dedupe_key=$1 AND status IN ('queued', 'running')
+"""
+
+# SKIP LOCKED lets every replica's workers poll the same table without double-claiming.
+CLAIM_JOBS_SQL = """
+    WITH next AS (
+        SELECT id FROM background_jobs
+        WHERE status='queued'
+        ORDER BY created_at, id
+        LIMIT $2
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE background_jobs AS j
+    SET status='running', worker=$1, attempts=j.attempts + 1,
+        started_at=NOW(), heartbeat_at=NOW(), error=NULL
+    FROM next
+    WHERE j.id = next.id
+    RETURNING j.id, j.kind, j.params, j.attempts
+"""
+
+UPDATE_PROGRESS_SQL = """
+    UPDATE background_jobs
+    SET rows_processed=$2, progress_pct=$3, heartbeat_at=NOW()
+    WHERE id=$1
+"""
+
+HEARTBEAT_SQL = """
+    UPDATE background_jobs
+    SET heartbeat_at=NOW()
+    WHERE id = ANY($1::bigint[]) AND status='running'
+"""
+
+FINISH_JOB_SQL = """
+    UPDATE background_jobs
+    SET status=$2, result=$3::jsonb, error=$4, rows_processed=$5, progress_pct=$6,
+        finished_at=NOW(), heartbeat_at=NOW()
+    WHERE id=$1
+"""
+
+RELEASE_JOBS_SQL = """
+    UPDATE background_jobs
+    SET status='queued', worker=NULL
+    WHERE id = ANY($1::bigint[]) AND status='running'
+"""
+
+# Jobs whose worker stopped heartbeating (crash, OOM, lost replica) go back on the queue,
+# or fail for good once they have used up their attempts.
+REQUEUE_STALE_SQL = """
+    UPDATE background_jobs
+    SET status = CASE WHEN attempts >= $2 THEN 'failed' ELSE 'queued' END,
+        error = CASE WHEN attempts >= $2 THEN 'worker lost after ' || attempts || ' attempt(s)' ELSE error END,
+        finished_at = CASE WHEN attempts >= $2 THEN NOW() ELSE NULL END,
+        worker = NULL
+    WHERE status='running' AND heartbeat_at < NOW() - make_interval(secs => $1)
+    RETURNING id, status
+"""
+
+
+class JobConflictError(Exception):
+    """Raised when an equivalent job is already queued or running."""
+
+    def __init__(self, dedupe_key: str, job_id: Optional[int]) -> None:
+        super().__init__(f"Job {dedupe_key} is already queued or running (job {job_id})")
+        self.dedupe_key = dedupe_key
+        self.job_id = job_id
+
+
+def _decode(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _job_from_row(row: asyncpg.Record) -> Dict[str, Any]:
+    job = dict(row)
+    job["params"] = _decode(job.get("params")) or {}
+    job["result"] = _decode(job.get("result"))
+    if job.get("progress_pct") is not None:
+        job["progress_pct"] = float(job["progress_pct"])
+    return job
+
+
+class JobStore:
+    """SQL access for ``background_jobs``; the queue talks to the table only through here."""
+
+    async def insert(self, kind: str, params: Dict[str, Any], dedupe_key: Optional[str] = None) -> int:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "jobs.enqueue") as conn:
+            job_id = await conn.fetchval(INSERT_JOB_SQL, kind, json.dumps(params, default=str), dedupe_key)
+            if job_id is None:
+                existing = await conn.fetchval(ACTIVE_BY_DEDUPE_SQL, dedupe_key)
+                raise JobConflictError(dedupe_key or kind, existing)
+        return int(job_id)
+
+    async def claim(self, worker: str, limit: int) -> List[Dict[str, Any]]:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "jobs.claim") as conn:
+            rows = await conn.fetch(CLAIM_JOBS_SQL, worker, limit)
+        return [
+            {"id": row["id"], "kind": row["kind"], "params": _decode(row["params"]) or {}, "attempts": row["attempts"]}
+            for row in rows
+        ]
+
+    async def update_progress(self, job_id: int, rows: int, pct: Optional[float]) -> None:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "jobs.progress") as conn:
+            await conn.execute(UPDATE_PROGRESS_SQL, job_id, rows, pct)
+
+    async def heartbeat(self, job_ids: Sequence[int]) -> None:
+        if not job_ids:
+            return
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "jobs.heartbeat") as conn:
+            await conn.execute(HEARTBEAT_SQL, list(job_ids))
+
+    async def finish(
+        self,
+        job_id: int,
+        status: str,
+        *,
+        rows: int,
+        pct: Optional[float],
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        payload = json.dumps(result, default=str) if result is not None else None
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "jobs.finish") as conn:
+            await conn.execute(FINISH_JOB_SQL, job_id, status, payload, error, rows, pct)
+
+    async def release(self, job_ids: Sequence[int]) -> None:
+        if not job_ids:
+            return
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "jobs.release") as conn:
+            await conn.execute(RELEASE_JOBS_SQL, list(job_ids))
+
+    async def requeue_stale(self, stale_seconds: float, max_attempts: int) -> List[Dict[str, Any]]:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "jobs.reap") as conn:
+            rows = await conn.fetch(REQUEUE_STALE_SQL, float(stale_seconds), max_attempts)
+        return [dict(row) for row in rows]
+
+    async def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        pool = await get_pool("api")
+        async with acquire_connection(pool, "jobs.get") as conn:
+            row = await conn.fetchrow(f"SELECT {JOB_COLUMNS} FROM background_jobs WHERE id=$1", job_id)
+        return _job_from_row(row) if row else None
+
+    async def list(self, *, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        pool = await get_pool("api")
+        async with acquire_connection(pool, "jobs.list") as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT {JOB_COLUMNS} FROM background_jobs
+                WHERE $1::text IS NULL OR status=$1
+                ORDER BY created_at DESC, id DESC
+                LIMIT $2
+                """,
+                status,
+                limit,
+            )
+        return [_job_from_row(row) for row in rows]
@@ -1,9 +1,22 @@
-from .atm_straddle import calculate_iv_proxy, get_recent_atm_straddles, ingest_atm_straddle
+from .atm_straddle import (
+    calculate_iv_proxy,
+    get_recent_atm_straddles,
+    ingest_atm_straddle,
+    ingest_atm_term_structure,
+)
+from .contracts import (
+    ContractIndex,
+    get_contract_index,
+    invalidate_contract_index,
+    refresh_option_contracts,
+)
+from .demand import flush_demand, load_demand, record_request
 from .expected_move import compute_expected_move, get_recent_expected_moves
 from .vol_surface import compute_surface, get_recent_surfaces, get_surface_iv
 
 __all__ = [
     "ingest_atm_straddle",
+    "ingest_atm_term_structure",
     "get_recent_atm_straddles",
     "compute_surface",
     "get_recent_surfaces",
@@ -11,5 +24,12 @@ __all__ = [
     "get_surface_iv",
     "compute_expected_move",
     "get_recent_expected_moves",
+    "ContractIndex",
+    "get_contract_index",
+    "invalidate_contract_index",
+    "refresh_option_contracts",
+    "record_request",
+    "flush_demand",
+    "load_demand",
 ]
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import math
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, Iterable, List, Optional, Tuple
@@ -7,13 +8,19 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 import asyncpg
 
 from app.clients.polygon_options import PolygonOptionsClient, PolygonOptionsClientError
+from app.core import run_stats
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
-from app.db.connection import get_pool
-from app.services.options import cache, degraded_mode, refresh_policy
+from app.db.connection import acquire_connection, get_pool
+from app.services.audit import insert_finished_run, record_failed_run
+from app.services.options import cache, contracts, degraded_mode, refresh_policy
+from app.services.securities import lookup_security_id
 
 logger = get_logger("options.atm")
 
+RUN_SOURCE = "options_atm_straddle"
+RUN_TARGET_TABLE = "option_straddles"
+
 
 async def ingest_atm_straddle(
     symbol: str,
@@ -25,117 +32,288 @@ async def ingest_atm_straddle(
 ) -> Dict[str, Any]:
     target_date = target_date or date.today()
     settings = settings or get_settings()
-    pool = await get_pool()
+    pool = await get_pool("ingestion")
     owns_client = client is None
     if client is None:
         client = PolygonOptionsClient(settings=settings)
 
-    async with pool.acquire() as conn:
-        run_id = await _create_ingestion_run(conn)
-        try:
+    started_at = datetime.now(tz=timezone.utc)
+    try:
+        async with acquire_connection(pool, "options.atm") as conn:
             security_id = await _get_security_id(conn, symbol)
             underlying_price = await get_underlying_price(conn, security_id, target_date)
-            if underlying_price is None:
-                raise ValueError(f"No underlying price found for {symbol}")
-
-            cached_atm = cache.get_cached_atm(symbol, settings=settings) if not force else None
-            if (
-                cached_atm
-                and not refresh_policy.should_refresh_atm(symbol, underlying_price, settings=settings, force=force)
-            ):
-                payload = dict(cached_atm.value)
-                payload["cached"] = True
-                return payload
-
-            expirations = await client.fetch_expirations(symbol)
-            expiration = _select_expiration(
-                expirations,
-                target_date,
-                settings.OPTIONS_MIN_DTE_BUFFER,
-            )
-            if expiration is None:
-                raise ValueError("No valid expirations returned from Polygon")
-
-            expiration_key = expiration.isoformat()
-
-            cached_chain_entry = cache.get_cached_chain(symbol, expiration_key, settings=settings) if not force else None
-            chain = None
-            chain_source = "live"
-
-            if (
-                cached_chain_entry
-                and not refresh_policy.should_refresh_chain(symbol, expiration_key, settings=settings, force=force)
-            ):
-                chain = cached_chain_entry.value
-                chain_source = cached_chain_entry.metadata.get("source", "cache")
-
-            if chain is None:
-                try:
-                    chain = await client.fetch_chain(symbol, expiration)
-                    chain_source = "live"
-                    cache.set_cached_chain(
-                        symbol,
-                        expiration_key,
-                        chain,
-                        {"source": chain_source},
-                        settings=settings,
-                    )
-                    refresh_policy.record_chain_refresh(symbol, expiration_key)
-                except PolygonOptionsClientError:
-                    if cached_chain_entry:
-                        chain = cached_chain_entry.value
-                        chain_source = "cache"
-                    else:
-                        fallback = await degraded_mode.fallback_chain_from_snapshot(conn, security_id, expiration)
-                        if fallback is None:
-                            raise
-                        chain = fallback
-                        chain_source = "historical"
-
-            if not chain:
-                raise ValueError("Polygon returned empty option chain")
-
-            await _insert_option_chain(conn, security_id, chain)
-            straddle_payload = _build_atm_straddle(
-                chain,
-                underlying_price,
-                expiration,
-                target_date,
-            )
-            straddle_payload["metadata"] = {
-                "chain_source": chain_source,
-                "degraded": chain_source != "live",
-            }
+            contract_index = await contracts.get_contract_index(conn, security_id, symbol, settings=settings)
+        if underlying_price is None:
+            raise ValueError(f"No underlying price found for {symbol}")
+
+        cached_atm = cache.get_cached_atm(symbol, settings=settings) if not force else None
+        if (
+            cached_atm
+            and not refresh_policy.should_refresh_atm(symbol, underlying_price, settings=settings, force=force)
+        ):
+            payload = dict(cached_atm.value)
+            payload["cached"] = True
+            return payload
+
+        # No connection is held while talking to Polygon.
+        expirations = await contracts.resolve_expirations(client, symbol, contract_index)
+        expiration = _select_expiration(
+            expirations,
+            target_date,
+            settings.OPTIONS_MIN_DTE_BUFFER,
+        )
+        if expiration is None:
+            raise ValueError("No valid expirations returned from Polygon")
+
+        chain, chain_source = await _load_chain(
+            client,
+            pool,
+            symbol,
+            security_id,
+            expiration,
+            settings,
+            force,
+            underlying_price,
+            contract_index,
+        )
+
+        if not chain:
+            raise ValueError("Polygon returned empty option chain")
+
+        straddle_payload = _build_atm_straddle(
+            chain,
+            underlying_price,
+            expiration,
+            target_date,
+        )
+        straddle_payload["metadata"] = {
+            "chain_source": chain_source,
+            "degraded": chain_source != "live",
+        }
+
+        async with acquire_connection(pool, "options.atm") as conn:
+            async with conn.transaction():
+                run_id = await _insert_run(conn, started_at, 1)
+                await _insert_option_chain(conn, security_id, chain)
+                straddle_id = await _insert_straddle(
+                    conn,
+                    security_id,
+                    straddle_payload,
+                    run_id,
+                )
+        run_stats.record_rows(len(chain) + 1)
+        straddle_payload["id"] = straddle_id
+        straddle_payload["symbol"] = symbol.upper()
+        cache.set_cached_atm(
+            symbol,
+            straddle_payload,
+            {"underlying_price": underlying_price, "source": chain_source},
+            settings=settings,
+        )
+        refresh_policy.record_atm_refresh(
+            symbol, underlying_price, straddle_payload.get("straddle_mid"), settings=settings
+        )
+        return straddle_payload
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("ATM straddle ingestion failed for %s: %s", symbol, exc)
+        async with acquire_connection(pool, "options.atm") as conn:
+            await _fail_run(conn, started_at, exc, {"symbol": symbol.upper()})
+        raise
+    finally:
+        if owns_client:
+            await client.close()
+
+
+async def ingest_atm_term_structure(
+    symbol: str,
+    target_date: Optional[date] = None,
+    *,
+    tenors: Optional[List[int]] = None,
+    client: Optional[PolygonOptionsClient] = None,
+    settings: Optional[Settings] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Store ATM straddles at every standard tenor (and listed expiries in between) in one run.
+
+    Expirations are fetched once and the chains concurrently; an expiration whose chain
+    cannot be loaded is reported in ``missing`` instead of failing the run. The straddle
+    the single-expiry path would have picked refreshes the ATM cache.
+    """
+    target_date = target_date or date.today()
+    settings = settings or get_settings()
+    tenors = sorted(set(tenors or settings.ATM_TERM_STRUCTURE_TENORS))
+    pool = await get_pool("ingestion")
+    owns_client = client is None
+    if client is None:
+        client = PolygonOptionsClient(settings=settings)
+
+    started_at = datetime.now(tz=timezone.utc)
+    try:
+        async with acquire_connection(pool, "options.atm.term") as conn:
+            security_id = await _get_security_id(conn, symbol)
+            underlying_price = await get_underlying_price(conn, security_id, target_date)
+            contract_index = await contracts.get_contract_index(conn, security_id, symbol, settings=settings)
+        if underlying_price is None:
+            raise ValueError(f"No underlying price found for {symbol}")
+
+        # Same guardrail as the single-expiry path: skip while the underlying has not moved.
+        if (
+            not force
+            and cache.get_cached_atm(symbol, settings=settings)
+            and not refresh_policy.should_refresh_atm(symbol, underlying_price, settings=settings)
+        ):
+            return {"symbol": symbol.upper(), "cached": True, "straddles": [], "missing": []}
+
+        expirations = await contracts.resolve_expirations(client, symbol, contract_index)
+        selected = _select_term_expirations(
+            expirations,
+            target_date,
+            tenors,
+            include_intermediate=settings.ATM_TERM_STRUCTURE_INCLUDE_INTERMEDIATE,
+            max_expirations=settings.ATM_TERM_STRUCTURE_MAX_EXPIRATIONS,
+        )
+        if not selected:
+            raise ValueError("No valid expirations returned from Polygon")
+
+        semaphore = asyncio.Semaphore(max(settings.ATM_TERM_STRUCTURE_CONCURRENCY, 1))
+
+        async def load(expiration: date) -> Tuple[List[Dict[str, Any]], str]:
+            async with semaphore:
+                return await _load_chain(
+                    client,
+                    pool,
+                    symbol,
+                    security_id,
+                    expiration,
+                    settings,
+                    force,
+                    underlying_price,
+                    contract_index,
+                )
+
+        loaded = await asyncio.gather(*(load(expiration) for expiration, _ in selected), return_exceptions=True)
+
+        straddles: List[Dict[str, Any]] = []
+        chain_rows: List[Dict[str, Any]] = []
+        missing: List[Dict[str, Any]] = []
+        for (expiration, tenor), result in zip(selected, loaded, strict=True):
+            try:
+                if isinstance(result, BaseException):
+                    raise result
+                chain, chain_source = result
+                if not chain:
+                    raise ValueError("Polygon returned empty option chain")
+                payload = _build_atm_straddle(chain, underlying_price, expiration, target_date)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Skipping %s %s in term structure: %s", symbol, expiration, exc)
+                missing.append({"expiration": expiration, "tenor_days": tenor, "error": str(exc)})
+                continue
+            payload["tenor_days"] = tenor
+            payload["metadata"] = {"chain_source": chain_source, "degraded": chain_source != "live"}
+            straddles.append(payload)
+            chain_rows.extend(chain)
+        if not straddles:
+            raise ValueError(f"No ATM straddles could be built for {symbol}")
+
+        async with acquire_connection(pool, "options.atm.term") as conn:
+            async with conn.transaction():
+                run_id = await _insert_run(conn, started_at, len(straddles))
+                await _insert_option_chain(conn, security_id, chain_rows)
+                for payload in straddles:
+                    payload["id"] = await _insert_straddle(conn, security_id, payload, run_id)
+                    payload["symbol"] = symbol.upper()
+        run_stats.record_rows(len(chain_rows) + len(straddles))
+
+        primary = _select_expiration([p["expiration"] for p in straddles], target_date, settings.OPTIONS_MIN_DTE_BUFFER)
+        for payload in straddles:
+            if payload["expiration"] == primary:
+                cache.set_cached_atm(
+                    symbol,
+                    payload,
+                    {"underlying_price": underlying_price, "source": payload["metadata"]["chain_source"]},
+                    settings=settings,
+                )
+                refresh_policy.record_atm_refresh(
+                    symbol, underlying_price, payload.get("straddle_mid"), settings=settings
+                )
+                break
+
+        return {
+            "symbol": symbol.upper(),
+            "run_id": run_id,
+            "underlying_price": underlying_price,
+            "straddles": straddles,
+            "missing": missing,
+        }
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("ATM term structure ingestion failed for %s: %s", symbol, exc)
+        async with acquire_connection(pool, "options.atm.term") as conn:
+            await _fail_run(conn, started_at, exc, {"symbol": symbol.upper(), "tenors": tenors})
+        raise
+    finally:
+        if owns_client:
+            await client.close()
+
+
+async def _load_chain(
+    client: PolygonOptionsClient,
+    pool: asyncpg.Pool,
+    symbol: str,
+    security_id: int,
+    expiration: date,
+    settings: Settings,
+    force: bool,
+    underlying_price: Optional[float] = None,
+    contract_index: Optional[contracts.ContractIndex] = None,
+) -> Tuple[List[Dict[str, Any]], str]:
+    """Chain for one expiration: fresh cache, then live, then cached or historical fallback.
+
+    With OPTIONS_CHAIN_STRIKE_WINDOW only strikes within OPTIONS_MONEINESS_WINDOW of spot
+    are requested; an empty windowed response is retried once without the window.
+    """
+    window: Optional[Tuple[float, float]] = None
+    strikes: Optional[Tuple[float, float]] = None
+    if settings.OPTIONS_CHAIN_STRIKE_WINDOW and underlying_price:
+        window = (-settings.OPTIONS_MONEINESS_WINDOW, settings.OPTIONS_MONEINESS_WINDOW)
+        strikes = contracts.strike_range(
+            underlying_price, *window, index=contract_index, expiration=expiration
+        )
+    expiration_key = cache.chain_key(expiration.isoformat(), window)
+    cached_chain_entry = cache.get_cached_chain(symbol, expiration_key, settings=settings) if not force else None
+    if (
+        cached_chain_entry
+        and not refresh_policy.should_refresh_chain(symbol, expiration_key, settings=settings, force=force)
+    ):
+        return cached_chain_entry.value, cached_chain_entry.metadata.get("source", "cache")
 
-            straddle_id = await _insert_straddle(
-                conn,
-                security_id,
-                straddle_payload,
-                run_id,
-            )
-            await _complete_run(conn, run_id, 1)
-            straddle_payload["id"] = straddle_id
-            straddle_payload["symbol"] = symbol.upper()
-            cache.set_cached_atm(
-                symbol,
-                straddle_payload,
-                {"underlying_price": underlying_price, "source": chain_source},
-                settings=settings,
-            )
-            refresh_policy.record_atm_refresh(symbol, underlying_price)
-            return straddle_payload
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("ATM straddle ingestion failed for %s: %s", symbol, exc)
-            await _fail_run(conn, run_id, exc, {"symbol": symbol.upper()})
+    try:
+        chain = await client.fetch_chain(symbol, expiration, strike_range=strikes)
+        if not chain and strikes is not None:
+            logger.info("No strikes for %s %s inside %s; fetching full chain", symbol.upper(), expiration, strikes)
+            chain = await client.fetch_chain(symbol, expiration)
+    except PolygonOptionsClientError:
+        if cached_chain_entry:
+            return cached_chain_entry.value, "cache"
+        async with acquire_connection(pool, "options.atm.fallback") as conn:
+            fallback = await degraded_mode.fallback_chain_from_snapshot(conn, security_id, expiration)
+        if fallback is None:
             raise
-        finally:
-            if owns_client:
-                await client.close()
+        return fallback, "historical"
+
+    cache.set_cached_chain(
+        symbol,
+        expiration_key,
+        chain,
+        {"source": "live"},
+        settings=settings,
+    )
+    refresh_policy.record_chain_refresh(symbol, expiration_key)
+    return chain, "live"
 
 
 async def get_recent_atm_straddles(symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
-    pool = await get_pool()
-    async with pool.acquire() as conn:
+    pool = await get_pool(read_only=True)
+    async with acquire_connection(pool, "options.atm.read") as conn:
         security_id = await _get_security_id(conn, symbol)
         rows = await conn.fetch(
             """
@@ -172,10 +350,7 @@ async def get_recent_atm_straddles(symbol: str, limit: int = 10) -> List[Dict[st
 
 
 async def _get_security_id(conn: asyncpg.Connection, symbol: str) -> int:
-    security_id = await conn.fetchval(
-        "SELECT id FROM securities WHERE symbol=$1 LIMIT 1",
-        symbol.upper(),
-    )
+    security_id = await lookup_security_id(conn, symbol)
     if security_id is None:
         raise ValueError(f"Security {symbol} not found in securities table")
     return int(security_id)
@@ -214,6 +389,44 @@ def _select_expiration(
     return None
 
 
+def _select_term_expirations(
+    expirations: Iterable[date],
+    target_date: date,
+    tenors: List[int],
+    *,
+    include_intermediate: bool = True,
+    max_expirations: int = 16,
+) -> List[Tuple[date, Optional[int]]]:
+    """Pick the listed expiry nearest each tenor, plus (optionally) every expiry in between.
+
+    Returns ``(expiration, tenor_days)`` pairs in date order; intermediate expiries carry
+    ``None``. When two tenors land on one expiry it is tagged with the closer tenor.
+    Anchors are always kept; intermediates fill the remaining ``max_expirations`` slots
+    nearest-first.
+    """
+    listed = sorted({exp for exp in expirations if (exp - target_date).days >= 1})
+    if not listed or not tenors:
+        return []
+
+    anchors: Dict[date, int] = {}
+    for tenor in tenors:
+        best = min(listed, key=lambda exp: (abs((exp - target_date).days - tenor), -exp.toordinal()))
+        drift = abs((best - target_date).days - tenor)
+        current = anchors.get(best)
+        if current is None or drift < abs((best - target_date).days - current):
+            anchors[best] = tenor
+
+    selected: Dict[date, Optional[int]] = dict(anchors)
+    if include_intermediate:
+        first, last = min(anchors), max(anchors)
+        for exp in listed:
+            if len(selected) >= max(max_expirations, len(anchors)):
+                break
+            if first < exp < last and exp not in selected:
+                selected[exp] = None
+    return sorted(selected.items())
+
+
 def _build_atm_straddle(
     chain: List[Dict[str, Any]],
     underlying_price: float,
@@ -351,9 +564,10 @@ async def _insert_straddle(
             snapshot_timestamp,
             ingestion_run_id,
             raw_call,
-            raw_put
+            raw_put,
+            tenor_days
         )
-        VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12)
+        VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12,$13)
         RETURNING id
         """,
         security_id,
@@ -368,56 +582,25 @@ async def _insert_straddle(
         run_id,
         payload["raw_call"],
         payload["raw_put"],
+        payload.get("tenor_days"),
     )
     return int(row["id"])
 
 
-async def _create_ingestion_run(conn: asyncpg.Connection) -> int:
-    row = await conn.fetchrow(
-        """
-        INSERT INTO ingestion_runs (source, target_table, status)
-        VALUES ('options_atm_straddle', 'option_straddles', 'running')
-        RETURNING id
-        """
-    )
-    return int(row["id"])
-
-
-async def _complete_run(conn: asyncpg.Connection, run_id: int, rows_inserted: int) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='success', finished_at=NOW(), rows_inserted=$2
-        WHERE id=$1
-        """,
-        run_id,
-        rows_inserted,
-    )
+async def _insert_run(
+    conn: asyncpg.Connection,
+    started_at: datetime,
+    rows_inserted: int,
+    status: str = "success",
+) -> int:
+    return await insert_finished_run(conn, RUN_SOURCE, RUN_TARGET_TABLE, started_at, rows_inserted, status=status)
 
 
 async def _fail_run(
     conn: asyncpg.Connection,
-    run_id: int,
+    started_at: datetime,
     exc: Exception,
     context: Optional[Dict[str, Any]] = None,
 ) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='failed', finished_at=NOW(), error_message=$2
-        WHERE id=$1
-        """,
-        run_id,
-        str(exc),
-    )
-    await conn.execute(
-        """
-        INSERT INTO ingestion_errors (ingestion_run_id, context, payload, message)
-        VALUES ($1, $2, $3, $4)
-        """,
-        run_id,
-        str(context),
-        {},
-        str(exc),
-    )
+    await record_failed_run(conn, RUN_SOURCE, RUN_TARGET_TABLE, started_at, exc, context)
 
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Tuple
 
 from app.core.config import Settings, get_settings
+from app.services.options import refresh_policy
 
 
 @dataclass
@@ -33,14 +34,23 @@ def _is_expired(entry: _CacheEntry) -> bool:
     return entry.expires_at <= _now()
 
 
-def _ttl(seconds: int) -> timedelta:
-    return timedelta(seconds=max(seconds, 0))
+def _expires_at(symbol: str, seconds: int, settings: Settings) -> datetime:
+    """Session-aware expiry: see ``market_session.expires_at``."""
+    return refresh_policy.due_at(symbol, _now(), max(seconds, 0), settings=settings)
 
 
 def _make_key(symbol: str, suffix: str) -> Tuple[str, str]:
     return (symbol.upper(), suffix)
 
 
+def chain_key(expiration: str, window: Optional[Tuple[float, float]] = None) -> str:
+    """Chain cache key; windowed chains are keyed by their moneyness bounds so a narrow
+    ATM chain is never served to a caller that needs the wider surface range."""
+    if window is None:
+        return expiration
+    return f"{expiration}:{window[0]:+.4f}:{window[1]:+.4f}"
+
+
 def get_cached_chain(symbol: str, expiration: str, *, settings: Optional[Settings] = None) -> Optional[CachedValue]:
     key = _make_key(symbol, expiration)
     entry = _chain_cache.get(key)
@@ -59,7 +69,7 @@ def set_cached_chain(
     settings: Optional[Settings] = None,
 ) -> None:
     settings = settings or get_settings()
-    expires_at = _now() + _ttl(settings.OPTIONS_CACHE_TTL_CHAIN)
+    expires_at = _expires_at(symbol, settings.OPTIONS_CACHE_TTL_CHAIN, settings)
     key = _make_key(symbol, expiration)
     _chain_cache[key] = _CacheEntry(value=value, metadata=metadata or {}, expires_at=expires_at)
 
@@ -80,7 +90,7 @@ def set_cached_atm(
     settings: Optional[Settings] = None,
 ) -> None:
     settings = settings or get_settings()
-    expires_at = _now() + _ttl(settings.OPTIONS_CACHE_TTL_ATM)
+    expires_at = _expires_at(symbol, settings.OPTIONS_CACHE_TTL_ATM, settings)
     _atm_cache[symbol.upper()] = _CacheEntry(value=value, metadata=metadata or {}, expires_at=expires_at)
 
 
@@ -100,7 +110,7 @@ def set_cached_surface(
     settings: Optional[Settings] = None,
 ) -> None:
     settings = settings or get_settings()
-    expires_at = _now() + _ttl(settings.OPTIONS_CACHE_TTL_SURFACE)
+    expires_at = _expires_at(symbol, settings.OPTIONS_CACHE_TTL_SURFACE, settings)
     _surface_cache[symbol.upper()] = _CacheEntry(value=value, metadata=metadata or {}, expires_at=expires_at)
 
 
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+import asyncpg
+
+from app.clients import circuit
+from app.clients.polygon_options import PolygonOptionsClient
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.connection import acquire_connection, get_pool
+from app.services.securities import lookup_security_id
+
+logger = get_logger("options.contracts")
+
+UPSERT_CONTRACT_SQL = """
+    INSERT INTO option_contracts (
+        option_symbol, security_id, expiration, strike, call_put, shares_per_contract, last_seen
+    )
+    VALUES ($1,$2,$3,$4,$5,$6,$7)
+    ON CONFLICT (option_symbol)
+    DO UPDATE SET security_id=EXCLUDED.security_id,
+                  expiration=EXCLUDED.expiration,
+                  strike=EXCLUDED.strike,
+                  call_put=EXCLUDED.call_put,
+                  shares_per_contract=EXCLUDED.shares_per_contract,
+                  last_seen=EXCLUDED.last_seen,
+                  updated_at=NOW()
+"""
+
+
+@dataclass
+class ContractIndex:
+    """Listed expirations and strikes for one underlying, as of ``as_of``."""
+
+    symbol: str
+    as_of: date
+    strikes: Dict[date, List[float]] = field(default_factory=dict)
+    loaded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def expirations(self) -> List[date]:
+        return sorted(self.strikes)
+
+    def strikes_for(self, expiration: date) -> List[float]:
+        return self.strikes.get(expiration, [])
+
+    def strikes_between(self, expiration: date, low: float, high: float) -> List[float]:
+        strikes = self.strikes_for(expiration)
+        return strikes[bisect.bisect_left(strikes, low) : bisect.bisect_right(strikes, high)]
+
+
+_indexes: Dict[str, ContractIndex] = {}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _is_fresh(index: ContractIndex, today: date, settings: Settings) -> bool:
+    age = (_now() - index.loaded_at).total_seconds()
+    return index.as_of == today and age < settings.OPTION_CONTRACTS_INDEX_TTL
+
+
+def _build_index(symbol: str, today: date, rows: List[asyncpg.Record]) -> ContractIndex:
+    strikes: Dict[date, Set[float]] = {}
+    for row in rows:
+        strikes.setdefault(row["expiration"], set()).add(float(row["strike"]))
+    return ContractIndex(
+        symbol=symbol.upper(),
+        as_of=today,
+        strikes={expiration: sorted(values) for expiration, values in strikes.items()},
+    )
+
+
+async def get_contract_index(
+    conn: asyncpg.Connection,
+    security_id: int,
+    symbol: str,
+    *,
+    today: Optional[date] = None,
+    settings: Optional[Settings] = None,
+) -> Optional[ContractIndex]:
+    """Return the in-memory index, loading it from ``option_contracts`` when stale.
+
+    Returns None when the reference table has nothing current for ``symbol`` (never
+    refreshed, or the last refresh is older than ``OPTION_CONTRACTS_MAX_AGE_DAYS``), in
+    which case callers fall back to the upstream contracts endpoint.
+    """
+    settings = settings or get_settings()
+    today = today or date.today()
+    index = _indexes.get(symbol.upper())
+    if index and _is_fresh(index, today, settings):
+        return index
+
+    # While the upstream reference endpoint is failing fast, any listing beats none; a stale
+    # index is returned but not memoized so recovery picks up the fresh one.
+    stale_ok = circuit.is_open("options.reference")
+    rows = await conn.fetch(
+        """
+        SELECT expiration, strike
+        FROM option_contracts
+        WHERE security_id=$1 AND expiration >= $2 AND last_seen >= $3
+        ORDER BY expiration, strike
+        """,
+        security_id,
+        today,
+        date.min if stale_ok else today - timedelta(days=settings.OPTION_CONTRACTS_MAX_AGE_DAYS),
+    )
+    if not rows:
+        _indexes.pop(symbol.upper(), None)
+        return None
+    index = _build_index(symbol, today, rows)
+    if not stale_ok:
+        _indexes[index.symbol] = index
+    return index
+
+
+async def resolve_expirations(
+    client: PolygonOptionsClient,
+    symbol: str,
+    index: Optional[ContractIndex],
+) -> List[date]:
+    if index is not None:
+        return index.expirations
+    logger.info("No current contract reference for %s; listing expirations upstream", symbol.upper())
+    return await client.fetch_expirations(symbol)
+
+
+def strike_range(
+    underlying_price: float,
+    lower: float,
+    upper: float,
+    *,
+    index: Optional[ContractIndex] = None,
+    expiration: Optional[date] = None,
+) -> Tuple[float, float]:
+    """Strike bounds for the moneyness window ``[lower, upper]`` around ``underlying_price``.
+
+    With a contract index the bounds are widened to the next listed strike on each side, so
+    the window never falls between strikes and edge lookups always have a neighbour.
+    """
+    low = underlying_price * (1 + lower)
+    high = underlying_price * (1 + upper)
+    strikes = index.strikes_for(expiration) if index is not None and expiration is not None else []
+    if strikes:
+        below = bisect.bisect_right(strikes, low) - 1
+        above = bisect.bisect_left(strikes, high)
+        if below >= 0:
+            low = strikes[below]
+        if above < len(strikes):
+            high = strikes[above]
+    return low, high
+
+
+def invalidate_contract_index(symbol: Optional[str] = None) -> None:
+    if symbol is None:
+        _indexes.clear()
+    else:
+        _indexes.pop(symbol.upper(), None)
+
+
+async def refresh_option_contracts(
+    symbol: str,
+    *,
+    client: Optional[PolygonOptionsClient] = None,
+    settings: Optional[Settings] = None,
+) -> int:
+    """Pull the full contract list for ``symbol`` and replace its reference rows."""
+    settings = settings or get_settings()
+    today = date.today()
+    owns_client = client is None
+    if client is None:
+        client = PolygonOptionsClient(settings=settings)
+    try:
+        contracts = await client.fetch_contracts(symbol)
+    finally:
+        if owns_client:
+            await client.close()
+
+    pool = await get_pool("ingestion")
+    async with acquire_connection(pool, "options.contracts.refresh") as conn:
+        security_id = await lookup_security_id(conn, symbol)
+        if security_id is None:
+            raise ValueError(f"Security {symbol} not found in securities table")
+        rows = [
+            (
+                contract["option_symbol"],
+                security_id,
+                contract["expiration"],
+                contract["strike"],
+                contract["call_put"],
+                contract["shares_per_contract"],
+                today,
+            )
+            for contract in contracts
+        ]
+        if not rows:
+            # An empty upstream listing is far more likely an outage than a delisting.
+            logger.warning("No option contracts returned for %s; keeping existing reference rows", symbol.upper())
+            return 0
+        async with conn.transaction():
+            await conn.executemany(UPSERT_CONTRACT_SQL, rows)
+            # Anything not re-listed today has expired or been delisted.
+            await conn.execute(
+                "DELETE FROM option_contracts WHERE security_id=$1 AND (last_seen < $2 OR expiration < $2)",
+                security_id,
+                today,
+            )
+    invalidate_contract_index(symbol)
+    logger.info("Option contracts refreshed for %s (%s contracts)", symbol.upper(), len(rows))
+    return len(rows)
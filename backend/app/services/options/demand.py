@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import Counter
+from typing import Dict, Optional, Sequence
+
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.connection import acquire_connection, get_pool
+
+logger = get_logger("options.demand")
+
+# Scores decay with a half-life of $3 seconds, so a name that was busy an hour ago fades
+# out without any cleanup job. Every replica adds its own counts on flush.
+UPSERT_DEMAND_SQL = """
+    INSERT INTO options_symbol_demand (symbol, score, updated_at)
+    SELECT s.symbol, s.hits, NOW()
+    FROM unnest($1::text[], $2::float8[]) AS s(symbol, hits)
+    ON CONFLICT (symbol) DO UPDATE SET
+        score = options_symbol_demand.score
+            * exp(-ln(2) * extract(epoch FROM NOW() - options_symbol_demand.updated_at) / $3)
+            + EXCLUDED.score,
+        updated_at = NOW()
+"""
+
+LOAD_DEMAND_SQL = """
+    SELECT symbol, score * exp(-ln(2) * extract(epoch FROM NOW() - updated_at) / $2) AS score
+    FROM options_symbol_demand
+    WHERE symbol = ANY($1::text[])
+"""
+
+_pending: Counter = Counter()
+_last_flush = time.monotonic()
+_flush_task: Optional[asyncio.Task] = None
+
+
+def record_request(symbol: str, *, settings: Optional[Settings] = None) -> None:
+    """Count one read of ``symbol``; counts are flushed in the background every few seconds."""
+    global _flush_task
+    settings = settings or get_settings()
+    _pending[symbol.upper()] += 1
+    if time.monotonic() - _last_flush < settings.OPTIONS_DEMAND_FLUSH_SECONDS:
+        return
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.get_running_loop().create_task(flush_demand(settings=settings))
+
+
+async def flush_demand(*, settings: Optional[Settings] = None) -> int:
+    """Write pending counts; on failure they are put back for the next flush."""
+    global _last_flush
+    settings = settings or get_settings()
+    _last_flush = time.monotonic()
+    if not _pending:
+        return 0
+    batch = dict(_pending)
+    _pending.clear()
+    try:
+        pool = await get_pool("api")
+        async with acquire_connection(pool, "options.demand.flush") as conn:
+            await conn.execute(
+                UPSERT_DEMAND_SQL,
+                list(batch),
+                [float(count) for count in batch.values()],
+                float(settings.OPTIONS_DEMAND_HALF_LIFE),
+            )
+    except Exception as exc:  # noqa: BLE001
+        _pending.update(batch)
+        logger.warning("Could not flush options demand: %s", exc)
+        return 0
+    return len(batch)
+
+
+async def load_demand(symbols: Sequence[str], *, settings: Optional[Settings] = None) -> Dict[str, float]:
+    """Decayed request score per symbol (0 for symbols nobody asked for)."""
+    settings = settings or get_settings()
+    symbols = [symbol.upper() for symbol in symbols]
+    scores = {symbol: 0.0 for symbol in symbols}
+    if not symbols:
+        return scores
+    pool = await get_pool("api", read_only=True)
+    async with acquire_connection(pool, "options.demand.load") as conn:
+        rows = await conn.fetch(LOAD_DEMAND_SQL, symbols, float(settings.OPTIONS_DEMAND_HALF_LIFE))
+    for row in rows:
+        score = float(row["score"] or 0.0)
+        scores[row["symbol"].upper()] = score if math.isfinite(score) else 0.0
+    return scores
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import json
 import math
-import statistics
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -10,13 +9,23 @@ import asyncpg
 
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
-from app.db.connection import get_pool
+from app.db.connection import acquire_connection, get_pool
+from app.services.analytics.realized_vol import get_realized_vol, update_realized_vol
+from app.services.audit import (
+    INSERT_CALIBRATION_FLAG_SQL,
+    insert_finished_run,
+    record_failed_run,
+)
 from app.services.options import cache
 from app.services.options.atm_straddle import calculate_iv_proxy, get_underlying_price
 from app.services.options.vol_surface import get_surface_iv
+from app.services.securities import lookup_security_id
 
 logger = get_logger("options.expected_move")
 
+RUN_SOURCE = "options_expected_move"
+RUN_TARGET_TABLE = "expected_move_checks"
+
 
 async def compute_expected_move(
     symbol: str,
@@ -27,10 +36,10 @@ async def compute_expected_move(
     settings: Optional[Settings] = None,
 ) -> Dict[str, Any]:
     settings = settings or get_settings()
-    pool = await get_pool()
-    async with pool.acquire() as conn:
-        run_id = await _create_ingestion_run(conn)
-        try:
+    pool = await get_pool("ingestion")
+    started_at = datetime.now(tz=timezone.utc)
+    try:
+        async with acquire_connection(pool, "options.expected_move") as conn:
             security_id = await _get_security_id(conn, symbol)
             cached_atm = cache.get_cached_atm(symbol) if not force else None
             straddle_row: Optional[Dict[str, Any]] = None
@@ -64,108 +73,112 @@ async def compute_expected_move(
             if underlying_price is None or underlying_price <= 0:
                 raise ValueError("Missing underlying price for expected move")
 
-            straddle_mid = float(straddle_row["straddle_mid"])
-            expected_move_abs = straddle_mid
-            expected_move_pct = (
-                expected_move_abs / underlying_price if underlying_price else None
-            )
-            atm_iv = calculate_iv_proxy(straddle_mid, underlying_price, resolved_horizon)
-
-            surface_iv = None
-            cached_surface = cache.get_cached_surface(symbol) if not force else None
-            if cached_surface:
-                surface_iv = _surface_iv_from_cache(cached_surface.value, resolved_horizon)
-            if surface_iv is None:
-                surface_iv = await get_surface_iv(symbol, resolved_horizon, 0.0)
-            surface_expected_move = None
-            if surface_iv:
-                surface_expected_move = (
-                    underlying_price * surface_iv * math.sqrt(resolved_horizon / 365)
-                )
-
             realized_map = await _compute_realized_vol_map(conn, security_id)
-            realized_vol = _select_realized_vol(resolved_horizon, realized_map)
-            realized_expected_move = None
-            if realized_vol:
-                realized_expected_move = (
-                    underlying_price * realized_vol * math.sqrt(resolved_horizon / 252)
-                )
 
-            pct_diff_surface = _compute_pct_diff(
-                expected_move_abs, surface_expected_move
-            )
-            pct_diff_realized = _compute_pct_diff(
-                expected_move_abs, realized_expected_move
+        straddle_mid = float(straddle_row["straddle_mid"])
+        expected_move_abs = straddle_mid
+        expected_move_pct = (
+            expected_move_abs / underlying_price if underlying_price else None
+        )
+        atm_iv = calculate_iv_proxy(straddle_mid, underlying_price, resolved_horizon)
+
+        # get_surface_iv acquires its own connection, so it must run after ours is released.
+        surface_iv = None
+        cached_surface = cache.get_cached_surface(symbol) if not force else None
+        if cached_surface:
+            surface_iv = _surface_iv_from_cache(cached_surface.value, resolved_horizon)
+        if surface_iv is None:
+            surface_iv = await get_surface_iv(symbol, resolved_horizon, 0.0)
+        surface_expected_move = None
+        if surface_iv:
+            surface_expected_move = (
+                underlying_price * surface_iv * math.sqrt(resolved_horizon / 365)
             )
 
-            severity_surface = _classify_severity(pct_diff_surface, settings)
-            severity_realized = _classify_severity(pct_diff_realized, settings)
-
-            check_id = await _insert_expected_move_check(
-                conn,
-                security_id,
-                resolved_horizon,
-                expected_move_abs,
-                expected_move_pct,
-                surface_expected_move,
-                realized_expected_move,
-                pct_diff_surface,
-                pct_diff_realized,
-                severity_surface,
-                severity_realized,
-                run_id,
-                {
-                    "straddle": straddle_row,
-                    "atm_iv": atm_iv,
-                    "metadata": cached_atm.metadata if cached_atm else {},
-                },
+        realized_vol = _select_realized_vol(resolved_horizon, realized_map)
+        realized_expected_move = None
+        if realized_vol:
+            realized_expected_move = (
+                underlying_price * realized_vol * math.sqrt(resolved_horizon / 252)
             )
 
-            await _maybe_insert_flag(
-                conn,
-                security_id,
-                resolved_horizon,
-                "SURFACE_MISMATCH",
-                pct_diff_surface,
-                settings.EXPECTED_MOVE_TOL_IV,
-                severity_surface,
-                run_id,
-            )
-            await _maybe_insert_flag(
-                conn,
-                security_id,
-                resolved_horizon,
-                "REALIZED_MISMATCH",
-                pct_diff_realized,
-                settings.EXPECTED_MOVE_TOL_REALIZED,
-                severity_realized,
-                run_id,
-            )
+        pct_diff_surface = _compute_pct_diff(
+            expected_move_abs, surface_expected_move
+        )
+        pct_diff_realized = _compute_pct_diff(
+            expected_move_abs, realized_expected_move
+        )
 
-            await _complete_run(conn, run_id, 1)
-            return {
-                "id": check_id,
-                "symbol": symbol.upper(),
-                "horizon": resolved_horizon,
-                "expected_move_abs": expected_move_abs,
-                "expected_move_pct": expected_move_pct,
-                "surface_expected_move": surface_expected_move,
-                "realized_expected_move": realized_expected_move,
-                "pct_diff_surface": pct_diff_surface,
-                "pct_diff_realized": pct_diff_realized,
-                "severity_surface": severity_surface,
-                "severity_realized": severity_realized,
-                "atm_implied_vol": atm_iv,
-            }
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Expected move computation failed for %s: %s", symbol, exc)
-            await _fail_run(conn, run_id, exc, {"symbol": symbol.upper()})
-            raise
+        severity_surface = _classify_severity(pct_diff_surface, settings)
+        severity_realized = _classify_severity(pct_diff_realized, settings)
+
+        async with acquire_connection(pool, "options.expected_move") as conn:
+            async with conn.transaction():
+                run_id = await _insert_run(conn, started_at, 1)
+                check_id = await _insert_expected_move_check(
+                    conn,
+                    security_id,
+                    resolved_horizon,
+                    expected_move_abs,
+                    expected_move_pct,
+                    surface_expected_move,
+                    realized_expected_move,
+                    pct_diff_surface,
+                    pct_diff_realized,
+                    severity_surface,
+                    severity_realized,
+                    run_id,
+                    {
+                        "straddle": straddle_row,
+                        "atm_iv": atm_iv,
+                        "metadata": cached_atm.metadata if cached_atm else {},
+                    },
+                )
+
+                await _maybe_insert_flag(
+                    conn,
+                    security_id,
+                    resolved_horizon,
+                    "SURFACE_MISMATCH",
+                    pct_diff_surface,
+                    settings.EXPECTED_MOVE_TOL_IV,
+                    severity_surface,
+                    run_id,
+                )
+                await _maybe_insert_flag(
+                    conn,
+                    security_id,
+                    resolved_horizon,
+                    "REALIZED_MISMATCH",
+                    pct_diff_realized,
+                    settings.EXPECTED_MOVE_TOL_REALIZED,
+                    severity_realized,
+                    run_id,
+                )
+        return {
+            "id": check_id,
+            "symbol": symbol.upper(),
+            "horizon": resolved_horizon,
+            "expected_move_abs": expected_move_abs,
+            "expected_move_pct": expected_move_pct,
+            "surface_expected_move": surface_expected_move,
+            "realized_expected_move": realized_expected_move,
+            "pct_diff_surface": pct_diff_surface,
+            "pct_diff_realized": pct_diff_realized,
+            "severity_surface": severity_surface,
+            "severity_realized": severity_realized,
+            "atm_implied_vol": atm_iv,
+        }
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Expected move computation failed for %s: %s", symbol, exc)
+        async with acquire_connection(pool, "options.expected_move") as conn:
+            await _fail_run(conn, started_at, exc, {"symbol": symbol.upper()})
+        raise
 
 
 async def get_recent_expected_moves(symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
-    pool = await get_pool()
-    async with pool.acquire() as conn:
+    pool = await get_pool(read_only=True)
+    async with acquire_connection(pool, "options.expected_move.read") as conn:
         security_id = await _get_security_id(conn, symbol)
         rows = await conn.fetch(
             """
@@ -226,6 +239,27 @@ async def _fetch_straddle(
             raise ValueError("No ATM straddles available for symbol")
         return dict(row), int(row["dte"])
 
+    # Term-structure runs tag standard tenors; that read is an exact index lookup. A newer
+    # untagged straddle (single-expiry ingest) supersedes the tagged one.
+    row = await conn.fetchrow(
+        """
+        SELECT t.id, t.straddle_mid, t.dte, t.snapshot_timestamp
+        FROM option_straddles t
+        WHERE t.security_id=$1 AND t.tenor_days=$2
+          AND NOT EXISTS (
+              SELECT 1 FROM option_straddles u
+              WHERE u.security_id=$1 AND u.tenor_days IS NULL
+                AND u.snapshot_timestamp > t.snapshot_timestamp
+          )
+        ORDER BY t.snapshot_timestamp DESC
+        LIMIT 1
+        """,
+        security_id,
+        horizon,
+    )
+    if row:
+        return dict(row), int(row["dte"])
+
     row = await conn.fetchrow(
         """
         SELECT id, straddle_mid, dte, snapshot_timestamp
@@ -247,32 +281,11 @@ async def _compute_realized_vol_map(
     security_id: int,
 ) -> Dict[int, Optional[float]]:
     lookbacks = [7, 14, 21]
-    rows = await conn.fetch(
-        """
-        SELECT close
-        FROM ohlcv_bars
-        WHERE security_id=$1 AND interval='1d'
-        ORDER BY time DESC
-        LIMIT 90
-        """,
-        security_id,
-    )
-    prices = [float(row["close"]) for row in rows][::-1]
-    vol_map: Dict[int, Optional[float]] = {}
-    for window in lookbacks:
-        if len(prices) < window + 1:
-            vol_map[window] = None
-            continue
-        window_prices = prices[-(window + 1):]
-        returns = [
-            math.log(window_prices[i + 1] / window_prices[i])
-            for i in range(len(window_prices) - 1)
-            if window_prices[i] > 0
-        ]
-        if len(returns) < 2:
-            vol_map[window] = None
-            continue
-        vol_map[window] = statistics.stdev(returns) * math.sqrt(252)
+    vol_map = await get_realized_vol(conn, security_id, lookbacks)
+    if all(value is None for value in vol_map.values()):
+        # Store not populated yet (first request before any post-ingest update).
+        if await update_realized_vol(conn, security_id):
+            vol_map = await get_realized_vol(conn, security_id, lookbacks)
     return vol_map
 
 
@@ -365,81 +378,36 @@ async def _maybe_insert_flag(
     if pct_diff is None or pct_diff <= tolerance or severity is None:
         return
     await conn.execute(
-        """
-        INSERT INTO calibration_flags (
-            security_id,
-            horizon_days,
-            flag_type,
-            severity,
-            details,
-            ingestion_run_id
-        )
-        VALUES ($1,$2,$3,$4,$5,$6)
-        """,
+        INSERT_CALIBRATION_FLAG_SQL,
         security_id,
         horizon,
         flag_type,
         severity,
-        {"pct_diff": pct_diff},
+        json.dumps({"pct_diff": pct_diff}),
         run_id,
     )
 
 
-async def _create_ingestion_run(conn: asyncpg.Connection) -> int:
-    row = await conn.fetchrow(
-        """
-        INSERT INTO ingestion_runs (source, target_table, status)
-        VALUES ('options_expected_move', 'expected_move_checks', 'running')
-        RETURNING id
-        """
-    )
-    return int(row["id"])
-
-
-async def _complete_run(conn: asyncpg.Connection, run_id: int, rows_inserted: int) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='success', finished_at=NOW(), rows_inserted=$2
-        WHERE id=$1
-        """,
-        run_id,
-        rows_inserted,
-    )
+async def _insert_run(
+    conn: asyncpg.Connection,
+    started_at: datetime,
+    rows_inserted: int,
+    status: str = "success",
+) -> int:
+    return await insert_finished_run(conn, RUN_SOURCE, RUN_TARGET_TABLE, started_at, rows_inserted, status=status)
 
 
 async def _fail_run(
     conn: asyncpg.Connection,
-    run_id: int,
+    started_at: datetime,
     exc: Exception,
     context: Optional[Dict[str, Any]] = None,
 ) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='failed', finished_at=NOW(), error_message=$2
-        WHERE id=$1
-        """,
-        run_id,
-        str(exc),
-    )
-    await conn.execute(
-        """
-        INSERT INTO ingestion_errors (ingestion_run_id, context, payload, message)
-        VALUES ($1, $2, $3, $4)
-        """,
-        run_id,
-        json.dumps(context or {}),
-        {},
-        str(exc),
-    )
+    await record_failed_run(conn, RUN_SOURCE, RUN_TARGET_TABLE, started_at, exc, context)
 
 
 async def _get_security_id(conn: asyncpg.Connection, symbol: str) -> int:
-    security_id = await conn.fetchval(
-        "SELECT id FROM securities WHERE symbol=$1 LIMIT 1",
-        symbol.upper(),
-    )
+    security_id = await lookup_security_id(conn, symbol)
     if security_id is None:
         raise ValueError(f"Security {symbol} not found in securities table")
     return int(security_id)
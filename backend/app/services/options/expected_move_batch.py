@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+import numpy as np
+
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.connection import acquire_connection, get_pool
+from app.services.analytics.realized_vol import get_realized_vol_many
+from app.services.audit import INSERT_CALIBRATION_FLAG_SQL, insert_finished_run, record_failed_run
+from app.services.options.expected_move import RUN_SOURCE, RUN_TARGET_TABLE
+
+logger = get_logger("options.expected_move.batch")
+
+REALIZED_WINDOWS = (7, 14, 21)
+
+INSERT_CHECK_SQL = """
+    INSERT INTO expected_move_checks (
+        security_id,
+        horizon_days,
+        expected_move_abs,
+        expected_move_pct,
+        surface_expected_move,
+        realized_expected_move,
+        pct_diff_surface,
+        pct_diff_realized,
+        severity_surface,
+        severity_realized,
+        ingestion_run_id,
+        raw_payload
+    )
+    VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12)
+"""
+
+
+async def compute_expected_moves_batch(
+    symbols: Optional[Sequence[str]] = None,
+    horizons: Optional[Sequence[int]] = None,
+    *,
+    settings: Optional[Settings] = None,
+) -> Dict[str, Any]:
+    """Compute expected-move checks for ``symbols`` (default: active universe) x ``horizons``.
+
+    Inputs are loaded with one query each, the arithmetic runs over NumPy arrays, and all
+    checks and flags are written under a single ingestion run. A requested horizon resolves
+    to the nearest-DTE straddle, so horizons that land on the same straddle yield one check.
+    """
+    settings = settings or get_settings()
+    horizons = sorted(set(horizons or settings.EXPECTED_MOVE_BATCH_HORIZONS))
+    pool = await get_pool("ingestion")
+    started_at = datetime.now(tz=timezone.utc)
+    since = started_at - timedelta(days=settings.EXPECTED_MOVE_BATCH_MAX_AGE_DAYS)
+    try:
+        async with acquire_connection(pool, "options.expected_move.batch") as conn:
+            securities = await _load_securities(conn, symbols)
+            ids = list(securities)
+            straddles = await _load_straddles(conn, ids, horizons, since)
+            prices = await _load_prices(conn, ids, date.today())
+            surfaces = await _load_surface_ivs(conn, sorted({(sid, dte) for sid, dte, _ in straddles}), since)
+            realized = await get_realized_vol_many(conn, ids, REALIZED_WINDOWS)
+
+        checks, skipped = _build_checks(securities, straddles, prices, surfaces, realized, settings)
+
+        async with acquire_connection(pool, "options.expected_move.batch") as conn:
+            async with conn.transaction():
+                run_id = await insert_finished_run(conn, RUN_SOURCE, RUN_TARGET_TABLE, started_at, len(checks))
+                flags = _build_flags(checks, settings, run_id)
+                if checks:
+                    await conn.executemany(INSERT_CHECK_SQL, [_check_params(check, run_id) for check in checks])
+                if flags:
+                    await conn.executemany(INSERT_CALIBRATION_FLAG_SQL, flags)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Batch expected move computation failed: %s", exc)
+        async with acquire_connection(pool, "options.expected_move.batch") as conn:
+            context = {"symbols": list(symbols or []), "horizons": horizons}
+            await record_failed_run(conn, RUN_SOURCE, RUN_TARGET_TABLE, started_at, exc, context)
+        raise
+
+    logger.info(
+        "Batch expected move: %s checks, %s flags, %s securities skipped",
+        len(checks),
+        len(flags),
+        len(skipped),
+    )
+    return {"run_id": run_id, "checks": len(checks), "flags": len(flags), "skipped": skipped, "results": checks}
+
+
+async def _load_securities(conn: asyncpg.Connection, symbols: Optional[Sequence[str]]) -> Dict[int, str]:
+    rows = await conn.fetch(
+        """
+        SELECT DISTINCT ON (symbol) id, symbol
+        FROM securities
+        WHERE is_active AND ($1::text[] IS NULL OR symbol = ANY($1::text[]))
+        ORDER BY symbol, id
+        """,
+        [symbol.upper() for symbol in symbols] if symbols else None,
+    )
+    return {int(row["id"]): row["symbol"] for row in rows}
+
+
+async def _load_straddles(
+    conn: asyncpg.Connection,
+    security_ids: List[int],
+    horizons: List[int],
+    since: datetime,
+) -> List[Tuple[int, int, Dict[str, Any]]]:
+    # Same choice as expected_move._fetch_straddle: the newest straddle tagged with the
+    # horizon as its tenor, unless a newer untagged (single-expiry) straddle exists; otherwise
+    # the nearest DTE.
+    rows = await conn.fetch(
+        """
+        WITH untagged AS (
+            SELECT security_id, MAX(snapshot_timestamp) AS latest
+            FROM option_straddles
+            WHERE security_id = ANY($1::bigint[]) AND tenor_days IS NULL AND snapshot_timestamp >= $3
+            GROUP BY security_id
+        ),
+        candidates AS (
+            SELECT s.security_id, h.horizon, s.id, s.straddle_mid, s.dte, s.snapshot_timestamp,
+                   COALESCE(s.tenor_days = h.horizon, FALSE)
+                       AND (u.latest IS NULL OR u.latest <= s.snapshot_timestamp) AS tenor_match
+            FROM unnest($2::int[]) AS h(horizon)
+            JOIN option_straddles s
+              ON s.security_id = ANY($1::bigint[]) AND s.snapshot_timestamp >= $3
+            LEFT JOIN untagged u ON u.security_id = s.security_id
+        )
+        SELECT DISTINCT ON (security_id, horizon)
+               security_id, horizon, id, straddle_mid, dte, snapshot_timestamp
+        FROM candidates
+        ORDER BY security_id, horizon, tenor_match DESC,
+                 CASE WHEN tenor_match THEN 0 ELSE ABS(dte - horizon) END, snapshot_timestamp DESC
+        """,
+        security_ids,
+        horizons,
+        since,
+    )
+    resolved: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for row in rows:
+        key = (int(row["security_id"]), int(row["dte"]))
+        resolved.setdefault(
+            key,
+            {
+                "id": row["id"],
+                "straddle_mid": row["straddle_mid"],
+                "dte": row["dte"],
+                "snapshot_timestamp": row["snapshot_timestamp"],
+            },
+        )
+    return [(security_id, dte, straddle) for (security_id, dte), straddle in resolved.items()]
+
+
+async def _load_prices(conn: asyncpg.Connection, security_ids: List[int], target_date: date) -> Dict[int, float]:
+    rows = await conn.fetch(
+        """
+        SELECT DISTINCT ON (security_id) security_id, close
+        FROM ohlcv_bars
+        WHERE security_id = ANY($1::bigint[]) AND interval='1d' AND time <= $2
+        ORDER BY security_id, time DESC
+        """,
+        security_ids,
+        datetime.combine(target_date, datetime.min.time(), tzinfo=timezone.utc),
+    )
+    return {int(row["security_id"]): float(row["close"]) for row in rows if row["close"] is not None}
+
+
+async def _load_surface_ivs(
+    conn: asyncpg.Connection,
+    targets: List[Tuple[int, int]],
+    since: datetime,
+) -> Dict[Tuple[int, int], float]:
+    if not targets:
+        return {}
+    rows = await conn.fetch(
+        """
+        SELECT DISTINCT ON (t.security_id, t.dte) t.security_id, t.dte, p.implied_vol
+        FROM unnest($1::bigint[], $2::int[]) AS t(security_id, dte)
+        JOIN vol_surface_points p
+          ON p.security_id = t.security_id AND p.snapshot_timestamp >= $3
+        ORDER BY t.security_id, t.dte, ABS(p.dte - t.dte), ABS(p.moneyness), p.snapshot_timestamp DESC
+        """,
+        [security_id for security_id, _ in targets],
+        [dte for _, dte in targets],
+        since,
+    )
+    return {
+        (int(row["security_id"]), int(row["dte"])): float(row["implied_vol"])
+        for row in rows
+        if row["implied_vol"] is not None
+    }
+
+
+def _nullable(values: np.ndarray) -> List[Optional[float]]:
+    return [float(value) if np.isfinite(value) else None for value in values]
+
+
+def _severity(pct_diff: np.ndarray, settings: Settings) -> List[Optional[str]]:
+    labels = np.select(
+        [pct_diff < settings.EXPECTED_MOVE_WARN_THRESHOLD, pct_diff < settings.EXPECTED_MOVE_SEVERE_THRESHOLD],
+        ["OK", "WARN"],
+        default="SEVERE",
+    )
+    return [str(label) if np.isfinite(value) else None for label, value in zip(labels, pct_diff, strict=True)]
+
+
+def _pct_diff(base: np.ndarray, comparison: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        diff = np.abs(base - comparison) / np.abs(comparison)
+    return np.where(comparison == 0, np.nan, diff)
+
+
+def _build_checks(
+    securities: Dict[int, str],
+    straddles: List[Tuple[int, int, Dict[str, Any]]],
+    prices: Dict[int, float],
+    surfaces: Dict[Tuple[int, int], float],
+    realized: Dict[int, Dict[int, Optional[float]]],
+    settings: Settings,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    usable = [
+        (security_id, dte, straddle)
+        for security_id, dte, straddle in straddles
+        if dte > 0 and prices.get(security_id, 0) > 0
+    ]
+    covered = {security_id for security_id, _, _ in usable}
+    skipped = sorted(symbol for security_id, symbol in securities.items() if security_id not in covered)
+    if not usable:
+        return [], skipped
+
+    security_ids = [security_id for security_id, _, _ in usable]
+    dte = np.array([dte for _, dte, _ in usable], dtype=np.float64)
+    mid = np.array([float(straddle["straddle_mid"]) for _, _, straddle in usable])
+    price = np.array([prices[security_id] for security_id in security_ids])
+    surface_iv = np.array([surfaces.get((security_id, int(days)), np.nan) for security_id, days in zip(security_ids, dte, strict=True)])
+    # Same horizon -> window rule as the single-symbol path (_select_realized_vol).
+    window = np.where(dte <= 7, 7, np.where(dte <= 14, 14, 21))
+    realized_vol = np.array(
+        [
+            np.nan if realized[security_id][int(w)] is None else realized[security_id][int(w)]
+            for security_id, w in zip(security_ids, window, strict=True)
+        ],
+        dtype=np.float64,
+    )
+
+    expected_move_pct = mid / price
+    atm_iv = mid / (price * np.sqrt(dte / 365))
+    surface_move = price * surface_iv * np.sqrt(dte / 365)
+    realized_move = np.where(realized_vol > 0, price * realized_vol * np.sqrt(dte / 252), np.nan)
+    pct_surface = _pct_diff(mid, surface_move)
+    pct_realized = _pct_diff(mid, realized_move)
+
+    surface_values = _nullable(surface_move)
+    realized_values = _nullable(realized_move)
+    pct_surface_values = _nullable(pct_surface)
+    pct_realized_values = _nullable(pct_realized)
+    severity_surface = _severity(pct_surface, settings)
+    severity_realized = _severity(pct_realized, settings)
+
+    checks = []
+    for index, (security_id, days, straddle) in enumerate(usable):
+        checks.append(
+            {
+                "security_id": security_id,
+                "symbol": securities[security_id],
+                "horizon": int(days),
+                "expected_move_abs": float(mid[index]),
+                "expected_move_pct": float(expected_move_pct[index]),
+                "surface_expected_move": surface_values[index],
+                "realized_expected_move": realized_values[index],
+                "pct_diff_surface": pct_surface_values[index],
+                "pct_diff_realized": pct_realized_values[index],
+                "severity_surface": severity_surface[index],
+                "severity_realized": severity_realized[index],
+                "atm_implied_vol": float(atm_iv[index]),
+                "straddle": straddle,
+            }
+        )
+    return checks, skipped
+
+
+def _check_params(check: Dict[str, Any], run_id: int) -> Tuple[Any, ...]:
+    return (
+        check["security_id"],
+        check["horizon"],
+        check["expected_move_abs"],
+        check["expected_move_pct"],
+        check["surface_expected_move"],
+        check["realized_expected_move"],
+        check["pct_diff_surface"],
+        check["pct_diff_realized"],
+        check["severity_surface"],
+        check["severity_realized"],
+        run_id,
+        json.dumps({"straddle": check["straddle"], "atm_iv": check["atm_implied_vol"], "batch": True}, default=str),
+    )
+
+
+def _build_flags(checks: List[Dict[str, Any]], settings: Settings, run_id: int) -> List[Tuple[Any, ...]]:
+    flags = []
+    for check in checks:
+        for flag_type, pct_key, severity_key, tolerance in (
+            ("SURFACE_MISMATCH", "pct_diff_surface", "severity_surface", settings.EXPECTED_MOVE_TOL_IV),
+            ("REALIZED_MISMATCH", "pct_diff_realized", "severity_realized", settings.EXPECTED_MOVE_TOL_REALIZED),
+        ):
+            pct_diff = check[pct_key]
+            if pct_diff is None or pct_diff <= tolerance or check[severity_key] is None:
+                continue
+            flags.append(
+                (
+                    check["security_id"],
+                    check["horizon"],
+                    flag_type,
+                    check[severity_key],
+                    json.dumps({"pct_diff": pct_diff}),
+                    run_id,
+                )
+            )
+    return flags
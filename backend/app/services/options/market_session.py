@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import FrozenSet, Optional
+from zoneinfo import ZoneInfo
+
+from app.core.config import Settings, get_settings
+
+PRE_MARKET = "pre_market"
+REGULAR = "regular"
+AFTER_HOURS = "after_hours"
+CLOSED = "closed"
+
+
+@dataclass(frozen=True)
+class MarketSession:
+    """The session in force at some instant and when it ends (the next boundary)."""
+
+    name: str
+    ends_at: datetime
+
+
+@lru_cache(maxsize=8)
+def _holidays(value: str) -> FrozenSet[date]:
+    return frozenset(date.fromisoformat(item.strip()) for item in value.split(",") if item.strip())
+
+
+def is_trading_day(day: date, settings: Optional[Settings] = None) -> bool:
+    settings = settings or get_settings()
+    return day.weekday() < 5 and day not in _holidays(settings.MARKET_HOLIDAYS)
+
+
+def _at(day: date, clock: str, tz: ZoneInfo) -> datetime:
+    return datetime.combine(day, time.fromisoformat(clock), tzinfo=tz)
+
+
+def next_open(now: datetime, settings: Optional[Settings] = None) -> datetime:
+    """Start of the next regular session strictly after ``now`` (UTC)."""
+    settings = settings or get_settings()
+    tz = ZoneInfo(settings.MARKET_TIMEZONE)
+    day = now.astimezone(tz).date()
+    for _ in range(15):
+        opens_at = _at(day, settings.MARKET_OPEN, tz)
+        if opens_at > now and is_trading_day(day, settings):
+            return opens_at.astimezone(timezone.utc)
+        day += timedelta(days=1)
+    raise ValueError("No trading day within 15 days; check MARKET_HOLIDAYS")
+
+
+def session_at(now: datetime, settings: Optional[Settings] = None) -> MarketSession:
+    settings = settings or get_settings()
+    tz = ZoneInfo(settings.MARKET_TIMEZONE)
+    day = now.astimezone(tz).date()
+    if is_trading_day(day, settings):
+        boundaries = (
+            (PRE_MARKET, _at(day, settings.MARKET_PRE_MARKET_OPEN, tz), _at(day, settings.MARKET_OPEN, tz)),
+            (REGULAR, _at(day, settings.MARKET_OPEN, tz), _at(day, settings.MARKET_CLOSE, tz)),
+            (AFTER_HOURS, _at(day, settings.MARKET_CLOSE, tz), _at(day, settings.MARKET_AFTER_HOURS_CLOSE, tz)),
+        )
+        for name, starts_at, ends_at in boundaries:
+            if starts_at <= now < ends_at:
+                return MarketSession(name, ends_at.astimezone(timezone.utc))
+    return MarketSession(CLOSED, next_open(now, settings))
+
+
+def expires_at(
+    start: datetime,
+    base_seconds: float,
+    *,
+    scale: float = 1.0,
+    settings: Optional[Settings] = None,
+) -> datetime:
+    """When data fetched at ``start`` with a regular-session TTL of ``base_seconds`` goes stale.
+
+    Regular session: ``base_seconds * scale`` (``scale`` reflects realized activity).
+    Pre-market / after-hours: the base TTL times ``OPTIONS_CACHE_EXTENDED_HOURS_MULTIPLIER``.
+    Closed: the next regular open, since listed option quotes cannot change before then.
+    No expiry runs past the end of its session, so the first fetch of a session is fresh.
+    A non-positive base TTL disables caching.
+    """
+    settings = settings or get_settings()
+    if base_seconds <= 0:
+        return start
+    if not settings.OPTIONS_CACHE_SESSION_AWARE:
+        return start + timedelta(seconds=base_seconds)
+    session = session_at(start, settings)
+    if session.name == CLOSED:
+        return session.ends_at
+    if session.name == REGULAR:
+        ttl = base_seconds * scale
+    else:
+        ttl = base_seconds * settings.OPTIONS_CACHE_EXTENDED_HOURS_MULTIPLIER
+    return min(start + timedelta(seconds=ttl), session.ends_at)
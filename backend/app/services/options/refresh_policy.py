@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import math
 from datetime import datetime, timezone
 from typing import Dict, Optional, Tuple
 
 from app.core.config import Settings, get_settings
+from app.services.options import market_session
 
 ChainKey = Tuple[str, str]
 
 _last_chain_refresh: Dict[ChainKey, datetime] = {}
 _last_atm_refresh: Dict[str, Tuple[datetime, Optional[float]]] = {}
 _last_surface_refresh: Dict[str, datetime] = {}
+# Realized activity per symbol: EWMA of the ATM straddle mid's relative change between
+# refreshes, normalised to one ATM_REFRESH_INTERVAL and to OPTIONS_CACHE_ACTIVITY_MOVE.
+_activity: Dict[str, float] = {}
+_last_straddle_mid: Dict[str, Tuple[datetime, float]] = {}
+
+ACTIVITY_ALPHA = 0.3
 
 
 def _now() -> datetime:
@@ -20,6 +28,48 @@ def _symbol(symbol: str) -> str:
     return symbol.upper()
 
 
+def activity_scale(symbol: str, settings: Optional[Settings] = None) -> float:
+    """TTL multiplier for the regular session: below 1 for busy names, above 1 for quiet ones."""
+    settings = settings or get_settings()
+    activity = _activity.get(_symbol(symbol))
+    if activity is None:
+        return 1.0
+    if activity <= 0:
+        return settings.OPTIONS_CACHE_MAX_SCALE
+    return min(max(1.0 / activity, settings.OPTIONS_CACHE_MIN_SCALE), settings.OPTIONS_CACHE_MAX_SCALE)
+
+
+def _record_activity(symbol: str, straddle_mid: float, now: datetime, settings: Settings) -> None:
+    previous = _last_straddle_mid.get(symbol)
+    _last_straddle_mid[symbol] = (now, straddle_mid)
+    if previous is None or previous[1] <= 0 or settings.OPTIONS_CACHE_ACTIVITY_MOVE <= 0:
+        return
+    previous_at, previous_mid = previous
+    # Only changes within one regular session say anything about intraday activity.
+    session = market_session.session_at(previous_at, settings)
+    elapsed = (now - previous_at).total_seconds()
+    if session.name != market_session.REGULAR or now >= session.ends_at or elapsed <= 0:
+        return
+    # Normalise to one refresh interval, assuming quote changes scale like a random walk.
+    change = abs(straddle_mid - previous_mid) / previous_mid / settings.OPTIONS_CACHE_ACTIVITY_MOVE
+    observed = change * math.sqrt(settings.ATM_REFRESH_INTERVAL / elapsed)
+    current = _activity.get(symbol)
+    _activity[symbol] = observed if current is None else current + ACTIVITY_ALPHA * (observed - current)
+
+
+def due_at(
+    symbol: str,
+    last: datetime,
+    base_seconds: float,
+    *,
+    settings: Optional[Settings] = None,
+) -> datetime:
+    """When data for ``symbol`` fetched at ``last`` should be refreshed (session and activity aware)."""
+    settings = settings or get_settings()
+    scale = activity_scale(symbol, settings)
+    return market_session.expires_at(last, base_seconds, scale=scale, settings=settings)
+
+
 def should_refresh_chain(
     symbol: str,
     expiration: str,
@@ -34,7 +84,7 @@ def should_refresh_chain(
     last = _last_chain_refresh.get(key)
     if last is None:
         return True
-    return (_now() - last).total_seconds() >= settings.OPTIONS_CACHE_TTL_CHAIN
+    return _now() >= due_at(symbol, last, settings.OPTIONS_CACHE_TTL_CHAIN, settings=settings)
 
 
 def record_chain_refresh(symbol: str, expiration: str) -> None:
@@ -57,7 +107,7 @@ def should_refresh_atm(
     if entry is None:
         return True
     last_time, last_underlying = entry
-    if (now - last_time).total_seconds() >= settings.ATM_REFRESH_INTERVAL:
+    if now >= due_at(symbol, last_time, settings.ATM_REFRESH_INTERVAL, settings=settings):
         return True
     if (
         underlying_price
@@ -69,8 +119,22 @@ def should_refresh_atm(
     return False
 
 
-def record_atm_refresh(symbol: str, underlying_price: Optional[float]) -> None:
-    _last_atm_refresh[_symbol(symbol)] = (_now(), underlying_price)
+def last_atm_refresh(symbol: str) -> Optional[Tuple[datetime, Optional[float]]]:
+    """(refreshed at, underlying price then) of the last ATM refresh, if any."""
+    return _last_atm_refresh.get(_symbol(symbol))
+
+
+def record_atm_refresh(
+    symbol: str,
+    underlying_price: Optional[float],
+    straddle_mid: Optional[float] = None,
+    *,
+    settings: Optional[Settings] = None,
+) -> None:
+    now = _now()
+    _last_atm_refresh[_symbol(symbol)] = (now, underlying_price)
+    if straddle_mid:
+        _record_activity(_symbol(symbol), float(straddle_mid), now, settings or get_settings())
 
 
 def should_refresh_surface(
@@ -85,7 +149,7 @@ def should_refresh_surface(
     last = _last_surface_refresh.get(_symbol(symbol))
     if last is None:
         return True
-    return (_now() - last).total_seconds() >= settings.SURFACE_REFRESH_INTERVAL
+    return _now() >= due_at(symbol, last, settings.SURFACE_REFRESH_INTERVAL, settings=settings)
 
 
 def record_surface_refresh(symbol: str) -> None:
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.core import metrics
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.connection import acquire_connection, get_pool
+from app.services.options import demand, market_session, refresh_policy
+from app.services.options.atm_straddle import ingest_atm_term_structure
+from app.services.options.vol_surface import compute_surface
+from app.services.scheduler.history import record_run, run_for_symbol
+from app.services.securities.universe import load_universe
+
+logger = get_logger("options.refresher")
+
+JOB_ID = "intraday_options_refresh"
+
+LATEST_CLOSES_SQL = """
+    SELECT s.symbol, b.close
+    FROM securities s
+    JOIN LATERAL (
+        SELECT close FROM ohlcv_bars
+        WHERE security_id = s.id AND interval = '1d'
+        ORDER BY time DESC
+        LIMIT 1
+    ) b ON TRUE
+    WHERE s.symbol = ANY($1::text[])
+"""
+
+
+@dataclass(order=True)
+class RefreshCandidate:
+    """Heap entry: highest priority first, busier symbols first on ties."""
+
+    sort_key: tuple = field(init=False, repr=False)
+    symbol: str = field(compare=False)
+    priority: float = field(compare=False)
+    staleness: float = field(compare=False)
+    move: float = field(compare=False)
+    demand: float = field(compare=False)
+
+    def __post_init__(self) -> None:
+        self.sort_key = (-self.priority, -self.demand, self.symbol)
+
+
+def score_symbol(
+    symbol: str,
+    price: Optional[float],
+    demand_score: float,
+    *,
+    now: datetime,
+    settings: Settings,
+) -> Optional[RefreshCandidate]:
+    """Candidate for ``symbol`` if it is due, using the same limits as ``should_refresh_atm``.
+
+    Demand shortens the refresh interval (``ATM_REFRESH_INTERVAL / (1 + w * log1p(demand))``)
+    before the session/activity adjustment of ``refresh_policy.due_at``; the underlying move
+    is measured in multiples of ``MIN_UNDERLYING_MOVE`` and ignored while the market is
+    closed. A symbol is due once either term reaches 1; a never-refreshed symbol always is.
+    """
+    boost = 1.0 + settings.OPTIONS_DEMAND_WEIGHT * math.log1p(max(demand_score, 0.0))
+    interval = settings.ATM_REFRESH_INTERVAL / boost
+    last = refresh_policy.last_atm_refresh(symbol)
+    if last is None:
+        staleness, move = math.inf, 0.0
+    else:
+        refreshed_at, last_price = last
+        due = refresh_policy.due_at(symbol, refreshed_at, max(interval, 1.0), settings=settings)
+        staleness = (now - refreshed_at).total_seconds() / max((due - refreshed_at).total_seconds(), 1.0)
+        move = 0.0
+        closed = settings.OPTIONS_CACHE_SESSION_AWARE and (
+            market_session.session_at(now, settings).name == market_session.CLOSED
+        )
+        if not closed and price and last_price and last_price > 0 and settings.MIN_UNDERLYING_MOVE > 0:
+            move = abs(price - last_price) / last_price / settings.MIN_UNDERLYING_MOVE
+    if staleness < 1.0 and move < 1.0:
+        return None
+    return RefreshCandidate(
+        symbol=symbol.upper(),
+        priority=staleness + move,
+        staleness=staleness,
+        move=move,
+        demand=demand_score,
+    )
+
+
+class IntradayRefresher:
+    """Refreshes ATM term structures (and due surfaces) for the options universe all day.
+
+    Each cycle builds a priority queue of the due symbols and refreshes from the top until
+    the next symbol would exceed ``OPTIONS_INTRADAY_UPSTREAM_BUDGET`` upstream calls.
+    Anything left over keeps its staleness and ranks higher next cycle.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        *,
+        is_leader: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.settings = settings or get_settings()
+        self._is_leader = is_leader
+        self._task: Optional[asyncio.Task] = None
+        # Running estimate of upstream calls per symbol, so the budget check looks ahead.
+        self.calls_per_symbol = 1.0
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                "Intraday options refresher started (every %ss)",
+                self.settings.OPTIONS_INTRADAY_REFRESH_INTERVAL,
+            )
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Intraday options refresher stopped")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.settings.OPTIONS_INTRADAY_REFRESH_INTERVAL)
+            if self._is_leader is not None and not self._is_leader():
+                continue
+            try:
+                await self.run_cycle()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Intraday options refresh cycle failed: %s", exc)
+
+    async def candidates(self, symbols: Sequence[str]) -> List[RefreshCandidate]:
+        """Due symbols as a heap (pop with ``heapq.heappop``)."""
+        await demand.flush_demand(settings=self.settings)
+        scores = await demand.load_demand(symbols, settings=self.settings)
+        prices = await _latest_closes(symbols)
+        now = datetime.now(tz=timezone.utc)
+        heap = []
+        for symbol in (symbol.upper() for symbol in symbols):
+            candidate = score_symbol(
+                symbol, prices.get(symbol), scores.get(symbol, 0.0), now=now, settings=self.settings
+            )
+            if candidate is not None:
+                heap.append(candidate)
+        heapq.heapify(heap)
+        return heap
+
+    async def run_cycle(self) -> List[str]:
+        """One pass over the options universe; returns the symbols refreshed, in order."""
+        symbols = await load_universe("options", settings=self.settings)
+        heap = await self.candidates(symbols)
+        budget = self.settings.OPTIONS_INTRADAY_UPSTREAM_BUDGET
+        refreshed: List[str] = []
+        if not heap:
+            return refreshed
+        async with record_run(JOB_ID, trigger="intraday") as run:
+            while heap:
+                if run.upstream_calls + self.calls_per_symbol > budget:
+                    break
+                candidate = heapq.heappop(heap)
+                before = run.upstream_calls
+                try:
+                    await run_for_symbol(candidate.symbol, self._refresh)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Intraday refresh of %s failed: %s", candidate.symbol, exc)
+                else:
+                    refreshed.append(candidate.symbol)
+                observed = max(run.upstream_calls - before, 1)
+                self.calls_per_symbol = 0.7 * self.calls_per_symbol + 0.3 * observed
+        metrics.set_gauge("options.intraday.backlog", float(len(heap)))
+        logger.info(
+            "Intraday options refresh: %s refreshed, %s due but over budget (%s upstream calls)",
+            len(refreshed),
+            len(heap),
+            run.upstream_calls,
+        )
+        return refreshed
+
+    async def _refresh(self, symbol: str) -> None:
+        await ingest_atm_term_structure(symbol, settings=self.settings, force=True)
+        if refresh_policy.should_refresh_surface(symbol, settings=self.settings):
+            await compute_surface(symbol, settings=self.settings)
+
+
+async def _latest_closes(symbols: Sequence[str]) -> Dict[str, float]:
+    if not symbols:
+        return {}
+    pool = await get_pool("ingestion", read_only=True)
+    async with acquire_connection(pool, "options.refresher.prices") as conn:
+        rows = await conn.fetch(LATEST_CLOSES_SQL, [symbol.upper() for symbol in symbols])
+    return {row["symbol"].upper(): float(row["close"]) for row in rows if row["close"] is not None}
@@ -3,18 +3,28 @@ from __future__ import annotations
 import json
 import math
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import asyncpg
 
 from app.clients.polygon_options import PolygonOptionsClient, PolygonOptionsClientError
+from app.core import run_stats
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
-from app.db.connection import get_pool
-from app.services.options import cache, degraded_mode, refresh_policy
+from app.db.connection import acquire_connection, get_pool
+from app.services.audit import (
+    INSERT_RECONCILIATION_SQL,
+    insert_finished_run,
+    record_failed_run,
+)
+from app.services.options import cache, contracts, degraded_mode, refresh_policy
+from app.services.securities import lookup_security_id
 
 logger = get_logger("options.surface")
 
+RUN_SOURCE = "options_vol_surface"
+RUN_TARGET_TABLE = "vol_surface_points"
+
 
 async def compute_surface(
     symbol: str,
@@ -26,156 +36,191 @@ async def compute_surface(
 ) -> Dict[str, Any]:
     target_date = target_date or date.today()
     settings = settings or get_settings()
-    pool = await get_pool()
+    pool = await get_pool("ingestion")
     owns_client = client is None
     if client is None:
         client = PolygonOptionsClient(settings=settings)
 
-    async with pool.acquire() as conn:
-        run_id = await _create_ingestion_run(conn)
-        try:
+    started_at = datetime.now(tz=timezone.utc)
+    try:
+        async with acquire_connection(pool, "options.surface") as conn:
             security_id = await _get_security_id(conn, symbol)
             underlying_price = await _get_underlying_price(conn, security_id, target_date)
-            if underlying_price is None:
-                raise ValueError(f"No underlying price found for {symbol}")
+            contract_index = await contracts.get_contract_index(conn, security_id, symbol, settings=settings)
+        if underlying_price is None:
+            raise ValueError(f"No underlying price found for {symbol}")
+
+        cached_surface = cache.get_cached_surface(symbol, settings=settings) if not force else None
+        if cached_surface and not refresh_policy.should_refresh_surface(symbol, settings=settings, force=force):
+            surface = dict(cached_surface.value)
+            meta = surface.setdefault("metadata", {})
+            meta["cached"] = True
+            return surface
 
-            cached_surface = cache.get_cached_surface(symbol, settings=settings) if not force else None
-            if cached_surface and not refresh_policy.should_refresh_surface(symbol, settings=settings, force=force):
-                surface = dict(cached_surface.value)
-                meta = surface.setdefault("metadata", {})
-                meta["cached"] = True
-                return surface
-
-            expirations = await client.fetch_expirations(symbol)
-            expirations = [
-                exp
-                for exp in expirations
-                if settings.VOL_SURFACE_MIN_DTE
-                <= (exp - target_date).days
-                <= settings.VOL_SURFACE_MAX_DTE
-            ]
-
-            bucket_expirations: Dict[int, date] = {}
-            for bucket in settings.VOL_SURFACE_DTE_BUCKETS:
-                matched = _match_expiration_for_bucket(
-                    expirations,
-                    target_date,
-                    bucket,
-                    settings.VOL_SURFACE_MAX_BUCKET_DRIFT,
-                )
-                if matched:
-                    bucket_expirations[bucket] = matched
-                else:
-                    await _log_issue(
-                        conn,
-                        security_id,
-                        "vol_surface_missing_bucket",
-                        {"bucket": bucket},
-                        run_id,
+        # No connection is held while talking to Polygon; writes are collected for one DB phase.
+        issues: List[Tuple[str, Dict[str, Any]]] = []
+        chains: List[List[Dict[str, Any]]] = []
+        points: List[Tuple[Any, ...]] = []
+
+        expirations = await contracts.resolve_expirations(client, symbol, contract_index)
+        expirations = [
+            exp
+            for exp in expirations
+            if settings.VOL_SURFACE_MIN_DTE
+            <= (exp - target_date).days
+            <= settings.VOL_SURFACE_MAX_DTE
+        ]
+
+        bucket_expirations: Dict[int, date] = {}
+        for bucket in settings.VOL_SURFACE_DTE_BUCKETS:
+            matched = _match_expiration_for_bucket(
+                expirations,
+                target_date,
+                bucket,
+                settings.VOL_SURFACE_MAX_BUCKET_DRIFT,
+            )
+            if matched:
+                bucket_expirations[bucket] = matched
+            else:
+                issues.append(("vol_surface_missing_bucket", {"bucket": bucket}))
+
+        moneyness_grid = settings.VOL_SURFACE_MONEYNESS_GRID
+        window: Optional[Tuple[float, float]] = None
+        if settings.OPTIONS_CHAIN_STRIKE_WINDOW and moneyness_grid:
+            window = (
+                min(moneyness_grid) - settings.VOL_SURFACE_STRIKE_PADDING,
+                max(moneyness_grid) + settings.VOL_SURFACE_STRIKE_PADDING,
+            )
+        iv_grid: List[List[Optional[float]]] = []
+        used_buckets: List[int] = []
+        surface_source = "live"
+
+        for bucket in settings.VOL_SURFACE_DTE_BUCKETS:
+            expiration = bucket_expirations.get(bucket)
+            if not expiration:
+                continue
+
+            expiration_key = cache.chain_key(expiration.isoformat(), window)
+            cached_chain_entry = cache.get_cached_chain(symbol, expiration_key, settings=settings) if not force else None
+            chain = None
+            chain_source = "live"
+
+            if (
+                cached_chain_entry
+                and not refresh_policy.should_refresh_chain(symbol, expiration_key, settings=settings, force=force)
+            ):
+                chain = cached_chain_entry.value
+                chain_source = cached_chain_entry.metadata.get("source", "cache")
+
+            if chain is None:
+                try:
+                    strikes = (
+                        contracts.strike_range(underlying_price, *window, index=contract_index, expiration=expiration)
+                        if window
+                        else None
                     )
-
-            moneyness_grid = settings.VOL_SURFACE_MONEYNESS_GRID
-            iv_grid: List[List[Optional[float]]] = []
-            used_buckets: List[int] = []
-            surface_source = "live"
-
-            for bucket in settings.VOL_SURFACE_DTE_BUCKETS:
-                expiration = bucket_expirations.get(bucket)
-                if not expiration:
-                    continue
-
-                expiration_key = expiration.isoformat()
-                cached_chain_entry = cache.get_cached_chain(symbol, expiration_key, settings=settings) if not force else None
-                chain = None
-                chain_source = "live"
-
-                if (
-                    cached_chain_entry
-                    and not refresh_policy.should_refresh_chain(symbol, expiration_key, settings=settings, force=force)
-                ):
-                    chain = cached_chain_entry.value
-                    chain_source = cached_chain_entry.metadata.get("source", "cache")
-
-                if chain is None:
-                    try:
-                        chain = await client.fetch_chain(symbol, expiration)
-                        chain_source = "live"
-                        cache.set_cached_chain(
-                            symbol,
-                            expiration_key,
-                            chain,
-                            {"source": chain_source},
-                            settings=settings,
+                    chain = await client.fetch_chain(symbol, expiration, strike_range=strikes)
+                    if not chain and strikes is not None:
+                        # A stale or misaligned contract index must not drop the expiration.
+                        logger.info(
+                            "No strikes for %s %s inside %s; fetching full chain", symbol.upper(), expiration, strikes
                         )
-                        refresh_policy.record_chain_refresh(symbol, expiration_key)
-                    except PolygonOptionsClientError:
-                        if cached_chain_entry:
-                            chain = cached_chain_entry.value
-                            chain_source = "cache"
-                        else:
-                            fallback_chain = await degraded_mode.fallback_chain_from_snapshot(conn, security_id, expiration)
-                            if fallback_chain is None:
-                                raise
-                            chain = fallback_chain
-                            chain_source = "historical"
-
-                await _insert_option_chain(conn, security_id, chain)
-
-                bucket_row = await _process_bucket(
-                    conn,
-                    security_id,
-                    chain,
-                    underlying_price,
-                    expiration,
-                    bucket,
-                    moneyness_grid,
-                    settings,
-                    run_id,
-                    chain_source,
-                )
-                iv_grid.append(bucket_row)
-                used_buckets.append(bucket)
-                if chain_source != "live":
-                    surface_source = "degraded"
-
-            snapshot_ts = datetime.now(tz=timezone.utc)
-            surface = {
-                "symbol": symbol.upper(),
-                "generated_at": snapshot_ts,
-                "dte": used_buckets,
-                "moneyness": moneyness_grid,
-                "iv_grid": iv_grid,
-                "metadata": {"source": surface_source, "cached": False},
-            }
-
-            if not used_buckets:
-                if cached_surface:
-                    cached = dict(cached_surface.value)
-                    meta = cached.setdefault("metadata", {})
-                    meta["cached"] = True
-                    return cached
-                fallback_surface = await degraded_mode.fallback_surface_from_snapshot(conn, security_id)
-                if fallback_surface:
-                    built = _build_surface_from_points(symbol, fallback_surface["points"], fallback_surface["snapshot_timestamp"])
-                    built["metadata"] = {"source": "historical", "cached": False}
-                    return built
-                raise ValueError("Unable to compute vol surface")
-
-            await _complete_run(conn, run_id, len(used_buckets) * len(moneyness_grid))
-            cache.set_cached_surface(symbol, surface, {"source": surface_source}, settings=settings)
-            refresh_policy.record_surface_refresh(symbol)
-            return surface
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Vol surface computation failed for %s: %s", symbol, exc)
-            await _fail_run(conn, run_id, exc, {"symbol": symbol.upper()})
-            raise
-        finally:
-            if owns_client:
-                await client.close()
+                        chain = await client.fetch_chain(symbol, expiration)
+                    chain_source = "live"
+                    cache.set_cached_chain(
+                        symbol,
+                        expiration_key,
+                        chain,
+                        {"source": chain_source},
+                        settings=settings,
+                    )
+                    refresh_policy.record_chain_refresh(symbol, expiration_key)
+                except PolygonOptionsClientError:
+                    if cached_chain_entry:
+                        chain = cached_chain_entry.value
+                        chain_source = "cache"
+                    else:
+                        async with acquire_connection(pool, "options.surface.fallback") as conn:
+                            fallback_chain = await degraded_mode.fallback_chain_from_snapshot(
+                                conn, security_id, expiration
+                            )
+                        if fallback_chain is None:
+                            raise
+                        chain = fallback_chain
+                        chain_source = "historical"
+
+            chains.append(chain)
+            bucket_row = _process_bucket(
+                security_id,
+                chain,
+                underlying_price,
+                expiration,
+                bucket,
+                moneyness_grid,
+                settings,
+                chain_source,
+                points,
+                issues,
+            )
+            iv_grid.append(bucket_row)
+            used_buckets.append(bucket)
+            if chain_source != "live":
+                surface_source = "degraded"
+
+        snapshot_ts = datetime.now(tz=timezone.utc)
+        surface = {
+            "symbol": symbol.upper(),
+            "generated_at": snapshot_ts,
+            "dte": used_buckets,
+            "moneyness": moneyness_grid,
+            "iv_grid": iv_grid,
+            "metadata": {"source": surface_source, "cached": False},
+        }
+
+        if not used_buckets:
+            async with acquire_connection(pool, "options.surface") as conn:
+                fallback_surface = None
+                if not cached_surface:
+                    fallback_surface = await degraded_mode.fallback_surface_from_snapshot(conn, security_id)
+                if cached_surface or fallback_surface:
+                    async with conn.transaction():
+                        run_id = await _insert_run(conn, started_at, 0, status="partial")
+                        await _log_issues(conn, security_id, issues, run_id)
+            if cached_surface:
+                cached = dict(cached_surface.value)
+                meta = cached.setdefault("metadata", {})
+                meta["cached"] = True
+                return cached
+            if fallback_surface:
+                built = _build_surface_from_points(symbol, fallback_surface["points"], fallback_surface["snapshot_timestamp"])
+                built["metadata"] = {"source": "historical", "cached": False}
+                return built
+            raise ValueError("Unable to compute vol surface")
+
+        async with acquire_connection(pool, "options.surface") as conn:
+            async with conn.transaction():
+                run_id = await _insert_run(conn, started_at, len(used_buckets) * len(moneyness_grid))
+                chain_rows = [option for chain in chains for option in chain]
+                await _insert_option_chain(conn, security_id, chain_rows)
+                await _insert_surface_points(conn, points, run_id)
+                await _log_issues(conn, security_id, issues, run_id)
+        run_stats.record_rows(len(chain_rows) + len(points))
+        cache.set_cached_surface(symbol, surface, {"source": surface_source}, settings=settings)
+        refresh_policy.record_surface_refresh(symbol)
+        return surface
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Vol surface computation failed for %s: %s", symbol, exc)
+        async with acquire_connection(pool, "options.surface") as conn:
+            await _fail_run(conn, started_at, exc, {"symbol": symbol.upper()})
+        raise
+    finally:
+        if owns_client:
+            await client.close()
+
 
 async def get_recent_surfaces(symbol: str, limit: int = 5) -> List[Dict[str, Any]]:
-    pool = await get_pool()
-    async with pool.acquire() as conn:
+    pool = await get_pool(read_only=True)
+    async with acquire_connection(pool, "options.surface.read") as conn:
         security_id = await _get_security_id(conn, symbol)
         rows = await conn.fetch(
             """
@@ -228,7 +273,7 @@ async def get_recent_surfaces(symbol: str, limit: int = 5) -> List[Dict[str, Any
 
 async def get_surface_iv(symbol: str, target_dte: int, moneyness: float = 0.0) -> Optional[float]:
     pool = await get_pool()
-    async with pool.acquire() as conn:
+    async with acquire_connection(pool, "options.surface.read") as conn:
         security_id = await _get_security_id(conn, symbol)
         row = await conn.fetchrow(
             """
@@ -267,8 +312,7 @@ def _match_expiration_for_bucket(
     return best
 
 
-async def _process_bucket(
-    conn: asyncpg.Connection,
+def _process_bucket(
     security_id: int,
     chain: List[Dict[str, Any]],
     underlying_price: float,
@@ -276,8 +320,9 @@ async def _process_bucket(
     bucket_dte: int,
     moneyness_grid: List[float],
     settings: Settings,
-    run_id: int,
     chain_source: str,
+    points: List[Tuple[Any, ...]],
+    issues: List[Tuple[str, Dict[str, Any]]],
 ) -> List[Optional[float]]:
     snapshot_ts = datetime.now(tz=timezone.utc)
     iv_row: List[Optional[float]] = []
@@ -291,25 +336,13 @@ async def _process_bucket(
             settings.VOL_SURFACE_MIN_LIQUIDITY,
         )
         if not option:
-            await _log_issue(
-                conn,
-                security_id,
-                "vol_surface_missing_strike",
-                {"moneyness": m, "dte": bucket_dte},
-                run_id,
-            )
+            issues.append(("vol_surface_missing_strike", {"moneyness": m, "dte": bucket_dte}))
             iv_row.append(None)
             continue
 
         mid = PolygonOptionsClient.option_mid(option)
         if not mid or mid <= 0:
-            await _log_issue(
-                conn,
-                security_id,
-                "vol_surface_invalid_mid",
-                {"moneyness": m, "dte": bucket_dte},
-                run_id,
-            )
+            issues.append(("vol_surface_invalid_mid", {"moneyness": m, "dte": bucket_dte}))
             iv_row.append(None)
             continue
 
@@ -319,38 +352,54 @@ async def _process_bucket(
             continue
 
         iv_row.append(iv)
-        await conn.execute(
-            """
-            INSERT INTO vol_surface_points (
+        points.append(
+            (
                 security_id,
                 expiration,
-                dte,
-                moneyness,
-                strike,
-                implied_vol,
-                snapshot_timestamp,
-                ingestion_run_id,
-                raw_payload
+                bucket_dte,
+                m,
+                option["strike"],
+                iv,
+                snapshot_ts,
+                json.dumps(
+                    {
+                        "option": option["raw"],
+                        "chain_source": chain_source,
+                    },
+                    default=str,
+                ),
             )
-            VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9)
-            """,
-            security_id,
-            expiration,
-            bucket_dte,
-            m,
-            option["strike"],
-            iv,
-            snapshot_ts,
-            run_id,
-            {
-                "option": option["raw"],
-                "chain_source": chain_source,
-            },
         )
 
     return iv_row
 
 
+async def _insert_surface_points(
+    conn: asyncpg.Connection,
+    points: List[Tuple[Any, ...]],
+    run_id: int,
+) -> None:
+    if not points:
+        return
+    await conn.executemany(
+        """
+        INSERT INTO vol_surface_points (
+            security_id,
+            expiration,
+            dte,
+            moneyness,
+            strike,
+            implied_vol,
+            snapshot_timestamp,
+            raw_payload,
+            ingestion_run_id
+        )
+        VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9)
+        """,
+        [(*point, run_id) for point in points],
+    )
+
+
 def _calculate_iv_proxy(mid: float, underlying_price: float, dte: int) -> Optional[float]:
     if underlying_price <= 0 or dte <= 0:
         return None
@@ -361,10 +410,7 @@ def _calculate_iv_proxy(mid: float, underlying_price: float, dte: int) -> Option
 
 
 async def _get_security_id(conn: asyncpg.Connection, symbol: str) -> int:
-    security_id = await conn.fetchval(
-        "SELECT id FROM securities WHERE symbol=$1 LIMIT 1",
-        symbol.upper(),
-    )
+    security_id = await lookup_security_id(conn, symbol)
     if security_id is None:
         raise ValueError(f"Security {symbol} not found in securities table")
     return int(security_id)
@@ -433,72 +479,39 @@ async def _insert_option_chain(
     )
 
 
-async def _create_ingestion_run(conn: asyncpg.Connection) -> int:
-    row = await conn.fetchrow(
-        """
-        INSERT INTO ingestion_runs (source, target_table, status)
-        VALUES ('options_vol_surface', 'vol_surface_points', 'running')
-        RETURNING id
-        """
-    )
-    return int(row["id"])
-
-
-async def _complete_run(conn: asyncpg.Connection, run_id: int, rows_inserted: int) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='success', finished_at=NOW(), rows_inserted=$2
-        WHERE id=$1
-        """,
-        run_id,
-        rows_inserted,
-    )
+async def _insert_run(
+    conn: asyncpg.Connection,
+    started_at: datetime,
+    rows_inserted: int,
+    status: str = "success",
+) -> int:
+    return await insert_finished_run(conn, RUN_SOURCE, RUN_TARGET_TABLE, started_at, rows_inserted, status=status)
 
 
 async def _fail_run(
     conn: asyncpg.Connection,
-    run_id: int,
+    started_at: datetime,
     exc: Exception,
     context: Optional[Dict[str, Any]] = None,
 ) -> None:
-    await conn.execute(
-        """
-        UPDATE ingestion_runs
-        SET status='failed', finished_at=NOW(), error_message=$2
-        WHERE id=$1
-        """,
-        run_id,
-        str(exc),
-    )
-    await conn.execute(
-        """
-        INSERT INTO ingestion_errors (ingestion_run_id, context, payload, message)
-        VALUES ($1, $2, $3, $4)
-        """,
-        run_id,
-        json.dumps(context or {}),
-        "{}",
-        str(exc),
-    )
+    await record_failed_run(conn, RUN_SOURCE, RUN_TARGET_TABLE, started_at, exc, context)
 
 
-async def _log_issue(
+async def _log_issues(
     conn: asyncpg.Connection,
     security_id: int,
-    issue_type: str,
-    details: Dict[str, Any],
+    issues: List[Tuple[str, Dict[str, Any]]],
     ingestion_run_id: int,
 ) -> None:
-    await conn.execute(
-        """
-        INSERT INTO reconciliation_log (security_id, issue_type, severity, details, issue_timestamp, ingestion_run_id)
-        VALUES ($1, $2, 'WARN', $3, NOW(), $4)
-        """,
-        security_id,
-        issue_type,
-        json.dumps(details),
-        ingestion_run_id,
+    if not issues:
+        return
+    issue_ts = datetime.now(tz=timezone.utc)
+    await conn.executemany(
+        INSERT_RECONCILIATION_SQL,
+        [
+            (security_id, issue_type, "WARN", json.dumps(details), issue_ts, ingestion_run_id)
+            for issue_type, details in issues
+        ],
     )
 
 
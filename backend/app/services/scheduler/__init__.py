@@ -1,4 +1,4 @@
-from .scheduler import get_job_status, run_job_now, start_scheduler, stop_scheduler
+from .scheduler import get_job_status, is_leader, run_job_now, start_scheduler, stop_scheduler
 
-__all__ = ["start_scheduler", "stop_scheduler", "run_job_now", "get_job_status"]
+__all__ = ["start_scheduler", "stop_scheduler", "run_job_now", "get_job_status", "is_leader"]
 
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Dict, Iterable, List, Optional
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
 
 import asyncpg
 
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
-from app.db.connection import get_pool
+from app.db.connection import acquire_connection, get_pool
 from app.services.ingestion import (
     backfill_corp_actions,
     backfill_index_series,
@@ -16,6 +16,9 @@ from app.services.ingestion import (
 
 logger = get_logger("scheduler.backfill")
 
+# Called after each symbol as ``progress(rows=..., done=..., total=...)``.
+ProgressCallback = Callable[..., Awaitable[None]]
+
 INGESTION_MAP = {
     "ohlcv": backfill_ohlcv,
     "corp_actions": backfill_corp_actions,
@@ -30,23 +33,29 @@ async def run_backfill(
     end: date,
     *,
     settings: Optional[Settings] = None,
+    progress: Optional[ProgressCallback] = None,
 ) -> Dict[str, int | List[int]]:
     settings = settings or get_settings()
     func = INGESTION_MAP.get(ingestion_type)
     if func is None:
         raise ValueError(f"Unsupported ingestion type {ingestion_type}")
 
-    pool = await get_pool()
+    symbols = list(symbols)
+    pool = await get_pool("ingestion")
     successes = 0
     failures = 0
+    total_rows = 0
     manifest_ids: List[int] = []
 
-    async with pool.acquire() as conn:
-        for symbol in symbols:
+    async with acquire_connection(pool, "scheduler.backfill") as conn:
+        for done, symbol in enumerate(symbols, start=1):
             manifest_id = await _create_manifest(conn, ingestion_type, symbol, start, end)
             manifest_ids.append(manifest_id)
+            rows = 0
             try:
-                await func(symbol, start, end)
+                result = await func(symbol, start, end)
+                rows = result if isinstance(result, int) else 0
+                total_rows += rows
                 await _update_manifest(conn, manifest_id, "success")
                 successes += 1
                 logger.info("Backfill success %s %s", ingestion_type, symbol)
@@ -54,8 +63,10 @@ async def run_backfill(
                 await _update_manifest(conn, manifest_id, "failed")
                 logger.exception("Backfill failed for %s %s: %s", ingestion_type, symbol, exc)
                 failures += 1
+            if progress is not None:
+                await progress(rows=rows, done=done, total=len(symbols))
 
-    return {"success": successes, "failed": failures, "manifest_ids": manifest_ids}
+    return {"success": successes, "failed": failures, "rows": total_rows, "manifest_ids": manifest_ids}
 
 
 async def _create_manifest(
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import json
+import time
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from app.core import metrics, run_stats
+from app.core.logging import get_logger
+from app.core.run_stats import RunStats, SymbolStats
+from app.db.connection import acquire_connection, get_pool
+from app.services.audit import write_audit
+from app.services.scheduler.pipeline import PipelineResult, PipelineTask
+
+logger = get_logger("scheduler.history")
+
+# One statement records the run and its per-symbol rows, so it can go through the audit sink.
+INSERT_JOB_RUN_SQL = """
+    WITH run AS (
+        INSERT INTO job_runs (
+            job_id, trigger, status, started_at, finished_at, duration_ms,
+            rows_written, upstream_calls, symbols_failed, error
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+        RETURNING id
+    )
+    INSERT INTO job_run_symbols (job_run_id, symbol, status, duration_ms, rows_written, upstream_calls, error)
+    SELECT run.id, s.symbol, s.status, s.duration_ms, s.rows_written, s.upstream_calls, s.error
+    FROM run, jsonb_to_recordset($11::jsonb) AS s(
+        symbol TEXT, status TEXT, duration_ms DOUBLE PRECISION, rows_written BIGINT, upstream_calls INTEGER, error TEXT
+    )
+"""
+
+JOB_RUNS_SQL = """
+    SELECT r.id, r.job_id, r.trigger, r.status, r.started_at, r.finished_at, r.duration_ms,
+           r.rows_written, r.upstream_calls, r.symbols_failed, r.error,
+           COALESCE((
+               SELECT json_agg(json_build_object(
+                   'symbol', s.symbol, 'status', s.status, 'duration_ms', s.duration_ms,
+                   'rows_written', s.rows_written, 'upstream_calls', s.upstream_calls, 'error', s.error
+               ) ORDER BY s.symbol)
+               FROM job_run_symbols s WHERE s.job_run_id = r.id
+           ), '[]'::json) AS symbols
+    FROM job_runs r
+    WHERE $1::text IS NULL OR r.job_id = $1
+    ORDER BY r.started_at DESC
+    LIMIT $2
+"""
+
+# Percentiles over the last $1 days, with p50/p95 over the preceding window of the same
+# length alongside so a slowdown shows up as a trend before it overruns the nightly window.
+JOB_PERCENTILES_SQL = """
+    SELECT job_id,
+           COUNT(*) FILTER (WHERE started_at >= NOW() - make_interval(days => $1)) AS runs,
+           COUNT(*) FILTER (WHERE started_at >= NOW() - make_interval(days => $1) AND status <> 'succeeded') AS failures,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms)
+               FILTER (WHERE started_at >= NOW() - make_interval(days => $1)) AS p50,
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms)
+               FILTER (WHERE started_at >= NOW() - make_interval(days => $1)) AS p95,
+           percentile_cont(0.99) WITHIN GROUP (ORDER BY duration_ms)
+               FILTER (WHERE started_at >= NOW() - make_interval(days => $1)) AS p99,
+           MAX(duration_ms) FILTER (WHERE started_at >= NOW() - make_interval(days => $1)) AS max,
+           AVG(upstream_calls) FILTER (WHERE started_at >= NOW() - make_interval(days => $1)) AS avg_upstream_calls,
+           SUM(rows_written) FILTER (WHERE started_at >= NOW() - make_interval(days => $1)) AS rows_written,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms)
+               FILTER (WHERE started_at < NOW() - make_interval(days => $1)) AS previous_p50,
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms)
+               FILTER (WHERE started_at < NOW() - make_interval(days => $1)) AS previous_p95,
+           MAX(started_at) AS last_started_at
+    FROM job_runs
+    WHERE started_at >= NOW() - make_interval(days => $1 * 2)
+      AND ($2::text IS NULL OR job_id = $2)
+    GROUP BY job_id
+    ORDER BY job_id
+"""
+
+SYMBOL_PERCENTILES_SQL = """
+    SELECT r.job_id, s.symbol,
+           COUNT(*) AS runs,
+           COUNT(*) FILTER (WHERE s.status = 'failed') AS failures,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY s.duration_ms) AS p50,
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY s.duration_ms) AS p95,
+           percentile_cont(0.99) WITHIN GROUP (ORDER BY s.duration_ms) AS p99,
+           MAX(s.duration_ms) AS max,
+           AVG(s.upstream_calls) AS avg_upstream_calls,
+           SUM(s.rows_written) AS rows_written
+    FROM job_run_symbols s
+    JOIN job_runs r ON r.id = s.job_run_id
+    WHERE r.started_at >= NOW() - make_interval(days => $1)
+      AND ($2::text IS NULL OR r.job_id = $2)
+      AND s.status <> 'skipped'
+    GROUP BY r.job_id, s.symbol
+    ORDER BY r.job_id, s.symbol
+"""
+
+
+def _run_status(run: RunStats) -> str:
+    statuses = [entry.status for entry in run.symbols.values()]
+    if not statuses or all(status == "succeeded" for status in statuses):
+        return "succeeded"
+    if any(status == "succeeded" for status in statuses):
+        return "partial"
+    return "skipped" if all(status == "skipped" for status in statuses) else "failed"
+
+
+async def save_run(run: RunStats) -> None:
+    """Persist a finished run; failures are logged, never raised into the job."""
+    symbols = [
+        {
+            "symbol": entry.symbol,
+            "status": entry.status,
+            "duration_ms": entry.duration_ms,
+            "rows_written": entry.rows,
+            "upstream_calls": entry.upstream_calls,
+            "error": entry.error,
+        }
+        for entry in run.symbols.values()
+    ]
+    try:
+        pool = await get_pool("ingestion")
+        async with acquire_connection(pool, "scheduler.history") as conn:
+            await write_audit(
+                conn,
+                INSERT_JOB_RUN_SQL,
+                run.job_id,
+                run.trigger,
+                run.status,
+                run.started_at,
+                run.finished_at or datetime.now(tz=timezone.utc),
+                run.duration_ms,
+                run.rows,
+                run.upstream_calls,
+                run.symbols_failed,
+                run.error,
+                json.dumps(symbols),
+            )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Could not record run of %s: %s", run.job_id, exc)
+
+
+def _observe(run: RunStats) -> None:
+    metrics.observe("scheduler.job.ms", run.duration_ms, job=run.job_id, status=run.status)
+    logger.info(
+        "Job %s (%s) %s in %.0f ms: %s rows, %s upstream calls, %s symbol failure(s)",
+        run.job_id,
+        run.trigger,
+        run.status,
+        run.duration_ms,
+        run.rows,
+        run.upstream_calls,
+        run.symbols_failed,
+    )
+
+
+@asynccontextmanager
+async def record_run(job_id: str, *, trigger: str) -> AsyncIterator[RunStats]:
+    """Record one job run; upstream calls and rows inside the block are attributed to it."""
+    run = RunStats(job_id=job_id, trigger=trigger)
+    token = run_stats.bind_run(run)
+    try:
+        yield run
+    except BaseException as exc:
+        run.finish("failed", str(exc) or exc.__class__.__name__)
+        raise
+    else:
+        run.finish(_run_status(run))
+    finally:
+        run_stats.reset_run(token)
+        _observe(run)
+        await save_run(run)
+
+
+@asynccontextmanager
+async def track_symbol(symbol: str) -> AsyncIterator[Optional[SymbolStats]]:
+    """Time one symbol of the current run; a no-op outside ``record_run``."""
+    run = run_stats.current_run()
+    if run is None:
+        yield None
+        return
+    entry = SymbolStats(symbol=symbol.upper())
+    run.symbols[entry.symbol] = entry
+    token = run_stats.bind_symbol(entry)
+    started = time.perf_counter()
+    try:
+        yield entry
+        entry.status = "succeeded"
+    except Exception as exc:
+        entry.status = "failed"
+        entry.error = str(exc) or exc.__class__.__name__
+        raise
+    finally:
+        entry.duration_ms = (time.perf_counter() - started) * 1000
+        run_stats.reset_symbol(token)
+
+
+async def run_for_symbol(symbol: str, func: Callable[[str], Awaitable[Any]]) -> Any:
+    """Run ``func(symbol)`` under ``track_symbol``; an integer result counts as rows written.
+
+    Services returning richer results (the options ATM/surface ingests) report their own
+    rows through ``run_stats.record_rows``.
+    """
+    async with track_symbol(symbol):
+        result = await func(symbol)
+        if isinstance(result, int) and not isinstance(result, bool):
+            run_stats.record_rows(result)
+        return result
+
+
+class PipelineRecorder:
+    """Records every task of a pipeline as its own job run (trigger ``pipeline``).
+
+    Pipeline members are only scheduled through the DAG, so this is what feeds their
+    history. A task's run spans its first node start to its last node end.
+    """
+
+    def __init__(self, tasks: Sequence[PipelineTask]) -> None:
+        self.runs: Dict[str, RunStats] = {task.name: RunStats(job_id=task.name, trigger="pipeline") for task in tasks}
+        self._spans: Dict[str, List[float]] = {}
+
+    def wrap(self, tasks: Sequence[PipelineTask]) -> List[PipelineTask]:
+        return [replace(task, run=self._node(task.name, task.run)) for task in tasks]
+
+    def _node(self, name: str, func: Callable[[str], Awaitable[Any]]) -> Callable[[str], Awaitable[Any]]:
+        run = self.runs[name]
+
+        async def call(symbol: str) -> Any:
+            now = time.perf_counter()
+            span = self._spans.setdefault(name, [now, now])
+            if not run.symbols:
+                run.started_at = datetime.now(tz=timezone.utc)
+            token = run_stats.bind_run(run)
+            try:
+                return await run_for_symbol(symbol, func)
+            finally:
+                run_stats.reset_run(token)
+                span[1] = time.perf_counter()
+
+        return call
+
+    async def finish(self, result: PipelineResult) -> List[RunStats]:
+        for (name, symbol), node in result.nodes.items():
+            run = self.runs[name]
+            if node.status == "skipped":
+                run.symbols[symbol.upper()] = SymbolStats(symbol=symbol.upper(), status="skipped", error=node.error)
+        finished = list(self.runs.values())
+        for run in finished:
+            span = self._spans.get(run.job_id)
+            run.finish(_run_status(run))
+            run.duration_ms = (span[1] - span[0]) * 1000 if span else 0.0
+            _observe(run)
+            await save_run(run)
+        return finished
+
+
+async def get_job_runs(job_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    pool = await get_pool("api", read_only=True)
+    async with acquire_connection(pool, "scheduler.history.runs") as conn:
+        rows = await conn.fetch(JOB_RUNS_SQL, job_id, limit)
+    runs = []
+    for row in rows:
+        run = dict(row)
+        symbols = run.get("symbols")
+        run["symbols"] = json.loads(symbols) if isinstance(symbols, str) else symbols
+        runs.append(run)
+    return runs
+
+
+async def get_job_runtimes(*, days: int = 7, job_id: Optional[str] = None) -> Dict[str, Any]:
+    """p50/p95/p99 durations per job and per (job, symbol) over the last ``days`` days."""
+    pool = await get_pool("api", read_only=True)
+    async with acquire_connection(pool, "scheduler.history.runtimes") as conn:
+        jobs = await conn.fetch(JOB_PERCENTILES_SQL, days, job_id)
+        symbols = await conn.fetch(SYMBOL_PERCENTILES_SQL, days, job_id)
+    return {
+        "window_days": days,
+        "jobs": [dict(row) for row in jobs if row["runs"]],
+        "symbols": [dict(row) for row in symbols],
+    }
@@ -1,50 +1,82 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta, timezone
+from typing import Mapping, Optional, Sequence
 
+from app.core import run_stats
+from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.services.ingestion import update_corp_actions, update_index_series, update_ohlcv
-from app.services.options.atm_straddle import ingest_atm_straddle
+from app.services.options.atm_straddle import ingest_atm_term_structure
+from app.services.options.contracts import refresh_option_contracts
 from app.services.options.vol_surface import compute_surface
+from app.services.securities.universe import load_universe
+from app.services.scheduler.history import PipelineRecorder, run_for_symbol
+from app.services.scheduler.pipeline import PipelineResult, PipelineTask, run_pipeline
 from app.services.validation.reconciliation import run_validation
 
 logger = get_logger("scheduler.jobs")
 
-OPTIONS_UNIVERSE = ("AAPL", "MSFT", "GOOGL")
+# Universe names (see app.services.securities.universe); members come from securities.tags
+# and each worker only sees its own shard.
+EQUITY_UNIVERSE = "equities"
+INDEX_UNIVERSE = "indexes"
+OPTIONS_UNIVERSE = "options"
+VALIDATION_UNIVERSE = "validation"
+
 
 async def job_update_ohlcv() -> None:
     logger.info("Starting OHLCV daily update")
-    for symbol in ("AAPL", "MSFT", "GOOGL"):
-        await update_ohlcv(symbol)
+    for symbol in await load_universe(EQUITY_UNIVERSE):
+        await run_for_symbol(symbol, update_ohlcv)
     logger.info("Completed OHLCV daily update")
 
 
 async def job_update_corp_actions() -> None:
     logger.info("Starting corporate actions daily update")
-    for symbol in ("AAPL", "MSFT", "GOOGL"):
-        await update_corp_actions(symbol)
+    for symbol in await load_universe(EQUITY_UNIVERSE):
+        await run_for_symbol(symbol, update_corp_actions)
     logger.info("Completed corporate actions daily update")
 
 
 async def job_update_indexes() -> None:
     logger.info("Starting index/macro daily update")
-    for symbol in ("SPX", "NDX", "VIX", "TNX", "SPY", "QQQ"):
-        await update_index_series(symbol)
+    for symbol in await load_universe(INDEX_UNIVERSE):
+        await run_for_symbol(symbol, update_index_series)
     logger.info("Completed index/macro daily update")
 
 
 async def job_validation_sweep() -> None:
     logger.info("Starting validation sweep")
-    today = date.today()
-    await run_validation("SPY", datetime.combine(today - timedelta(days=30), datetime.min.time(), tzinfo=timezone.utc), datetime.now(tz=timezone.utc))
+    for symbol in await load_universe(VALIDATION_UNIVERSE):
+        await run_for_symbol(symbol, _validate)
     logger.info("Completed validation sweep")
 
 
+async def _validate(symbol: str) -> None:
+    today = date.today()
+    await run_validation(
+        symbol,
+        datetime.combine(today - timedelta(days=30), datetime.min.time(), tzinfo=timezone.utc),
+        datetime.now(tz=timezone.utc),
+    )
+
+
+async def job_refresh_option_contracts() -> None:
+    logger.info("Refreshing option contract reference for options universe")
+    for symbol in await load_universe(OPTIONS_UNIVERSE):
+        try:
+            await run_for_symbol(symbol, refresh_option_contracts)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Option contract refresh failed for %s: %s", symbol, exc)
+    logger.info("Option contract refresh job complete")
+
+
 async def job_refresh_options_atm() -> None:
-    logger.info("Refreshing ATM straddles for options universe")
-    for symbol in OPTIONS_UNIVERSE:
+    logger.info("Refreshing ATM term structures for options universe")
+    for symbol in await load_universe(OPTIONS_UNIVERSE):
         try:
-            await ingest_atm_straddle(symbol)
+            await run_for_symbol(symbol, ingest_atm_term_structure)
         except Exception as exc:  # noqa: BLE001
             logger.exception("ATM refresh failed for %s: %s", symbol, exc)
     logger.info("ATM refresh job complete")
@@ -52,10 +84,64 @@ async def job_refresh_options_atm() -> None:
 
 async def job_refresh_options_surface() -> None:
     logger.info("Refreshing vol surfaces for options universe")
-    for symbol in OPTIONS_UNIVERSE:
+    for symbol in await load_universe(OPTIONS_UNIVERSE):
         try:
-            await compute_surface(symbol)
+            await run_for_symbol(symbol, compute_surface)
         except Exception as exc:  # noqa: BLE001
             logger.exception("Surface refresh failed for %s: %s", symbol, exc)
     logger.info("Surface refresh job complete")
 
+
+def nightly_pipeline(universes: Optional[Mapping[str, Sequence[str]]] = None) -> list[PipelineTask]:
+    """Nightly DAG; names match JOB_DEFINITIONS so manual single-job runs stay available.
+
+    ``universes`` maps universe names to this shard's symbols (empty when omitted, which is
+    enough to inspect the task graph). Callables are looked up at run time so tests (and
+    hot patches) can replace them.
+    """
+    universes = universes or {}
+    equities = tuple(universes.get(EQUITY_UNIVERSE, ()))
+    indexes = tuple(universes.get(INDEX_UNIVERSE, ()))
+    options = tuple(universes.get(OPTIONS_UNIVERSE, ()))
+    validation = tuple(universes.get(VALIDATION_UNIVERSE, ()))
+    return [
+        PipelineTask("update_ohlcv", lambda symbol: update_ohlcv(symbol), equities),
+        PipelineTask("update_corp_actions", lambda symbol: update_corp_actions(symbol), equities),
+        PipelineTask("update_indexes", lambda symbol: update_index_series(symbol), indexes),
+        PipelineTask(
+            "validation_sweep",
+            lambda symbol: _validate(symbol),
+            validation,
+            depends_on=("update_indexes", "update_corp_actions"),
+        ),
+        PipelineTask("refresh_option_contracts", lambda symbol: refresh_option_contracts(symbol), options),
+        PipelineTask(
+            "refresh_options_atm",
+            lambda symbol: ingest_atm_term_structure(symbol),
+            options,
+            depends_on=("update_ohlcv", "refresh_option_contracts"),
+        ),
+        PipelineTask(
+            "refresh_options_surface",
+            lambda symbol: compute_surface(symbol),
+            options,
+            depends_on=("refresh_options_atm",),
+        ),
+    ]
+
+
+async def job_nightly_pipeline() -> PipelineResult:
+    settings = get_settings()
+    universes = {
+        name: await load_universe(name, settings=settings)
+        for name in (EQUITY_UNIVERSE, INDEX_UNIVERSE, OPTIONS_UNIVERSE, VALIDATION_UNIVERSE)
+    }
+    tasks = nightly_pipeline(universes)
+    recorder = PipelineRecorder(tasks)
+    result = await run_pipeline("nightly", recorder.wrap(tasks), concurrency=settings.PIPELINE_CONCURRENCY)
+    task_runs = await recorder.finish(result)
+    pipeline_run = run_stats.current_run()
+    if pipeline_run is not None:
+        pipeline_run.rows += sum(run.rows for run in task_runs)
+        pipeline_run.upstream_calls += sum(run.upstream_calls for run in task_runs)
+    return result
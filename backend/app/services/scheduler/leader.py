@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import asyncpg
+
+from app.core import metrics
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.connection import open_connection
+from app.services.securities.universe import current_shard
+
+logger = get_logger("scheduler.leader")
+
+ConnectionFactory = Callable[[], Awaitable[asyncpg.Connection]]
+
+
+class JobLockedError(Exception):
+    """Raised when a job is already running on another replica."""
+
+
+def leader_lock_key(settings: Settings) -> int:
+    index, _ = current_shard(settings)
+    return settings.SCHEDULER_LEADER_LOCK_ID + index
+
+
+def job_lock_name(job_id: str, settings: Settings) -> str:
+    """Lock name for ``job_id`` on the current shard; shards run the same job concurrently."""
+    index, count = current_shard(settings)
+    return job_id if count == 1 else f"{job_id}@{index}"
+
+
+class LeaderElector:
+    """Holds a session-level advisory lock on a dedicated connection while leader.
+
+    Every replica runs the elector; only the one holding the lock for its shard
+    (``SCHEDULER_LEADER_LOCK_ID + SCHEDULER_SHARD_INDEX``) fires scheduled jobs, so each
+    shard has exactly one leader. Postgres drops the lock with the session, so if the leader dies (or its
+    connection does) another replica acquires it on its next attempt, within
+    ``SCHEDULER_LEADER_RETRY_SECONDS``. The lock lives on its own connection because pooled
+    connections run ``pg_advisory_unlock_all()`` when released.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        connect: ConnectionFactory = open_connection,
+    ) -> None:
+        self.settings = settings or get_settings()
+        self._connect = connect
+        self._conn: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self.is_leader = False
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        await self.try_acquire()
+        self._task = asyncio.create_task(self._run(), name="scheduler-leader")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._drop()
+
+    async def try_acquire(self) -> bool:
+        """Confirm leadership if held, otherwise attempt to take it."""
+        try:
+            if self._conn is not None:
+                await self._conn.fetchval("SELECT 1")
+                return True
+            conn = await self._connect()
+            acquired = await conn.fetchval("SELECT pg_try_advisory_lock($1)", leader_lock_key(self.settings))
+            if not acquired:
+                await conn.close()
+                return False
+            self._conn = conn
+            self._set_leader(True)
+            logger.info("Acquired scheduler leadership")
+            return True
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+            logger.warning("Scheduler leadership check failed: %s", exc)
+            await self._drop()
+            return False
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(max(self.settings.SCHEDULER_LEADER_RETRY_SECONDS, 1))
+            await self.try_acquire()
+
+    async def _drop(self) -> None:
+        if self.is_leader:
+            logger.warning("Scheduler leadership released")
+        self._set_leader(False)
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close()
+            except Exception:  # noqa: BLE001
+                conn.terminate()
+
+    def _set_leader(self, value: bool) -> None:
+        self.is_leader = value
+        metrics.set_gauge("scheduler.leader", 1 if value else 0)
+
+
+@asynccontextmanager
+async def job_lock(
+    job_id: str,
+    *,
+    settings: Optional[Settings] = None,
+    connect: Optional[ConnectionFactory] = None,
+) -> AsyncIterator[None]:
+    """Cluster-wide mutual exclusion for one job (scheduled or manual); raises JobLockedError."""
+    settings = settings or get_settings()
+    name = job_lock_name(job_id, settings)
+    conn = await (connect or open_connection)()
+    try:
+        acquired = await conn.fetchval(
+            "SELECT pg_try_advisory_lock($1, hashtext($2))", settings.SCHEDULER_LEADER_LOCK_ID, name
+        )
+        if not acquired:
+            raise JobLockedError(f"Job {name} is already running on another replica")
+        try:
+            yield
+        finally:
+            await conn.execute(
+                "SELECT pg_advisory_unlock($1, hashtext($2))", settings.SCHEDULER_LEADER_LOCK_ID, name
+            )
+    finally:
+        await conn.close()
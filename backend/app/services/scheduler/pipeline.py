@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.core import metrics
+from app.core.logging import get_logger
+
+logger = get_logger("scheduler.pipeline")
+
+NodeKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class PipelineTask:
+    """One job of the pipeline, run once per symbol.
+
+    For every dependency, a symbol waits only for the same symbol of the upstream task
+    when the upstream covers it, and for the whole upstream task otherwise. That lets AAPL's
+    surface start as soon as AAPL's straddles land, while a task over a different universe
+    (validation of SPY after corp actions) still waits for all of its upstream.
+    """
+
+    name: str
+    run: Callable[[str], Awaitable[Any]]
+    symbols: Sequence[str]
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class NodeResult:
+    status: str = "pending"
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class PipelineResult:
+    name: str
+    nodes: Dict[NodeKey, NodeResult] = field(default_factory=dict)
+    duration_ms: float = 0.0
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        counts: Dict[str, Dict[str, int]] = {}
+        for (task, _), node in self.nodes.items():
+            task_counts = counts.setdefault(task, {})
+            task_counts[node.status] = task_counts.get(node.status, 0) + 1
+        return counts
+
+    @property
+    def failed(self) -> List[NodeKey]:
+        return [key for key, node in self.nodes.items() if node.status == "failed"]
+
+
+def _prerequisites(tasks: Dict[str, PipelineTask]) -> Dict[NodeKey, List[NodeKey]]:
+    prerequisites: Dict[NodeKey, List[NodeKey]] = {}
+    for task in tasks.values():
+        for symbol in task.symbols:
+            needs: List[NodeKey] = []
+            for dependency in task.depends_on:
+                upstream = tasks[dependency]
+                if symbol in upstream.symbols:
+                    needs.append((dependency, symbol))
+                else:
+                    needs.extend((dependency, other) for other in upstream.symbols)
+            prerequisites[(task.name, symbol)] = needs
+    return prerequisites
+
+
+def validate(tasks: Sequence[PipelineTask]) -> Dict[str, PipelineTask]:
+    """Index tasks by name, rejecting unknown dependencies and cycles."""
+    by_name = {task.name: task for task in tasks}
+    if len(by_name) != len(tasks):
+        raise ValueError("Pipeline task names must be unique")
+    for task in tasks:
+        unknown = [dep for dep in task.depends_on if dep not in by_name]
+        if unknown:
+            raise ValueError(f"Task {task.name} depends on unknown task(s) {unknown}")
+
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Pipeline has a dependency cycle through {name}")
+        visiting.add(name)
+        for dependency in by_name[name].depends_on:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in by_name:
+        visit(name)
+    return by_name
+
+
+async def run_pipeline(name: str, tasks: Sequence[PipelineTask], *, concurrency: int = 4) -> PipelineResult:
+    """Run every (task, symbol) node as soon as its prerequisites have succeeded.
+
+    Nodes whose prerequisites failed (or were skipped) are skipped rather than run on
+    missing data. At most ``concurrency`` nodes run at once.
+    """
+    by_name = validate(tasks)
+    prerequisites = _prerequisites(by_name)
+    result = PipelineResult(name=name, nodes={key: NodeResult() for key in prerequisites})
+    finished = {key: asyncio.Event() for key in prerequisites}
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    started = time.perf_counter()
+
+    async def run_node(key: NodeKey) -> None:
+        node = result.nodes[key]
+        try:
+            for needed in prerequisites[key]:
+                await finished[needed].wait()
+            blocked = [needed for needed in prerequisites[key] if result.nodes[needed].status != "succeeded"]
+            if blocked:
+                node.status = "skipped"
+                node.error = f"upstream not complete: {blocked[0][0]}:{blocked[0][1]}"
+                return
+            async with semaphore:
+                node_started = time.perf_counter()
+                try:
+                    await by_name[key[0]].run(key[1])
+                    node.status = "succeeded"
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("Pipeline %s: %s for %s failed: %s", name, key[0], key[1], exc)
+                    node.status = "failed"
+                    node.error = str(exc)
+                finally:
+                    node.duration_ms = (time.perf_counter() - node_started) * 1000
+                    metrics.observe("scheduler.pipeline.node_ms", node.duration_ms, pipeline=name, task=key[0])
+        finally:
+            finished[key].set()
+
+    logger.info("Pipeline %s starting with %s nodes", name, len(prerequisites))
+    await asyncio.gather(*(run_node(key) for key in prerequisites))
+    result.duration_ms = (time.perf_counter() - started) * 1000
+    metrics.observe("scheduler.pipeline.ms", result.duration_ms, pipeline=name)
+    logger.info("Pipeline %s finished in %.0f ms: %s", name, result.duration_ms, result.summary())
+    return result
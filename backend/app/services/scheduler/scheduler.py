@@ -1,45 +1,83 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
+from app.services.options import refresher as intraday
 from app.services.scheduler import jobs
+from app.services.scheduler.history import record_run
+from app.services.scheduler.leader import JobLockedError, LeaderElector, job_lock
 
 logger = get_logger("scheduler")
 
 _scheduler: Optional[AsyncIOScheduler] = None
+_elector: Optional[LeaderElector] = None
+_refresher: Optional[intraday.IntradayRefresher] = None
 
 JOB_DEFINITIONS = {
     "update_ohlcv": jobs.job_update_ohlcv,
     "update_corp_actions": jobs.job_update_corp_actions,
     "update_indexes": jobs.job_update_indexes,
     "validation_sweep": jobs.job_validation_sweep,
+    "refresh_option_contracts": jobs.job_refresh_option_contracts,
     "refresh_options_atm": jobs.job_refresh_options_atm,
     "refresh_options_surface": jobs.job_refresh_options_surface,
+    "nightly_pipeline": jobs.job_nightly_pipeline,
 }
 
-JOB_SCHEDULES = {
+# Members of the nightly pipeline are registered paused: the DAG runner sequences them by
+# dependency instead of fixed cron offsets, and they remain available to run_job_now.
+# They keep their former cron slot, so resuming one restores that slot.
+JOB_SCHEDULES: Dict[str, Dict[str, Any]] = {
+    "nightly_pipeline": {"hour": 1, "minute": 0},
     "update_ohlcv": {"hour": 1, "minute": 0},
     "update_corp_actions": {"hour": 2, "minute": 0},
     "update_indexes": {"hour": 3, "minute": 0},
     "validation_sweep": {"hour": 4, "minute": 0},
+    "refresh_option_contracts": {"hour": 4, "minute": 30},
     "refresh_options_atm": {"hour": 5, "minute": 0},
     "refresh_options_surface": {"hour": 5, "minute": 30},
 }
 
+PIPELINE_MEMBERS = {task.name for task in jobs.nightly_pipeline()}
+
+
+def _leader_only(job_id: str, func: Callable[[], Awaitable[Any]], settings: Settings) -> Callable[[], Awaitable[None]]:
+    """Scheduled entry point: every replica's scheduler fires, only the leader runs the job."""
+
+    async def run() -> None:
+        if not settings.SCHEDULER_LEADER_ELECTION:
+            async with record_run(job_id, trigger="scheduled"):
+                await func()
+            return
+        if _elector is None or not _elector.is_leader:
+            logger.debug("Skipping %s: not the scheduler leader", job_id)
+            return
+        try:
+            async with job_lock(job_id, settings=settings), record_run(job_id, trigger="scheduled"):
+                await func()
+        except JobLockedError as exc:
+            logger.warning("Skipping %s: %s", job_id, exc)
+
+    return run
+
 
 def register_jobs(scheduler: AsyncIOScheduler, settings: Optional[Settings] = None) -> None:
     settings = settings or get_settings()
     for job_id, func in JOB_DEFINITIONS.items():
-        schedule = JOB_SCHEDULES.get(job_id)
-        if schedule is None:
+        schedule: Dict[str, Any]
+        if job_id in JOB_SCHEDULES:
+            schedule = dict(JOB_SCHEDULES[job_id])
+        else:
             interval = max(settings.JOB_INTERVAL_MINUTES, 1)
             schedule = {"minute": f"*/{interval}"}
+        if job_id in PIPELINE_MEMBERS:
+            schedule["next_run_time"] = None
         scheduler.add_job(
-            func,
+            _leader_only(job_id, func, settings),
             trigger="cron",
             id=job_id,
             replace_existing=True,
@@ -55,7 +93,16 @@ async def start_scheduler(settings: Optional[Settings] = None) -> bool:
         logger.info("Scheduler disabled via settings")
         return False
 
-    global _scheduler
+    global _scheduler, _elector, _refresher
+    if settings.SCHEDULER_LEADER_ELECTION and _elector is None:
+        _elector = LeaderElector(settings=settings)
+        await _elector.start()
+    if settings.OPTIONS_INTRADAY_REFRESH_ENABLED and _refresher is None:
+        # Runs next to the cron jobs and, like them, only does work on the leader.
+        _refresher = intraday.IntradayRefresher(
+            settings, is_leader=is_leader if settings.SCHEDULER_LEADER_ELECTION else None
+        )
+        await _refresher.start()
     if _scheduler is None:
         _scheduler = AsyncIOScheduler(timezone=settings.SCHEDULER_TIMEZONE)
         register_jobs(_scheduler, settings=settings)
@@ -67,11 +114,17 @@ async def start_scheduler(settings: Optional[Settings] = None) -> bool:
 
 
 async def stop_scheduler() -> None:
-    global _scheduler
+    global _scheduler, _elector, _refresher
+    if _refresher is not None:
+        await _refresher.stop()
+        _refresher = None
     if _scheduler and _scheduler.running:
         _scheduler.shutdown(wait=False)
         logger.info("Scheduler stopped")
     _scheduler = None
+    if _elector is not None:
+        await _elector.stop()
+        _elector = None
 
 
 async def run_job_now(job_id: str) -> None:
@@ -79,7 +132,18 @@ async def run_job_now(job_id: str) -> None:
     if not func:
         raise ValueError(f"Unknown job {job_id}")
     logger.info("Manually running job %s", job_id)
-    await func()
+    settings = get_settings()
+    if not settings.SCHEDULER_LEADER_ELECTION:
+        async with record_run(job_id, trigger="manual"):
+            await func()
+        return
+    # Manual runs may land on any replica; the job lock still keeps them exclusive.
+    async with job_lock(job_id, settings=settings), record_run(job_id, trigger="manual"):
+        await func()
+
+
+def is_leader() -> bool:
+    return _elector is not None and _elector.is_leader
 
 
 def get_job_status() -> Dict[str, Dict[str, str]]:
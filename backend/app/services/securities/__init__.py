@@ -0,0 +1,37 @@
+from .registry import (
+    SecurityRecord,
+    ensure_security,
+    get_cached_security,
+    invalidate_registry,
+    invalidate_security,
+    lookup_security_id,
+    preload_securities,
+    resolve_security_ids,
+    warm_security_registry,
+)
+from .universe import (
+    UNIVERSES,
+    Universe,
+    current_shard,
+    load_universe,
+    shard_for,
+    shard_scope,
+)
+
+__all__ = [
+    "SecurityRecord",
+    "preload_securities",
+    "warm_security_registry",
+    "resolve_security_ids",
+    "lookup_security_id",
+    "ensure_security",
+    "get_cached_security",
+    "invalidate_security",
+    "invalidate_registry",
+    "Universe",
+    "UNIVERSES",
+    "load_universe",
+    "shard_for",
+    "shard_scope",
+    "current_shard",
+]
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+
+import asyncpg
+
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.connection import acquire_connection, get_pool
+
+logger = get_logger("securities.registry")
+
+_SELECT_SECURITIES = "SELECT id, symbol, type, is_active FROM securities"
+
+
+@dataclass(frozen=True)
+class SecurityRecord:
+    id: int
+    symbol: str
+    type: str
+    is_active: bool
+
+
+_by_symbol: Dict[str, SecurityRecord] = {}
+_loaded_at: Optional[datetime] = None
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _symbol(symbol: str) -> str:
+    return symbol.upper()
+
+
+def _remember(row: Any) -> None:
+    record = SecurityRecord(
+        id=int(row["id"]),
+        symbol=_symbol(row["symbol"]),
+        type=row["type"],
+        is_active=bool(row["is_active"]),
+    )
+    # securities is unique on (symbol, type); keep the lowest id like the old LIMIT 1 lookups.
+    _by_symbol.setdefault(record.symbol, record)
+
+
+def _expire_if_stale(settings: Settings) -> None:
+    global _loaded_at
+    if _loaded_at is None:
+        return
+    if (_now() - _loaded_at).total_seconds() >= settings.SECURITIES_REGISTRY_TTL:
+        _by_symbol.clear()
+        _loaded_at = None
+
+
+async def preload_securities(conn: asyncpg.Connection) -> int:
+    """Replace the registry contents with the full securities table."""
+    global _loaded_at
+    rows = await conn.fetch(f"{_SELECT_SECURITIES} ORDER BY id")
+    _by_symbol.clear()
+    for row in rows:
+        _remember(row)
+    _loaded_at = _now()
+    return len(_by_symbol)
+
+
+async def warm_security_registry() -> None:
+    pool = await get_pool()
+    async with acquire_connection(pool, "securities.registry") as conn:
+        count = await preload_securities(conn)
+    logger.info("Security registry preloaded (%s symbols)", count)
+
+
+async def resolve_security_ids(
+    conn: asyncpg.Connection,
+    symbols: Iterable[str],
+    *,
+    settings: Optional[Settings] = None,
+) -> Dict[str, int]:
+    """Map symbols to security ids, fetching every cache miss in a single query.
+
+    Symbols that do not exist are omitted from the result; misses are never cached.
+    """
+    global _loaded_at
+    settings = settings or get_settings()
+    _expire_if_stale(settings)
+
+    wanted = list(dict.fromkeys(_symbol(symbol) for symbol in symbols))
+    missing = [symbol for symbol in wanted if symbol not in _by_symbol]
+    if missing:
+        rows = await conn.fetch(
+            f"{_SELECT_SECURITIES} WHERE symbol = ANY($1::text[]) ORDER BY id",
+            missing,
+        )
+        for row in rows:
+            _remember(row)
+        if _loaded_at is None:
+            _loaded_at = _now()
+    return {symbol: _by_symbol[symbol].id for symbol in wanted if symbol in _by_symbol}
+
+
+async def lookup_security_id(
+    conn: asyncpg.Connection,
+    symbol: str,
+    *,
+    settings: Optional[Settings] = None,
+) -> Optional[int]:
+    resolved = await resolve_security_ids(conn, [symbol], settings=settings)
+    return resolved.get(_symbol(symbol))
+
+
+async def ensure_security(
+    conn: asyncpg.Connection,
+    symbol: str,
+    security_type: str,
+    *,
+    settings: Optional[Settings] = None,
+) -> int:
+    existing = await lookup_security_id(conn, symbol, settings=settings)
+    if existing is not None:
+        return existing
+
+    row = await conn.fetchrow(
+        """
+        INSERT INTO securities (symbol, type, is_active)
+        VALUES ($1, $2, true)
+        RETURNING id
+        """,
+        _symbol(symbol),
+        security_type,
+    )
+    invalidate_security(symbol)
+    _remember({"id": row["id"], "symbol": symbol, "type": security_type, "is_active": True})
+    return int(row["id"])
+
+
+def get_cached_security(symbol: str) -> Optional[SecurityRecord]:
+    return _by_symbol.get(_symbol(symbol))
+
+
+def invalidate_security(symbol: str) -> None:
+    _by_symbol.pop(_symbol(symbol), None)
+
+
+def invalidate_registry() -> None:
+    global _loaded_at
+    _by_symbol.clear()
+    _loaded_at = None
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.config import Settings, get_settings
+from app.core.logging import get_logger
+from app.db.connection import acquire_connection, get_pool
+
+logger = get_logger("securities.universe")
+
+UNIVERSE_SQL = """
+    SELECT DISTINCT symbol FROM securities
+    WHERE is_active
+      AND tags @> ARRAY[$1]::text[]
+      AND ($2::text[] IS NULL OR type = ANY($2::text[]))
+    ORDER BY symbol
+"""
+
+
+@dataclass(frozen=True)
+class Universe:
+    """Active securities tagged ``tag``, optionally restricted to some security types."""
+
+    name: str
+    tag: str
+    types: Tuple[str, ...] = ()
+
+
+EQUITIES = Universe("equities", "equities", ("stock", "etf"))
+INDEXES = Universe("indexes", "indexes")
+OPTIONS = Universe("options", "options", ("stock", "etf"))
+VALIDATION = Universe("validation", "validation")
+
+UNIVERSES: Dict[str, Universe] = {universe.name: universe for universe in (EQUITIES, INDEXES, OPTIONS, VALIDATION)}
+
+_shard_override: ContextVar[Optional[int]] = ContextVar("universe_shard", default=None)
+
+
+def shard_for(symbol: str, shard_count: int) -> int:
+    """Stable shard of ``symbol``: the same on every process and run, unlike ``hash()``."""
+    if shard_count <= 1:
+        return 0
+    digest = hashlib.blake2b(symbol.upper().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+def current_shard(settings: Optional[Settings] = None) -> Tuple[int, int]:
+    """(shard index, shard count) for this process, honouring ``shard_scope``."""
+    settings = settings or get_settings()
+    count = max(settings.SCHEDULER_SHARD_COUNT, 1)
+    override = _shard_override.get()
+    index = settings.SCHEDULER_SHARD_INDEX if override is None else override
+    if not 0 <= index < count:
+        raise ValueError(f"Shard index {index} outside 0..{count - 1}")
+    return index, count
+
+
+@contextmanager
+def shard_scope(index: int) -> Iterator[None]:
+    """Run universe lookups as shard ``index`` (manual runs fanned out per shard)."""
+    token = _shard_override.set(index)
+    try:
+        yield
+    finally:
+        _shard_override.reset(token)
+
+
+def in_shard(symbols: Iterable[str], index: int, count: int) -> List[str]:
+    return [symbol for symbol in symbols if shard_for(symbol, count) == index]
+
+
+async def load_universe(name: str, *, settings: Optional[Settings] = None) -> Tuple[str, ...]:
+    """Symbols of universe ``name`` that belong to this worker's shard."""
+    universe = UNIVERSES.get(name)
+    if universe is None:
+        raise ValueError(f"Unknown universe {name}")
+    index, count = current_shard(settings)
+    pool = await get_pool("ingestion", read_only=True)
+    async with acquire_connection(pool, "securities.universe") as conn:
+        rows = await conn.fetch(UNIVERSE_SQL, universe.tag, list(universe.types) or None)
+    symbols = in_shard((row["symbol"].upper() for row in rows), index, count)
+    logger.info("Universe %s shard %s/%s: %s of %s symbols", name, index, count, len(symbols), len(rows))
+    return tuple(symbols)
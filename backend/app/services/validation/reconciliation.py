@@ -8,7 +8,9 @@ import asyncpg
 
 from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
-from app.db.connection import get_pool
+from app.db.connection import acquire_connection, get_pool
+from app.services.audit import INSERT_RECONCILIATION_SQL, write_audit_many
+from app.services.securities import resolve_security_ids
 from app.services.validation import validators
 
 logger = get_logger("validation")
@@ -22,8 +24,8 @@ async def run_validation(
     settings: Optional[Settings] = None,
 ) -> int:
     settings = settings or get_settings()
-    pool = await get_pool()
-    async with pool.acquire() as conn:
+    pool = await get_pool("analytics")
+    async with acquire_connection(pool, "validation.run") as conn:
         security = await _get_security(conn, symbol)
         rows = await _fetch_prices(conn, security["id"], start, end)
         corp_actions = await _fetch_corp_actions(conn, security["id"], start, end)
@@ -54,9 +56,9 @@ async def run_reconciliation(
         raise ValueError("reconciliation requires at least two symbols")
 
     settings = settings or get_settings()
-    pool = await get_pool()
-    async with pool.acquire() as conn:
-        securities = [await _get_security(conn, sym) for sym in symbols]
+    pool = await get_pool("analytics")
+    async with acquire_connection(pool, "validation.reconciliation") as conn:
+        securities = await _get_securities(conn, symbols)
         issues = []
 
         base_rows = await _fetch_prices(conn, securities[0]["id"], start, end)
@@ -79,13 +81,8 @@ async def _insert_issues(
     issues: Iterable[Dict[str, Any]],
     ingestion_run_id: Optional[int],
 ) -> int:
-    count = 0
-    for issue in issues:
-        await conn.execute(
-            """
-            INSERT INTO reconciliation_log (security_id, issue_type, severity, details, issue_timestamp, ingestion_run_id)
-            VALUES ($1, $2, $3, $4, $5, $6)
-            """,
+    rows = [
+        (
             issue["security_id"],
             issue["issue_type"],
             issue["severity"],
@@ -93,15 +90,25 @@ async def _insert_issues(
             issue["issue_timestamp"],
             ingestion_run_id,
         )
-        count += 1
-    return count
+        for issue in issues
+    ]
+    await write_audit_many(conn, INSERT_RECONCILIATION_SQL, rows)
+    return len(rows)
 
 
 async def _get_security(conn: asyncpg.Connection, symbol: str) -> Dict[str, Any]:
-    row = await conn.fetchrow("SELECT id FROM securities WHERE symbol=$1 LIMIT 1", symbol.upper())
-    if not row:
-        raise ValueError(f"Security {symbol} not found")
-    return dict(row)
+    return (await _get_securities(conn, [symbol]))[0]
+
+
+async def _get_securities(conn: asyncpg.Connection, symbols: Sequence[str]) -> List[Dict[str, Any]]:
+    resolved = await resolve_security_ids(conn, symbols)
+    securities: List[Dict[str, Any]] = []
+    for symbol in symbols:
+        security_id = resolved.get(symbol.upper())
+        if security_id is None:
+            raise ValueError(f"Security {symbol} not found")
+        securities.append({"id": security_id})
+    return securities
 
 
 async def _fetch_prices(
@@ -2,6 +2,33 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.services.securities import invalidate_registry
+
+
+@pytest.fixture(autouse=True)
+def reset_security_registry():
+    invalidate_registry()
+    yield
+    invalidate_registry()
+
+
+SEEDED_UNIVERSES = {
+    "equities": ("AAPL", "GOOGL", "MSFT"),
+    "indexes": ("NDX", "QQQ", "SPX", "SPY", "TNX", "VIX"),
+    "options": ("AAPL", "GOOGL", "MSFT"),
+    "validation": ("SPY",),
+}
+
+
+@pytest.fixture
+def seeded_universes(monkeypatch: pytest.MonkeyPatch):
+    """Serve job universes from the 016 seed data instead of the securities table."""
+
+    async def fake_load_universe(name, *, settings=None):
+        return SEEDED_UNIVERSES[name]
+
+    monkeypatch.setattr("app.services.scheduler.jobs.load_universe", fake_load_universe)
+    return SEEDED_UNIVERSES
 
 
 @pytest.fixture
@@ -12,8 +39,36 @@ def client(monkeypatch: pytest.MonkeyPatch):
     async def fake_close_db_connection() -> None:
         return None
 
+    async def fake_warm_security_registry() -> None:
+        return None
+
+    async def fake_start_audit_sink() -> None:
+        return None
+
+    async def fake_stop_audit_sink() -> None:
+        return None
+
+    async def fake_start_job_queue() -> None:
+        return None
+
+    async def fake_stop_job_queue() -> None:
+        return None
+
+    async def fake_start_scheduler() -> bool:
+        return False
+
+    async def fake_stop_scheduler() -> None:
+        return None
+
     monkeypatch.setattr("app.main.connect_to_db", fake_connect_to_db)
     monkeypatch.setattr("app.main.close_db_connection", fake_close_db_connection)
+    monkeypatch.setattr("app.main.warm_security_registry", fake_warm_security_registry)
+    monkeypatch.setattr("app.main.start_audit_sink", fake_start_audit_sink)
+    monkeypatch.setattr("app.main.stop_audit_sink", fake_stop_audit_sink)
+    monkeypatch.setattr("app.main.start_job_queue", fake_start_job_queue)
+    monkeypatch.setattr("app.main.stop_job_queue", fake_stop_job_queue)
+    monkeypatch.setattr("app.main.start_scheduler", fake_start_scheduler)
+    monkeypatch.setattr("app.main.stop_scheduler", fake_stop_scheduler)
 
     with TestClient(app) as test_client:
         yield test_client
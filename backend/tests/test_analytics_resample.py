@@ -0,0 +1,110 @@
+import pytest
+
+from app.services.analytics import resample
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def fetch(self, query, *args):
+        if "FROM securities" in query:
+            return [{"id": 3, "symbol": symbol, "type": "stock", "is_active": True} for symbol in args[0]]
+        self.calls.append((query, args))
+        return self.rows
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+@pytest.mark.parametrize(
+    "value, interval, source",
+    [
+        ("1d", "1 days", "day"),
+        ("5 days", "5 days", "day"),
+        ("1w", "1 weeks", "week"),
+        ("2wk", "2 weeks", "week"),
+        ("1mo", "1 months", "month"),
+        ("1q", "3 months", "month"),
+        ("1y", "12 months", "month"),
+    ],
+)
+def test_parse_bucket(value, interval, source):
+    bucket = resample.parse_bucket(value)
+
+    assert bucket.interval == interval
+    assert bucket.source_unit == source
+
+
+@pytest.mark.parametrize("value", ["", "w", "0d", "1h", "1 fortnight"])
+def test_parse_bucket_rejects_unknown(value):
+    with pytest.raises(ValueError):
+        resample.parse_bucket(value)
+
+
+def test_native_buckets_read_aggregates_directly():
+    query, takes_interval = resample.build_bars_query(resample.parse_bucket("1w"))
+
+    assert "FROM ohlcv_bars_1w" in query
+    assert "time_bucket" not in query
+    assert takes_interval is False
+
+
+def test_multiples_roll_up_from_the_nearest_aggregate():
+    query, takes_interval = resample.build_bars_query(resample.parse_bucket("1q"))
+
+    assert "FROM ohlcv_bars_1mo" in query
+    assert "time_bucket($5::interval, bucket)" in query
+    assert takes_interval is True
+
+
+@pytest.mark.asyncio
+async def test_get_resampled_bars_returns_oldest_first(monkeypatch):
+    conn = FakeConnection(
+        [
+            {"bucket": "2025-02-03", "open": 2, "high": 3, "low": 1, "close": 2.5, "volume": 10, "log_return": 0.1},
+            {"bucket": "2025-01-27", "open": 1, "high": 2, "low": 1, "close": 2.0, "volume": 5, "log_return": None},
+        ]
+    )
+
+    async def fake_get_pool(*args, **kwargs):
+        assert args == ("analytics",) and kwargs == {"read_only": True}
+        return FakePool(conn)
+
+    monkeypatch.setattr(resample, "get_pool", fake_get_pool)
+
+    bars = await resample.get_resampled_bars("aapl", "2w", limit=10)
+
+    assert [bar["bucket"] for bar in bars] == ["2025-01-27", "2025-02-03"]
+    assert conn.calls[0][1] == (3, None, None, 10, "2 weeks")
+
+
+def test_bars_endpoint_rejects_bad_bucket(client) -> None:  # type: ignore[no-untyped-def]
+    response = client.get("/api/v1/analytics/bars/AAPL", params={"bucket": "3h"})
+
+    assert response.status_code == 400
+
+
+def test_bars_endpoint(client, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    async def fake_bars(symbol, bucket, *, start=None, end=None, limit=500):
+        return [{"bucket": "2025-01-27", "close": 2.0}]
+
+    monkeypatch.setattr("app.api.v1.routes.analytics.get_resampled_bars", fake_bars)
+
+    response = client.get("/api/v1/analytics/bars/aapl", params={"bucket": "1mo"})
+
+    assert response.status_code == 200
+    assert response.json()["symbol"] == "AAPL"
+    assert response.json()["results"][0]["close"] == 2.0
@@ -13,8 +13,11 @@ def test_cli_invokes_service(monkeypatch):
         return {}
 
     def fake_run(coro):
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(coro)
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
 
     monkeypatch.setattr("app.cli.run_atm_straddle_ingestion.ingest_atm_straddle", fake_ingest)
     monkeypatch.setattr(cli.asyncio, "run", fake_run)
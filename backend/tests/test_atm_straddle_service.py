@@ -2,7 +2,9 @@ from datetime import date, timedelta
 
 import pytest
 
+from app.core import run_stats
 from app.core.config import Settings
+from app.services.audit import RECORD_FAILED_RUN_SQL
 from app.services.options import atm_straddle
 
 
@@ -10,7 +12,7 @@ class FakeClient:
     async def fetch_expirations(self, symbol):
         return [date.today() + timedelta(days=10)]
 
-    async def fetch_chain(self, symbol, expiration):
+    async def fetch_chain(self, symbol, expiration, strike_range=None):
         return [
             {
                 "option_symbol": "CALL150",
@@ -44,11 +46,23 @@ class FakeClient:
         return None
 
 
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
 class FakeConnection:
     def __init__(self):
         self.inserted_chain = []
         self.straddle_row = None
         self.run_ids = []
+        self.executed = []
+
+    def transaction(self):
+        return FakeTransaction()
 
     async def fetchval(self, query, *args):
         if "FROM securities" in query:
@@ -57,6 +71,11 @@ class FakeConnection:
             return 149.0
         return None
 
+    async def fetch(self, query, *args):
+        if "FROM securities" in query:
+            return [{"id": 1, "symbol": symbol, "type": "stock", "is_active": True} for symbol in args[0]]
+        return []
+
     async def fetchrow(self, query, *args):
         if "INSERT INTO ingestion_runs" in query:
             run_id = len(self.run_ids) + 1
@@ -71,6 +90,7 @@ class FakeConnection:
         self.inserted_chain.extend(rows)
 
     async def execute(self, query, *args):
+        self.executed.append((query, args))
         return None
 
 
@@ -92,7 +112,7 @@ class FakePool:
 async def test_ingest_atm_straddle(monkeypatch):
     conn = FakeConnection()
 
-    async def fake_get_pool():
+    async def fake_get_pool(*args, **kwargs):
         return FakePool(conn)
 
     monkeypatch.setattr(atm_straddle, "get_pool", fake_get_pool)
@@ -113,3 +133,161 @@ async def test_ingest_atm_straddle(monkeypatch):
     assert result["straddle_mid"] == pytest.approx(7.9)
     assert len(conn.inserted_chain) == 2
 
+
+
+class TrackingPool(FakePool):
+    def __init__(self, conn):
+        super().__init__(conn)
+        self.held = 0
+
+    async def __aenter__(self):
+        self.held += 1
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.held -= 1
+        return False
+
+
+@pytest.mark.asyncio
+async def test_ingest_atm_straddle_releases_connection_during_fetches(monkeypatch):
+    pool = TrackingPool(FakeConnection())
+    held_during_fetch = []
+
+    class ObservingClient(FakeClient):
+        async def fetch_expirations(self, symbol):
+            held_during_fetch.append(pool.held)
+            return await super().fetch_expirations(symbol)
+
+        async def fetch_chain(self, symbol, expiration, strike_range=None):
+            held_during_fetch.append(pool.held)
+            return await super().fetch_chain(symbol, expiration, strike_range)
+
+    async def fake_get_pool(*args, **kwargs):
+        return pool
+
+    monkeypatch.setattr(atm_straddle, "get_pool", fake_get_pool)
+
+    await atm_straddle.ingest_atm_straddle(
+        "AAPL",
+        date.today(),
+        client=ObservingClient(),
+        settings=Settings(POLYGON_API_KEY="x", POLYGON_OPTIONS_API_KEY="y"),
+        force=True,
+    )
+
+    assert held_during_fetch == [0, 0]
+    assert pool.held == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_ingest_records_run_in_one_statement(monkeypatch):
+    conn = FakeConnection()
+
+    class EmptyClient(FakeClient):
+        async def fetch_expirations(self, symbol):
+            return []
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool(conn)
+
+    monkeypatch.setattr(atm_straddle, "get_pool", fake_get_pool)
+
+    with pytest.raises(ValueError):
+        await atm_straddle.ingest_atm_straddle(
+            "AAPL",
+            date.today(),
+            client=EmptyClient(),
+            settings=Settings(POLYGON_API_KEY="x", POLYGON_OPTIONS_API_KEY="y"),
+            force=True,
+        )
+
+    assert conn.run_ids == []
+    assert len(conn.executed) == 1
+    query, args = conn.executed[0]
+    assert query == RECORD_FAILED_RUN_SQL
+    assert args[:2] == ("options_atm_straddle", "option_straddles")
+
+
+def test_select_term_expirations_anchors_tenors_and_fills_between():
+    today = date(2024, 1, 1)
+    listed = [today + timedelta(days=days) for days in (0, 6, 10, 16, 30, 45, 58, 93, 180)]
+
+    selected = atm_straddle._select_term_expirations(listed, today, [7, 30, 60, 90], max_expirations=6)
+
+    tenors = {exp: tenor for exp, tenor in selected}
+    assert tenors[today + timedelta(days=6)] == 7
+    assert tenors[today + timedelta(days=30)] == 30
+    assert tenors[today + timedelta(days=58)] == 60
+    assert tenors[today + timedelta(days=93)] == 90
+    # Two slots left for intermediates, filled nearest-first; nothing outside the anchors.
+    assert [exp for exp, tenor in selected if tenor is None] == [
+        today + timedelta(days=10),
+        today + timedelta(days=16),
+    ]
+    assert [exp for exp, _ in selected] == sorted(exp for exp, _ in selected)
+
+
+@pytest.mark.asyncio
+async def test_ingest_atm_term_structure_fetches_chains_concurrently(monkeypatch):
+    import asyncio
+
+    conn = FakeConnection()
+    straddle_rows = []
+    in_flight = {"now": 0, "max": 0}
+    expiration_calls = []
+
+    original_fetchrow = conn.fetchrow
+
+    async def recording_fetchrow(query, *args):
+        if "INSERT INTO option_straddles" in query:
+            straddle_rows.append(args)
+        return await original_fetchrow(query, *args)
+
+    conn.fetchrow = recording_fetchrow
+
+    class TermClient(FakeClient):
+        async def fetch_expirations(self, symbol):
+            expiration_calls.append(symbol)
+            return [date.today() + timedelta(days=days) for days in (7, 30, 45, 60, 90)]
+
+        async def fetch_chain(self, symbol, expiration, strike_range=None):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0)
+            in_flight["now"] -= 1
+            if (expiration - date.today()).days == 45:
+                raise atm_straddle.PolygonOptionsClientError("boom")
+            return await super().fetch_chain(symbol, expiration, strike_range)
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool(conn)
+
+    async def no_fallback(conn, security_id, expiration):
+        return None
+
+    monkeypatch.setattr(atm_straddle, "get_pool", fake_get_pool)
+    monkeypatch.setattr(atm_straddle.degraded_mode, "fallback_chain_from_snapshot", no_fallback)
+
+    run = run_stats.RunStats(job_id="refresh_options_atm", trigger="manual")
+    token = run_stats.bind_run(run)
+    try:
+        result = await atm_straddle.ingest_atm_term_structure(
+            "AAPL",
+            date.today(),
+            client=TermClient(),
+            settings=Settings(POLYGON_API_KEY="x", POLYGON_OPTIONS_API_KEY="y"),
+            force=True,
+        )
+    finally:
+        run_stats.reset_run(token)
+
+    assert expiration_calls == ["AAPL"]
+    assert in_flight["max"] > 1
+    assert [s["tenor_days"] for s in result["straddles"]] == [7, 30, 60, 90]
+    assert [m["expiration"] for m in result["missing"]] == [date.today() + timedelta(days=45)]
+    assert conn.run_ids == [1]
+    assert [row[-1] for row in straddle_rows] == [7, 30, 60, 90]
+    assert len(conn.inserted_chain) == 8
+    # Chain rows plus one straddle per tenor.
+    assert run.rows == 12
@@ -0,0 +1,114 @@
+import pytest
+
+from app.core.config import Settings
+from app.services.audit import sink as audit_sink
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeConnection:
+    def __init__(self):
+        self.batches = []
+        self.executed = []
+        self.closed = False
+
+    def transaction(self):
+        return FakeTransaction()
+
+    async def executemany(self, sql, rows):
+        self.batches.append((sql, list(rows)))
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    def terminate(self):
+        self.closed = True
+
+
+def _settings(**overrides):
+    values = {"AUDIT_FLUSH_INTERVAL": 0.01, "AUDIT_FLUSH_BATCH_SIZE": 100, "AUDIT_BUFFER_MAX": 10}
+    values.update(overrides)
+    return Settings(**values)
+
+
+@pytest.mark.asyncio
+async def test_sink_batches_statements_on_dedicated_connection():
+    dedicated = FakeConnection()
+
+    async def connect():
+        return dedicated
+
+    sink = audit_sink.AuditSink(settings=_settings(), connect=connect)
+    await sink.start()
+    await sink.submit(audit_sink.COMPLETE_RUN_SQL, (1, 10))
+    await sink.submit(audit_sink.COMPLETE_RUN_SQL, (2, 20))
+    await sink.submit(audit_sink.FAIL_RUN_SQL, (3, "boom"))
+    await sink.stop()
+
+    grouped = {sql: rows for sql, rows in dedicated.batches}
+    assert grouped[audit_sink.COMPLETE_RUN_SQL] == [(1, 10), (2, 20)]
+    assert grouped[audit_sink.FAIL_RUN_SQL] == [(3, "boom")]
+    assert sink.written == 3
+    assert dedicated.closed
+
+
+@pytest.mark.asyncio
+async def test_write_audit_runs_inline_without_sink():
+    request_conn = FakeConnection()
+
+    await audit_sink.write_audit(request_conn, audit_sink.COMPLETE_RUN_SQL, 5, 1)
+
+    assert request_conn.executed == [(audit_sink.COMPLETE_RUN_SQL, (5, 1))]
+
+
+@pytest.mark.asyncio
+async def test_write_audit_defers_to_running_sink(monkeypatch):
+    dedicated = FakeConnection()
+    request_conn = FakeConnection()
+
+    async def connect():
+        return dedicated
+
+    sink = audit_sink.AuditSink(settings=_settings(), connect=connect)
+    monkeypatch.setattr(audit_sink, "_sink", sink)
+    await sink.start()
+
+    await audit_sink.write_audit(request_conn, audit_sink.COMPLETE_RUN_SQL, 5, 1)
+    await audit_sink.stop_audit_sink()
+
+    assert request_conn.executed == []
+    assert dedicated.batches == [(audit_sink.COMPLETE_RUN_SQL, [(5, 1)])]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_single_statements():
+    dedicated = FakeConnection()
+
+    async def failing_executemany(sql, rows):
+        raise RuntimeError("batch failed")
+
+    dedicated.executemany = failing_executemany
+    dedicated.terminate = lambda: None
+
+    async def connect():
+        return dedicated
+
+    sink = audit_sink.AuditSink(settings=_settings(), connect=connect)
+    await sink.start()
+    await sink.submit(audit_sink.COMPLETE_RUN_SQL, (1, 10))
+    await sink.stop()
+
+    assert dedicated.executed == [(audit_sink.COMPLETE_RUN_SQL, (1, 10))]
+    assert sink.dropped == 0
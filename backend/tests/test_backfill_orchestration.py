@@ -41,7 +41,7 @@ class FakePool:
 async def test_run_backfill_updates_manifest(monkeypatch):
     conn = FakeConnection()
 
-    async def fake_get_pool():
+    async def fake_get_pool(*args, **kwargs):
         return FakePool(conn)
 
     async def fake_backfill(symbol, start, end):
@@ -56,3 +56,34 @@ async def test_run_backfill_updates_manifest(monkeypatch):
     statuses = [args[1] for _, args in conn.updated]
     assert statuses == ["success", "success"]
 
+
+
+@pytest.mark.asyncio
+async def test_run_backfill_reports_progress_per_symbol(monkeypatch):
+    conn = FakeConnection()
+    reports = []
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool(conn)
+
+    async def fake_backfill(symbol, start, end):
+        if symbol == "MSFT":
+            raise RuntimeError("boom")
+        return 3
+
+    async def progress(**kwargs):
+        reports.append(kwargs)
+
+    monkeypatch.setattr(backfill, "get_pool", fake_get_pool)
+    monkeypatch.setitem(backfill.INGESTION_MAP, "ohlcv", fake_backfill)
+
+    summary = await backfill.run_backfill(
+        "ohlcv", ["AAPL", "MSFT", "GOOGL"], date(2020, 1, 1), date(2020, 1, 5), progress=progress
+    )
+
+    assert summary["rows"] == 6
+    assert reports == [
+        {"rows": 3, "done": 1, "total": 3},
+        {"rows": 0, "done": 2, "total": 3},
+        {"rows": 3, "done": 3, "total": 3},
+    ]
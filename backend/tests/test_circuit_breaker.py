@@ -0,0 +1,106 @@
+from datetime import date
+
+import httpx
+import pytest
+
+from app.clients import circuit, concurrency
+from app.clients.polygon_options import PolygonOptionsCircuitOpenError, PolygonOptionsClient
+from app.core.config import Settings
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    circuit.reset_breakers()
+    concurrency.reset_limiters()
+    yield
+    circuit.reset_breakers()
+    concurrency.reset_limiters()
+
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_endpoint_families():
+    assert circuit.endpoint_family("/v3/snapshot/options/AAPL") == "options.snapshot"
+    assert circuit.endpoint_family("https://api.polygon.io/v3/reference/options/contracts?cursor=x") == "options.reference"
+    assert circuit.endpoint_family("/v2/aggs/ticker/AAPL/range/1/day/a/b") == "aggs"
+    assert circuit.endpoint_family("/v3/reference/dividends") == "reference"
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(circuit.time, "monotonic", lambda: now[0])
+    breaker = circuit.CircuitBreaker("test", failure_threshold=3, reset_seconds=30)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == circuit.CLOSED
+
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(circuit.CircuitOpenError):
+        breaker.before_call()
+
+    now[0] += 31
+    breaker.before_call()
+    assert breaker.state == circuit.HALF_OPEN
+    # Only one probe at a time while half-open.
+    with pytest.raises(circuit.CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_failure()
+    assert breaker.is_open
+
+    now[0] += 31
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == circuit.CLOSED
+    assert breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_skips_retries_and_raises_client_error():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(503)
+
+    settings = Settings(INGESTION_MAX_ATTEMPTS=5, UPSTREAM_BREAKER_FAILURE_THRESHOLD=2)
+    http_client = httpx.AsyncClient(base_url="https://api.polygon.io", transport=httpx.MockTransport(handler))
+    client = PolygonOptionsClient(settings=settings, http_client=http_client)
+    # Skip the tenacity backoff between the attempts that trip the breaker.
+    _open(circuit.get_breaker("/v3/snapshot/options/AAPL", settings=settings))
+
+    with pytest.raises(PolygonOptionsCircuitOpenError):
+        await client.fetch_chain("AAPL", date(2025, 12, 19))
+    await http_client.aclose()
+
+    assert calls == []
+    assert circuit.breaker_status()["options.snapshot"]["state"] == circuit.OPEN
+    # Other endpoint families are unaffected.
+    assert not circuit.is_open("options.reference")
+
+
+@pytest.mark.asyncio
+async def test_transport_failures_count_against_the_breaker():
+    breaker = circuit.CircuitBreaker("test", failure_threshold=1, reset_seconds=30)
+
+    with pytest.raises(httpx.ConnectError):
+        async with breaker.call():
+            raise httpx.ConnectError("down")
+
+    assert breaker.is_open
+
+
+def test_circuits_endpoint_reports_state(client):
+    _open(circuit.get_breaker("/v2/aggs/ticker/AAPL", settings=Settings()))
+
+    response = client.get("/api/v1/meta/circuits")
+
+    assert response.status_code == 200
+    assert response.json()["aggs"]["state"] == "open"
@@ -42,6 +42,11 @@ class FakeConnection:
             return self.latest_ex_date
         return None
 
+    async def fetch(self, query, *args):
+        if "FROM securities" in query and self.security_exists:
+            return [{"id": 1, "symbol": symbol, "type": "stock", "is_active": True} for symbol in args[0]]
+        return []
+
     async def fetchrow(self, query, *args):
         return {"id": 99}
 
@@ -70,7 +75,7 @@ def patch_dependencies(monkeypatch, conn, dividends=None, splits=None):
     dividends = dividends or []
     splits = splits or []
 
-    async def fake_get_pool():
+    async def fake_get_pool(*args, **kwargs):
         return FakePool(conn)
 
     monkeypatch.setattr(corp_actions, "get_pool", fake_get_pool)
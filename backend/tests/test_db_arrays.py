@@ -0,0 +1,63 @@
+import math
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.db import connection
+from app.db.arrays import fetch_arrays
+
+
+class FakeRecord(dict):
+    pass
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = [FakeRecord(row) for row in rows]
+        self.codecs = []
+
+    async def fetch(self, query, *args):
+        return self.rows
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.codecs.append((typename, kwargs))
+
+
+@pytest.mark.asyncio
+async def test_fetch_arrays_returns_float_columns():
+    conn = FakeConnection(
+        [
+            {"strike": Decimal("150.5"), "implied_vol": 0.25},
+            {"strike": Decimal("155"), "implied_vol": None},
+        ]
+    )
+
+    columns = await fetch_arrays(conn, "SELECT strike, implied_vol FROM vol_surface_points")
+
+    assert columns["strike"].dtype == np.float64
+    assert columns["strike"].tolist() == [150.5, 155.0]
+    assert math.isnan(columns["implied_vol"][1])
+
+
+@pytest.mark.asyncio
+async def test_fetch_arrays_respects_dtype_overrides_and_empty_results():
+    conn = FakeConnection([{"symbol": "AAPL", "close": 1}])
+
+    columns = await fetch_arrays(conn, "SELECT symbol, close", dtypes={"symbol": object})
+
+    assert columns["symbol"].tolist() == ["AAPL"]
+    assert await fetch_arrays(FakeConnection([]), "SELECT close") == {}
+
+
+@pytest.mark.asyncio
+async def test_float_numeric_codec_uses_text_format():
+    conn = FakeConnection([])
+
+    await connection.use_float_numeric(conn)
+
+    typename, kwargs = conn.codecs[0]
+    assert typename == "numeric"
+    assert kwargs["decoder"] is float
+    assert kwargs["format"] == "text"
+
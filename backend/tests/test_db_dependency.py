@@ -34,7 +34,7 @@ async def test_get_db_connection_yields_connection(monkeypatch: pytest.MonkeyPat
     acquire_context = DummyAcquireContext(connection)
     pool = DummyPool(acquire_context)
 
-    async def fake_get_pool():
+    async def fake_get_pool(*args, **kwargs):
         return pool
 
     monkeypatch.setattr(deps, "get_pool", fake_get_pool)
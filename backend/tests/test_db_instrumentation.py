@@ -0,0 +1,94 @@
+import pytest
+
+from app.core import metrics
+from app.core.config import Settings
+from app.db import instrumentation
+from app.db.connection import acquire_connection
+
+
+class FakePool:
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return "conn"
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    metrics.reset()
+    instrumentation.clear_slow_queries()
+    yield
+    metrics.reset()
+    instrumentation.clear_slow_queries()
+
+
+def _series(name):
+    return [series for series in metrics.snapshot()["histograms"] if series["name"] == name]
+
+
+def test_fast_statement_records_latency_and_rows_only():
+    settings = Settings(DB_SLOW_QUERY_MS=100)
+
+    capture = instrumentation.record_statement("SELECT 1", (), 5.0, 1, settings=settings)
+
+    assert capture is None
+    assert _series("db.query.ms")[0]["tags"] == {"caller": "unknown", "statement": "SELECT 1"}
+    assert _series("db.query.rows")[0]["sum"] == 1
+    assert instrumentation.get_slow_queries() == []
+
+
+@pytest.mark.asyncio
+async def test_slow_statement_is_captured_with_caller_and_params():
+    settings = Settings(DB_SLOW_QUERY_MS=100)
+    query = """
+        SELECT strike FROM option_chain_raw
+        WHERE security_id=$1
+        ORDER BY ABS(strike - $2)
+    """
+
+    async with acquire_connection(FakePool(), "options.atm"):
+        instrumentation.record_statement(query, (7, 150.0), 250.0, 40, settings=settings)
+    instrumentation.record_statement("SELECT 2", (), 300.0, 1, settings=settings)
+
+    latest, first = instrumentation.get_slow_queries()
+    assert latest["caller"] == "unknown"
+    assert first["caller"] == "options.atm"
+    assert first["statement"].startswith("SELECT strike FROM option_chain_raw WHERE")
+    assert first["params"] == ["7", "150.0"]
+    assert first["rows"] == 40
+
+
+def test_only_read_statements_are_explained():
+    assert instrumentation.is_explainable("  select * from ohlcv_bars")
+    assert instrumentation.is_explainable("WITH latest AS (SELECT 1) SELECT * FROM latest")
+    assert not instrumentation.is_explainable("WITH run AS (INSERT INTO ingestion_runs DEFAULT VALUES RETURNING id) SELECT id FROM run")
+    assert not instrumentation.is_explainable("UPDATE ingestion_runs SET status='failed'")
+    assert not instrumentation.is_explainable("WITH run AS (\n    UPDATE\njob_queue SET status = 'running' RETURNING id)\nSELECT id FROM run")
+    assert not instrumentation.is_explainable("SELECT pg_try_advisory_lock($1)")
+    assert not instrumentation.is_explainable("SELECT create_hypertable('realized_vol', 'as_of')")
+    assert not instrumentation.is_explainable("SELECT add_retention_policy('option_chain_raw', INTERVAL '30 days')")
+    assert not instrumentation.is_explainable("SELECT nextval('job_queue_id_seq')")
+    assert not instrumentation.is_explainable("SELECT id FROM job_queue WHERE status = 'queued' FOR UPDATE SKIP LOCKED")
+    assert instrumentation.is_explainable("SELECT updated_at, next_run FROM securities_universe")
+
+
+def test_capture_buffer_is_bounded():
+    settings = Settings(DB_SLOW_QUERY_MS=0, DB_SLOW_QUERY_CAPTURE_MAX=2)
+
+    for index in range(3):
+        instrumentation.record_statement(f"SELECT {index}", (), 1.0, 0, settings=settings)
+
+    assert [entry["statement"] for entry in instrumentation.get_slow_queries()] == ["SELECT 2", "SELECT 1"]
+
+
+def test_slow_queries_endpoint(client) -> None:  # type: ignore[no-untyped-def]
+    instrumentation.record_statement("SELECT 1", (), 10.0, 1, settings=Settings(DB_SLOW_QUERY_MS=1))
+
+    response = client.get("/api/v1/meta/slow-queries")
+
+    assert response.status_code == 200
+    assert response.json()[0]["statement"] == "SELECT 1"
@@ -0,0 +1,64 @@
+import pytest
+
+from app.core import metrics
+from app.db.connection import acquire_connection
+
+
+class FakePool:
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return "conn"
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _histogram(name, caller):
+    for series in metrics.snapshot()["histograms"]:
+        if series["name"] == name and series["tags"] == {"caller": caller}:
+            return series
+    return None
+
+
+@pytest.mark.asyncio
+async def test_acquire_connection_records_wait_and_hold():
+    async with acquire_connection(FakePool(), "options.atm") as conn:
+        assert conn == "conn"
+
+    assert _histogram("db.pool.wait_ms", "options.atm")["count"] == 1
+    assert _histogram("db.pool.hold_ms", "options.atm")["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hold_time_is_recorded_when_body_raises():
+    with pytest.raises(RuntimeError):
+        async with acquire_connection(FakePool(), "api"):
+            raise RuntimeError("boom")
+
+    assert _histogram("db.pool.hold_ms", "api")["count"] == 1
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+
+    assert metrics.percentile(values, 50) == 50
+    assert metrics.percentile(values, 99) == 99
+    assert metrics.percentile([], 50) is None
+
+
+def test_metrics_endpoint_returns_snapshot(client) -> None:  # type: ignore[no-untyped-def]
+    metrics.observe("db.pool.wait_ms", 1.5, caller="api")
+
+    response = client.get("/api/v1/meta/metrics")
+
+    assert response.status_code == 200
+    assert response.json()["histograms"][0]["name"] == "db.pool.wait_ms"
@@ -0,0 +1,81 @@
+import pytest
+
+from app.core.config import Settings
+from app.db import connection
+
+
+class FakePool:
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def created_pools(monkeypatch):
+    created = []
+
+    async def fake_create_pool(**kwargs):
+        pool = FakePool(kwargs)
+        created.append(pool)
+        return pool
+
+    monkeypatch.setattr(connection.asyncpg, "create_pool", fake_create_pool)
+    monkeypatch.setattr(connection, "_pools", {})
+    return created
+
+
+def _use_settings(monkeypatch, **overrides):
+    settings = Settings(**overrides)
+    monkeypatch.setattr(connection, "get_settings", lambda: settings)
+    return settings
+
+
+def test_profiles_read_their_own_settings():
+    settings = Settings(DB_POOL_INGESTION_MAX_SIZE=4, DB_POOL_ANALYTICS_STATEMENT_TIMEOUT_MS=1000)
+
+    assert connection.get_pool_profile("ingestion", settings).max_size == 4
+    assert connection.get_pool_profile("analytics", settings).statement_timeout_ms == 1000
+    with pytest.raises(ValueError):
+        connection.get_pool_profile("reporting", settings)
+
+
+@pytest.mark.asyncio
+async def test_each_profile_gets_a_separate_pool(monkeypatch, created_pools):
+    _use_settings(monkeypatch, DB_POOL_API_MAX_SIZE=8, DB_POOL_INGESTION_MAX_SIZE=3)
+
+    api = await connection.get_pool()
+    ingestion = await connection.get_pool("ingestion")
+
+    assert api is not ingestion
+    assert await connection.get_pool("api") is api
+    assert api.kwargs["max_size"] == 8
+    assert ingestion.kwargs["max_size"] == 3
+    assert ingestion.kwargs["server_settings"] == {"application_name": "astrasim-ingestion"}
+    assert api.kwargs["server_settings"]["statement_timeout"] == "15000"
+    assert api.kwargs["init"] is connection.use_float_numeric
+    assert ingestion.kwargs["init"] is None
+
+
+@pytest.mark.asyncio
+async def test_read_only_requests_use_replica_when_configured(monkeypatch, created_pools):
+    _use_settings(monkeypatch, DATABASE_REPLICA_HOST="replica.internal")
+
+    primary = await connection.get_pool("api")
+    replica = await connection.get_pool("api", read_only=True)
+
+    assert primary.kwargs["host"] == "localhost"
+    assert replica.kwargs["host"] == "replica.internal"
+
+    await connection.close_db_connection()
+    assert primary.closed and replica.closed
+
+
+@pytest.mark.asyncio
+async def test_read_only_falls_back_to_primary_without_replica(monkeypatch, created_pools):
+    _use_settings(monkeypatch)
+
+    assert await connection.get_pool("api", read_only=True) is await connection.get_pool("api")
+    assert len(created_pools) == 1
@@ -0,0 +1,115 @@
+import json
+import math
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.config import Settings
+from app.services.options import expected_move_batch
+
+NOW = datetime(2024, 6, 3, tzinfo=timezone.utc)
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeConnection:
+    def __init__(self):
+        self.queries = []
+        self.executemany_calls = []
+
+    def transaction(self):
+        return FakeTransaction()
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        if "FROM securities" in query:
+            return [{"id": 1, "symbol": "AAPL"}, {"id": 2, "symbol": "MSFT"}]
+        if "JOIN option_straddles" in query:
+            # AAPL has one straddle (7 and 14 both resolve to it); MSFT has none.
+            return [
+                {"security_id": 1, "horizon": 7, "id": 11, "straddle_mid": 6.0, "dte": 9, "snapshot_timestamp": NOW},
+                {"security_id": 1, "horizon": 14, "id": 11, "straddle_mid": 6.0, "dte": 9, "snapshot_timestamp": NOW},
+            ]
+        if "FROM ohlcv_bars" in query:
+            return [{"security_id": 1, "close": 100.0}, {"security_id": 2, "close": 300.0}]
+        if "JOIN vol_surface_points" in query:
+            assert args[0] == [1] and args[1] == [9]
+            return [{"security_id": 1, "dte": 9, "implied_vol": 0.3}]
+        if "FROM realized_vol" in query:
+            return [{"security_id": 1, "window_days": 14, "value": 0.2}]
+        return []
+
+    async def fetchrow(self, query, *args):
+        return {"id": 77}
+
+    async def executemany(self, query, rows):
+        self.executemany_calls.append((query, list(rows)))
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_batch_expected_move_bulk_loads_and_writes(monkeypatch):
+    conn = FakeConnection()
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool(conn)
+
+    monkeypatch.setattr(expected_move_batch, "get_pool", fake_get_pool)
+    settings = Settings(EXPECTED_MOVE_BATCH_HORIZONS=[7, 14])
+
+    summary = await expected_move_batch.compute_expected_moves_batch(settings=settings)
+
+    assert summary["run_id"] == 77
+    assert summary["checks"] == 1
+    assert summary["skipped"] == ["MSFT"]
+    check = summary["results"][0]
+    assert check["horizon"] == 9
+    assert check["expected_move_pct"] == pytest.approx(0.06)
+    assert check["surface_expected_move"] == pytest.approx(100 * 0.3 * math.sqrt(9 / 365))
+    assert check["realized_expected_move"] == pytest.approx(100 * 0.2 * math.sqrt(9 / 252))
+
+    # One query per input, independent of the number of symbols and horizons.
+    assert len(conn.queries) == 5
+    (check_sql, check_rows), (flag_sql, flag_rows) = conn.executemany_calls
+    assert "expected_move_checks" in check_sql
+    assert check_rows[0][10] == 77
+    assert json.loads(check_rows[0][11])["straddle"]["id"] == 11
+    assert "calibration_flags" in flag_sql
+    assert {row[2] for row in flag_rows} == {"SURFACE_MISMATCH", "REALIZED_MISMATCH"}
+
+
+def test_build_checks_matches_single_symbol_severity_rules():
+    settings = Settings()
+    checks, skipped = expected_move_batch._build_checks(
+        {1: "AAPL"},
+        [(1, 30, {"id": 1, "straddle_mid": 10.0, "dte": 30, "snapshot_timestamp": NOW})],
+        {1: 100.0},
+        {},
+        {1: {7: None, 14: None, 21: None}},
+        settings,
+    )
+
+    assert skipped == []
+    assert checks[0]["surface_expected_move"] is None
+    assert checks[0]["severity_surface"] is None
+    assert checks[0]["atm_implied_vol"] == pytest.approx(10 / (100 * math.sqrt(30 / 365)))
+    assert expected_move_batch._build_flags(checks, settings, 1) == []
@@ -17,6 +17,17 @@ class FakeAcquire:
         return False
 
 
+class FakeConnection:
+    def __init__(self):
+        self.failed_runs = []
+
+    def transaction(self):
+        return FakeAcquire(self)
+
+    async def execute(self, query, *args):
+        self.failed_runs.append(args)
+
+
 class FakePool:
     def __init__(self, conn):
         self.conn = conn
@@ -27,17 +38,15 @@ class FakePool:
 
 @pytest.mark.asyncio
 async def test_compute_expected_move(monkeypatch):
-    fake_conn = object()
+    fake_conn = FakeConnection()
     inserted_flags = []
 
-    async def fake_get_pool():
+    async def fake_get_pool(*args, **kwargs):
         return FakePool(fake_conn)
 
-    async def fake_create_run(conn):
-        return 1
-
-    async def fake_complete_run(conn, run_id, rows):
+    async def fake_insert_run(conn, started_at, rows):
         assert rows == 1
+        return 1
 
     async def fake_security_id(conn, symbol):
         return 42
@@ -86,8 +95,7 @@ async def test_compute_expected_move(monkeypatch):
         inserted_flags.append(flag_type)
 
     monkeypatch.setattr(expected_move, "get_pool", fake_get_pool)
-    monkeypatch.setattr(expected_move, "_create_ingestion_run", fake_create_run)
-    monkeypatch.setattr(expected_move, "_complete_run", fake_complete_run)
+    monkeypatch.setattr(expected_move, "_insert_run", fake_insert_run)
     monkeypatch.setattr(expected_move, "_get_security_id", fake_security_id)
     monkeypatch.setattr(expected_move, "_fetch_straddle", fake_fetch_straddle)
     monkeypatch.setattr(expected_move, "get_underlying_price", fake_underlying)
@@ -101,4 +109,26 @@ async def test_compute_expected_move(monkeypatch):
     assert result["symbol"] == "AAPL"
     assert result["horizon"] == 30
     assert "SURFACE_MISMATCH" in inserted_flags or "REALIZED_MISMATCH" in inserted_flags
+    assert fake_conn.failed_runs == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_straddle_falls_back_when_tagged_tenor_is_superseded():
+    class StraddleConnection:
+        def __init__(self):
+            self.queries = []
+
+        async def fetchrow(self, query, *args):
+            self.queries.append(query)
+            if "tenor_days=$2" in query:
+                # A newer untagged straddle exists, so no tagged row qualifies.
+                return None
+            return {"id": 8, "straddle_mid": 4.0, "dte": 29, "snapshot_timestamp": None}
+
+    conn = StraddleConnection()
+
+    straddle, dte = await expected_move._fetch_straddle(conn, 1, 30, False)
 
+    assert (straddle["id"], dte) == (8, 29)
+    assert "u.tenor_days IS NULL" in conn.queries[0]
+    assert "ORDER BY ABS(dte-$2)" in conn.queries[1]
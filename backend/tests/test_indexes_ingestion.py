@@ -41,6 +41,11 @@ class FakeConnection:
             return None
         return {"id": 11}
 
+    async def fetch(self, query, *args):
+        if "FROM securities" in query and self.security_id:
+            return [{"id": self.security_id, "symbol": symbol, "type": "index", "is_active": True} for symbol in args[0]]
+        return []
+
     async def fetchval(self, query, *args):
         if "MAX(time)" in query:
             return self.latest_time
@@ -68,7 +73,7 @@ class FakePool:
 
 
 def patch_dependencies(monkeypatch, conn, series):
-    async def fake_get_pool():
+    async def fake_get_pool(*args, **kwargs):
         return FakePool(conn)
 
     monkeypatch.setattr(indexes, "get_pool", fake_get_pool)
@@ -6,8 +6,12 @@ from app.main import app
 client = TestClient(app)
 
 
-async def fake_backfill(symbol, start, end):
-    return 42
+queued = []
+
+
+async def fake_enqueue(kind, params, **kwargs):
+    queued.append((kind, params))
+    return 7
 
 
 async def fake_update(symbol):
@@ -15,7 +19,7 @@ async def fake_update(symbol):
 
 
 def test_backfill_endpoint(monkeypatch):
-    monkeypatch.setattr("app.api.v1.routes.ingestion.backfill_ohlcv", fake_backfill)
+    monkeypatch.setattr("app.api.v1.routes.ingestion.enqueue_job", fake_enqueue)
 
     response = client.post(
         "/api/v1/ingestion/ohlcv/backfill",
@@ -23,7 +27,8 @@ def test_backfill_endpoint(monkeypatch):
     )
 
     assert response.status_code == 202
-    assert response.json() == {"status": "ok", "rows": 42}
+    assert response.json() == {"status": "queued", "job_id": 7}
+    assert queued[-1] == ("ingestion.ohlcv_backfill", {"symbol": "AAPL", "start": "2023-01-01", "end": "2023-01-05"})
 
 
 def test_update_endpoint(monkeypatch):
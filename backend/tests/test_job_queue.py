@@ -0,0 +1,223 @@
+import asyncio
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.main import app
+from app.services.job_queue import handlers
+from app.services.job_queue.queue import JobQueue
+
+
+class FakeStore:
+    """In-memory stand-in for JobStore."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.progress = []
+        self.released = []
+
+    def add(self, kind, params=None):
+        job_id = len(self.jobs) + 1
+        self.jobs[job_id] = {"id": job_id, "kind": kind, "params": params or {}, "status": "queued", "attempts": 0}
+        return job_id
+
+    async def claim(self, worker, limit):
+        claimed = []
+        for job in self.jobs.values():
+            if job["status"] == "queued" and len(claimed) < limit:
+                job.update(status="running", worker=worker, attempts=job["attempts"] + 1)
+                claimed.append(dict(job))
+        return claimed
+
+    async def update_progress(self, job_id, rows, pct):
+        self.progress.append((job_id, rows, pct))
+
+    async def heartbeat(self, job_ids):
+        return None
+
+    async def finish(self, job_id, status, *, rows, pct, result=None, error=None):
+        self.jobs[job_id].update(status=status, rows=rows, pct=pct, result=result, error=error)
+
+    async def release(self, job_ids):
+        self.released.extend(job_ids)
+        for job_id in job_ids:
+            self.jobs[job_id]["status"] = "queued"
+
+    async def requeue_stale(self, stale_seconds, max_attempts):
+        return []
+
+
+def make_settings(**overrides):
+    values = {"JOB_QUEUE_CONCURRENCY": 2, "JOB_QUEUE_POLL_SECONDS": 0.01, "JOB_QUEUE_PROGRESS_INTERVAL": 0.0}
+    values.update(overrides)
+    return Settings(**values)
+
+
+async def wait_for(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_queue_runs_jobs_with_bounded_concurrency():
+    store = FakeStore()
+    running = {"now": 0, "max": 0}
+
+    async def work(params, progress):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.02)
+        await progress.update(rows=params["rows"], done=1, total=1)
+        running["now"] -= 1
+        return {"ok": True}
+
+    for rows in (1, 2, 3, 4):
+        store.add("work", {"rows": rows})
+    queue = JobQueue(settings=make_settings(), store=store, handlers={"work": work})
+
+    await queue.start()
+    await wait_for(lambda: all(job["status"] == "succeeded" for job in store.jobs.values()))
+    await queue.stop()
+
+    assert running["max"] == 2
+    assert [job["rows"] for job in store.jobs.values()] == [1, 2, 3, 4]
+    assert all(job["pct"] == 100.0 for job in store.jobs.values())
+
+
+@pytest.mark.asyncio
+async def test_failed_and_unknown_jobs_record_errors():
+    store = FakeStore()
+
+    async def boom(params, progress):
+        await progress.update(rows=5, done=1, total=4)
+        raise RuntimeError("upstream exploded")
+
+    failing = store.add("boom")
+    unknown = store.add("mystery")
+    queue = JobQueue(settings=make_settings(), store=store, handlers={"boom": boom})
+
+    await queue.poll()
+    await wait_for(lambda: not queue.active)
+
+    assert store.jobs[failing]["status"] == "failed"
+    assert store.jobs[failing]["error"] == "upstream exploded"
+    assert (store.jobs[failing]["rows"], store.jobs[failing]["pct"]) == (5, 25.0)
+    assert store.jobs[unknown]["status"] == "failed"
+    assert "mystery" in store.jobs[unknown]["error"]
+
+
+@pytest.mark.asyncio
+async def test_stop_returns_in_flight_jobs_to_the_queue():
+    store = FakeStore()
+    started = asyncio.Event()
+
+    async def slow(params, progress):
+        started.set()
+        await asyncio.sleep(10)
+
+    job_id = store.add("slow")
+    queue = JobQueue(settings=make_settings(), store=store, handlers={"slow": slow})
+
+    await queue.start()
+    await asyncio.wait_for(started.wait(), 2)
+    await queue.stop()
+
+    assert store.released == [job_id]
+    assert store.jobs[job_id]["status"] == "queued"
+
+
+@pytest.mark.asyncio
+async def test_ohlcv_backfill_handler_reports_progress_per_chunk(monkeypatch):
+    store = FakeStore()
+    calls = []
+
+    async def fake_backfill(symbol, start, end):
+        calls.append((start, end))
+        return 10
+
+    monkeypatch.setattr(handlers, "backfill_ohlcv", fake_backfill)
+    monkeypatch.setattr(handlers, "get_settings", lambda: make_settings(JOB_QUEUE_OHLCV_CHUNK_DAYS=10))
+    progress = handlers.JobProgress(store, 1, min_interval=0.0)
+
+    result = await handlers.run_ohlcv_backfill(
+        {"symbol": "aapl", "start": "2024-01-01", "end": "2024-01-25"}, progress
+    )
+
+    assert calls == [
+        (date(2024, 1, 1), date(2024, 1, 10)),
+        (date(2024, 1, 11), date(2024, 1, 20)),
+        (date(2024, 1, 21), date(2024, 1, 25)),
+    ]
+    assert result == {"symbol": "AAPL", "rows": 30, "chunks": 3}
+    assert store.progress == [(1, 10, 33.3), (1, 20, 66.7), (1, 30, 100.0)]
+
+
+@pytest.mark.asyncio
+async def test_options_handlers_store_summaries(monkeypatch):
+    store = FakeStore()
+
+    async def fake_term_structure(symbol, target_date, *, tenors=None, force=False):
+        assert (symbol, target_date, tenors, force) == ("AAPL", date(2024, 6, 3), [7, 30], True)
+        straddles = [{"id": 1, "tenor_days": 7, "dte": 7, "raw_call": {}}, {"id": 2, "tenor_days": 30, "dte": 31}]
+        return {"symbol": "AAPL", "run_id": 4, "straddles": straddles, "missing": []}
+
+    async def fake_batch(symbols, horizons):
+        return {"run_id": 5, "checks": 6, "flags": 1, "skipped": [], "results": [{}] * 6}
+
+    monkeypatch.setattr(handlers, "ingest_atm_term_structure", fake_term_structure)
+    monkeypatch.setattr(handlers, "compute_expected_moves_batch", fake_batch)
+
+    term = await handlers.HANDLERS[handlers.ATM_TERM_STRUCTURE](
+        {"symbol": "AAPL", "target_date": "2024-06-03", "tenors": [7, 30], "force": True},
+        handlers.JobProgress(store, 1, min_interval=0.0),
+    )
+    batch = await handlers.HANDLERS[handlers.EXPECTED_MOVE_BATCH](
+        {"symbols": None, "horizons": None}, handlers.JobProgress(store, 2, min_interval=0.0)
+    )
+
+    assert [straddle["id"] for straddle in term["straddles"]] == [1, 2]
+    assert "raw_call" not in term["straddles"][0]
+    assert batch == {"run_id": 5, "checks": 6, "flags": 1, "skipped": []}
+    assert store.progress == [(1, 2, 100.0), (2, 6, 100.0)]
+
+
+def test_long_options_routes_enqueue_jobs(monkeypatch):
+    queued = []
+
+    async def fake_enqueue(kind, params, *, dedupe_key=None):
+        queued.append((kind, params))
+        return len(queued)
+
+    monkeypatch.setattr("app.api.v1.routes.atm_straddles.enqueue_job", fake_enqueue)
+    monkeypatch.setattr("app.api.v1.routes.expected_move.enqueue_job", fake_enqueue)
+    client = TestClient(app)
+
+    term = client.post("/api/v1/options/straddles/term-structure", json={"symbol": "aapl", "tenors": [30]})
+    batch = client.post("/api/v1/options/expected-move/batch", json={"symbols": ["msft"]})
+
+    assert (term.status_code, term.json()) == (202, {"status": "queued", "job_id": 1})
+    assert (batch.status_code, batch.json()) == (202, {"status": "queued", "job_id": 2})
+    assert queued == [
+        ("options.atm_term_structure", {"symbol": "AAPL", "target_date": None, "tenors": [30], "force": False}),
+        ("options.expected_move_batch", {"symbols": ["MSFT"], "horizons": None}),
+    ]
+
+
+def test_job_status_endpoint(monkeypatch):
+    async def fake_get_job(job_id):
+        if job_id != 5:
+            return None
+        return {"id": 5, "kind": "ingestion.ohlcv_backfill", "status": "running", "rows_processed": 120, "progress_pct": 40.0}
+
+    monkeypatch.setattr("app.api.v1.routes.jobs.get_job", fake_get_job)
+    client = TestClient(app)
+
+    response = client.get("/api/v1/jobs/5")
+    assert response.status_code == 200
+    assert response.json()["progress_pct"] == 40.0
+    assert client.get("/api/v1/jobs/6").status_code == 404
@@ -34,6 +34,11 @@ class FakeConnection:
             return self.latest_time
         return None
 
+    async def fetch(self, query, *args):
+        if "FROM securities" in query and self.security_exists:
+            return [{"id": 1, "symbol": symbol, "type": "stock", "is_active": True} for symbol in args[0]]
+        return []
+
     async def fetchrow(self, query, *args):
         return {"id": 10}
 
@@ -59,7 +64,7 @@ class FakePool:
 
 
 def patch_dependencies(monkeypatch, conn, polygon_results):
-    async def fake_get_pool():
+    async def fake_get_pool(*args, **kwargs):
         return FakePool(conn)
 
     monkeypatch.setattr(ohlcv, "get_pool", fake_get_pool)
@@ -99,6 +104,17 @@ async def test_backfill_writes_rows(monkeypatch):
     assert len(conn.executemany_payloads[0]) == 2
     statuses = [call[0] for call in conn.executed]
     assert any("status='success'" in sql for sql in statuses)
+    refreshes = [(sql.split("'")[1], args) for sql, args in conn.executed if "refresh_continuous_aggregate" in sql]
+    assert refreshes == [
+        (
+            "ohlcv_bars_1w",
+            (datetime(2022, 12, 26, tzinfo=timezone.utc), datetime(2023, 1, 9, tzinfo=timezone.utc)),
+        ),
+        (
+            "ohlcv_bars_1mo",
+            (datetime(2023, 1, 1, tzinfo=timezone.utc), datetime(2023, 2, 1, tzinfo=timezone.utc)),
+        ),
+    ]
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,225 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.config import Settings
+from app.clients import circuit
+from app.services.options import atm_straddle, contracts
+
+TODAY = date.today()
+NEAR = TODAY + timedelta(days=10)
+FAR = TODAY + timedelta(days=40)
+
+
+@pytest.fixture(autouse=True)
+def _clear_index():
+    contracts.invalidate_contract_index()
+    yield
+    contracts.invalidate_contract_index()
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, reference=None):
+        self.reference = reference or []
+        self.reference_reads = 0
+        self.upserts = []
+        self.executed = []
+
+    def transaction(self):
+        return FakeTransaction()
+
+    async def fetch(self, query, *args):
+        if "FROM option_contracts" in query:
+            self.reference_reads += 1
+            return self.reference
+        if "FROM securities" in query:
+            return [{"id": 1, "symbol": symbol, "type": "stock", "is_active": True} for symbol in args[0]]
+        return []
+
+    async def fetchval(self, query, *args):
+        if "FROM securities" in query:
+            return 1
+        if "FROM ohlcv_bars" in query:
+            return 149.0
+        return None
+
+    async def fetchrow(self, query, *args):
+        return {"id": 1}
+
+    async def executemany(self, query, rows):
+        if "option_contracts" in query:
+            self.upserts.extend(rows)
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+def _reference():
+    return [
+        {"expiration": NEAR, "strike": strike}
+        for strike in (140.0, 145.0, 150.0, 150.0, 155.0)
+    ] + [{"expiration": FAR, "strike": 150.0}]
+
+
+@pytest.mark.asyncio
+async def test_contract_index_is_served_from_memory_while_fresh():
+    conn = FakeConnection(_reference())
+    settings = Settings()
+
+    first = await contracts.get_contract_index(conn, 1, "aapl", settings=settings)
+    second = await contracts.get_contract_index(conn, 1, "AAPL", settings=settings)
+
+    assert second is first
+    assert conn.reference_reads == 1
+    assert first.expirations == [NEAR, FAR]
+    assert first.strikes_for(NEAR) == [140.0, 145.0, 150.0, 155.0]
+    assert first.strikes_between(NEAR, 142.0, 150.0) == [145.0, 150.0]
+    assert await contracts.get_contract_index(FakeConnection(), 1, "MSFT", settings=settings) is None
+
+
+@pytest.mark.asyncio
+async def test_stale_reference_is_used_but_not_memoized_while_upstream_is_down(monkeypatch):
+    monkeypatch.setattr(circuit, "is_open", lambda family: family == "options.reference")
+
+    class RecordingConnection(FakeConnection):
+        async def fetch(self, query, *args):
+            self.since = args[2]
+            return await super().fetch(query, *args)
+
+    conn = RecordingConnection(_reference())
+    index = await contracts.get_contract_index(conn, 1, "AAPL", settings=Settings())
+
+    assert index.expirations == [NEAR, FAR]
+    assert conn.since == date.min
+    assert "AAPL" not in contracts._indexes
+
+
+def test_strike_range_widens_to_next_listed_strikes():
+    index = contracts.ContractIndex(symbol="AAPL", as_of=TODAY, strikes={NEAR: [140.0, 145.0, 150.0, 155.0, 160.0]})
+
+    assert contracts.strike_range(150.0, -0.05, 0.05) == pytest.approx((142.5, 157.5))
+    assert contracts.strike_range(150.0, -0.05, 0.05, index=index, expiration=NEAR) == (140.0, 160.0)
+    # Outside the listed range the raw moneyness bound is kept.
+    assert contracts.strike_range(150.0, -0.2, 0.2, index=index, expiration=NEAR) == pytest.approx((120.0, 180.0))
+
+
+@pytest.mark.asyncio
+async def test_refresh_upserts_listing_and_prunes_stale_rows(monkeypatch):
+    conn = FakeConnection()
+
+    class ContractsClient:
+        async def fetch_contracts(self, symbol):
+            return [
+                {
+                    "option_symbol": f"O:AAPL{leg[0].upper()}150",
+                    "expiration": NEAR,
+                    "strike": 150.0,
+                    "call_put": leg,
+                    "shares_per_contract": 100,
+                }
+                for leg in ("call", "put")
+            ]
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool(conn)
+
+    monkeypatch.setattr(contracts, "get_pool", fake_get_pool)
+    contracts._indexes["AAPL"] = contracts.ContractIndex(symbol="AAPL", as_of=TODAY)
+
+    count = await contracts.refresh_option_contracts("AAPL", client=ContractsClient())
+
+    assert count == 2
+    assert [row[0] for row in conn.upserts] == ["O:AAPLC150", "O:AAPLP150"]
+    assert all(row[6] == TODAY for row in conn.upserts)
+    assert "DELETE FROM option_contracts" in conn.executed[0][0]
+    assert "AAPL" not in contracts._indexes
+
+
+@pytest.mark.asyncio
+async def test_refresh_keeps_reference_when_upstream_is_empty(monkeypatch):
+    conn = FakeConnection()
+
+    class EmptyClient:
+        async def fetch_contracts(self, symbol):
+            return []
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool(conn)
+
+    monkeypatch.setattr(contracts, "get_pool", fake_get_pool)
+
+    assert await contracts.refresh_option_contracts("AAPL", client=EmptyClient()) == 0
+    assert conn.executed == []
+
+
+@pytest.mark.asyncio
+async def test_atm_ingest_uses_reference_instead_of_paging_expirations(monkeypatch):
+    conn = FakeConnection(_reference())
+    chains = []
+
+    class IndexedClient:
+        async def fetch_expirations(self, symbol):
+            raise AssertionError("expirations should come from the contract index")
+
+        async def fetch_chain(self, symbol, expiration, strike_range=None):
+            chains.append((expiration, strike_range))
+            return [
+                {
+                    "option_symbol": f"{leg}150",
+                    "strike": 150.0,
+                    "expiration": expiration,
+                    "call_put": leg,
+                    "bid": 3.9,
+                    "ask": 4.1,
+                    "mid": 4.0,
+                    "volume": 10,
+                    "open_interest": 10,
+                    "underlying_price": 149.0,
+                    "raw": {},
+                }
+                for leg in ("call", "put")
+            ]
+
+        async def close(self):
+            return None
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool(conn)
+
+    monkeypatch.setattr(atm_straddle, "get_pool", fake_get_pool)
+
+    result = await atm_straddle.ingest_atm_straddle(
+        "AAPL",
+        TODAY,
+        client=IndexedClient(),
+        settings=Settings(POLYGON_API_KEY="x", POLYGON_OPTIONS_API_KEY="y"),
+        force=True,
+    )
+
+    # Spot 149 +/- 5% is 141.55..156.45: the low end snaps down to the listed 140 strike,
+    # nothing is listed above 156.45 so the high end keeps the raw bound.
+    assert chains[0][0] == NEAR
+    assert chains[0][1] == pytest.approx((140.0, 149 * 1.05))
+    assert result["straddle_mid"] == pytest.approx(8.0)
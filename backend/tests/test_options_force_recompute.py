@@ -21,11 +21,11 @@ def test_force_recompute_atm(monkeypatch):
 def test_force_recompute_surface(monkeypatch):
     flags = {}
 
-    async def fake_compute(symbol, target_date=None, *, force=False, **kwargs):
-        flags["force"] = force
-        return {"symbol": symbol, "dte": [], "moneyness": [], "iv_grid": []}
+    async def fake_enqueue(kind, params, **kwargs):
+        flags["force"] = params["force"]
+        return 1
 
-    monkeypatch.setattr("app.api.v1.routes.vol_surface.compute_surface", fake_compute)
+    monkeypatch.setattr("app.api.v1.routes.vol_surface.enqueue_job", fake_enqueue)
     response = client.post("/api/v1/options/surface/compute?force=true", json={"symbol": "AAPL"})
     assert response.status_code == 202
     assert flags.get("force") is True
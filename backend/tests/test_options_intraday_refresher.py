@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import run_stats
+from app.core.config import Settings
+from app.services.options import demand, refresh_policy, refresher
+from app.services.scheduler import history
+
+NOW = datetime(2025, 3, 3, 15, 0, tzinfo=timezone.utc)
+SETTINGS = Settings(
+    ATM_REFRESH_INTERVAL=300,
+    MIN_UNDERLYING_MOVE=0.01,
+    OPTIONS_DEMAND_WEIGHT=1.0,
+    OPTIONS_INTRADAY_UPSTREAM_BUDGET=5,
+    OPTIONS_CACHE_SESSION_AWARE=False,
+)
+
+
+@pytest.fixture(autouse=True)
+def atm_refreshes(monkeypatch):
+    state = {}
+    monkeypatch.setattr(refresh_policy, "_last_atm_refresh", state)
+    return state
+
+
+def test_score_symbol_combines_staleness_move_and_demand(atm_refreshes):
+    assert refresher.score_symbol("NEW", 10.0, 0.0, now=NOW, settings=SETTINGS).staleness == float("inf")
+
+    atm_refreshes["AAPL"] = (NOW - timedelta(seconds=150), 100.0)
+    assert refresher.score_symbol("AAPL", 100.5, 0.0, now=NOW, settings=SETTINGS) is None
+
+    moved = refresher.score_symbol("AAPL", 102.0, 0.0, now=NOW, settings=SETTINGS)
+    assert moved.move == pytest.approx(2.0)
+    assert moved.priority == pytest.approx(2.5)
+
+    # Demand shortens the effective interval: 300 / (1 + ln(1 + e - 1)) = 150 seconds.
+    busy = refresher.score_symbol("AAPL", 100.0, 2.718281828459045 - 1, now=NOW, settings=SETTINGS)
+    assert busy.staleness == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_run_cycle_refreshes_highest_priority_first_within_budget(monkeypatch, atm_refreshes):
+    now = datetime.now(tz=timezone.utc)
+    atm_refreshes.update(
+        {
+            "AAPL": (now - timedelta(seconds=400), 100.0),
+            "MSFT": (now - timedelta(seconds=310), 100.0),
+            "SPY": (now - timedelta(seconds=310), 100.0),
+            "QQQ": (now - timedelta(seconds=10), 100.0),
+        }
+    )
+    saved = []
+    refreshed = []
+
+    async def fake_universe(name, *, settings=None):
+        return ("AAPL", "MSFT", "NVDA", "QQQ", "SPY")
+
+    async def fake_flush(*, settings=None):
+        return 0
+
+    async def fake_demand(symbols, *, settings=None):
+        return {"SPY": 5.0}
+
+    async def fake_closes(symbols):
+        return {"AAPL": 100.0, "MSFT": 103.0, "SPY": 100.0, "QQQ": 100.1}
+
+    async def fake_refresh(self, symbol):
+        refreshed.append(symbol)
+        for _ in range(2):
+            run_stats.record_upstream_call()
+
+    async def fake_save(run):
+        saved.append(run)
+
+    monkeypatch.setattr(refresher, "load_universe", fake_universe)
+    monkeypatch.setattr(demand, "flush_demand", fake_flush)
+    monkeypatch.setattr(demand, "load_demand", fake_demand)
+    monkeypatch.setattr(refresher, "_latest_closes", fake_closes)
+    monkeypatch.setattr(refresher.IntradayRefresher, "_refresh", fake_refresh)
+    monkeypatch.setattr(history, "save_run", fake_save)
+
+    result = await refresher.IntradayRefresher(SETTINGS).run_cycle()
+
+    # NVDA was never refreshed; MSFT moved 3%; SPY's demand makes it staler than AAPL.
+    assert result == refreshed == ["NVDA", "MSFT"]
+    [run] = saved
+    assert (run.job_id, run.trigger, run.upstream_calls) == ("intraday_options_refresh", "intraday", 4)
+
+
+@pytest.mark.asyncio
+async def test_demand_is_flushed_in_batches_and_kept_on_failure(monkeypatch):
+    executed = []
+    fail = {"value": True}
+
+    class FakeConnection:
+        async def execute(self, sql, *args):
+            if fail["value"]:
+                raise RuntimeError("db down")
+            executed.append(args)
+
+    class FakePool:
+        def acquire(self):
+            return self
+
+        async def __aenter__(self):
+            return FakeConnection()
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool()
+
+    monkeypatch.setattr(demand, "get_pool", fake_get_pool)
+    monkeypatch.setattr(demand, "_pending", demand.Counter())
+    settings = Settings(OPTIONS_DEMAND_FLUSH_SECONDS=3600, OPTIONS_DEMAND_HALF_LIFE=600)
+
+    for symbol in ("aapl", "AAPL", "msft"):
+        demand.record_request(symbol, settings=settings)
+    assert await demand.flush_demand(settings=settings) == 0
+
+    fail["value"] = False
+    assert await demand.flush_demand(settings=settings) == 2
+    assert executed == [(["AAPL", "MSFT"], [2.0, 1.0], 600.0)]
+    assert await demand.flush_demand(settings=settings) == 0
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import Settings
+from app.services.options import cache, market_session, refresh_policy
+
+SETTINGS = Settings(OPTIONS_CACHE_EXTENDED_HOURS_MULTIPLIER=4.0)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "now, session, ends_at",
+    [
+        # Monday 2025-03-03, New York on EST (UTC-5).
+        (utc(2025, 3, 3, 8, 0), market_session.CLOSED, utc(2025, 3, 3, 14, 30)),
+        (utc(2025, 3, 3, 10, 0), market_session.PRE_MARKET, utc(2025, 3, 3, 14, 30)),
+        (utc(2025, 3, 3, 15, 0), market_session.REGULAR, utc(2025, 3, 3, 21, 0)),
+        (utc(2025, 3, 3, 22, 0), market_session.AFTER_HOURS, utc(2025, 3, 4, 1, 0)),
+        # Friday night and Saturday wait for Monday's open.
+        (utc(2025, 3, 8, 2, 0), market_session.CLOSED, utc(2025, 3, 10, 13, 30)),
+        (utc(2025, 3, 8, 17, 0), market_session.CLOSED, utc(2025, 3, 10, 13, 30)),
+    ],
+)
+def test_session_at(now, session, ends_at):
+    assert market_session.session_at(now, SETTINGS) == market_session.MarketSession(session, ends_at)
+
+
+def test_holidays_are_closed_all_day():
+    settings = Settings(MARKET_HOLIDAYS="2025-12-25")
+
+    session = market_session.session_at(utc(2025, 12, 25, 16, 0), settings)
+
+    assert session == market_session.MarketSession(market_session.CLOSED, utc(2025, 12, 26, 14, 30))
+
+
+def test_expires_at_follows_the_session():
+    regular = utc(2025, 3, 3, 15, 0)
+    assert market_session.expires_at(regular, 300, settings=SETTINGS) == regular + timedelta(seconds=300)
+    assert market_session.expires_at(regular, 300, scale=0.5, settings=SETTINGS) == regular + timedelta(seconds=150)
+    # Never past the close, so the closing quotes are fetched once.
+    assert market_session.expires_at(utc(2025, 3, 3, 20, 58), 300, settings=SETTINGS) == utc(2025, 3, 3, 21, 0)
+
+    pre_market = utc(2025, 3, 3, 10, 0)
+    assert market_session.expires_at(pre_market, 300, settings=SETTINGS) == pre_market + timedelta(seconds=1200)
+
+    friday_night = utc(2025, 3, 8, 2, 0)
+    assert market_session.expires_at(friday_night, 300, settings=SETTINGS) == utc(2025, 3, 10, 13, 30)
+    assert market_session.expires_at(friday_night, 0, settings=SETTINGS) == friday_night
+
+    fixed = Settings(OPTIONS_CACHE_SESSION_AWARE=False)
+    assert market_session.expires_at(friday_night, 300, settings=fixed) == friday_night + timedelta(seconds=300)
+
+
+def test_activity_scales_regular_session_ttl(monkeypatch):
+    monkeypatch.setattr(refresh_policy, "_activity", {})
+    monkeypatch.setattr(refresh_policy, "_last_straddle_mid", {})
+    settings = Settings(
+        ATM_REFRESH_INTERVAL=300,
+        OPTIONS_CACHE_ACTIVITY_MOVE=0.02,
+        OPTIONS_CACHE_MIN_SCALE=0.25,
+        OPTIONS_CACHE_MAX_SCALE=3.0,
+    )
+    clock = {"now": utc(2025, 3, 3, 15, 0)}
+    monkeypatch.setattr(refresh_policy, "_now", lambda: clock["now"])
+
+    def refresh(symbol, mid):
+        refresh_policy.record_atm_refresh(symbol, 100.0, mid, settings=settings)
+        clock["now"] += timedelta(seconds=300)
+
+    assert refresh_policy.activity_scale("AAPL", settings) == 1.0
+    for mid in (5.0, 5.4):
+        refresh("AAPL", mid)
+    for mid in (5.0, 5.0):
+        refresh("MSFT", mid)
+
+    # An 8% change in one interval is four times the reference move.
+    assert refresh_policy.activity_scale("AAPL", settings) == pytest.approx(0.25)
+    assert refresh_policy.activity_scale("MSFT", settings) == 3.0
+    last = utc(2025, 3, 3, 16, 0)
+    assert refresh_policy.due_at("AAPL", last, 120, settings=settings) == last + timedelta(seconds=30)
+
+
+def test_closed_market_cache_lives_until_the_open(monkeypatch):
+    cache.invalidate_all()
+    clock = {"now": utc(2025, 3, 8, 2, 0)}
+    monkeypatch.setattr(cache, "_now", lambda: clock["now"])
+
+    cache.set_cached_chain("AAPL", "2025-03-21", [{"strike": 100}], settings=SETTINGS)
+    clock["now"] = utc(2025, 3, 9, 20, 0)
+    assert cache.get_cached_chain("AAPL", "2025-03-21", settings=SETTINGS) is not None
+
+    clock["now"] = utc(2025, 3, 10, 13, 30)
+    assert cache.get_cached_chain("AAPL", "2025-03-21", settings=SETTINGS) is None
+    cache.invalidate_all()
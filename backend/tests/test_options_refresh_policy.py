@@ -5,7 +5,7 @@ from app.services.options import refresh_policy
 
 
 def test_should_refresh_atm_with_interval(monkeypatch):
-    settings = Settings(ATM_REFRESH_INTERVAL=60, MIN_UNDERLYING_MOVE=0.01)
+    settings = Settings(ATM_REFRESH_INTERVAL=60, MIN_UNDERLYING_MOVE=0.01, OPTIONS_CACHE_SESSION_AWARE=False)
     refresh_policy.record_atm_refresh("AAPL", 150.0)
 
     def fake_now():
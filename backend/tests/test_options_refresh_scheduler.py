@@ -4,19 +4,19 @@ from app.services.scheduler import jobs
 
 
 @pytest.mark.asyncio
-async def test_job_refresh_options_atm(monkeypatch):
+async def test_job_refresh_options_atm(monkeypatch, seeded_universes):
     called = []
 
     async def fake_ingest(symbol, *args, **kwargs):
         called.append(symbol)
 
-    monkeypatch.setattr(jobs, "ingest_atm_straddle", fake_ingest)
+    monkeypatch.setattr(jobs, "ingest_atm_term_structure", fake_ingest)
     await jobs.job_refresh_options_atm()
     assert "AAPL" in called
 
 
 @pytest.mark.asyncio
-async def test_job_refresh_options_surface(monkeypatch):
+async def test_job_refresh_options_surface(monkeypatch, seeded_universes):
     called = []
 
     async def fake_compute(symbol, *args, **kwargs):
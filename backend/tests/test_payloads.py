@@ -0,0 +1,49 @@
+import json
+
+import httpx
+import pytest
+
+from app.clients import payloads
+from app.core.config import Settings
+
+
+@pytest.fixture
+def thread_calls(monkeypatch):
+    calls = []
+
+    async def fake_to_thread(func, *args):
+        calls.append(func)
+        return func(*args)
+
+    monkeypatch.setattr(payloads.asyncio, "to_thread", fake_to_thread)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_small_bodies_are_decoded_inline(thread_calls):
+    data = await payloads.decode_json(b'{"results": [1, 2]}', offload_bytes=1024)
+
+    assert data == {"results": [1, 2]}
+    assert thread_calls == []
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_are_decoded_and_transformed_off_loop(thread_calls):
+    raw = json.dumps({"results": [{"v": i} for i in range(200)], "next_url": "next"}).encode()
+    transform = payloads.page_transform(lambda item: item if item["v"] % 2 == 0 else None)
+
+    page = await payloads.decode_json(raw, transform, offload_bytes=len(raw))
+
+    assert len(thread_calls) == 1
+    assert len(page["results"]) == 100
+    assert page["next_url"] == "next"
+
+
+@pytest.mark.asyncio
+async def test_zero_threshold_disables_offloading(thread_calls):
+    response = httpx.Response(200, content=b'{"ok": true}')
+
+    data = await payloads.decode_response(response, settings=Settings(HTTP_JSON_OFFLOAD_BYTES=0))
+
+    assert data == {"ok": True}
+    assert thread_calls == []
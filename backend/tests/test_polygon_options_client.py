@@ -14,8 +14,8 @@ async def test_polygon_options_client_fetch_chain(monkeypatch):
     )
     client = PolygonOptionsClient(settings=settings)
 
-    async def fake_request(url, params):
-        return {
+    async def fake_request(url, params, transform=None):
+        return transform({
             "results": [
                 {
                     "details": {
@@ -42,7 +42,7 @@ async def test_polygon_options_client_fetch_chain(monkeypatch):
                     "underlying_price": 149.5,
                 },
             ]
-        }
+        })
 
     monkeypatch.setattr(client, "_request", fake_request)
 
@@ -52,3 +52,45 @@ async def test_polygon_options_client_fetch_chain(monkeypatch):
     assert chain[0]["option_symbol"] == "OPT1"
     assert chain[0]["mid"] == pytest.approx(4.5)
 
+
+
+def _snapshot(ticker, strike, contract_type):
+    return {
+        "details": {
+            "ticker": ticker,
+            "strike_price": strike,
+            "expiration_date": "2025-12-19",
+            "contract_type": contract_type,
+        },
+        "quote": {"bid_price": 1.0, "ask_price": 1.2},
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_chain_windows_strikes_and_follows_next_url(monkeypatch):
+    client = PolygonOptionsClient(settings=Settings(POLYGON_API_KEY="test", POLYGON_OPTIONS_API_KEY="test"))
+    calls = []
+    pages = {
+        "/v3/snapshot/options/AAPL": {
+            "results": [_snapshot("C145", 145, "call"), _snapshot("C150", 150, "call")],
+            "next_url": "https://api.polygon.io/v3/snapshot/options/AAPL?cursor=abc",
+        },
+        "https://api.polygon.io/v3/snapshot/options/AAPL?cursor=abc": {
+            # A repeated contract across a page boundary is only kept once.
+            "results": [_snapshot("C150", 150, "call"), _snapshot("P150", 150, "put")],
+        },
+    }
+
+    async def fake_request(url, params, transform=None):
+        calls.append((url, params))
+        return transform(pages[url])
+
+    monkeypatch.setattr(client, "_request", fake_request)
+
+    chain = await client.fetch_chain("AAPL", date(2025, 12, 19), strike_range=(142.5, 157.5))
+    await client.close()
+
+    assert [option["option_symbol"] for option in chain] == ["C145", "C150", "P150"]
+    assert calls[0][1]["strike_price.gte"] == 142.5
+    assert calls[0][1]["strike_price.lte"] == 157.5
+    assert calls[1][1] is None
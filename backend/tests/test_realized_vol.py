@@ -0,0 +1,167 @@
+import math
+import statistics
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.core.config import Settings
+from app.services.analytics import estimators, realized_vol
+from app.services.options import expected_move
+
+
+def _bars(closes, start=date(2024, 1, 1), security_id=5):
+    return [
+        {
+            "security_id": security_id,
+            "time": datetime.combine(start + timedelta(days=i), datetime.min.time(), tzinfo=timezone.utc),
+            "open": price,
+            "high": price,
+            "low": price,
+            "close": price,
+        }
+        for i, price in enumerate(closes)
+    ]
+
+
+class FakeConnection:
+    def __init__(self, bars, latest=None, stored=None, series=(("close_to_close", 7),)):
+        self.bars = bars
+        self.latest = latest
+        self.series = series
+        self.stored = stored or []
+        self.fetch_args = []
+        self.upserts = []
+
+    async def fetch(self, query, *args):
+        self.fetch_args.append((query, args))
+        if "MAX(as_of)" in query:
+            if not self.latest:
+                return []
+            return [
+                {"security_id": args[0][0], "estimator": name, "window_days": window, "latest": self.latest}
+                for name, window in self.series
+            ]
+        if "FROM ohlcv_bars" in query:
+            return self.bars
+        if "FROM realized_vol" in query:
+            return [row for row in self.stored if row["window_days"] in args[2]]
+        return []
+
+    async def executemany(self, query, rows):
+        self.upserts.extend(rows)
+        self.stored = [{"window_days": row[3], "value": row[4]} for row in self.upserts]
+
+
+def test_close_to_close_matches_sample_stdev_per_row():
+    closes = np.array(
+        [
+            [100 * math.exp(0.01 * (i % 2)) for i in range(12)],
+            [50 + i for i in range(12)],
+        ]
+    )
+
+    vols = estimators.close_to_close(closes, 7)
+
+    assert vols.shape == closes.shape
+    assert np.isnan(vols[:, :7]).all()
+    for row in range(2):
+        window = closes[row, -8:]
+        returns = [math.log(window[i + 1] / window[i]) for i in range(7)]
+        assert vols[row, -1] == pytest.approx(statistics.stdev(returns) * math.sqrt(252))
+
+
+def test_close_to_close_skips_non_positive_prices():
+    closes = np.array([100.0, 101.0, 0.0, 102.0, 101.0, 103.0])
+
+    vols = estimators.close_to_close(closes, 5)
+
+    returns = [math.log(103.0 / 101.0), math.log(101.0 / 102.0), math.log(101.0 / 100.0)]
+    assert vols[-1] == pytest.approx(statistics.stdev(returns) * math.sqrt(252))
+
+
+def test_estimate_rejects_unknown_estimator():
+    with pytest.raises(ValueError):
+        estimators.estimate("bogus", {"close": np.ones(3)}, 2)
+
+
+@pytest.mark.asyncio
+async def test_update_realized_vol_writes_every_window_on_first_run():
+    settings = Settings(REALIZED_VOL_WINDOWS=[7, 14], REALIZED_VOL_ESTIMATORS=["close_to_close"])
+    conn = FakeConnection(_bars([100 + (i % 3) for i in range(20)]))
+
+    written = await realized_vol.update_realized_vol(conn, 5, settings=settings)
+
+    # 20 closes -> 13 dates with a full 7-day window, 6 with a full 14-day window.
+    assert written == 13 + 6
+    assert {row[3] for row in conn.upserts} == {7, 14}
+    assert conn.fetch_args[1][1] == ([5], None, None)
+
+
+@pytest.mark.asyncio
+async def test_update_realized_vol_only_rewrites_recent_tail():
+    settings = Settings(
+        REALIZED_VOL_WINDOWS=[7], REALIZED_VOL_ESTIMATORS=["close_to_close"], REALIZED_VOL_RECOMPUTE_DAYS=2
+    )
+    bars = _bars([100 + (i % 3) for i in range(40)])
+    latest = bars[-3]["time"].date()
+    conn = FakeConnection(bars, latest=latest)
+
+    await realized_vol.update_realized_vol(conn, 5, settings=settings)
+
+    since = latest - timedelta(days=2)
+    assert conn.fetch_args[1][1][1] < since
+    assert sorted(row[1] for row in conn.upserts) == [since + timedelta(days=i) for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_backfill_before_stored_history_recomputes_from_its_start():
+    settings = Settings(
+        REALIZED_VOL_WINDOWS=[7], REALIZED_VOL_ESTIMATORS=["close_to_close"], REALIZED_VOL_RECOMPUTE_DAYS=2
+    )
+    bars = _bars([100 + (i % 3) for i in range(40)])
+    conn = FakeConnection(bars, latest=bars[-1]["time"].date())
+    backfill_start = bars[10]["time"].date()
+
+    await realized_vol.update_realized_vol(conn, 5, since=backfill_start, settings=settings)
+
+    assert conn.fetch_args[1][1][1] == backfill_start - timedelta(days=realized_vol._calendar_lookback(7))
+    assert sorted(row[1] for row in conn.upserts) == [backfill_start + timedelta(days=i) for i in range(30)]
+
+
+@pytest.mark.asyncio
+async def test_new_estimators_and_windows_start_from_full_history():
+    settings = Settings(
+        REALIZED_VOL_WINDOWS=[7, 14],
+        REALIZED_VOL_ESTIMATORS=["close_to_close", "parkinson"],
+        REALIZED_VOL_RECOMPUTE_DAYS=2,
+    )
+    bars = _bars([100 + (i % 3) for i in range(40)])
+    latest = bars[-1]["time"].date()
+    conn = FakeConnection(bars, latest=latest)
+
+    await realized_vol.update_realized_vol(conn, 5, settings=settings)
+
+    assert conn.fetch_args[1][1][1] is None
+    written = {}
+    for _, as_of, name, window, _ in conn.upserts:
+        written.setdefault((name, window), []).append(as_of)
+    assert min(written[("close_to_close", 7)]) == latest - timedelta(days=2)
+    assert len(written[("close_to_close", 14)]) == 40 - 14
+    assert len(written[("parkinson", 7)]) > 3
+
+
+@pytest.mark.asyncio
+async def test_expected_move_reads_store_and_fills_on_miss(monkeypatch):
+    monkeypatch.setattr(realized_vol, "get_settings", lambda: Settings(REALIZED_VOL_WINDOWS=[7, 14, 21]))
+    conn = FakeConnection(_bars([100 + (i % 3) for i in range(30)], security_id=1))
+
+    vol_map = await expected_move._compute_realized_vol_map(conn, 1)
+
+    assert set(vol_map) == {7, 14, 21}
+    assert all(value is not None for value in vol_map.values())
+    assert conn.upserts
+
+    conn.upserts.clear()
+    await expected_move._compute_realized_vol_map(conn, 1)
+    assert conn.upserts == []
@@ -1,24 +1,22 @@
 from fastapi.testclient import TestClient
 
+from app.core.config import Settings
 from app.main import app
+from app.services.job_queue import JobConflictError
 
 client = TestClient(app)
 
 
-async def fake_run_backfill(ingestion_type, symbols, start, end):
-    return {"success": len(symbols), "failed": 0, "manifest_ids": list(range(len(symbols)))}
+queued = []
 
 
-async def fake_run_job(job_id):
-    return None
-
-
-async def fake_start_scheduler():
-    return True
+async def fake_enqueue(kind, params, **kwargs):
+    queued.append((kind, params, kwargs))
+    return len(queued)
 
 
 def test_scheduler_backfill_endpoint(monkeypatch):
-    monkeypatch.setattr("app.api.v1.routes.scheduler.run_backfill", fake_run_backfill)
+    monkeypatch.setattr("app.api.v1.routes.scheduler.enqueue_job", fake_enqueue)
 
     response = client.post(
         "/api/v1/scheduler/backfill",
@@ -26,19 +24,62 @@ def test_scheduler_backfill_endpoint(monkeypatch):
     )
 
     assert response.status_code == 202
-    assert response.json()["success"] == 2
+    assert response.json()["status"] == "queued"
+    kind, params, _ = queued[-1]
+    assert kind == "scheduler.backfill"
+    assert params["symbols"] == ["AAPL", "MSFT"]
 
 
 def test_scheduler_run_job_endpoint(monkeypatch):
-    monkeypatch.setattr("app.api.v1.routes.scheduler.run_job_now", fake_run_job)
+    monkeypatch.setattr("app.api.v1.routes.scheduler.enqueue_job", fake_enqueue)
 
     response = client.post("/api/v1/scheduler/run/update_ohlcv")
-    assert response.status_code == 200
-    assert response.json()["status"] == "ok"
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    assert queued[-1] == (
+        "scheduler.run",
+        {"job_id": "update_ohlcv", "shard": 0},
+        {"dedupe_key": "scheduler:update_ohlcv:0"},
+    )
+
+
+def test_scheduler_run_unknown_job_is_404(monkeypatch):
+    monkeypatch.setattr("app.api.v1.routes.scheduler.enqueue_job", fake_enqueue)
+
+    response = client.post("/api/v1/scheduler/run/not_a_job")
+    assert response.status_code == 404
+
+
+def test_scheduler_run_reports_conflict_when_job_is_active(monkeypatch):
+    async def active(kind, params, *, dedupe_key=None):
+        raise JobConflictError(dedupe_key, 3)
+
+    monkeypatch.setattr("app.api.v1.routes.scheduler.enqueue_job", active)
+
+    response = client.post("/api/v1/scheduler/run/update_ohlcv")
+    assert response.status_code == 409
+
+
+def test_scheduler_run_conflict_reports_shards_already_queued(monkeypatch):
+    async def second_shard_active(kind, params, *, dedupe_key=None):
+        if params["shard"] == 1:
+            raise JobConflictError(dedupe_key, 7)
+        return 20 + params["shard"]
+
+    monkeypatch.setattr("app.api.v1.routes.scheduler.enqueue_job", second_shard_active)
+    monkeypatch.setattr(
+        "app.api.v1.routes.scheduler.get_settings", lambda: Settings(SCHEDULER_SHARD_COUNT=3)
+    )
+
+    response = client.post("/api/v1/scheduler/run/update_ohlcv")
+
+    assert response.status_code == 409
+    detail = response.json()["detail"]
+    assert detail["job_ids"] == [20, 22]
+    assert [(conflict["shard"], conflict["job_id"]) for conflict in detail["conflicts"]] == [(1, 7)]
 
 
 def test_scheduler_status_endpoint(monkeypatch):
-    monkeypatch.setattr("app.api.v1.routes.scheduler.start_scheduler", fake_start_scheduler)
     monkeypatch.setattr("app.api.v1.routes.scheduler.get_job_status", lambda: {"job": {"next_run_time": None}})
 
     response = client.get("/api/v1/scheduler/status")
@@ -0,0 +1,160 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.clients import concurrency
+from app.core.config import Settings
+from app.core.run_stats import RunStats, SymbolStats
+from app.main import app
+from app.services.scheduler import history
+from app.services.scheduler.pipeline import PipelineTask, run_pipeline
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    runs = []
+
+    async def fake_save(run):
+        runs.append(run)
+
+    monkeypatch.setattr(history, "save_run", fake_save)
+    concurrency.reset_limiters()
+    yield runs
+    concurrency.reset_limiters()
+
+
+async def upstream_calls(count):
+    limiter = concurrency.get_limiter(settings=Settings())
+    for _ in range(count):
+        async with limiter.slot() as slot:
+            slot.record(200)
+
+
+@pytest.mark.asyncio
+async def test_record_run_attributes_upstream_calls_and_rows_per_symbol(saved):
+    async def ingest(symbol):
+        await upstream_calls(2 if symbol == "AAPL" else 1)
+        if symbol == "MSFT":
+            raise RuntimeError("no data")
+        return 12
+
+    async with history.record_run("update_ohlcv", trigger="manual"):
+        for symbol in ("AAPL", "MSFT"):
+            try:
+                await history.run_for_symbol(symbol, ingest)
+            except RuntimeError:
+                pass
+
+    [run] = saved
+    assert (run.job_id, run.trigger, run.status) == ("update_ohlcv", "manual", "partial")
+    assert (run.rows, run.upstream_calls, run.symbols_failed) == (12, 3, 1)
+    assert (run.symbols["AAPL"].status, run.symbols["AAPL"].upstream_calls, run.symbols["AAPL"].rows) == (
+        "succeeded",
+        2,
+        12,
+    )
+    assert (run.symbols["MSFT"].status, run.symbols["MSFT"].error) == ("failed", "no data")
+    assert run.finished_at is not None and run.duration_ms >= 0
+
+
+@pytest.mark.asyncio
+async def test_record_run_marks_aborted_run_failed(saved):
+    with pytest.raises(ValueError):
+        async with history.record_run("update_indexes", trigger="scheduled"):
+            raise ValueError("boom")
+
+    assert saved[0].status == "failed"
+    assert saved[0].error == "boom"
+
+
+@pytest.mark.asyncio
+async def test_upstream_calls_outside_a_run_are_not_attributed(saved):
+    await upstream_calls(1)
+    async with history.record_run("validation_sweep", trigger="manual") as run:
+        pass
+    assert run.upstream_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_recorder_records_each_task(saved):
+    async def ohlcv(symbol):
+        if symbol == "MSFT":
+            raise RuntimeError("upstream down")
+        await upstream_calls(1)
+        return 3
+
+    async def surface(symbol):
+        return None
+
+    tasks = [
+        PipelineTask("update_ohlcv", ohlcv, ("AAPL", "MSFT")),
+        PipelineTask("refresh_options_surface", surface, ("AAPL", "MSFT"), depends_on=("update_ohlcv",)),
+    ]
+    recorder = history.PipelineRecorder(tasks)
+
+    result = await run_pipeline("nightly", recorder.wrap(tasks))
+    runs = {run.job_id: run for run in await recorder.finish(result)}
+
+    assert {run.trigger for run in runs.values()} == {"pipeline"}
+    assert runs["update_ohlcv"].status == "partial"
+    assert (runs["update_ohlcv"].rows, runs["update_ohlcv"].upstream_calls) == (3, 1)
+    surface_run = runs["refresh_options_surface"]
+    assert {symbol: entry.status for symbol, entry in surface_run.symbols.items()} == {
+        "AAPL": "succeeded",
+        "MSFT": "skipped",
+    }
+    assert [run.job_id for run in saved] == ["update_ohlcv", "refresh_options_surface"]
+
+
+@pytest.mark.asyncio
+async def test_save_run_writes_run_and_symbols_in_one_statement(monkeypatch):
+    executed = []
+
+    class FakeConnection:
+        async def execute(self, sql, *args):
+            executed.append((sql, args))
+
+    class FakePool:
+        def acquire(self):
+            return self
+
+        async def __aenter__(self):
+            return FakeConnection()
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool()
+
+    monkeypatch.setattr(history, "get_pool", fake_get_pool)
+    run = RunStats(job_id="refresh_options_atm", trigger="scheduled")
+    run.symbols["AAPL"] = SymbolStats(symbol="AAPL", status="succeeded", duration_ms=40.0, rows=2, upstream_calls=5)
+    run.finish("succeeded")
+
+    await history.save_run(run)
+
+    [(sql, args)] = executed
+    assert "INSERT INTO job_run_symbols" in sql
+    assert args[:3] == ("refresh_options_atm", "scheduled", "succeeded")
+    assert json.loads(args[-1]) == [
+        {"symbol": "AAPL", "status": "succeeded", "duration_ms": 40.0, "rows_written": 2, "upstream_calls": 5, "error": None}
+    ]
+
+
+def test_runtimes_endpoint(monkeypatch):
+    async def fake_runtimes(*, days, job_id):
+        return {
+            "window_days": days,
+            "jobs": [{"job_id": "refresh_options_surface", "runs": 7, "p50": 1200.0, "p95": 1800.0, "p99": 1900.0}],
+            "symbols": [],
+        }
+
+    monkeypatch.setattr("app.api.v1.routes.scheduler.get_job_runtimes", fake_runtimes)
+
+    response = TestClient(app).get("/api/v1/scheduler/runtimes?days=14")
+
+    assert response.status_code == 200
+    assert response.json()["window_days"] == 14
+    assert response.json()["jobs"][0]["p95"] == 1800.0
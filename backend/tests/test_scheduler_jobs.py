@@ -4,7 +4,7 @@ from app.services.scheduler import jobs
 
 
 @pytest.mark.asyncio
-async def test_job_update_ohlcv_calls_ingestion(monkeypatch):
+async def test_job_update_ohlcv_calls_ingestion(monkeypatch, seeded_universes):
     called = []
 
     async def fake_update(symbol):
@@ -14,11 +14,11 @@ async def test_job_update_ohlcv_calls_ingestion(monkeypatch):
 
     await jobs.job_update_ohlcv()
 
-    assert called == ["AAPL", "MSFT", "GOOGL"]
+    assert called == ["AAPL", "GOOGL", "MSFT"]
 
 
 @pytest.mark.asyncio
-async def test_job_validation_sweep_runs_validation(monkeypatch):
+async def test_job_validation_sweep_runs_validation(monkeypatch, seeded_universes):
     called = []
 
     async def fake_run_validation(symbol, start, end):
@@ -0,0 +1,116 @@
+import asyncpg
+import pytest
+
+from app.core.config import Settings
+from app.services.scheduler import history, leader, scheduler
+
+
+class FakeLockServer:
+    """Session-scoped advisory locks shared by every fake connection."""
+
+    def __init__(self):
+        self.holders = {}
+
+    def connect(self):
+        server = self
+
+        class Conn:
+            def __init__(self):
+                self.closed = False
+                self.dead = False
+
+            async def fetchval(self, query, *args):
+                if self.dead:
+                    raise asyncpg.InterfaceError("connection lost")
+                if "pg_try_advisory_lock" in query:
+                    key = args
+                    if server.holders.get(key, self) is not self:
+                        return False
+                    server.holders[key] = self
+                    return True
+                return 1
+
+            async def execute(self, query, *args):
+                if "pg_advisory_unlock" in query and server.holders.get(args) is self:
+                    del server.holders[args]
+
+            def is_closed(self):
+                return self.closed
+
+            async def close(self):
+                self.closed = True
+                # Postgres releases session locks when the session ends.
+                for key in [k for k, holder in server.holders.items() if holder is self]:
+                    del server.holders[key]
+
+        async def factory():
+            return Conn()
+
+        return factory
+
+
+@pytest.mark.asyncio
+async def test_only_one_replica_leads_and_another_takes_over():
+    server = FakeLockServer()
+    settings = Settings(SCHEDULER_LEADER_LOCK_ID=42)
+    first = leader.LeaderElector(settings=settings, connect=server.connect())
+    second = leader.LeaderElector(settings=settings, connect=server.connect())
+
+    assert await first.try_acquire() is True
+    assert await second.try_acquire() is False
+
+    # The leader's session dies: it notices on its next check and the lock is free again.
+    first._conn.dead = True
+    await first._conn.close()
+    assert await first.try_acquire() is False
+    assert await second.try_acquire() is True
+    assert second.is_leader and not first.is_leader
+
+    await second.stop()
+    assert server.holders == {}
+
+
+@pytest.mark.asyncio
+async def test_job_lock_is_exclusive_across_replicas():
+    server = FakeLockServer()
+    settings = Settings(SCHEDULER_LEADER_LOCK_ID=42)
+
+    async with leader.job_lock("update_ohlcv", settings=settings, connect=server.connect()):
+        with pytest.raises(leader.JobLockedError):
+            async with leader.job_lock("update_ohlcv", settings=settings, connect=server.connect()):
+                pass
+        async with leader.job_lock("update_indexes", settings=settings, connect=server.connect()):
+            pass
+
+    async with leader.job_lock("update_ohlcv", settings=settings, connect=server.connect()):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_scheduled_jobs_only_run_on_the_leader(monkeypatch):
+    server = FakeLockServer()
+    monkeypatch.setattr(leader, "open_connection", server.connect())
+    settings = Settings(SCHEDULER_LEADER_ELECTION=True, SCHEDULER_LEADER_LOCK_ID=42)
+    ran = []
+    recorded = []
+
+    async def job():
+        ran.append("job")
+
+    async def fake_save(run):
+        recorded.append((run.job_id, run.trigger, run.status))
+
+    monkeypatch.setattr(history, "save_run", fake_save)
+    run = scheduler._leader_only("update_ohlcv", job, settings)
+    elector = leader.LeaderElector(settings=settings, connect=server.connect())
+    monkeypatch.setattr(scheduler, "_elector", elector)
+
+    await run()
+    assert ran == []
+
+    await elector.try_acquire()
+    await run()
+    assert ran == ["job"]
+    assert recorded == [("update_ohlcv", "scheduled", "succeeded")]
+    await elector.stop()
+
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from app.core.config import Settings
+from app.services.scheduler import history, jobs, scheduler
+from app.services.scheduler.pipeline import PipelineTask, run_pipeline, validate
+
+
+@pytest.mark.asyncio
+async def test_downstream_symbol_starts_as_soon_as_its_upstream_lands():
+    events = []
+    msft_gate = asyncio.Event()
+
+    async def ingest(symbol):
+        if symbol == "MSFT":
+            await msft_gate.wait()
+        events.append(("ingest", symbol))
+
+    async def surface(symbol):
+        events.append(("surface", symbol))
+        if symbol == "AAPL":
+            msft_gate.set()
+
+    result = await run_pipeline(
+        "test",
+        [
+            PipelineTask("ingest", ingest, ("AAPL", "MSFT")),
+            PipelineTask("surface", surface, ("AAPL", "MSFT"), depends_on=("ingest",)),
+        ],
+    )
+
+    # AAPL's surface ran while MSFT ingestion was still blocked.
+    assert events.index(("surface", "AAPL")) < events.index(("ingest", "MSFT"))
+    assert result.summary() == {"ingest": {"succeeded": 2}, "surface": {"succeeded": 2}}
+
+
+@pytest.mark.asyncio
+async def test_failed_symbol_only_skips_its_own_downstream():
+    ran = []
+
+    async def ingest(symbol):
+        if symbol == "MSFT":
+            raise RuntimeError("upstream down")
+
+    async def surface(symbol):
+        ran.append(symbol)
+
+    async def validate_spy(symbol):
+        ran.append(symbol)
+
+    result = await run_pipeline(
+        "test",
+        [
+            PipelineTask("ingest", ingest, ("AAPL", "MSFT")),
+            PipelineTask("surface", surface, ("AAPL", "MSFT"), depends_on=("ingest",)),
+            # SPY is not in the ingest universe, so it waits for (and needs) all of it.
+            PipelineTask("validate", validate_spy, ("SPY",), depends_on=("ingest",)),
+        ],
+    )
+
+    assert ran == ["AAPL"]
+    assert result.failed == [("ingest", "MSFT")]
+    assert result.nodes[("surface", "MSFT")].status == "skipped"
+    assert result.nodes[("validate", "SPY")].status == "skipped"
+
+
+def test_validate_rejects_cycles_and_unknown_dependencies():
+    async def noop(symbol):
+        return None
+
+    with pytest.raises(ValueError, match="cycle"):
+        validate([PipelineTask("a", noop, ("X",), ("b",)), PipelineTask("b", noop, ("X",), ("a",))])
+    with pytest.raises(ValueError, match="unknown"):
+        validate([PipelineTask("a", noop, ("X",), ("missing",))])
+
+
+@pytest.mark.asyncio
+async def test_nightly_pipeline_orders_options_after_prices(monkeypatch, seeded_universes):
+    calls = []
+    recorded = []
+
+    async def fake_save(run):
+        recorded.append(run.job_id)
+
+    monkeypatch.setattr(history, "save_run", fake_save)
+
+    def recorder(name):
+        async def record(symbol, *args, **kwargs):
+            calls.append((name, symbol))
+
+        return record
+
+    for attr in (
+        "update_ohlcv",
+        "update_corp_actions",
+        "update_index_series",
+        "run_validation",
+        "refresh_option_contracts",
+        "ingest_atm_term_structure",
+        "compute_surface",
+    ):
+        monkeypatch.setattr(jobs, attr, recorder(attr))
+
+    result = await jobs.job_nightly_pipeline()
+
+    assert not result.failed
+    for symbol in seeded_universes["options"]:
+        assert calls.index(("update_ohlcv", symbol)) < calls.index(("ingest_atm_term_structure", symbol))
+        assert calls.index(("ingest_atm_term_structure", symbol)) < calls.index(("compute_surface", symbol))
+    assert ("run_validation", "SPY") in calls
+    assert set(recorded) == {task.name for task in jobs.nightly_pipeline()}
+
+
+def test_pipeline_members_are_registered_paused():
+    class FakeScheduler:
+        def __init__(self):
+            self.jobs = {}
+
+        def add_job(self, func, trigger, id, replace_existing, timezone, **schedule):
+            self.jobs[id] = schedule
+
+    fake = FakeScheduler()
+    scheduler.register_jobs(fake, settings=Settings())
+
+    assert fake.jobs["nightly_pipeline"] == {"hour": 1, "minute": 0}
+    assert fake.jobs["refresh_options_surface"] == {"hour": 5, "minute": 30, "next_run_time": None}
+    assert all(set(fake.jobs[name]) > {"next_run_time"} for name in scheduler.PIPELINE_MEMBERS)
@@ -0,0 +1,77 @@
+import pytest
+
+from app.core.config import Settings
+from app.services.securities import registry
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = {row["symbol"]: row for row in rows}
+        self.fetch_calls = []
+        self.inserted = []
+
+    async def fetch(self, query, *args):
+        self.fetch_calls.append((query, args))
+        if args:
+            return [self.rows[symbol] for symbol in args[0] if symbol in self.rows]
+        return list(self.rows.values())
+
+    async def fetchrow(self, query, *args):
+        self.inserted.append(args)
+        return {"id": 500}
+
+
+def _row(security_id, symbol, security_type="stock"):
+    return {"id": security_id, "symbol": symbol, "type": security_type, "is_active": True}
+
+
+@pytest.mark.asyncio
+async def test_resolve_many_symbols_in_one_query():
+    conn = FakeConnection([_row(1, "AAPL"), _row(2, "MSFT"), _row(3, "SPY", "etf")])
+
+    resolved = await registry.resolve_security_ids(conn, ["aapl", "MSFT", "SPY", "NOPE"])
+
+    assert resolved == {"AAPL": 1, "MSFT": 2, "SPY": 3}
+    assert len(conn.fetch_calls) == 1
+    assert registry.get_cached_security("spy").type == "etf"
+
+
+@pytest.mark.asyncio
+async def test_cached_symbols_skip_the_database():
+    conn = FakeConnection([_row(1, "AAPL")])
+    await registry.preload_securities(conn)
+
+    assert await registry.lookup_security_id(conn, "AAPL") == 1
+    assert await registry.lookup_security_id(conn, "AAPL") == 1
+    assert len(conn.fetch_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_misses_are_not_cached():
+    conn = FakeConnection([])
+
+    assert await registry.lookup_security_id(conn, "TSLA") is None
+    conn.rows["TSLA"] = _row(7, "TSLA")
+    assert await registry.lookup_security_id(conn, "TSLA") == 7
+
+
+@pytest.mark.asyncio
+async def test_ensure_security_registers_inserted_row():
+    conn = FakeConnection([])
+
+    security_id = await registry.ensure_security(conn, "vix", "index")
+
+    assert security_id == 500
+    assert conn.inserted == [("VIX", "index")]
+    assert registry.get_cached_security("VIX").id == 500
+
+
+@pytest.mark.asyncio
+async def test_registry_expires_after_ttl():
+    conn = FakeConnection([_row(1, "AAPL")])
+    await registry.preload_securities(conn)
+    settings = Settings(SECURITIES_REGISTRY_TTL=0)
+
+    await registry.lookup_security_id(conn, "AAPL", settings=settings)
+
+    assert len(conn.fetch_calls) == 2
@@ -0,0 +1,92 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.main import app
+from app.services.securities import universe
+from app.services.scheduler import leader
+
+SYMBOLS = [f"SYM{i}" for i in range(300)]
+
+
+def test_shards_partition_symbols_deterministically():
+    shards = [universe.in_shard(SYMBOLS, index, 4) for index in range(4)]
+
+    assert sorted(symbol for shard in shards for symbol in shard) == sorted(SYMBOLS)
+    assert all(len(shard) > 40 for shard in shards)
+    assert universe.shard_for("aapl", 4) == universe.shard_for("AAPL", 4)
+    assert universe.shard_for("AAPL", 1) == 0
+
+
+def test_shard_scope_overrides_configured_shard():
+    settings = Settings(SCHEDULER_SHARD_COUNT=3, SCHEDULER_SHARD_INDEX=0)
+
+    with universe.shard_scope(2):
+        assert universe.current_shard(settings) == (2, 3)
+    assert universe.current_shard(settings) == (0, 3)
+    with pytest.raises(ValueError):
+        universe.current_shard(Settings(SCHEDULER_SHARD_COUNT=2, SCHEDULER_SHARD_INDEX=2))
+
+
+@pytest.mark.asyncio
+async def test_load_universe_filters_by_tag_type_and_shard(monkeypatch):
+    queries = []
+
+    class FakeConnection:
+        async def fetch(self, sql, *args):
+            queries.append(args)
+            return [{"symbol": symbol} for symbol in SYMBOLS]
+
+    class FakePool:
+        def acquire(self):
+            return self
+
+        async def __aenter__(self):
+            return FakeConnection()
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool()
+
+    monkeypatch.setattr(universe, "get_pool", fake_get_pool)
+    settings = Settings(SCHEDULER_SHARD_COUNT=3, SCHEDULER_SHARD_INDEX=1)
+
+    options = await universe.load_universe("options", settings=settings)
+    indexes = await universe.load_universe("indexes", settings=settings)
+
+    assert queries == [("options", ["stock", "etf"]), ("indexes", None)]
+    assert list(options) == universe.in_shard(SYMBOLS, 1, 3)
+    assert options == indexes
+    with pytest.raises(ValueError):
+        await universe.load_universe("crypto", settings=settings)
+
+
+def test_leader_and_job_locks_are_per_shard():
+    single = Settings(SCHEDULER_LEADER_LOCK_ID=100)
+    sharded = Settings(SCHEDULER_LEADER_LOCK_ID=100, SCHEDULER_SHARD_COUNT=4, SCHEDULER_SHARD_INDEX=3)
+
+    assert leader.leader_lock_key(single) == 100
+    assert leader.leader_lock_key(sharded) == 103
+    assert leader.job_lock_name("update_ohlcv", single) == "update_ohlcv"
+    assert leader.job_lock_name("update_ohlcv", sharded) == "update_ohlcv@3"
+
+
+def test_manual_run_enqueues_one_job_per_shard(monkeypatch):
+    queued = []
+
+    async def fake_enqueue(kind, params, *, dedupe_key=None):
+        queued.append((params["shard"], dedupe_key))
+        return 10 + len(queued)
+
+    monkeypatch.setattr("app.api.v1.routes.scheduler.enqueue_job", fake_enqueue)
+    monkeypatch.setattr(
+        "app.api.v1.routes.scheduler.get_settings", lambda: Settings(SCHEDULER_SHARD_COUNT=3)
+    )
+
+    response = TestClient(app).post("/api/v1/scheduler/run/refresh_options_surface")
+
+    assert response.status_code == 202
+    assert response.json()["job_ids"] == [11, 12, 13]
+    assert queued == [(shard, f"scheduler:refresh_options_surface:{shard}") for shard in range(3)]
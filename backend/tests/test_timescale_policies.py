@@ -0,0 +1,129 @@
+from pathlib import Path
+
+import pytest
+
+from app.db.timescale_policies import TablePolicy, TableState, apply_policies, load_policies, plan_table
+
+POLICY_FILE = Path(__file__).resolve().parents[2] / "infra" / "db" / "timescale" / "policies" / "policies.json"
+
+
+def _policy(**overrides):
+    values = {
+        "table": "option_chain_raw",
+        "time_column": "snapshot_timestamp",
+        "chunk_interval": "1 day",
+        "primary_key": ["id", "snapshot_timestamp"],
+        "compress_segmentby": ["security_id", "expiration"],
+        "compress_orderby": ["snapshot_timestamp DESC", "strike ASC"],
+        "compress_after": "3 days",
+        "retention": "30 days",
+    }
+    values.update(overrides)
+    return TablePolicy(**values)
+
+
+def test_repo_policy_file_loads():
+    tables = {policy.table: policy for policy in load_policies(POLICY_FILE)}
+
+    assert tables["option_chain_raw"].retention == "30 days"
+    assert tables["reconciliation_log"].retention
+    assert tables["ohlcv_bars"].compress_segmentby == ["security_id", "interval"]
+
+
+def test_plain_table_is_converted_with_time_in_primary_key():
+    state = TableState(primary_key_name="option_chain_raw_pkey", primary_key=["id"])
+
+    statements = plan_table(_policy(), state)
+
+    assert statements[:3] == [
+        "ALTER TABLE option_chain_raw DROP CONSTRAINT option_chain_raw_pkey",
+        "ALTER TABLE option_chain_raw ADD PRIMARY KEY (id, snapshot_timestamp)",
+        "SELECT create_hypertable('option_chain_raw', 'snapshot_timestamp', "
+        "chunk_time_interval => INTERVAL '1 day', migrate_data => true)",
+    ]
+    assert (
+        "ALTER TABLE option_chain_raw SET (timescaledb.compress, "
+        "timescaledb.compress_segmentby = 'security_id, expiration', "
+        "timescaledb.compress_orderby = 'snapshot_timestamp DESC, strike')"
+    ) in statements
+    assert statements[-1] == "SELECT add_retention_policy('option_chain_raw', INTERVAL '30 days')"
+
+
+def test_configured_hypertable_only_refreshes_jobs():
+    state = TableState(
+        is_hypertable=True,
+        primary_key=["id", "snapshot_timestamp"],
+        compress_segmentby=["security_id", "expiration"],
+        compress_orderby=["snapshot_timestamp DESC", "strike"],
+    )
+
+    statements = plan_table(_policy(), state)
+
+    assert not any(statement.startswith("ALTER TABLE") for statement in statements)
+    assert statements[0] == "SELECT set_chunk_time_interval('option_chain_raw', INTERVAL '1 day')"
+    assert "SELECT add_compression_policy('option_chain_raw', INTERVAL '3 days')" in statements
+
+
+def test_primary_key_must_include_time_column(tmp_path):
+    config = tmp_path / "policies.json"
+    config.write_text(
+        '{"version": 1, "tables": [{"table": "t", "time_column": "ts", "chunk_interval": "1 day", "primary_key": ["id"]}]}'
+    )
+
+    with pytest.raises(ValueError):
+        load_policies(config)
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, fail_on=None):
+        self.executed = []
+        self.fail_on = fail_on
+
+    def transaction(self):
+        return FakeTransaction()
+
+    async def fetchval(self, query, *args):
+        if "to_regclass" in query:
+            return args[0] != "public.missing"
+        return True
+
+    async def fetchrow(self, query, *args):
+        return {"conname": f"{args[0]}_pkey", "columns": ["id", "snapshot_timestamp"]}
+
+    async def fetch(self, query, *args):
+        return []
+
+    async def execute(self, statement):
+        if self.fail_on and self.fail_on in statement:
+            raise RuntimeError("compressed chunks exist")
+        self.executed.append(statement)
+
+
+@pytest.mark.asyncio
+async def test_apply_continues_after_a_failing_table():
+    conn = FakeConnection(fail_on="option_chain_raw SET")
+    policies = [_policy(), _policy(table="missing"), _policy(table="vol_surface_points", retention=None)]
+
+    results = await apply_policies(conn, policies)
+
+    assert results["option_chain_raw"]["error"] == "compressed chunks exist"
+    assert results["missing"]["statements"] == []
+    assert results["vol_surface_points"]["applied"] is True
+
+
+@pytest.mark.asyncio
+async def test_dry_run_executes_nothing():
+    conn = FakeConnection()
+
+    results = await apply_policies(conn, [_policy()], dry_run=True)
+
+    assert conn.executed == []
+    assert results["option_chain_raw"]["statements"]
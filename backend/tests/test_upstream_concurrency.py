@@ -0,0 +1,117 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.clients import concurrency
+from app.clients.polygon import PolygonClient
+from app.core import metrics
+from app.core.config import Settings
+
+
+def _limiter(**overrides):
+    options = dict(initial=4, minimum=1, maximum=8, increase=1.0, decrease=0.5, latency_target_ms=1000)
+    options.update(overrides)
+    return concurrency.AimdLimiter("test", **options)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    metrics.reset()
+    concurrency.reset_limiters()
+    yield
+    concurrency.reset_limiters()
+
+
+def _gauge(name):
+    return {g["name"]: g["value"] for g in metrics.snapshot()["gauges"] if g["tags"].get("limiter") == "test"}[name]
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_by_one_per_window_of_fast_successes():
+    limiter = _limiter()
+
+    for _ in range(4):
+        async with limiter.slot() as slot:
+            slot.record(200)
+
+    assert limiter.limit == 4
+    for _ in range(2):
+        async with limiter.slot() as slot:
+            slot.record(200)
+    assert limiter.limit == 5
+    assert _gauge("upstream.concurrency.limit") == 5
+
+
+@pytest.mark.asyncio
+async def test_slow_successes_hold_the_limit():
+    limiter = _limiter(latency_target_ms=0)
+
+    for _ in range(10):
+        async with limiter.slot() as slot:
+            slot.record(200)
+
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_overload_burst_halves_the_limit_once():
+    limiter = _limiter(initial=8)
+    release = asyncio.Event()
+
+    async def request(status):
+        async with limiter.slot() as slot:
+            await release.wait()
+            slot.record(status)
+
+    tasks = [asyncio.create_task(request(429)) for _ in range(4)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert limiter.limit == 4
+    async with limiter.slot() as slot:
+        slot.record(503)
+    async with limiter.slot() as slot:
+        slot.record(503)
+    assert limiter.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_queue_beyond_the_limit():
+    limiter = _limiter(initial=2)
+    release = asyncio.Event()
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with limiter.slot() as slot:
+            peak = max(peak, limiter.in_flight)
+            await release.wait()
+            slot.record(200)
+
+    tasks = [asyncio.create_task(request()) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert limiter.in_flight == 2
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert peak <= 3
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_polygon_client_reports_rate_limits_to_shared_limiter():
+    statuses = iter([429, 200])
+
+    def handler(request):
+        return httpx.Response(next(statuses), json={"results": []})
+
+    settings = Settings(UPSTREAM_CONCURRENCY_INITIAL=8, INGESTION_RATE_LIMIT_SLEEP=0)
+    http_client = httpx.AsyncClient(base_url="https://api.polygon.io", transport=httpx.MockTransport(handler))
+    client = PolygonClient(settings=settings, http_client=http_client)
+
+    assert await client._request("/v2/test", None) == {"results": []}
+    await http_client.aclose()
+
+    assert concurrency.get_limiter().limit == 4
@@ -0,0 +1,120 @@
+import math
+import random
+import statistics
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.services.analytics import estimators
+from app.services.analytics.panel import fetch_ohlc_panel
+
+WINDOW = 10
+
+
+def _ohlc(seed, days=30):
+    rng = random.Random(seed)
+    bars = []
+    close = 100.0
+    for _ in range(days):
+        open_ = close * math.exp(rng.gauss(0, 0.005))
+        close = open_ * math.exp(rng.gauss(0, 0.01))
+        high = max(open_, close) * math.exp(abs(rng.gauss(0, 0.005)))
+        low = min(open_, close) * math.exp(-abs(rng.gauss(0, 0.005)))
+        bars.append((open_, high, low, close))
+    return bars
+
+
+def _panel():
+    series = [_ohlc(seed) for seed in (1, 2, 3)]
+    return {
+        name: np.array([[bar[index] for bar in bars] for bars in series])
+        for index, name in enumerate(("open", "high", "low", "close"))
+    }
+
+
+def _reference(name, bars):
+    """Straight textbook formulas over the last WINDOW bars of one series."""
+    o, h, low, c = (bars[key] for key in ("open", "high", "low", "close"))
+    t = range(len(c) - WINDOW, len(c))
+    if name == "parkinson":
+        variance = sum(math.log(h[i] / low[i]) ** 2 for i in t) / (4 * math.log(2) * WINDOW)
+    elif name == "garman_klass":
+        variance = sum(
+            0.5 * math.log(h[i] / low[i]) ** 2 - (2 * math.log(2) - 1) * math.log(c[i] / o[i]) ** 2 for i in t
+        ) / WINDOW
+    elif name == "rogers_satchell":
+        variance = sum(
+            math.log(h[i] / c[i]) * math.log(h[i] / o[i]) + math.log(low[i] / c[i]) * math.log(low[i] / o[i])
+            for i in t
+        ) / WINDOW
+    elif name == "yang_zhang":
+        overnight = [math.log(o[i] / c[i - 1]) for i in t]
+        open_close = [math.log(c[i] / o[i]) for i in t]
+        rs = _reference("rogers_satchell", bars) ** 2 / 252
+        k = 0.34 / (1.34 + (WINDOW + 1) / (WINDOW - 1))
+        variance = statistics.variance(overnight) + k * statistics.variance(open_close) + (1 - k) * rs
+    elif name == "ewma":
+        returns = [math.log(c[i] / c[i - 1]) for i in t]
+        weights = [0.94 ** (WINDOW - 1 - n) for n in range(WINDOW)]
+        variance = sum(w * r * r for w, r in zip(weights, returns, strict=True)) / sum(weights)
+    else:
+        variance = statistics.variance([math.log(c[i] / c[i - 1]) for i in t])
+    return math.sqrt(variance * 252)
+
+
+@pytest.mark.parametrize("name", sorted(estimators.ESTIMATORS))
+def test_estimators_match_reference_for_every_symbol(name):
+    panel = _panel()
+
+    values = estimators.estimate(name, panel, WINDOW)
+
+    assert values.shape == panel["close"].shape
+    for row in range(values.shape[0]):
+        series = {key: panel[key][row] for key in panel}
+        assert values[row, -1] == pytest.approx(_reference(name, series), rel=1e-9)
+
+
+@pytest.mark.parametrize("name", sorted(estimators.ESTIMATORS))
+def test_estimators_are_nan_until_window_is_full(name):
+    panel = _panel()
+
+    values = estimators.estimate(name, panel, WINDOW)
+
+    assert np.isnan(values[:, : WINDOW - 1]).all()
+    assert np.isfinite(values[:, WINDOW:]).all()
+
+
+def test_missing_bars_are_skipped_not_propagated():
+    panel = _panel()
+    panel["close"][1, 20] = np.nan
+
+    values = estimators.close_to_close(panel["close"], WINDOW)
+
+    assert np.isfinite(values[1, 20:]).all()
+    assert values[0, -1] == pytest.approx(estimators.close_to_close(_panel()["close"], WINDOW)[0, -1])
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetch(self, query, *args):
+        return self.rows
+
+
+@pytest.mark.asyncio
+async def test_fetch_ohlc_panel_aligns_symbols_on_shared_dates():
+    start = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    rows = [
+        {"security_id": sid, "time": start + timedelta(days=day), "open": 1, "high": 2, "low": 0.5, "close": close}
+        for sid, day, close in [(7, 0, 10.0), (3, 0, 20.0), (7, 1, 11.0), (3, 2, 22.0)]
+    ]
+
+    panel = await fetch_ohlc_panel(FakeConnection(rows), [7, 3])
+
+    assert panel.dates == [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4)]
+    assert panel.close[panel.row(7)].tolist()[:2] == [10.0, 11.0]
+    assert math.isnan(panel.close[panel.row(7), 2])
+    assert math.isnan(panel.close[panel.row(3), 1])
+    assert await fetch_ohlc_panel(FakeConnection([]), [7]) is None
@@ -5,14 +5,9 @@ from app.main import app
 client = TestClient(app)
 
 
-async def fake_compute(symbol, target_date, *, force=False):
-    return {
-        "symbol": symbol.upper(),
-        "dte": [30],
-        "moneyness": [-0.1, 0.0, 0.1],
-        "iv_grid": [[0.2, 0.25, 0.3]],
-        "generated_at": "2025-01-01T00:00:00Z",
-    }
+async def fake_enqueue(kind, params, **kwargs):
+    assert kind == "options.surface_compute"
+    return 11
 
 
 async def fake_recent(symbol, limit):
@@ -28,10 +23,10 @@ async def fake_recent(symbol, limit):
 
 
 def test_post_compute_surface(monkeypatch):
-    monkeypatch.setattr("app.api.v1.routes.vol_surface.compute_surface", fake_compute)
+    monkeypatch.setattr("app.api.v1.routes.vol_surface.enqueue_job", fake_enqueue)
     response = client.post("/api/v1/options/surface/compute", json={"symbol": "AAPL"})
     assert response.status_code == 202
-    assert response.json()["status"] == "ok"
+    assert response.json() == {"status": "queued", "job_id": 11}
 
 
 def test_get_surface(monkeypatch):
@@ -2,6 +2,7 @@ from datetime import date, timedelta
 
 import pytest
 
+from app.core import run_stats
 from app.core.config import Settings
 from app.services.options import vol_surface
 
@@ -13,7 +14,7 @@ class FakeClient:
     async def fetch_expirations(self, symbol):
         return [self.expiration]
 
-    async def fetch_chain(self, symbol, expiration):
+    async def fetch_chain(self, symbol, expiration, strike_range=None):
         return [
             {
                 "option_symbol": "CALL150",
@@ -47,12 +48,23 @@ class FakeClient:
         return None
 
 
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
 class FakeConnection:
     def __init__(self):
         self.chain_rows = []
         self.surface_rows = []
         self.recon_rows = []
 
+    def transaction(self):
+        return FakeTransaction()
+
     async def fetchval(self, query, *args):
         if "FROM securities" in query:
             return 1
@@ -71,6 +83,8 @@ class FakeConnection:
     async def executemany(self, query, rows):
         if "option_chain_raw" in query:
             self.chain_rows.extend(rows)
+        if "vol_surface_points" in query:
+            self.surface_rows.extend(rows)
 
     async def execute(self, query, *args):
         if "reconciliation_log" in query:
@@ -78,6 +92,8 @@ class FakeConnection:
         return None
 
     async def fetch(self, query, *args):
+        if "FROM securities" in query:
+            return [{"id": 1, "symbol": symbol, "type": "stock", "is_active": True} for symbol in args[0]]
         return []
 
 
@@ -99,7 +115,7 @@ class FakePool:
 async def test_compute_surface(monkeypatch):
     conn = FakeConnection()
 
-    async def fake_get_pool():
+    async def fake_get_pool(*args, **kwargs):
         return FakePool(conn)
 
     monkeypatch.setattr(vol_surface, "get_pool", fake_get_pool)
@@ -111,8 +127,41 @@ async def test_compute_surface(monkeypatch):
         POLYGON_OPTIONS_API_KEY="y",
     )
 
-    result = await vol_surface.compute_surface("AAPL", date.today(), client=client, settings=settings)
+    run = run_stats.RunStats(job_id="refresh_options_surface", trigger="manual")
+    token = run_stats.bind_run(run)
+    try:
+        result = await vol_surface.compute_surface("AAPL", date.today(), client=client, settings=settings)
+    finally:
+        run_stats.reset_run(token)
 
     assert result["symbol"] == "AAPL"
     assert conn.chain_rows
+    assert run.rows == len(conn.chain_rows) + len(conn.surface_rows) > len(conn.chain_rows)
+
+
+
+@pytest.mark.asyncio
+async def test_compute_surface_refetches_full_chain_when_strike_window_is_empty(monkeypatch):
+    conn = FakeConnection()
+    calls = []
+
+    class WindowedClient(FakeClient):
+        async def fetch_chain(self, symbol, expiration, strike_range=None):
+            calls.append(strike_range)
+            if strike_range is not None:
+                return []
+            return await super().fetch_chain(symbol, expiration)
+
+    async def fake_get_pool(*args, **kwargs):
+        return FakePool(conn)
+
+    monkeypatch.setattr(vol_surface, "get_pool", fake_get_pool)
+
+    client = WindowedClient(date.today() + timedelta(days=30))
+    settings = Settings(POLYGON_API_KEY="x", POLYGON_OPTIONS_API_KEY="y", OPTIONS_CHAIN_STRIKE_WINDOW=True)
+
+    result = await vol_surface.compute_surface("AAPL", date.today(), client=client, settings=settings, force=True)
 
+    assert calls[0] is not None and calls[1] is None
+    assert result["dte"]
+    assert len(conn.chain_rows) == 2
@@ -0,0 +1,88 @@
+-- 010_ohlcv_continuous_aggregates.sql
+-- Weekly/monthly OHLCV rollups of daily bars plus a daily log-return view.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS ohlcv_bars_1w
+WITH (timescaledb.continuous) AS
+SELECT
+    time_bucket(INTERVAL '1 week', time) AS bucket,
+    security_id,
+    first(open, time) AS open,
+    max(high) AS high,
+    min(low) AS low,
+    last(close, time) AS close,
+    sum(volume) AS volume,
+    count(*) AS bar_count
+FROM ohlcv_bars
+WHERE interval = '1d'
+GROUP BY bucket, security_id
+WITH NO DATA;
+
+CREATE INDEX IF NOT EXISTS idx_ohlcv_bars_1w_security_bucket
+    ON ohlcv_bars_1w (security_id, bucket DESC);
+
+SELECT add_continuous_aggregate_policy(
+    'ohlcv_bars_1w',
+    start_offset => INTERVAL '5 weeks',
+    end_offset => INTERVAL '1 day',
+    schedule_interval => INTERVAL '1 hour',
+    if_not_exists => TRUE
+);
+
+-- The policy only refreshes recent buckets: materialize the full history once, and let
+-- reads past the last refresh fall through to the raw bars.
+CALL refresh_continuous_aggregate('ohlcv_bars_1w', NULL, NULL);
+ALTER MATERIALIZED VIEW ohlcv_bars_1w SET (timescaledb.materialized_only = false);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS ohlcv_bars_1mo
+WITH (timescaledb.continuous) AS
+SELECT
+    time_bucket(INTERVAL '1 month', time) AS bucket,
+    security_id,
+    first(open, time) AS open,
+    max(high) AS high,
+    min(low) AS low,
+    last(close, time) AS close,
+    sum(volume) AS volume,
+    count(*) AS bar_count
+FROM ohlcv_bars
+WHERE interval = '1d'
+GROUP BY bucket, security_id
+WITH NO DATA;
+
+CREATE INDEX IF NOT EXISTS idx_ohlcv_bars_1mo_security_bucket
+    ON ohlcv_bars_1mo (security_id, bucket DESC);
+
+SELECT add_continuous_aggregate_policy(
+    'ohlcv_bars_1mo',
+    start_offset => INTERVAL '3 months',
+    end_offset => INTERVAL '1 day',
+    schedule_interval => INTERVAL '6 hours',
+    if_not_exists => TRUE
+);
+
+-- The policy only refreshes recent buckets: materialize the full history once, and let
+-- reads past the last refresh fall through to the raw bars.
+CALL refresh_continuous_aggregate('ohlcv_bars_1mo', NULL, NULL);
+ALTER MATERIALIZED VIEW ohlcv_bars_1mo SET (timescaledb.materialized_only = false);
+
+-- Continuous aggregates cannot use window functions, so close-to-close returns are a
+-- plain view. Filters on security_id are pushed below the window (it is the partition key).
+CREATE OR REPLACE VIEW ohlcv_daily_log_returns AS
+SELECT
+    time,
+    security_id,
+    close,
+    CASE
+        WHEN prev_close > 0 AND close > 0 THEN ln(close / prev_close)
+    END AS log_return
+FROM (
+    SELECT
+        time,
+        security_id,
+        close,
+        lag(close) OVER (PARTITION BY security_id ORDER BY time) AS prev_close
+    FROM ohlcv_bars
+    WHERE interval = '1d'
+) daily;
+
+COMMENT ON VIEW ohlcv_daily_log_returns IS 'Close-to-close daily log returns per security.';
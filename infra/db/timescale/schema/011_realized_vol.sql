@@ -0,0 +1,16 @@
+-- 011_realized_vol.sql
+-- Maintained realized-volatility series per security, estimator and window.
+
+CREATE TABLE IF NOT EXISTS realized_vol (
+    security_id BIGINT NOT NULL REFERENCES securities (id) ON DELETE CASCADE,
+    as_of DATE NOT NULL,
+    estimator TEXT NOT NULL,
+    window_days INTEGER NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (security_id, estimator, window_days, as_of)
+);
+
+SELECT create_hypertable('realized_vol', 'as_of', chunk_time_interval => INTERVAL '180 days', if_not_exists => TRUE);
+
+COMMENT ON TABLE realized_vol IS 'Annualized realized volatility, updated incrementally after OHLCV ingestion.';
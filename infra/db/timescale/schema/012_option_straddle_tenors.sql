@@ -0,0 +1,9 @@
+-- 012_option_straddle_tenors.sql
+-- Term-structure straddles: tag rows with the standard tenor they anchor so horizon
+-- lookups are exact indexed reads instead of nearest-DTE scans.
+
+ALTER TABLE option_straddles ADD COLUMN IF NOT EXISTS tenor_days INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_straddles_sec_tenor_time
+    ON option_straddles (security_id, tenor_days, snapshot_timestamp DESC)
+    WHERE tenor_days IS NOT NULL;
@@ -0,0 +1,21 @@
+-- 013_option_contracts.sql
+-- Daily-refreshed reference list of listed option contracts per underlying. Options
+-- services resolve expirations and strikes from here instead of paging the upstream
+-- contracts endpoint on every computation.
+
+CREATE TABLE IF NOT EXISTS option_contracts (
+    option_symbol TEXT PRIMARY KEY,
+    security_id BIGINT NOT NULL REFERENCES securities(id) ON DELETE CASCADE,
+    expiration DATE NOT NULL,
+    strike NUMERIC NOT NULL,
+    call_put TEXT NOT NULL,
+    shares_per_contract INTEGER,
+    first_seen DATE NOT NULL DEFAULT CURRENT_DATE,
+    last_seen DATE NOT NULL DEFAULT CURRENT_DATE,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_option_contracts_sec_exp_strike
+    ON option_contracts (security_id, expiration, strike);
+
+COMMENT ON TABLE option_contracts IS 'Listed option contracts, refreshed daily by app.cli.run_option_contracts.';
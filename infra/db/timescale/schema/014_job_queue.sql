@@ -0,0 +1,38 @@
+-- 014_job_queue.sql
+-- Durable queue for long-running work (backfills, manual job runs, surface computes).
+-- API endpoints insert a row and return its id; in-process workers on any replica claim
+-- queued rows with FOR UPDATE SKIP LOCKED and report progress back onto the same row.
+
+CREATE TABLE IF NOT EXISTS background_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params JSONB NOT NULL DEFAULT '{}'::jsonb,
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    rows_processed BIGINT NOT NULL DEFAULT 0,
+    progress_pct NUMERIC,
+    result JSONB,
+    error TEXT,
+    worker TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    heartbeat_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_background_jobs_queued
+    ON background_jobs (created_at)
+    WHERE status = 'queued';
+
+CREATE INDEX IF NOT EXISTS idx_background_jobs_running_heartbeat
+    ON background_jobs (heartbeat_at)
+    WHERE status = 'running';
+
+-- At most one queued/running job per dedupe key (e.g. one manual run of each scheduler job).
+CREATE UNIQUE INDEX IF NOT EXISTS idx_background_jobs_active_dedupe
+    ON background_jobs (dedupe_key)
+    WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'running');
+
+COMMENT ON TABLE background_jobs IS 'Background job queue; see app.services.job_queue.';
@@ -0,0 +1,39 @@
+-- 015_job_runs.sql
+-- One row per scheduled, manual or pipeline job run, plus per-symbol timings, so runtime
+-- percentiles and their trend can be queried per job and per symbol.
+
+CREATE TABLE IF NOT EXISTS job_runs (
+    id BIGSERIAL PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    trigger TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TIMESTAMPTZ NOT NULL,
+    finished_at TIMESTAMPTZ NOT NULL,
+    duration_ms DOUBLE PRECISION NOT NULL,
+    rows_written BIGINT NOT NULL DEFAULT 0,
+    upstream_calls INTEGER NOT NULL DEFAULT 0,
+    symbols_failed INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_runs_job_started
+    ON job_runs (job_id, started_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_job_runs_started
+    ON job_runs (started_at DESC);
+
+CREATE TABLE IF NOT EXISTS job_run_symbols (
+    job_run_id BIGINT NOT NULL REFERENCES job_runs(id) ON DELETE CASCADE,
+    symbol TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration_ms DOUBLE PRECISION NOT NULL,
+    rows_written BIGINT NOT NULL DEFAULT 0,
+    upstream_calls INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    PRIMARY KEY (job_run_id, symbol)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_run_symbols_symbol
+    ON job_run_symbols (symbol, job_run_id);
+
+COMMENT ON TABLE job_runs IS 'Job execution history; see app.services.scheduler.history.';
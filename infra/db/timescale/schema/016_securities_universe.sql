@@ -0,0 +1,27 @@
+-- 016_securities_universe.sql
+-- Scheduler universes are read from securities (is_active, type, tags) instead of symbol
+-- tuples in code. A security belongs to a universe when its tags contain the universe tag;
+-- adding names is a data change, and sharding across scheduler workers is configuration.
+
+ALTER TABLE securities
+    ADD COLUMN IF NOT EXISTS tags TEXT[] NOT NULL DEFAULT '{}';
+
+CREATE INDEX IF NOT EXISTS idx_securities_tags
+    ON securities USING GIN (tags)
+    WHERE is_active;
+
+-- Seed the universes previously hardcoded in app.services.scheduler.jobs.
+INSERT INTO securities (symbol, type, tags)
+VALUES
+    ('AAPL', 'stock', ARRAY['equities', 'options']),
+    ('MSFT', 'stock', ARRAY['equities', 'options']),
+    ('GOOGL', 'stock', ARRAY['equities', 'options']),
+    ('SPX', 'index', ARRAY['indexes']),
+    ('NDX', 'index', ARRAY['indexes']),
+    ('VIX', 'index', ARRAY['indexes']),
+    ('TNX', 'index', ARRAY['indexes']),
+    ('SPY', 'index', ARRAY['indexes', 'validation']),
+    ('QQQ', 'index', ARRAY['indexes'])
+ON CONFLICT (symbol, type) DO UPDATE
+SET tags = ARRAY(SELECT DISTINCT unnest(securities.tags || EXCLUDED.tags) ORDER BY 1),
+    updated_at = NOW();
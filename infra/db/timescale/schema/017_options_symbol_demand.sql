@@ -0,0 +1,12 @@
+-- 017_options_symbol_demand.sql
+-- Exponentially decayed read demand per options underlying. API replicas flush their
+-- request counts here; the intraday refresher on the scheduler leader reads it to
+-- prioritise the names people are actually looking at.
+
+CREATE TABLE IF NOT EXISTS options_symbol_demand (
+    symbol TEXT PRIMARY KEY,
+    score DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE options_symbol_demand IS 'Decayed request counts; see app.services.options.demand.';